@@ -0,0 +1,33 @@
+"""Add input_hash to processing_jobs for upload deduplication
+
+Revision ID: 20261018_job_input_hash
+Revises: 20261018_keyset_indexes
+Create Date: 2026-10-18
+
+Uploads are hashed while they stream to disk. The hash of the file content
+plus the processing parameters is stored on the parse job, so re-uploading
+an identical file reuses the earlier results instead of parsing it again.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa  # type: ignore[import-not-found]
+from alembic import op  # type: ignore[import-not-found]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_job_input_hash'  # type: ignore[assignment]
+down_revision: Union[str, Sequence[str], None] = '20261018_keyset_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add processing_jobs.input_hash and its index."""
+    op.add_column('processing_jobs', sa.Column('input_hash', sa.String(64), nullable=True))
+    op.create_index('ix_processing_jobs_input_hash', 'processing_jobs', ['input_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop processing_jobs.input_hash."""
+    op.drop_index('ix_processing_jobs_input_hash', table_name='processing_jobs')
+    op.drop_column('processing_jobs', 'input_hash')
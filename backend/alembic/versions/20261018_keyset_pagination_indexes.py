@@ -0,0 +1,41 @@
+"""Add composite indexes for keyset pagination of samples, jobs and alerts
+
+Revision ID: 20261018_keyset_indexes
+Revises: 20260102_fix_parquet
+Create Date: 2026-10-18
+
+The sample, job and alert listings are ordered newest-first and now paginate
+with an (timestamp, id) cursor. These indexes let each page be a single range
+scan instead of a sort of the whole (filtered) table.
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore[import-not-found]
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_keyset_indexes'  # type: ignore[assignment]
+down_revision: Union[str, Sequence[str], None] = '20260102_fix_parquet'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = [
+    ('idx_sample_upload_ts_id', 'samples', ['upload_timestamp', 'id']),
+    ('idx_sample_user_upload_ts_id', 'samples', ['user_id', 'upload_timestamp', 'id']),
+    ('idx_job_created_id', 'processing_jobs', ['created_at', 'id']),
+    ('idx_alert_created_id', 'alerts', ['created_at', 'id']),
+    ('idx_alert_user_created_id', 'alerts', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Create the keyset pagination indexes."""
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination indexes."""
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -9,14 +9,16 @@ Creates a FastAPI application pre-configured with:
 - Exception handlers
 - Health endpoint
 - Auth router (all modules need auth)
-- Database lifespan (init + default user + cleanup)
+- Database lifespan (init + default user + cleanup + warm-up + cache sweeper)
 
-Each module calls `create_module_app()` and then includes
-only the routers it needs.
+Each module calls `create_module_app()` with the routers it needs. They
+are imported on the first API request (or by the startup warm-up), so the
+server starts listening before the scientific/AI stack is loaded.
 """
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Sequence
+import asyncio
 import sys
 import time
 
@@ -27,7 +29,9 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from loguru import logger
 
+from src.api.cache import start_cache_sweeper
 from src.api.config import get_settings
+from src.api.lazy_routers import LazyRouters, RouterSpec
 from src.database.connection import init_database, close_connections, check_connection
 
 settings = get_settings()
@@ -77,6 +81,7 @@ def create_module_app(
     module_title: str,
     module_description: str = "",
     module_version: str = "1.0.0",
+    routers: Sequence[RouterSpec] = (),
 ) -> FastAPI:
     """
     Create a FastAPI app for a specific module with shared middleware and lifespan.
@@ -86,9 +91,10 @@ def create_module_app(
         module_title: Human-readable title for API docs
         module_description: Description shown in /docs
         module_version: Version string
+        routers: Module-specific routers, loaded lazily (see LazyRouters)
         
     Returns:
-        Configured FastAPI application — add module-specific routers after this.
+        Configured FastAPI application; the lazy routers are at app.state.api_routers
     """
     
     @asynccontextmanager
@@ -104,10 +110,19 @@ def create_module_app(
         except Exception as e:
             logger.warning(f"   Database: Failed to initialize - {e}")
         
+        warm_up = None
+        if settings.warmup_on_startup:
+            warm_up = asyncio.create_task(app.state.api_routers.warm_up(), name="router-warm-up")
+        
+        cache_sweeper = start_cache_sweeper(settings.cache_sweep_interval_s)
+        
         logger.success(f"✅ BioVaram {module_title} ready")
         yield
         
         logger.info(f"🛑 BioVaram {module_title} shutting down...")
+        for task in (warm_up, cache_sweeper):
+            if task is not None:
+                task.cancel()
         try:
             await close_connections()
             logger.info("   Database connections closed")
@@ -209,4 +224,8 @@ def create_module_app(
         tags=["Authentication"]
     )
     
+    # ---- Module Routers (imported on first use) ----
+    app.state.api_routers = LazyRouters(app, routers, api_prefix=settings.api_prefix)
+    app.state.api_routers.install()
+    
     return app
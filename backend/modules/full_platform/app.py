@@ -9,69 +9,21 @@ Default port: 8000
 """
 
 from modules.base import create_module_app
-from src.api.config import get_settings
-
-settings = get_settings()
+from src.api.lazy_routers import RouterSpec
 
 app = create_module_app(
     module_name="full",
     module_title="EV Analysis Platform",
     module_description="Complete EV Analysis Platform — NanoFACS, NTA, Cross-Compare, Dashboard, AI Chat.",
+    routers=[
+        RouterSpec("src.api.routers.upload", "/upload", ("Upload",)),
+        RouterSpec("src.api.routers.samples", "/samples", ("Samples",)),
+        RouterSpec("src.api.routers.jobs", "/jobs", ("Jobs",)),
+        RouterSpec("src.api.routers.analysis", "/analysis", ("Analysis",)),
+        RouterSpec("src.api.routers.alerts", "/alerts", ("Alerts",)),
+        RouterSpec("src.api.routers.chat", "", ("AI Chat",)),
+        RouterSpec("src.api.routers.backup", "", ("Database",)),
+        # Calibration (optional)
+        RouterSpec("src.api.routers.calibration", "/calibration", ("Calibration",), optional=True),
+    ],
 )
-
-# ---- All routers ----
-
-from src.api.routers import upload, samples, jobs, analysis, alerts, chat, backup
-
-app.include_router(
-    upload.router,
-    prefix=f"{settings.api_prefix}/upload",
-    tags=["Upload"]
-)
-
-app.include_router(
-    samples.router,
-    prefix=f"{settings.api_prefix}/samples",
-    tags=["Samples"]
-)
-
-app.include_router(
-    jobs.router,
-    prefix=f"{settings.api_prefix}/jobs",
-    tags=["Jobs"]
-)
-
-app.include_router(
-    analysis.router,
-    prefix=f"{settings.api_prefix}/analysis",
-    tags=["Analysis"]
-)
-
-app.include_router(
-    alerts.router,
-    prefix=f"{settings.api_prefix}/alerts",
-    tags=["Alerts"]
-)
-
-app.include_router(
-    chat.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["AI Chat"]
-)
-
-app.include_router(
-    backup.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["Database"]
-)
-
-# Calibration (optional)
-try:
-    from src.api.routers import calibration as calibration_router
-    app.include_router(
-        calibration_router.router,
-        prefix=f"{settings.api_prefix}/calibration",
-        tags=["Calibration"]
-    )
-except ImportError:
-    pass
@@ -15,75 +15,25 @@ Default port: 8001
 """
 
 from modules.base import create_module_app
-from src.api.config import get_settings
-
-settings = get_settings()
+from src.api.lazy_routers import RouterSpec
 
 app = create_module_app(
     module_name="nanofacs",
     module_title="NanoFACS Analysis",
     module_description="Flow Cytometry EV Analysis — Upload FCS files, run Mie sizing, view scatter plots and size distributions. Includes Dashboard & AI Chat.",
+    routers=[
+        # FCS upload (the upload router handles both FCS and NTA; only FCS will be
+        # called from the NanoFACS frontend build, but including the full router
+        # is harmless and avoids risky code splitting)
+        RouterSpec("src.api.routers.upload", "/upload", ("Upload",)),
+        # Sample endpoints (includes FCS scatter-data, size-bins, distribution, etc.)
+        RouterSpec("src.api.routers.samples", "/samples", ("Samples",)),
+        RouterSpec("src.api.routers.jobs", "/jobs", ("Jobs",)),
+        RouterSpec("src.api.routers.alerts", "/alerts", ("Alerts",)),
+        RouterSpec("src.api.routers.backup", "", ("Database",)),
+        # Calibration (optional — may not be installed in all environments)
+        RouterSpec("src.api.routers.calibration", "/calibration", ("Calibration",), optional=True),
+        # AI Research Chat
+        RouterSpec("src.api.routers.chat", "", ("AI Chat",), optional=True),
+    ],
 )
-
-# ---- Module-specific routers ----
-
-from src.api.routers import upload, samples, jobs, alerts, backup
-
-# FCS upload (the upload router handles both FCS and NTA; only FCS will be
-# called from the NanoFACS frontend build, but including the full router
-# is harmless and avoids risky code splitting)
-app.include_router(
-    upload.router,
-    prefix=f"{settings.api_prefix}/upload",
-    tags=["Upload"]
-)
-
-# Sample endpoints (includes FCS scatter-data, size-bins, distribution, etc.)
-app.include_router(
-    samples.router,
-    prefix=f"{settings.api_prefix}/samples",
-    tags=["Samples"]
-)
-
-# Processing jobs
-app.include_router(
-    jobs.router,
-    prefix=f"{settings.api_prefix}/jobs",
-    tags=["Jobs"]
-)
-
-# Alerts
-app.include_router(
-    alerts.router,
-    prefix=f"{settings.api_prefix}/alerts",
-    tags=["Alerts"]
-)
-
-# DB Backup
-app.include_router(
-    backup.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["Database"]
-)
-
-# Calibration (optional — may not be installed in all environments)
-try:
-    from src.api.routers import calibration as calibration_router
-    app.include_router(
-        calibration_router.router,
-        prefix=f"{settings.api_prefix}/calibration",
-        tags=["Calibration"]
-    )
-except ImportError:
-    pass
-
-# AI Research Chat
-try:
-    from src.api.routers import chat
-    app.include_router(
-        chat.router,
-        prefix=f"{settings.api_prefix}",
-        tags=["AI Chat"]
-    )
-except ImportError:
-    pass
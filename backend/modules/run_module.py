@@ -12,7 +12,6 @@ import os
 import socket
 import webbrowser
 import threading
-import time
 import signal
 from pathlib import Path
 
@@ -234,6 +233,19 @@ def _open_as_app_window(url: str, title: str) -> bool:
         return False
 
 
+def create_module_desktop_app():
+    """
+    Module app with the frontend mounted, for the module named by CRMIT_MODULE.
+    
+    Also the uvicorn app factory in multi-worker mode (one call per worker).
+    """
+    from importlib import import_module
+    mod = import_module(f"modules.{os.environ['CRMIT_MODULE']}.app")
+    app = mod.app
+    mount_frontend(app)
+    return app
+
+
 def run_module(
     module_name: str,
     module_title: str,
@@ -262,13 +274,21 @@ def run_module(
     os.environ.setdefault("CRMIT_TEMP_DIR", str(data_root / "temp"))
     os.environ.setdefault("CRMIT_DEBUG", "false")
     
-    # Import module app (after env vars are set)
-    from importlib import import_module
-    mod = import_module(f"modules.{module_name}.app")
-    app = mod.app
+    # Worker processes (CRMIT_WORKERS); frozen builds cannot spawn workers
+    try:
+        workers = max(int(os.environ.get("CRMIT_WORKERS", "1") or 1), 1)
+    except ValueError:
+        workers = 1
+    if workers > 1 and getattr(sys, 'frozen', False):
+        print("  Multi-worker mode is not available in the packaged app; using 1 worker")
+        workers = 1
     
-    # Mount frontend
-    mount_frontend(app)
+    # Import module app (after env vars are set); each worker builds its own
+    os.environ["CRMIT_MODULE"] = module_name
+    if workers > 1:
+        os.environ["CRMIT_WORKERS"] = str(workers)
+    else:
+        app = create_module_desktop_app()
     
     # Find port
     port = find_available_port(default_port)
@@ -296,9 +316,11 @@ def run_module(
     print("=" * 60)
     print()
     
-    # Open browser in standalone app window (like a PWA)
+    # Open browser in standalone app window (like a PWA) once the server answers
+    from src.utils.server_probe import wait_for_server
+
     def _open_browser():
-        time.sleep(2.0)
+        wait_for_server(port)
         url = f"http://localhost:{port}"
         
         if sys.platform == 'win32':
@@ -322,6 +344,17 @@ def run_module(
     
     # Run
     try:
+        if workers > 1:
+            print(f"  Workers: {workers} (shared caches)")
+            uvicorn.run(
+                "modules.run_module:create_module_desktop_app",
+                factory=True,
+                host="127.0.0.1",
+                port=port,
+                workers=workers,
+                log_level="info",
+            )
+            return
         config = uvicorn.Config(
             app,
             host="127.0.0.1",
@@ -1,4 +1,13 @@
-"""Startup script for CRMIT FastAPI backend."""
+"""Startup script for CRMIT FastAPI backend.
+
+Usage:
+    python run_api.py                 # single worker
+    python run_api.py --workers 8     # multi-worker mode (or CRMIT_WORKERS=8)
+
+With more than one worker, caches are shared between the worker processes
+(SQLite TTL store + memory-mapped event/LUT files under <temp_dir>/shared_cache).
+"""
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -19,9 +28,22 @@ load_dotenv(env_path)
 from src.api.main import app
 
 if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=8000,
-        reload=False
-    )
+    parser = argparse.ArgumentParser(description="Run the CRMIT API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CRMIT_WORKERS or 1)")
+    args = parser.parse_args()
+
+    workers = args.workers or int(os.environ.get("CRMIT_WORKERS", "1") or 1)
+    if workers > 1:
+        # Workers are separate interpreters: they read the worker count (and
+        # so enable the shared caches) from the environment
+        os.environ["CRMIT_WORKERS"] = str(workers)
+        uvicorn.run("src.api.main:app", host=args.host, port=args.port, workers=workers, reload=False)
+    else:
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port,
+            reload=False
+        )
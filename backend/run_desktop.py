@@ -19,7 +19,6 @@ import os
 import socket
 import webbrowser
 import threading
-import time
 from pathlib import Path
 
 
@@ -380,10 +379,13 @@ def create_desktop_app():
     return app
 
 
-def open_browser(port: int, delay: float = 2.0):
-    """Open the default browser after a short delay to let the server start."""
+def open_browser(port: int, timeout: float = 30.0):
+    """Open the default browser as soon as the server answers its health check."""
+    from src.utils.server_probe import wait_for_server
+
     def _open():
-        time.sleep(delay)
+        if not wait_for_server(port, timeout):
+            print(f"\n  Server did not answer within {timeout:.0f}s; opening the browser anyway")
         url = f"http://localhost:{port}"
         print(f"\n  Opening browser: {url}")
         
@@ -470,11 +472,23 @@ def main():
     preferred_port = _parse_env_int("CRMIT_PORT", 8000)
     port = preferred_port if _is_truthy_env("CRMIT_PORT_STRICT") else find_available_port(preferred_port)
     
+    # Worker processes (CRMIT_WORKERS): more than one serves concurrent users on
+    # many-core lab servers, with caches shared between the workers. Frozen
+    # builds cannot re-import this script in worker processes, so they stay at one.
+    workers = _parse_env_int("CRMIT_WORKERS", 1)
+    if workers > 1 and getattr(sys, 'frozen', False):
+        print("  Multi-worker mode is not available in the packaged app; using 1 worker")
+        workers = 1
+    
     # Print banner
     print_banner(port)
     
-    # Create the app
-    app = create_desktop_app()
+    # Create the app (each worker creates its own in multi-worker mode)
+    if workers > 1:
+        os.environ["CRMIT_WORKERS"] = str(workers)
+        print(f"  Workers:     {workers} (shared caches)")
+    else:
+        app = create_desktop_app()
     
     # Open browser only when not embedded by a desktop shell
     if _should_open_browser():
@@ -492,6 +506,16 @@ def main():
     
     # Start server
     try:
+        if workers > 1:
+            uvicorn.run(
+                "run_desktop:create_desktop_app",
+                factory=True,
+                host="127.0.0.1",
+                port=port,
+                workers=workers,
+                log_level="info",
+            )
+            return
         config = uvicorn.Config(
             app,
             host="127.0.0.1",
@@ -7,12 +7,20 @@ Processes all FCS samples and generates comprehensive visualizations:
 - Histograms (multi-channel)
 - Summary report with thumbnails
 
+Density plots are rasterized from every event with
+src.visualization.density_raster (no matplotlib); the matplotlib plots
+(hexbin, histograms) still use a SAMPLE_SIZE subsample. Samples are
+processed on a process pool of BATCH_WORKERS workers.
+
 Author: CRMIT Analysis Team
 Date: November 17, 2025
 """
 
+import os
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
@@ -23,13 +31,15 @@ import json
 from typing import Dict, List, Tuple, Optional
 import base64
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.visualization.fcs_plots import FCSPlotter
+from src.legacy.visualization.fcs_plots import FCSPlotter
 from src.visualization.auto_axis_selector import AutoAxisSelector
+from src.visualization.density_raster import render_density_png
 
 warnings.filterwarnings('ignore')
 
@@ -38,7 +48,9 @@ OUTPUT_DIR = project_root / 'figures' / 'batch_fcs'
 REPORTS_DIR = project_root / 'reports'
 DATA_DIR = project_root / 'data' / 'processed'
 THUMBNAIL_SIZE = (400, 300)
-SAMPLE_SIZE = 50000  # Events to plot (for performance)
+SAMPLE_SIZE = 50000  # Events for matplotlib plots (density plots use all events)
+DENSITY_SIZE = (800, 600)  # Density raster size in pixels (one bin per pixel)
+BATCH_WORKERS = max(1, (os.cpu_count() or 2) - 1)
 
 # Plot types to generate
 PLOT_TYPES = {
@@ -51,16 +63,18 @@ PLOT_TYPES = {
 class FCSBatchVisualizer:
     """Batch visualization pipeline for FCS data."""
     
-    def __init__(self, output_dir: Path, sample_size: int = 50000):
+    def __init__(self, output_dir: Path, sample_size: int = 50000, workers: int = 1):
         """
         Initialize batch visualizer.
         
         Args:
             output_dir: Directory to save plots
-            sample_size: Number of events to plot per sample
+            sample_size: Number of events per matplotlib plot
+            workers: Worker processes for run() (1 = process samples in order here)
         """
         self.output_dir = Path(output_dir)
         self.sample_size = sample_size
+        self.workers = workers
         self.plotter = FCSPlotter()
         self.axis_selector = AutoAxisSelector()
         
@@ -110,49 +124,34 @@ class FCSBatchVisualizer:
             print(f"   📂 Reading FCS file: {fcs_path.name}")
             meta, data = fcsparser.parse(str(fcs_path), reformat_meta=True)
             
-            # Sample if too many events
-            if len(data) > self.sample_size:
-                data = data.sample(n=self.sample_size, random_state=42)
-            
             return data
         except Exception as e:
             print(f"   ❌ Error loading {sample_id}: {e}")
             return None
     
+    def _subsample(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Subsample events for matplotlib plots."""
+        if len(data) > self.sample_size:
+            return data.sample(n=self.sample_size, random_state=42)
+        return data
+    
     def generate_scatter_density(self, sample_id: str, data: pd.DataFrame, 
-                                 x_channel: str, y_channel: str) -> Optional[Path]:
-        """Generate density scatter plot."""
+                                 x_channel: str, y_channel: str) -> Optional[Tuple[Path, Path]]:
+        """Generate full-resolution density raster (and its thumbnail) from all events."""
         try:
             output_file = self.output_dir / 'scatter_density' / f"{sample_id}_density.png"
+            thumbnail_file = self.output_dir / 'thumbnails' / output_file.name
             
-            fig, ax = plt.subplots(figsize=(8, 6))
-            
-            # Create density plot
             x_data = np.asarray(data[x_channel].values, dtype=np.float64)
             y_data = np.asarray(data[y_channel].values, dtype=np.float64)
             
-            # Create a mask for valid data points (both x and y > 0 and < 99th percentile)
-            x_valid = (x_data > 0) & (x_data < np.percentile(x_data[x_data > 0], 99))
-            y_valid = (y_data > 0) & (y_data < np.percentile(y_data[y_data > 0], 99))
-            valid_mask = x_valid & y_valid
-            
-            x_data = x_data[valid_mask]
-            y_data = y_data[valid_mask]
-            
-            # Plot with log scale
-            ax.hexbin(x_data, y_data, gridsize=100, cmap='viridis', 
-                     xscale='log', yscale='log', mincnt=1)
-            
-            ax.set_xlabel(x_channel, fontsize=12)
-            ax.set_ylabel(y_channel, fontsize=12)
-            ax.set_title(f'{sample_id} - Density Plot', fontsize=14, fontweight='bold')
-            ax.grid(True, alpha=0.3)
+            # Log axes; non-positive events drop out, range is the 0.1-99.9th percentile
+            render_density_png(x_data, y_data, output_path=output_file,
+                               width=DENSITY_SIZE[0], height=DENSITY_SIZE[1])
+            render_density_png(x_data, y_data, output_path=thumbnail_file,
+                               width=THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1])
             
-            plt.tight_layout()
-            plt.savefig(output_file, dpi=150, bbox_inches='tight')
-            plt.close()
-            
-            return output_file
+            return output_file, thumbnail_file
         except Exception as e:
             print(f"      ❌ Scatter density failed: {e}")
             return None
@@ -162,6 +161,7 @@ class FCSBatchVisualizer:
         """Generate hexbin scatter plot."""
         try:
             output_file = self.output_dir / 'scatter_hexbin' / f"{sample_id}_hexbin.png"
+            data = self._subsample(data)
             
             fig, ax = plt.subplots(figsize=(8, 6))
             
@@ -200,6 +200,7 @@ class FCSBatchVisualizer:
         """Generate multi-channel histogram grid."""
         try:
             output_file = self.output_dir / 'histogram_grid' / f"{sample_id}_histograms.png"
+            data = self._subsample(data)
             
             # Select key channels (up to 6)
             channels = [col for col in data.columns if col not in ['Time', 'sample_id']][:6]
@@ -298,18 +299,12 @@ class FCSBatchVisualizer:
         if not fcs_file_path or not Path(fcs_file_path).exists():
             print(f"   ⚠️  FCS file not found for {sample_id}")
             result['error'] = 'FCS file not found'
-            self.stats['failed'] += 1
-            self.stats['failures'].append({
-                'sample_id': sample_id,
-                'reason': 'FCS file not found'
-            })
             return result
         
         # Load event data from FCS file
         data = self.get_sample_data(sample_id, fcs_file_path)
         if data is None:
             result['error'] = 'Failed to load event data'
-            self.stats['failed'] += 1
             return result
         
         print(f"   📊 Loaded {len(data)} events")
@@ -337,15 +332,14 @@ class FCSBatchVisualizer:
         
         if PLOT_TYPES['scatter_density']:
             print(f"   🎨 Generating density plot...")
-            plot_path = self.generate_scatter_density(sample_id, data, x_channel, y_channel)
-            if plot_path:
-                thumb_path = self.create_thumbnail(plot_path)
+            density_paths = self.generate_scatter_density(sample_id, data, x_channel, y_channel)
+            if density_paths:
+                plot_path, thumb_path = density_paths
                 plots_generated.append({
                     'type': 'scatter_density',
                     'path': str(plot_path.relative_to(project_root)),
                     'thumbnail': str(thumb_path.relative_to(project_root))
                 })
-                self.stats['plots_generated'] += 1
         
         if PLOT_TYPES['scatter_hexbin']:
             print(f"   🎨 Generating hexbin plot...")
@@ -357,7 +351,6 @@ class FCSBatchVisualizer:
                     'path': str(plot_path.relative_to(project_root)),
                     'thumbnail': str(thumb_path.relative_to(project_root))
                 })
-                self.stats['plots_generated'] += 1
         
         if PLOT_TYPES['histogram_grid']:
             print(f"   🎨 Generating histogram grid...")
@@ -369,20 +362,30 @@ class FCSBatchVisualizer:
                     'path': str(plot_path.relative_to(project_root)),
                     'thumbnail': str(thumb_path.relative_to(project_root))
                 })
-                self.stats['plots_generated'] += 1
         
         result['plots'] = plots_generated
         result['success'] = len(plots_generated) > 0
         
         if result['success']:
             print(f"   ✅ Generated {len(plots_generated)} plots")
-            self.stats['processed'] += 1
         else:
             print(f"   ❌ No plots generated")
-            self.stats['failed'] += 1
+            result['error'] = 'No plots generated'
         
         return result
     
+    def record_result(self, result: Dict) -> None:
+        """Add one sample's result to the run statistics."""
+        self.stats['plots_generated'] += len(result['plots'])
+        if result['success']:
+            self.stats['processed'] += 1
+        else:
+            self.stats['failed'] += 1
+            self.stats['failures'].append({
+                'sample_id': result['sample_id'],
+                'reason': result['error']
+            })
+    
     def generate_html_report(self, results: List[Dict], output_file: Path):
         """Generate HTML summary report with thumbnails."""
         print("\n📄 Generating HTML report...")
@@ -666,18 +669,27 @@ class FCSBatchVisualizer:
         print("=" * 80)
         print(f"📅 Started: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"📂 Output directory: {self.output_dir}")
-        print(f"📊 Sample size: {self.sample_size:,} events per plot")
+        print(f"📊 Sample size: {self.sample_size:,} events per matplotlib plot (density: all events)")
+        print(f"⚙️  Workers: {self.workers}")
         print("=" * 80)
         
         # Load statistics
         df_stats = self.load_fcs_statistics(stats_file)
         self.stats['total_samples'] = len(df_stats)
         
-        # Process each sample
-        results = []
-        for idx, row in df_stats.iterrows():
-            result = self.process_sample(row)
-            results.append(result)
+        # Process samples on a process pool (each worker has its own visualizer)
+        rows = [row for _, row in df_stats.iterrows()]
+        if self.workers > 1 and len(rows) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(rows)),
+                initializer=_init_worker,
+                initargs=(self.output_dir, self.sample_size),
+            ) as pool:
+                results = list(pool.map(_process_sample_in_worker, rows))
+        else:
+            results = [self.process_sample(row) for row in rows]
+        for result in results:
+            self.record_result(result)
         
         # Generate HTML report
         report_file = REPORTS_DIR / 'fcs_batch_visualization_report.html'
@@ -701,6 +713,20 @@ class FCSBatchVisualizer:
         return self.stats
 
 
+_worker_visualizer: Optional[FCSBatchVisualizer] = None
+
+
+def _init_worker(output_dir: Path, sample_size: int) -> None:
+    """Process-pool initializer: one visualizer per worker process."""
+    global _worker_visualizer
+    _worker_visualizer = FCSBatchVisualizer(output_dir=output_dir, sample_size=sample_size)
+
+
+def _process_sample_in_worker(row: pd.Series) -> Dict:
+    assert _worker_visualizer is not None
+    return _worker_visualizer.process_sample(row)
+
+
 def main():
     """Main execution function."""
     
@@ -716,7 +742,8 @@ def main():
     # Create visualizer and run
     visualizer = FCSBatchVisualizer(
         output_dir=OUTPUT_DIR,
-        sample_size=SAMPLE_SIZE
+        sample_size=SAMPLE_SIZE,
+        workers=BATCH_WORKERS
     )
     
     stats = visualizer.run(stats_file)
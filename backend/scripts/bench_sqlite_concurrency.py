@@ -0,0 +1,148 @@
+"""
+SQLite Concurrency Benchmark
+============================
+
+Measures sample-list read latency while uploads are writing, for:
+
+- legacy: NullPool, a fresh connection per session, default rollback journal
+- tuned:  the engine profile from src.database.connection (WAL + pragmas,
+          persistent reader pool, single serialized writer)
+
+Each profile gets its own temporary database seeded with the same samples.
+Readers loop on the sample-list query (page of 50 + total count); writers
+simulate uploads (insert a sample, commit, then mark it processed).
+
+Usage:
+    python scripts/bench_sqlite_concurrency.py
+    python scripts/bench_sqlite_concurrency.py --readers 16 --writers 2 --seconds 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func, update  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import (  # type: ignore[import-not-found]
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool  # type: ignore[import-not-found]
+
+from src.database import connection
+from src.database.models import Base, Sample
+
+
+def legacy_factory(url: str):
+    engine = create_async_engine(url, poolclass=NullPool)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine, factory
+
+
+def tuned_factory(url: str):
+    connection.settings.database_url = url
+    connection._engine = connection._read_engine = connection._session_factory = None
+    factory = connection.get_session_factory()
+    return connection.get_engine(), factory
+
+
+async def seed(engine, n_samples: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession)
+    async with factory() as session:
+        session.add_all(
+            Sample(sample_id=f"seed_{i:06d}", processing_status="completed")
+            for i in range(n_samples)
+        )
+        await session.commit()
+
+
+async def reader(factory, stop: float, latencies: list, errors: list):
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        try:
+            async with factory() as session:
+                page = await session.execute(
+                    select(Sample).order_by(Sample.upload_timestamp.desc()).limit(50)
+                )
+                page.scalars().all()
+                await session.execute(select(func.count()).select_from(Sample))
+            latencies.append(time.perf_counter() - started)
+        except Exception as exc:  # "database is locked" under contention
+            errors.append(str(exc))
+
+
+async def writer(factory, wid: int, stop: float, done: list, errors: list):
+    i = 0
+    while time.perf_counter() < stop:
+        try:
+            async with factory() as session:
+                sample = Sample(sample_id=f"upload_{wid}_{i}", processing_status="processing")
+                session.add(sample)
+                await session.commit()
+                await asyncio.sleep(0.005)  # parsing happens between the two writes
+                await session.execute(
+                    update(Sample).where(Sample.id == sample.id).values(processing_status="completed")
+                )
+                await session.commit()
+            done.append(1)
+        except Exception as exc:
+            errors.append(str(exc))
+        i += 1
+
+
+async def run_profile(name: str, make, args) -> dict:
+    tmp = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    url = f"sqlite+aiosqlite:///{tmp / 'bench.db'}"
+    engine, factory = make(url)
+    await seed(engine, args.samples)
+
+    latencies: list = []
+    writes: list = []
+    errors: list = []
+    stop = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        *(reader(factory, stop, latencies, errors) for _ in range(args.readers)),
+        *(writer(factory, w, stop, writes, errors) for w in range(args.writers)),
+    )
+    if name == "tuned":
+        await connection.close_connections()
+    else:
+        await engine.dispose()
+
+    latencies.sort()
+    return {
+        "reads/s": len(latencies) / args.seconds,
+        "p50 ms": 1000 * statistics.median(latencies) if latencies else float("nan"),
+        "p95 ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))] if latencies else float("nan"),
+        "uploads": len(writes),
+        "errors": len(errors),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="SQLite read-during-upload benchmark")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s, "
+          f"{args.samples} seeded samples\n")
+    print(f"{'profile':<8} {'reads/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'uploads':>8} {'errors':>7}")
+    for name, make in (("legacy", legacy_factory), ("tuned", tuned_factory)):
+        r = await run_profile(name, make, args)
+        print(f"{name:<8} {r['reads/s']:>9.1f} {r['p50 ms']:>8.2f} {r['p95 ms']:>8.2f} "
+              f"{r['uploads']:>8} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Backend Startup Benchmark
+=========================
+
+Measures how long importing the API app takes before uvicorn can bind its
+port, using ``python -X importtime`` in a fresh interpreter per run:
+
+- startup:  ``import src.api.main`` (what run_api.py / run_desktop.py pay)
+- routers:  the same, plus loading every lazy router (what the first API
+            request or the startup warm-up pays)
+
+For each, prints the median wall time, the slowest top-level imports
+(cumulative) and which heavy scientific / AI packages were loaded.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --app modules.nanofacs.app --repeat 5 --top 15
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+HEAVY_PACKAGES = ("pandas", "scipy", "sklearn", "pyarrow", "miepython", "boto3", "matplotlib", "numba")
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import importlib
+module = importlib.import_module({app!r})
+if {load_routers!r}:
+    app = module.app
+    routers = getattr(module, "api_routers", None) or app.state.api_routers
+    routers.load()
+elapsed = time.perf_counter() - start
+heavy = [p for p in {heavy!r} if p in sys.modules]
+print(f"RESULT {{elapsed:.4f}} {{','.join(heavy)}}")
+"""
+
+
+def _run_once(app: str, load_routers: bool):
+    """One fresh interpreter; returns (seconds, heavy packages, importtime rows)."""
+    code = _PROBE.format(app=app, load_routers=load_routers, heavy=HEAVY_PACKAGES)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    result = [line for line in proc.stdout.splitlines() if line.startswith("RESULT ")]
+    if proc.returncode != 0 or not result:
+        raise RuntimeError(f"Probe failed for {app}:\n{proc.stderr[-2000:]}")
+    _, seconds, heavy = result[-1].split(" ")
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Nesting is shown by indenting the name two spaces per level
+        rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    return float(seconds), [p for p in heavy.split(",") if p], rows
+
+
+def bench(app: str, load_routers: bool, repeat: int, top: int) -> float:
+    label = "routers" if load_routers else "startup"
+    runs = [_run_once(app, load_routers) for _ in range(repeat)]
+    median = statistics.median(seconds for seconds, _, _ in runs)
+    _, heavy, rows = runs[-1]
+
+    print(f"\n[{label}] {app}{' + routers' if load_routers else ''}")
+    print(f"  wall time: median {median * 1000:.0f} ms over {repeat} runs "
+          f"(min {min(r[0] for r in runs) * 1000:.0f} ms)")
+    print(f"  heavy packages loaded: {', '.join(heavy) or 'none'}")
+    # Top-level imports only (no leading indentation in importtime output)
+    top_level = sorted((r for r in rows if not r[2].startswith(" ")), reverse=True)[:top]
+    print(f"  slowest top-level imports (cumulative):")
+    for cumulative_us, _, name in top_level:
+        print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend import/startup time")
+    parser.add_argument("--app", default="src.api.main", help="Module exposing the FastAPI app")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    startup = bench(args.app, False, args.repeat, args.top)
+    full = bench(args.app, True, args.repeat, args.top)
+    print(f"\nTime to bind the port: {startup * 1000:.0f} ms "
+          f"({(full - startup) * 1000:.0f} ms of router imports deferred to first use / warm-up)")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,14 @@ Statistical Tests:
 - Levene's test: Detects changes in variance/spread
 - Chi-square test: For categorical/binned data
 
+Batch engine:
+Each sample is reduced once to a PreparedSample (sorted values plus the
+moments the tests need). Pairwise tests then run on the sorted arrays with
+searchsorted merges instead of re-sorting both samples per test, Welch and
+Levene statistics come straight from the moments, and shift_matrix()
+evaluates every sample's CDF on one shared grid so KS D and Wasserstein-1
+for all N x N pairs are a few vectorized array reductions.
+
 Use Cases:
 - Compare before/after treatment samples
 - Detect drift over time in control samples
@@ -24,7 +32,9 @@ Author: CRMIT Backend Team
 Date: January 1, 2026
 """
 
-from typing import List, Dict, Optional, Tuple, Any, TYPE_CHECKING
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence, Tuple, Any, Union, TYPE_CHECKING
 from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
@@ -32,16 +42,13 @@ from loguru import logger
 
 # Type stubs for conditional imports
 stats: Any = None
-wasserstein_distance: Any = None
 
 try:
     from scipy import stats  # type: ignore[import-not-found]
-    from scipy.stats import wasserstein_distance  # type: ignore[import-not-found]
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
     stats = None
-    wasserstein_distance = None
     logger.warning("scipy not installed - population shift detection will be limited")
 
 
@@ -114,6 +121,308 @@ class MultiSampleShiftResult:
     max_severity: ShiftSeverity
 
 
+@dataclass
+class ShiftMatrixResult:
+    """All-pairs shift statistics for N samples (each matrix is N x N)."""
+    sample_ids: List[str]
+    sample_names: List[str]
+    n_events: List[int]
+    metric_name: str
+    method: str  # "grid" or "exact"
+    matrices: Dict[str, np.ndarray]
+    severity: List[List[ShiftSeverity]]
+    any_significant_shift: bool
+    max_severity: ShiftSeverity
+
+
+# ============================================================================
+# Batch engine
+# ============================================================================
+
+# Above this sample size, KS p-values use the (Stephens-corrected) limiting
+# Kolmogorov distribution. scipy's finite-n kstwo costs ~0.2 s per p-value at
+# flow-cytometry event counts; ks_2samp uses the same cutoff for 'exact'.
+KS_EXACT_MAX_N = 10000
+
+# EMD permutation test: events drawn per sample, and permutations run
+EMD_PERMUTATION_EVENTS = 2000
+EMD_PERMUTATIONS = 1000
+
+# Points in the shared CDF grid used by shift_matrix(method="grid")
+DEFAULT_GRID_SIZE = 4096
+
+_SEVERITY_ORDER = [
+    ShiftSeverity.NONE, ShiftSeverity.MINOR, ShiftSeverity.MODERATE,
+    ShiftSeverity.MAJOR, ShiftSeverity.CRITICAL,
+]
+
+
+@dataclass
+class PreparedSample:
+    """
+    A sample reduced once for repeated comparisons.
+
+    Holds the sorted, NaN-free values and the moments the shift tests need,
+    so comparing it against any number of other samples never re-sorts or
+    re-scans the raw events.
+    """
+    sample_id: str
+    sample_name: str
+    values: np.ndarray      # sorted ascending, float64, no NaN
+    mean: float
+    var: float              # ddof=1
+    median: float
+    abs_dev_mean: float     # mean of |x - median| (median-centred Levene)
+    abs_dev_var: float      # variance of |x - median|, ddof=1
+    _metrics: Dict[Tuple[str, str], "PopulationMetrics"] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @property
+    def n(self) -> int:
+        return int(self.values.shape[0])
+
+    @property
+    def min(self) -> float:
+        return float(self.values[0])
+
+    @property
+    def max(self) -> float:
+        return float(self.values[-1])
+
+
+SampleData = Union[np.ndarray, PreparedSample]
+
+
+def prepare_sample(data: SampleData, sample_id: str = "", sample_name: str = "") -> PreparedSample:
+    """
+    Sort ``data`` once and compute its moments.
+
+    Args:
+        data: Raw values (NaNs are dropped) or an already prepared sample
+        sample_id: Sample identifier
+        sample_name: Human-readable sample name
+
+    Returns:
+        PreparedSample (``data`` itself if it is already prepared)
+    """
+    if isinstance(data, PreparedSample):
+        return data
+
+    values = np.asarray(data, dtype=np.float64).ravel()
+    values = np.sort(values[~np.isnan(values)])
+    n = len(values)
+    if n == 0:
+        raise ValueError(f"No valid data for sample {sample_id}")
+
+    median = float(np.median(values))
+    abs_dev = np.abs(values - median)
+    return PreparedSample(
+        sample_id=sample_id,
+        sample_name=sample_name,
+        values=values,
+        mean=float(values.mean()),
+        var=float(values.var(ddof=1)) if n > 1 else 0.0,
+        median=median,
+        abs_dev_mean=float(abs_dev.mean()),
+        abs_dev_var=float(abs_dev.var(ddof=1)) if n > 1 else 0.0,
+    )
+
+
+def _default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def prepare_samples(
+    samples: Sequence[Tuple[SampleData, str, str]],
+    max_workers: Optional[int] = None
+) -> List[PreparedSample]:
+    """
+    prepare_sample() for many (data, sample_id, sample_name) tuples.
+
+    Sorting releases the GIL, so samples are prepared on a thread pool of
+    ``max_workers`` threads (default: up to 4).
+    """
+    workers = max_workers or _default_workers()
+    if workers <= 1 or len(samples) <= 1:
+        return [prepare_sample(*item) for item in samples]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda item: prepare_sample(*item), samples))
+
+
+def ks_pvalue(d: Any, n1: Any, n2: Any) -> Any:
+    """
+    Two-sided KS p-value from the limiting distribution with Stephens'
+    small-sample correction; vectorized over ``d``, ``n1`` and ``n2``.
+    """
+    en = np.asarray(n1, dtype=np.float64) * n2 / (np.asarray(n1, dtype=np.float64) + n2)
+    sqrt_en = np.sqrt(en)
+    return np.clip(stats.kstwobign.sf((sqrt_en + 0.12 + 0.11 / sqrt_en) * d), 0.0, 1.0)  # type: ignore[union-attr]
+
+
+def ks_2samp_sorted(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sided two-sample KS statistic and p-value for sorted arrays.
+
+    D is exact (both ECDFs are evaluated at every observation, as in
+    ``scipy.stats.ks_2samp``). Small samples defer to ks_2samp for its exact
+    p-value; larger ones use ks_pvalue().
+    """
+    n1, n2 = len(a), len(b)
+    if max(n1, n2) <= KS_EXACT_MAX_N:
+        result = stats.ks_2samp(a, b)  # type: ignore[union-attr]
+        return float(result.statistic), float(result.pvalue)
+
+    # Right-continuous ECDFs at the points of a, then at the points of b
+    d_a = np.max(np.abs(np.searchsorted(a, a, "right") / n1 - np.searchsorted(b, a, "right") / n2))
+    d_b = np.max(np.abs(np.searchsorted(a, b, "right") / n1 - np.searchsorted(b, b, "right") / n2))
+    d = float(max(d_a, d_b))
+    return d, float(ks_pvalue(d, n1, n2))
+
+
+def wasserstein_sorted(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Wasserstein-1 distance between the empirical distributions of two sorted
+    arrays (same result as ``scipy.stats.wasserstein_distance``).
+    """
+    # Concatenated sorted runs: the stable sort is a linear merge
+    all_values = np.sort(np.concatenate([a, b]), kind="stable")
+    deltas = np.diff(all_values)
+    cdf_a = np.searchsorted(a, all_values[:-1], "right") / len(a)
+    cdf_b = np.searchsorted(b, all_values[:-1], "right") / len(b)
+    return float(np.sum(np.abs(cdf_a - cdf_b) * deltas))
+
+
+def emd_permutation_pvalue(
+    a: np.ndarray,
+    b: np.ndarray,
+    observed: Optional[float] = None,
+    n_events: int = EMD_PERMUTATION_EVENTS,
+    n_permutations: int = EMD_PERMUTATIONS,
+    seed: int = 0
+) -> float:
+    """
+    Permutation p-value for the Wasserstein-1 distance between ``a`` and ``b``.
+
+    The permutation null is built from equal-size subsamples of m <=
+    ``n_events`` events each, where W1 is just mean(|sort(a) - sort(b)|), so
+    all permutations are row-wise sorts of one (n_permutations x 2m) array.
+    Under the null sqrt(n_eff) * W1 (n_eff = n1 * n2 / (n1 + n2)) has a
+    size-free limit, so null draws are rescaled to the full sample sizes
+    before comparing with the full-data ``observed`` distance; when both
+    samples fit in ``n_events`` this is the plain permutation test. Seeded, so
+    repeated calls give the same answer.
+    """
+    if observed is None:
+        observed = wasserstein_sorted(a, b)
+    rng = np.random.default_rng(seed)
+
+    scale = 1.0
+    if max(len(a), len(b)) > n_events:
+        m = min(len(a), len(b), n_events)
+        n_eff = len(a) * len(b) / (len(a) + len(b))
+        a = rng.choice(a, m, replace=False) if len(a) > m else a
+        b = rng.choice(b, m, replace=False) if len(b) > m else b
+        scale = float(np.sqrt((m / 2) / n_eff))
+
+    pooled = np.concatenate([a, b])
+    n_a = len(a)
+    exceed = 0
+    chunk = max(1, 2_000_000 // len(pooled))  # bound the working set to ~16 MB
+    for start in range(0, n_permutations, chunk):
+        rows = min(chunk, n_permutations - start)
+        shuffled = rng.permuted(np.tile(pooled, (rows, 1)), axis=1)
+        left = np.sort(shuffled[:, :n_a], axis=1)
+        right = np.sort(shuffled[:, n_a:], axis=1)
+        if left.shape[1] == right.shape[1]:
+            null = np.mean(np.abs(left - right), axis=1)
+        else:
+            null = np.array([wasserstein_sorted(x, y) for x, y in zip(left, right)])
+        exceed += int(np.count_nonzero(null * scale >= observed))
+    return exceed / n_permutations
+
+
+def welch_from_moments(a: Any, b: Any) -> Tuple[Any, Any]:
+    """
+    Welch's t statistic and two-sided p-value from sample moments.
+
+    ``a`` and ``b`` are PreparedSamples or broadcastable (mean, var, n)
+    array triples.
+    """
+    mean_a, var_a, n_a = (a.mean, a.var, a.n) if isinstance(a, PreparedSample) else a
+    mean_b, var_b, n_b = (b.mean, b.var, b.n) if isinstance(b, PreparedSample) else b
+    result = stats.ttest_ind_from_stats(  # type: ignore[union-attr]
+        mean_a, np.sqrt(var_a), n_a, mean_b, np.sqrt(var_b), n_b, equal_var=False
+    )
+    return result.statistic, result.pvalue
+
+
+def levene_from_moments(a: Any, b: Any) -> Tuple[Any, Any]:
+    """
+    Median-centred Levene W and p-value for two samples from the mean and
+    variance of their absolute deviations (identical to
+    ``scipy.stats.levene(a, b, center='median')``).
+
+    ``a`` and ``b`` are PreparedSamples or broadcastable
+    (abs_dev_mean, abs_dev_var, n) array triples.
+    """
+    z_a, zv_a, n_a = (a.abs_dev_mean, a.abs_dev_var, a.n) if isinstance(a, PreparedSample) else a
+    z_b, zv_b, n_b = (b.abs_dev_mean, b.abs_dev_var, b.n) if isinstance(b, PreparedSample) else b
+    n_a = np.asarray(n_a, dtype=np.float64)
+    n_b = np.asarray(n_b, dtype=np.float64)
+    total = n_a + n_b
+    z_bar = (n_a * z_a + n_b * z_b) / total
+    between = n_a * (z_a - z_bar) ** 2 + n_b * (z_b - z_bar) ** 2
+    within = (n_a - 1) * zv_a + (n_b - 1) * zv_b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = (total - 2) * between / within
+    return w, stats.f.sf(w, 1, total - 2)  # type: ignore[union-attr]
+
+
+def _cdf_grid(prepared: Sequence[PreparedSample], grid_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Shared evaluation grid and every sample's ECDF on it.
+
+    The grid is ``grid_size`` quantiles of the pooled samples (each sample
+    weighted equally) plus the overall extremes, so each cell holds about
+    1/grid_size of the pooled mass.
+
+    Returns:
+        (grid, cdf) with cdf[i, k] = F_i(grid[k])
+    """
+    levels = (np.arange(grid_size) + 0.5) / grid_size
+    quantiles = np.stack([
+        p.values[np.minimum((levels * p.n).astype(np.int64), p.n - 1)] for p in prepared
+    ])
+    n = len(prepared)
+    pooled = np.sort(quantiles.ravel())[n // 2::n]
+    extremes = [min(p.min for p in prepared), max(p.max for p in prepared)]
+    grid = np.unique(np.concatenate([pooled, extremes]))
+    cdf = np.stack([np.searchsorted(p.values, grid, "right") / p.n for p in prepared])
+    return grid, cdf
+
+
+def _quantile_means(prepared: Sequence[PreparedSample], grid_size: int) -> np.ndarray:
+    """
+    Every sample's quantile function averaged over ``grid_size`` equal
+    probability cells: q[i, k] = mean of sample i's sorted values in cell k.
+
+    W1 = integral of |Q_i(u) - Q_j(u)| du, so mean(|q[i] - q[j]|) is a lower
+    bound on it that is exact whenever the two quantile functions do not
+    cross inside a cell. Averaging (rather than point-sampling) keeps the
+    heavy upper tail of each cell's events in the estimate.
+    """
+    edges = np.arange(grid_size + 1) / grid_size
+    rows = []
+    for p in prepared:
+        # Integral of the (step) quantile function from 0 to u is piecewise
+        # linear with knots at k/n, so cell integrals are exact interpolations
+        knots = np.arange(p.n + 1) / p.n
+        integral = np.concatenate([[0.0], np.cumsum(p.values)]) / p.n
+        rows.append(np.diff(np.interp(edges, knots, integral)) * grid_size)
+    return np.stack(rows)
+
+
 class PopulationShiftDetector:
     """
     Detects statistically significant shifts in particle populations.
@@ -150,35 +459,47 @@ class PopulationShiftDetector:
         }
     }
     
-    def __init__(self, alpha: float = 0.05):
+    def __init__(self, alpha: float = 0.05, max_workers: Optional[int] = None):
         """
         Initialize the detector.
         
         Args:
             alpha: Significance level for statistical tests (default 0.05)
+            max_workers: Threads used to prepare samples and run batch
+                comparisons (default: up to 4)
         """
         self.alpha = alpha
+        self.max_workers = max_workers
         
         if not SCIPY_AVAILABLE:
             logger.warning("scipy not available - limited functionality")
     
     def calculate_metrics(
         self, 
-        data: np.ndarray, 
+        data: SampleData, 
         sample_id: str,
         sample_name: str
     ) -> PopulationMetrics:
         """
         Calculate descriptive metrics for a population.
         
+        Metrics of a PreparedSample are computed once per (id, name) and reused.
+        
         Args:
-            data: Array of values (e.g., particle sizes)
+            data: Array of values (e.g., particle sizes) or a PreparedSample
             sample_id: Sample identifier
             sample_name: Human-readable sample name
             
         Returns:
             PopulationMetrics with comprehensive statistics
         """
+        if isinstance(data, PreparedSample):
+            metrics = data._metrics.get((sample_id, sample_name))
+            if metrics is None:
+                metrics = self.calculate_metrics(data.values, sample_id, sample_name)
+                data._metrics[(sample_id, sample_name)] = metrics
+            return metrics
+        
         data = np.asarray(data)
         data = data[~np.isnan(data)]  # Remove NaN values
         
@@ -238,8 +559,8 @@ class PopulationShiftDetector:
     
     def ks_test(
         self, 
-        data_a: np.ndarray, 
-        data_b: np.ndarray
+        data_a: SampleData, 
+        data_b: SampleData
     ) -> ShiftTestResult:
         """
         Kolmogorov-Smirnov test for distribution shift.
@@ -248,8 +569,8 @@ class PopulationShiftDetector:
         Sensitive to differences in location, spread, and shape.
         
         Args:
-            data_a: First sample data
-            data_b: Second sample data
+            data_a: First sample data (array or PreparedSample)
+            data_b: Second sample data (array or PreparedSample)
             
         Returns:
             ShiftTestResult with KS test results
@@ -264,9 +585,9 @@ class PopulationShiftDetector:
             )
         
         try:
-            result = stats.ks_2samp(data_a, data_b)  # type: ignore[union-attr]
-            statistic = float(getattr(result, 'statistic', 0.0))
-            p_value = float(getattr(result, 'pvalue', 1.0))
+            statistic, p_value = ks_2samp_sorted(
+                prepare_sample(data_a).values, prepare_sample(data_b).values
+            )
             significant = p_value < self.alpha
             
             severity = self._classify_severity(statistic, "ks_statistic")
@@ -304,18 +625,19 @@ class PopulationShiftDetector:
     
     def earth_movers_distance(
         self, 
-        data_a: np.ndarray, 
-        data_b: np.ndarray
+        data_a: SampleData, 
+        data_b: SampleData
     ) -> ShiftTestResult:
         """
         Earth Mover's Distance (Wasserstein distance) for distribution shift.
         
         Quantifies the "work" needed to transform one distribution into another.
         More interpretable than KS statistic for practical differences.
+        Significance comes from emd_permutation_pvalue().
         
         Args:
-            data_a: First sample data
-            data_b: Second sample data
+            data_a: First sample data (array or PreparedSample)
+            data_b: Second sample data (array or PreparedSample)
             
         Returns:
             ShiftTestResult with EMD results
@@ -331,27 +653,15 @@ class PopulationShiftDetector:
         
         try:
             # Calculate EMD (Wasserstein-1 distance)
-            if not SCIPY_AVAILABLE or wasserstein_distance is None:
-                raise RuntimeError("scipy not available")
-            emd = wasserstein_distance(data_a, data_b)  # type: ignore[misc]
+            a, b = prepare_sample(data_a), prepare_sample(data_b)
+            emd = wasserstein_sorted(a.values, b.values)
             
             # Normalize by the range for interpretability
-            combined_range = max(np.max(data_a), np.max(data_b)) - min(np.min(data_a), np.min(data_b))
+            combined_range = max(a.max, b.max) - min(a.min, b.min)
             normalized_emd = emd / combined_range if combined_range > 0 else 0
             
-            # Bootstrap for significance testing
-            n_bootstrap = 1000
-            bootstrap_emds = []
-            combined = np.concatenate([data_a, data_b])
-            n_a = len(data_a)
-            
-            for _ in range(n_bootstrap):
-                np.random.shuffle(combined)
-                boot_emd = wasserstein_distance(combined[:n_a], combined[n_a:])  # type: ignore[misc]
-                bootstrap_emds.append(boot_emd)
-            
-            # Calculate p-value from bootstrap distribution
-            p_value = float(np.mean(np.array(bootstrap_emds) >= emd))
+            # Permutation test for significance
+            p_value = emd_permutation_pvalue(a.values, b.values, observed=emd)
             significant = p_value < self.alpha
             
             severity = self._classify_severity(normalized_emd, "emd_normalized")
@@ -389,8 +699,8 @@ class PopulationShiftDetector:
     
     def mean_shift_test(
         self, 
-        data_a: np.ndarray, 
-        data_b: np.ndarray
+        data_a: SampleData, 
+        data_b: SampleData
     ) -> ShiftTestResult:
         """
         Test for shift in population mean using Welch's t-test.
@@ -398,8 +708,8 @@ class PopulationShiftDetector:
         Detects changes in the central tendency of the population.
         
         Args:
-            data_a: First sample data
-            data_b: Second sample data
+            data_a: First sample data (array or PreparedSample)
+            data_b: Second sample data (array or PreparedSample)
             
         Returns:
             ShiftTestResult with t-test results
@@ -414,14 +724,15 @@ class PopulationShiftDetector:
             )
         
         try:
-            result = stats.ttest_ind(data_a, data_b, equal_var=False)  # type: ignore[union-attr]
-            statistic = float(getattr(result, 'statistic', 0.0))
-            p_value = float(getattr(result, 'pvalue', 1.0))
+            a, b = prepare_sample(data_a), prepare_sample(data_b)
+            t_stat, t_p = welch_from_moments(a, b)
+            statistic = float(t_stat)
+            p_value = float(t_p)
             significant = p_value < self.alpha
             
             # Calculate Cohen's d
-            mean_a, mean_b = np.mean(data_a), np.mean(data_b)
-            std_a, std_b = np.std(data_a, ddof=1), np.std(data_b, ddof=1)
+            mean_a, mean_b = a.mean, b.mean
+            std_a, std_b = np.sqrt(a.var), np.sqrt(b.var)
             pooled_std = np.sqrt((std_a**2 + std_b**2) / 2)
             cohens_d = (mean_a - mean_b) / pooled_std if pooled_std > 0 else 0
             
@@ -429,8 +740,8 @@ class PopulationShiftDetector:
             
             # Calculate confidence interval for mean difference
             mean_diff = mean_a - mean_b
-            se_diff = np.sqrt(std_a**2/len(data_a) + std_b**2/len(data_b))
-            ci_margin = stats.t.ppf(1 - self.alpha/2, min(len(data_a), len(data_b)) - 1) * se_diff  # type: ignore[union-attr]
+            se_diff = np.sqrt(std_a**2/a.n + std_b**2/b.n)
+            ci_margin = stats.t.ppf(1 - self.alpha/2, min(a.n, b.n) - 1) * se_diff  # type: ignore[union-attr]
             ci = (mean_diff - ci_margin, mean_diff + ci_margin)
             
             if significant:
@@ -469,8 +780,8 @@ class PopulationShiftDetector:
     
     def variance_shift_test(
         self, 
-        data_a: np.ndarray, 
-        data_b: np.ndarray
+        data_a: SampleData, 
+        data_b: SampleData
     ) -> ShiftTestResult:
         """
         Test for shift in population variance using Levene's test.
@@ -478,8 +789,8 @@ class PopulationShiftDetector:
         Detects changes in the spread/variability of the population.
         
         Args:
-            data_a: First sample data
-            data_b: Second sample data
+            data_a: First sample data (array or PreparedSample)
+            data_b: Second sample data (array or PreparedSample)
             
         Returns:
             ShiftTestResult with Levene's test results
@@ -494,13 +805,14 @@ class PopulationShiftDetector:
             )
         
         try:
-            result = stats.levene(data_a, data_b, center='median')  # type: ignore[union-attr]
-            statistic = float(result.statistic)
-            p_value = float(result.pvalue)
+            a, b = prepare_sample(data_a), prepare_sample(data_b)
+            w, w_p = levene_from_moments(a, b)
+            statistic = float(w)
+            p_value = float(w_p)
             significant = p_value < self.alpha
             
             # Calculate variance ratio as effect size
-            var_a, var_b = np.var(data_a, ddof=1), np.var(data_b, ddof=1)
+            var_a, var_b = a.var, b.var
             var_ratio = float(max(var_a, var_b) / min(var_a, var_b)) if min(var_a, var_b) > 0 else 1.0
             
             severity = self._classify_severity(var_ratio, "variance_ratio")
@@ -554,8 +866,8 @@ class PopulationShiftDetector:
     
     def detect_shift(
         self,
-        data_a: np.ndarray,
-        data_b: np.ndarray,
+        data_a: SampleData,
+        data_b: SampleData,
         sample_a_id: str,
         sample_a_name: str,
         sample_b_id: str,
@@ -569,8 +881,8 @@ class PopulationShiftDetector:
         Runs multiple statistical tests and provides an overall assessment.
         
         Args:
-            data_a: First sample data array
-            data_b: Second sample data array
+            data_a: First sample data array or PreparedSample
+            data_b: Second sample data array or PreparedSample
             sample_a_id: ID of first sample
             sample_a_name: Display name of first sample
             sample_b_id: ID of second sample
@@ -585,13 +897,11 @@ class PopulationShiftDetector:
         if tests is None:
             tests = ["ks", "emd", "mean", "variance"]
         
-        # Clean data
-        data_a = np.asarray(data_a)
-        data_b = np.asarray(data_b)
-        data_a = data_a[~np.isnan(data_a)]
-        data_b = data_b[~np.isnan(data_b)]
+        # Clean and sort once; every test below reuses the prepared samples
+        data_a = prepare_sample(data_a, sample_a_id, sample_a_name)
+        data_b = prepare_sample(data_b, sample_b_id, sample_b_name)
         
-        if len(data_a) < 3 or len(data_b) < 3:
+        if data_a.n < 3 or data_b.n < 3:
             raise ValueError("Each sample must have at least 3 data points")
         
         # Calculate metrics for both samples
@@ -714,6 +1024,23 @@ class PopulationShiftDetector:
         
         return recommendations
     
+    def _prepare_all(
+        self,
+        samples: Sequence[Tuple[SampleData, str, str]]
+    ) -> List[Union[PreparedSample, Exception]]:
+        """prepare_samples(), keeping a per-sample exception in place of failures."""
+        def prepare(item: Tuple[SampleData, str, str]) -> Union[PreparedSample, Exception]:
+            try:
+                return prepare_sample(*item)
+            except Exception as e:
+                return e
+
+        workers = self.max_workers or _default_workers()
+        if workers <= 1 or len(samples) <= 1:
+            return [prepare(item) for item in samples]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(prepare, samples))
+
     def compare_to_baseline(
         self,
         baseline_data: np.ndarray,
@@ -727,6 +1054,8 @@ class PopulationShiftDetector:
         Compare multiple samples against a baseline.
         
         Useful for quality control where you have a reference sample.
+        The baseline and every sample are sorted once (on a thread pool), not
+        once per test per comparison.
         
         Args:
             baseline_data: Reference sample data
@@ -741,10 +1070,18 @@ class PopulationShiftDetector:
         """
         comparisons = []
         
-        for data, sample_id, sample_name in sample_data_list:
+        prepared = self._prepare_all([(baseline_data, baseline_id, baseline_name), *sample_data_list])
+        baseline = prepared[0]
+        
+        for data, (_, sample_id, sample_name) in zip(prepared[1:], sample_data_list):
+            if isinstance(data, Exception):
+                logger.error(f"Comparison failed for {sample_name}: {data}")
+                continue
             try:
+                if isinstance(baseline, Exception):
+                    raise baseline
                 result = self.detect_shift(
-                    data_a=baseline_data,
+                    data_a=baseline,
                     data_b=data,
                     sample_a_id=baseline_id,
                     sample_a_name=baseline_name,
@@ -799,7 +1136,8 @@ class PopulationShiftDetector:
         """
         Compare sequential samples to detect drift over time.
         
-        Compares each sample to its predecessor in the sequence.
+        Compares each sample to its predecessor in the sequence. Each sample
+        is sorted once even though it takes part in two comparisons.
         
         Args:
             temporal_data: Time-ordered list of (data, sample_id, sample_name)
@@ -813,12 +1151,17 @@ class PopulationShiftDetector:
             raise ValueError("Need at least 2 samples for temporal comparison")
         
         comparisons = []
+        prepared = self._prepare_all(temporal_data)
         
         for i in range(1, len(temporal_data)):
-            prev_data, prev_id, prev_name = temporal_data[i-1]
-            curr_data, curr_id, curr_name = temporal_data[i]
+            _, prev_id, prev_name = temporal_data[i-1]
+            _, curr_id, curr_name = temporal_data[i]
+            prev_data, curr_data = prepared[i-1], prepared[i]
             
             try:
+                for data in (prev_data, curr_data):
+                    if isinstance(data, Exception):
+                        raise data
                 result = self.detect_shift(
                     data_a=prev_data,
                     data_b=curr_data,
@@ -867,6 +1210,169 @@ class PopulationShiftDetector:
             max_severity=max_severity
         )
 
+    def _severity_levels(self, effect: np.ndarray, threshold_key: str) -> np.ndarray:
+        """Vectorized _classify_severity(): index into _SEVERITY_ORDER per element."""
+        thresholds = self.SEVERITY_THRESHOLDS[threshold_key]
+        bounds = [thresholds[level.value] for level in _SEVERITY_ORDER[1:]]
+        return np.searchsorted(bounds, np.abs(effect), side="right")
+
+    def shift_matrix(
+        self,
+        samples: Sequence[Tuple[SampleData, str, str]],
+        metric_name: str = "particle_size",
+        tests: Optional[List[str]] = None,
+        method: str = "grid",
+        grid_size: int = DEFAULT_GRID_SIZE
+    ) -> ShiftMatrixResult:
+        """
+        Shift statistics for every pair of samples (cross-sample QC matrix).
+
+        method="grid" reduces each sample once to its ECDF on a shared grid
+        of ``grid_size`` pooled quantiles and to its cell-averaged quantile
+        function; KS D and Wasserstein-1 for all pairs are then row-wise
+        reductions of those (N x grid_size) matrices. Both can only
+        underestimate: D by at most the largest mass one sample puts in a
+        single grid cell (~1/grid_size for similar samples), W1 by a few
+        percent for near-identical samples and not at all for clearly shifted
+        ones. method="exact" runs the sorted-array kernels per pair on the
+        thread pool instead.
+
+        Grid KS p-values always come from the limiting distribution
+        (ks_pvalue): scipy's exact test costs ~0.2 s per pair at typical EV
+        event counts, too slow for an all-pairs matrix. method="exact" uses
+        the exact p-value of ks_2samp_sorted() for pairs where both samples
+        have at most KS_EXACT_MAX_N events.
+
+        Welch and Levene statistics come from per-sample moments and are exact
+        either way. No per-pair EMD permutation test is run: an EMD shift is
+        significant when the KS test (same null hypothesis) is.
+
+        Args:
+            samples: List of (data, sample_id, sample_name) tuples
+            metric_name: Name of metric being compared
+            tests: Tests that contribute to severity (default: all)
+            method: "grid" (default) or "exact"
+            grid_size: Grid points for method="grid"
+
+        Returns:
+            ShiftMatrixResult with N x N matrices ks_statistic, ks_p_value,
+            emd, emd_normalized, mean_t, mean_p_value, cohens_d,
+            variance_ratio, levene_statistic and levene_p_value
+        """
+        if tests is None:
+            tests = ["ks", "emd", "mean", "variance"]
+        if method not in ("grid", "exact"):
+            raise ValueError(f"Unknown shift matrix method: {method}. Must be 'grid' or 'exact'")
+        if not SCIPY_AVAILABLE:
+            raise RuntimeError("scipy is required for shift matrices")
+        if len(samples) < 2:
+            raise ValueError("Need at least 2 samples for a shift matrix")
+
+        prepared = prepare_samples(samples, self.max_workers)
+        if any(p.n < 3 for p in prepared):
+            raise ValueError("Each sample must have at least 3 data points")
+        n = len(prepared)
+
+        # Distribution statistics (upper triangle, mirrored below)
+        ks_d = np.zeros((n, n))
+        ks_exact_p = np.full((n, n), np.nan)
+        emd = np.zeros((n, n))
+        if method == "grid":
+            _, cdf = _cdf_grid(prepared, grid_size)
+            quantiles = _quantile_means(prepared, grid_size)
+            for i in range(n - 1):
+                ks_d[i, i + 1:] = np.abs(cdf[i] - cdf[i + 1:]).max(axis=1)
+                emd[i, i + 1:] = np.abs(quantiles[i] - quantiles[i + 1:]).mean(axis=1)
+        else:
+            pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+            def run(pair: Tuple[int, int]) -> Tuple[float, float, float]:
+                a, b = prepared[pair[0]].values, prepared[pair[1]].values
+                return (*ks_2samp_sorted(a, b), wasserstein_sorted(a, b))
+
+            workers = self.max_workers or _default_workers()
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(run, pairs))
+            else:
+                results = [run(pair) for pair in pairs]
+            for (i, j), (d, p, w) in zip(pairs, results):
+                ks_d[i, j], emd[i, j] = d, w
+                if max(prepared[i].n, prepared[j].n) <= KS_EXACT_MAX_N:
+                    ks_exact_p[i, j] = p
+        ks_d += ks_d.T
+        emd += emd.T
+        ks_exact_p = np.fmin(ks_exact_p, ks_exact_p.T)
+
+        # Per-sample moments as column (i) and row (j) vectors
+        def column(attr: str) -> np.ndarray:
+            return np.array([float(getattr(p, attr)) for p in prepared])[:, None]
+
+        sizes, means, variances = column("n"), column("mean"), column("var")
+        lows, highs = column("min"), column("max")
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ks_p = np.where(np.isnan(ks_exact_p), ks_pvalue(ks_d, sizes, sizes.T), ks_exact_p)
+            mean_t, mean_p = welch_from_moments((means, variances, sizes), (means.T, variances.T, sizes.T))
+            levene_w, levene_p = levene_from_moments(
+                (column("abs_dev_mean"), column("abs_dev_var"), sizes),
+                (column("abs_dev_mean").T, column("abs_dev_var").T, sizes.T),
+            )
+            pooled_std = np.sqrt((variances + variances.T) / 2)
+            cohens_d = np.where(pooled_std > 0, (means - means.T) / pooled_std, 0.0)
+            var_hi, var_lo = np.maximum(variances, variances.T), np.minimum(variances, variances.T)
+            variance_ratio = np.where(var_lo > 0, var_hi / var_lo, 1.0)
+            ranges = np.maximum(highs, highs.T) - np.minimum(lows, lows.T)
+            emd_normalized = np.where(ranges > 0, emd / ranges, 0.0)
+
+        # Identical samples on the diagonal: no statistic, no significance
+        off_diagonal = ~np.eye(n, dtype=bool)
+        mean_t = np.where(off_diagonal, np.nan_to_num(mean_t), 0.0)
+        levene_w = np.where(off_diagonal, np.nan_to_num(levene_w), 0.0)
+        ks_p, mean_p, levene_p = (
+            np.where(off_diagonal, np.nan_to_num(p, nan=1.0), 1.0) for p in (ks_p, mean_p, levene_p)
+        )
+
+        # Severity: highest level among significant tests, as in detect_shift()
+        checks = {
+            "ks": (ks_d, ks_p, "ks_statistic"),
+            "emd": (emd_normalized, ks_p, "emd_normalized"),
+            "mean": (cohens_d, mean_p, "cohens_d"),
+            "variance": (variance_ratio, levene_p, "variance_ratio"),
+        }
+        level = np.zeros((n, n), dtype=np.int64)
+        significant = np.zeros((n, n), dtype=bool)
+        for test in tests:
+            if test not in checks:
+                continue
+            effect, p_value, key = checks[test]
+            test_significant = (p_value < self.alpha) & off_diagonal
+            significant |= test_significant
+            level = np.maximum(level, np.where(test_significant, self._severity_levels(effect, key), 0))
+
+        return ShiftMatrixResult(
+            sample_ids=[p.sample_id for p in prepared],
+            sample_names=[p.sample_name for p in prepared],
+            n_events=[p.n for p in prepared],
+            metric_name=metric_name,
+            method=method,
+            matrices={
+                "ks_statistic": ks_d,
+                "ks_p_value": ks_p,
+                "emd": emd,
+                "emd_normalized": emd_normalized,
+                "mean_t": mean_t,
+                "mean_p_value": mean_p,
+                "cohens_d": cohens_d,
+                "variance_ratio": variance_ratio,
+                "levene_statistic": levene_w,
+                "levene_p_value": levene_p,
+            },
+            severity=[[_SEVERITY_ORDER[v] for v in row] for row in level.tolist()],
+            any_significant_shift=bool(significant.any()),
+            max_severity=_SEVERITY_ORDER[int(level.max())],
+        )
+
 
 # Convenience function for quick shift detection
 def detect_population_shift(
@@ -4,18 +4,86 @@ In-memory TTL cache for expensive computations.
 Caches FCS parsing, scatter-data, distribution analysis,
 and other heavy endpoints to avoid re-computing on every request.
 
-No external dependencies (no Redis needed) — simple dict-based cache
-with TTL expiration and max-size eviction.
+No external dependencies (no Redis needed). Each TTLCache keeps:
+- an OrderedDict in LRU order: reads move a key to the end, inserts at
+  capacity evict from the front (O(1))
+- a min-heap of expiry times, so expired entries are found without a scan;
+  they are dropped on insert and by the background sweeper
+  (run_cache_sweeper, started in the app lifespan by start_cache_sweeper)
+- an estimate of the memory held by each value (estimate_size_bytes),
+  reported per cache by get_all_cache_stats
+- an index of keys by "<kind>:<sample_id>:" group, so invalidating one
+  sample only touches that sample's keys
+
+Multi-worker mode: when shared caches are enabled (CRMIT_WORKERS > 1 or
+CRMIT_SHARED_CACHE=true), every TTLCache stores its entries in the SQLite
+store of src.utils.shared_cache instead of a dict, so all workers share
+hits and invalidations. Values must then be picklable; ones that are not
+are simply not cached.
+
+Concurrent misses on the same key can be coalesced with get_or_compute /
+get_or_compute_async: the first caller computes the value, the others wait
+for it (src.utils.single_flight) instead of repeating the work.
 """
 
+import asyncio
+import heapq
+import sys
 import time
 import hashlib
 import json
-from typing import Any, Optional
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Awaitable, Callable, Optional
 from dataclasses import dataclass, field
 from threading import Lock
 from loguru import logger
 
+from src.utils.single_flight import SingleFlight
+
+
+# Containers larger than this are sized from a sample of their items
+_SIZE_SAMPLE_ITEMS = 20
+_SIZE_MAX_DEPTH = 4
+
+
+def estimate_size_bytes(value: Any, _depth: int = 0) -> int:
+    """
+    Approximate memory held by a cached value.
+
+    NumPy arrays count their buffer, pandas objects their column buffers
+    (object columns count pointers only), and dicts / lists / tuples / sets
+    are walked a few levels deep, extrapolating from a sample of the items
+    of large containers.
+    """
+    columns = getattr(value, "columns", None)
+    memory_usage = getattr(value, "memory_usage", None)
+    if columns is not None and callable(memory_usage):  # pandas DataFrame
+        try:
+            return int(memory_usage(index=True, deep=False).sum())
+        except Exception:
+            pass
+    nbytes = getattr(value, "nbytes", None)  # NumPy arrays / scalars, pandas Series and Index
+    if isinstance(nbytes, int):
+        return nbytes
+
+    size = sys.getsizeof(value, 64)
+    if _depth >= _SIZE_MAX_DEPTH or isinstance(value, (str, bytes, bytearray)):
+        return size
+    if isinstance(value, dict):
+        items = list(islice(value.items(), _SIZE_SAMPLE_ITEMS))
+        sampled = sum(
+            estimate_size_bytes(k, _depth + 1) + estimate_size_bytes(v, _depth + 1) for k, v in items
+        )
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(islice(value, _SIZE_SAMPLE_ITEMS))
+        sampled = sum(estimate_size_bytes(item, _depth + 1) for item in items)
+    else:
+        return size
+    if not items:
+        return size
+    return size + sampled * len(value) // len(items)
+
 
 @dataclass
 class CacheEntry:
@@ -27,26 +95,54 @@ class CacheEntry:
     size_bytes: int = 0
 
 
+def _sample_group(key: str) -> Optional[str]:
+    """Index group of a key: its '<kind>:<sample_id>:' prefix, or None."""
+    parts = key.split(":", 2)
+    if len(parts) < 3:
+        return None
+    return f"{parts[0]}:{parts[1]}:"
+
+
 class TTLCache:
     """
     Thread-safe in-memory cache with TTL expiration.
     
     Features:
-    - Per-key TTL
-    - Max size with LRU-like eviction (oldest first)
-    - Automatic cleanup of expired entries
+    - Per-key TTL, expiry tracked in a heap
+    - Max size with LRU eviction (O(1))
+    - Background cleanup of expired entries (cleanup_expired, run by the sweeper)
+    - Estimated memory use per entry and in total
+    - O(k) invalidation of a sample's keys ('<kind>:<sample_id>:' prefixes)
+    - Coalesced computation of missing keys (get_or_compute)
     - Cache statistics for monitoring
     """
     
     def __init__(self, max_entries: int = 500, name: str = "default"):
-        self._cache: dict[str, CacheEntry] = {}
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._groups: dict[str, set[str]] = {}
+        self._bytes = 0
         self._lock = Lock()
         self._max_entries = max_entries
         self._name = name
-        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "sets": 0}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "sets": 0}
+        self._flights = SingleFlight(name)
+    
+    @staticmethod
+    def _shared():
+        """Cross-process store in multi-worker mode, else None."""
+        from src.utils.shared_cache import get_ttl_store
+        return get_ttl_store()
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache, returns None if expired or missing."""
+        shared = self._shared()
+        if shared is not None:
+            found, value = shared.get(self._name, key)
+            with self._lock:
+                self._stats["hits" if found else "misses"] += 1
+            return value
+        
         with self._lock:
             entry = self._cache.get(key)
             if entry is None:
@@ -54,72 +150,200 @@ class TTLCache:
                 return None
             
             if time.time() > entry.expires_at:
-                # Expired
-                del self._cache[key]
+                self._remove(key)
+                self._stats["expirations"] += 1
                 self._stats["misses"] += 1
                 return None
             
+            self._cache.move_to_end(key)
             entry.hits += 1
             self._stats["hits"] += 1
             return entry.value
     
     def set(self, key: str, value: Any, ttl_seconds: float = 60.0) -> None:
         """Store value with TTL."""
+        shared = self._shared()
+        if shared is not None:
+            try:
+                evicted = shared.set(self._name, key, value, ttl_seconds, self._max_entries)
+            except Exception as e:
+                logger.debug(f"Cache {self._name}: value for {key} not shareable ({e}), not cached")
+                return
+            with self._lock:
+                self._stats["sets"] += 1
+                self._stats["evictions"] += evicted
+            return
+        
+        size = estimate_size_bytes(value)
+        now = time.time()
         with self._lock:
-            # Evict oldest if at capacity
-            if len(self._cache) >= self._max_entries and key not in self._cache:
-                self._evict_oldest()
+            if key in self._cache:
+                self._remove(key)
+            elif len(self._cache) >= self._max_entries:
+                # Make room: expired entries first, then the least recently used
+                self._stats["expirations"] += self._expire(now)
+                while len(self._cache) >= self._max_entries:
+                    self._remove(next(iter(self._cache)))
+                    self._stats["evictions"] += 1
             
-            self._cache[key] = CacheEntry(
-                value=value,
-                expires_at=time.time() + ttl_seconds,
-            )
+            entry = CacheEntry(value=value, expires_at=now + ttl_seconds, created_at=now, size_bytes=size)
+            self._cache[key] = entry
+            self._bytes += size
+            heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+            group = _sample_group(key)
+            if group is not None:
+                self._groups.setdefault(group, set()).add(key)
             self._stats["sets"] += 1
+            self._compact_heap()
+    
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl_seconds: float = 60.0) -> Any:
+        """
+        Cached value of ``key``, computing and storing it on a miss.
+
+        Threads that miss the same key while it is being computed wait for
+        that computation and share its result (or its exception).
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        def compute_and_store() -> Any:
+            value = self._peek(key)
+            if value is None:
+                value = compute()
+                self.set(key, value, ttl_seconds)
+            return value
+
+        return self._flights.do(key, compute_and_store)
+    
+    async def get_or_compute_async(
+        self, key: str, compute: Callable[[], Awaitable[Any]], ttl_seconds: float = 60.0
+    ) -> Any:
+        """
+        Async get_or_compute for endpoints: requests that miss the same key
+        while ``compute()`` is being awaited wait for it instead of running
+        it again.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        async def compute_and_store() -> Any:
+            value = self._peek(key)
+            if value is None:
+                value = await compute()
+                self.set(key, value, ttl_seconds)
+            return value
+
+        return await self._flights.do_async(key, compute_and_store)
+    
+    def _peek(self, key: str) -> Optional[Any]:
+        """Live value of ``key`` without touching statistics."""
+        shared = self._shared()
+        if shared is not None:
+            return shared.get(self._name, key)[1]
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or time.time() > entry.expires_at:
+                return None
+            return entry.value
     
     def invalidate(self, prefix: str) -> int:
-        """Remove all entries matching a key prefix. Returns count removed."""
+        """
+        Remove all entries matching a key prefix. Returns count removed.
+        
+        Prefixes of the form '<kind>:<sample_id>:' (or longer) only look at
+        that sample's keys.
+        """
+        shared = self._shared()
+        if shared is not None:
+            return shared.invalidate(self._name, prefix)
+        group = _sample_group(prefix)
         with self._lock:
-            keys_to_remove = [k for k in self._cache if k.startswith(prefix)]
+            candidates = self._groups.get(group, ()) if group is not None else self._cache
+            keys_to_remove = [k for k in candidates if k.startswith(prefix)]
             for k in keys_to_remove:
-                del self._cache[k]
+                self._remove(k)
             return len(keys_to_remove)
     
     def clear(self) -> None:
         """Clear all cache entries."""
+        shared = self._shared()
+        if shared is not None:
+            shared.clear(self._name)
+            return
         with self._lock:
             self._cache.clear()
-    
-    def _evict_oldest(self) -> None:
-        """Evict the oldest entry (by creation time)."""
-        if not self._cache:
-            return
-        oldest_key = min(self._cache, key=lambda k: self._cache[k].created_at)
-        del self._cache[oldest_key]
-        self._stats["evictions"] += 1
+            self._expiry_heap.clear()
+            self._groups.clear()
+            self._bytes = 0
     
     def cleanup_expired(self) -> int:
         """Remove all expired entries. Returns count removed."""
-        now = time.time()
+        shared = self._shared()
+        if shared is not None:
+            return shared.cleanup_expired(self._name)
         with self._lock:
-            expired = [k for k, v in self._cache.items() if now > v.expires_at]
-            for k in expired:
-                del self._cache[k]
-            return len(expired)
+            removed = self._expire(time.time())
+            self._stats["expirations"] += removed
+            return removed
+    
+    def _remove(self, key: str) -> None:
+        """Drop a key (caller holds the lock); its heap item goes stale."""
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size_bytes
+        group = _sample_group(key)
+        if group is not None:
+            keys = self._groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[group]
+    
+    def _expire(self, now: float) -> int:
+        """Remove entries expired at ``now`` (caller holds the lock)."""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip heap items of keys that were overwritten or removed since
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                removed += 1
+        return removed
+    
+    def _compact_heap(self) -> None:
+        """Rebuild the heap once stale items outnumber live ones (caller holds the lock)."""
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [(entry.expires_at, key) for key, entry in self._cache.items()]
+            heapq.heapify(self._expiry_heap)
     
     @property
     def stats(self) -> dict:
         """Cache statistics."""
         total = self._stats["hits"] + self._stats["misses"]
         hit_rate = (self._stats["hits"] / total * 100) if total > 0 else 0.0
+        shared = self._shared()
+        if shared is not None:
+            entries, size_bytes = shared.count(self._name), shared.size_bytes(self._name)  # pickled size
+        else:
+            with self._lock:
+                entries, size_bytes = len(self._cache), self._bytes
         return {
             "name": self._name,
-            "entries": len(self._cache),
+            "shared": shared is not None,
+            "entries": entries,
             "max_entries": self._max_entries,
+            "size_bytes": size_bytes,
+            "megabytes": round(size_bytes / 1e6, 2),
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
             "hit_rate_pct": round(hit_rate, 1),
             "evictions": self._stats["evictions"],
+            "expirations": self._stats["expirations"],
             "sets": self._stats["sets"],
+            "coalesced": self._flights.stats["coalesced"],
         }
 
 
@@ -153,20 +377,63 @@ size_bins_cache = TTLCache(max_entries=100, name="size_bins")
 # TTL: 10s (changes on upload/delete)
 sample_list_cache = TTLCache(max_entries=20, name="sample_list")
 
+# Row count cache — totals for paginated listings (samples, jobs)
+# TTL: 15s, dropped on writes (see src.database.pagination)
+count_cache = TTLCache(max_entries=200, name="row_counts")
+
 # Misc cache — for lighter endpoints
 misc_cache = TTLCache(max_entries=200, name="misc")
 
 
+_all_caches = (
+    fcs_parse_cache,
+    scatter_cache,
+    distribution_cache,
+    size_bins_cache,
+    sample_list_cache,
+    count_cache,
+    misc_cache,
+)
+
+
 def get_all_cache_stats() -> list[dict]:
-    """Get stats for all cache instances."""
-    return [
-        fcs_parse_cache.stats,
-        scatter_cache.stats,
-        distribution_cache.stats,
-        size_bins_cache.stats,
-        sample_list_cache.stats,
-        misc_cache.stats,
-    ]
+    """Get stats (including estimated memory) for all cache instances."""
+    return [cache.stats for cache in _all_caches]
+
+
+def cleanup_all_expired() -> int:
+    """Remove expired entries from every cache. Returns count removed."""
+    return sum(cache.cleanup_expired() for cache in _all_caches)
+
+
+async def run_cache_sweeper(interval_seconds: float = 30.0) -> None:
+    """
+    Remove expired entries from every cache every ``interval_seconds``
+    until cancelled. Started as a task in the app lifespan, so memory held
+    by entries nobody reads again is released without waiting for a read.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = await asyncio.to_thread(cleanup_all_expired)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache sweep failed: {e}")
+            continue
+        if removed:
+            logger.debug(f"🧹 Cache sweep removed {removed} expired entries")
+
+
+def start_cache_sweeper(interval_seconds: float) -> Optional[asyncio.Task]:
+    """
+    Start run_cache_sweeper as a task on the running loop (call from the app
+    lifespan and cancel the task on shutdown).
+
+    Returns:
+        The sweeper task, or None if ``interval_seconds`` <= 0 (disabled)
+    """
+    if interval_seconds <= 0:
+        return None
+    return asyncio.create_task(run_cache_sweeper(interval_seconds), name="cache-sweeper")
 
 
 def invalidate_sample_caches(sample_id: str) -> int:
@@ -178,6 +445,7 @@ def invalidate_sample_caches(sample_id: str) -> int:
     total += fcs_parse_cache.invalidate(f"fcs:{sample_id}:")
     total += misc_cache.invalidate(f"anomaly:{sample_id}:")
     total += sample_list_cache.clear() or 0
+    total += count_cache.invalidate("count:samples:")
     if total > 0:
         logger.debug(f"Invalidated {total} cache entries for sample {sample_id}")
     return total
@@ -185,10 +453,6 @@ def invalidate_sample_caches(sample_id: str) -> int:
 
 def invalidate_all_caches() -> None:
     """Clear all caches (e.g., after calibration change)."""
-    fcs_parse_cache.clear()
-    scatter_cache.clear()
-    distribution_cache.clear()
-    size_bins_cache.clear()
-    sample_list_cache.clear()
-    misc_cache.clear()
+    for cache in _all_caches:
+        cache.clear()
     logger.info("All caches cleared")
@@ -10,7 +10,7 @@ Date: November 21, 2025
 """
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings  # type: ignore[import-not-found]
 from functools import lru_cache
 
@@ -46,6 +46,8 @@ class Settings(BaseSettings):
     api_prefix: str = "/api/v1"
     docs_url: str = "/docs"
     redoc_url: str = "/redoc"
+    warmup_on_startup: bool = True  # Load routers + heavy modules in the background after startup
+    cache_sweep_interval_s: float = 30.0  # Background removal of expired API cache entries (0 disables)
     
     # Database - Use SQLite by default for local development
     database_url: str = "sqlite+aiosqlite:///./data/crmit.db"
@@ -53,6 +55,12 @@ class Settings(BaseSettings):
     db_pool_size: int = 10
     db_max_overflow: int = 20
     
+    # SQLite engine profile (ignored for other databases)
+    sqlite_read_write_split: bool = True  # Reader pool + single serialized writer
+    sqlite_busy_timeout_s: float = 30.0
+    sqlite_mmap_mb: int = 256
+    sqlite_cache_mb: int = 16  # Page cache per connection
+    
     # File Storage
     upload_dir: Path = Path("data/uploads")
     parquet_dir: Path = Path("data/parquet")
@@ -89,6 +97,21 @@ class Settings(BaseSettings):
     max_workers: int = 4
     task_timeout_seconds: int = 300
     
+    # Server processes
+    workers: int = 1  # uvicorn worker processes started by run_api / the desktop launchers
+    shared_cache: Optional[bool] = None  # Cross-process caches; on by default when workers > 1
+    shared_cache_max_mb: int = 2048  # Disk budget for memory-mapped event arrays and LUTs
+    summary_cache_max_mb: int = 256  # Disk budget for cached AI file summaries
+    
+    @property
+    def shared_cache_enabled(self) -> bool:
+        """Whether caches live in files shared by all worker processes."""
+        return self.workers > 1 if self.shared_cache is None else self.shared_cache
+    
+    @property
+    def shared_cache_dir(self) -> Path:
+        return self.temp_dir / "shared_cache"
+    
     # Quality Control
     qc_min_events_fcs: int = 1000
     qc_temp_min_celsius: float = 15.0
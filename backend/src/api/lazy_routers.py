@@ -0,0 +1,208 @@
+"""
+Deferred API Router Loading
+===========================
+
+Importing the routers pulls in most of the scientific and AI stack (pandas,
+scipy, sklearn, pyarrow, the Mie solver, boto3). Done at module load, this
+happens before uvicorn binds its port, so the desktop window waits for
+libraries the first screen does not need.
+
+LazyRouters registers the routers by module name instead:
+
+- the app starts with only its root endpoints (health, status) and auth
+- the first request under the API prefix (or to the docs) imports and
+  includes every router, in declaration order, before it is routed
+- warm_up() does the same as a background task right after startup, then
+  preloads the heavy modules that endpoints import on first use
+
+The imports run on a worker thread; the routers are then included on the
+event loop, so the app's route table is only changed from the loop that
+serves it.
+
+Health checks and static frontend files never wait for the routers, so
+the UI appears while the warm-up is still running.
+
+Usage:
+    routers = LazyRouters(app, [RouterSpec("src.api.routers.upload", "/upload", ("Upload",))])
+    routers.install()
+    asyncio.create_task(routers.warm_up())  # in the lifespan
+"""
+
+import asyncio
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from fastapi import FastAPI, Request
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """A router included on first use."""
+
+    module: str
+    """Module exposing ``router``, e.g. 'src.api.routers.upload'"""
+    prefix: str = ""
+    """Path prefix below the API prefix, e.g. '/upload'"""
+    tags: Tuple[str, ...] = ()
+    optional: bool = False
+    """Skip (instead of failing) when the module cannot be imported"""
+
+
+# Modules imported inside endpoint bodies on first use; warm_up() loads them
+# in the background so the first scatter plot / sizing request is not slow
+WARMUP_MODULES: Tuple[str, ...] = (
+    "src.parsers.fcs_parser",
+    "src.parsers.nta_parser",
+    "src.parsers.event_parquet",
+    "src.physics.mie_scatter",
+    "src.physics.bead_calibration",
+    "src.physics.statistics_utils",
+    "src.visualization.auto_axis_selector",
+    "scipy.stats",
+    "sklearn.cluster",
+)
+
+
+class LazyRouters:
+    """Routers of an app, imported and included once on first use."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        specs: Sequence[RouterSpec],
+        api_prefix: str = "/api/v1",
+        warmup_modules: Iterable[str] = WARMUP_MODULES,
+    ):
+        self.app = app
+        self.specs = list(specs)
+        self.api_prefix = api_prefix.rstrip("/")
+        self.warmup_modules = tuple(warmup_modules)
+        self._imported: Dict[str, Optional[ModuleType]] = {}
+        self._included: Set[str] = set()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._import_seconds = 0.0
+
+        # Paths that need the routers before they can be served
+        self._wait_prefixes = tuple(
+            p for p in (f"{self.api_prefix}/", app.docs_url, app.redoc_url, app.openapi_url) if p
+        )
+        self._no_wait_paths = {f"{self.api_prefix}/health", f"{self.api_prefix}/status"}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def import_routers(self) -> None:
+        """
+        Import every router module not imported yet (thread-safe; blocking,
+        so call it from a worker thread when on the event loop).
+
+        Raises:
+            ImportError: If a non-optional router module cannot be imported
+        """
+        with self._lock:
+            start = time.perf_counter()
+            for spec in self.specs:
+                if spec.module in self._imported:
+                    continue
+                try:
+                    self._imported[spec.module] = importlib.import_module(spec.module)
+                except ImportError as e:
+                    if not spec.optional:
+                        raise
+                    logger.warning(f"⚠️ Optional router {spec.module} unavailable: {e}")
+                    self._imported[spec.module] = None
+            self._import_seconds += time.perf_counter() - start
+
+    def include_routers(self) -> None:
+        """
+        Include the imported routers in declaration order (call on the event
+        loop once import_routers() has returned).
+        """
+        if self._loaded:
+            return
+        for spec in self.specs:
+            if spec.module in self._included:
+                continue
+            module = self._imported[spec.module]
+            if module is not None:
+                self.app.include_router(
+                    module.router,
+                    prefix=f"{self.api_prefix}{spec.prefix}",
+                    tags=list(spec.tags) or None,
+                )
+            self._included.add(spec.module)
+        # Routes changed, so a schema generated before now is stale
+        self.app.openapi_schema = None
+        self._loaded = True
+        logger.info(f"📦 Loaded {len(self.specs)} API routers in {self._import_seconds * 1000:.0f}ms")
+
+    def load(self) -> None:
+        """
+        Import and include every router from the calling thread (for
+        scripts and tests; the app uses ensure_loaded()).
+
+        Raises:
+            ImportError: If a non-optional router module cannot be imported
+        """
+        if not self._loaded:
+            self.import_routers()
+            self.include_routers()
+
+    async def ensure_loaded(self) -> None:
+        """Import the routers on a worker thread, then include them on the loop."""
+        if not self._loaded:
+            await asyncio.to_thread(self.import_routers)
+            self.include_routers()
+
+    def needs_routers(self, path: str) -> bool:
+        """Whether a request path can only be served once the routers are loaded."""
+        return path.startswith(self._wait_prefixes) and path not in self._no_wait_paths
+
+    async def warm_up(self, modules: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Load the routers, then preload heavy modules used by the endpoints.
+
+        Meant to run as a background task after startup; all imports happen
+        on a worker thread. Modules that fail to import are skipped (the
+        endpoint reports the error later).
+
+        Returns:
+            The modules that were preloaded
+        """
+        start = time.perf_counter()
+        try:
+            await self.ensure_loaded()
+        except Exception as e:
+            logger.warning(f"⚠️ Router warm-up failed: {e}")
+            return []
+        names = self.warmup_modules if modules is None else tuple(modules)
+        preloaded = await asyncio.to_thread(self._preload, names)
+        logger.info(f"🔥 Warm-up finished in {time.perf_counter() - start:.1f}s ({len(preloaded)} modules preloaded)")
+        return preloaded
+
+    @staticmethod
+    def _preload(modules: Iterable[str]) -> List[str]:
+        preloaded = []
+        for name in modules:
+            try:
+                importlib.import_module(name)
+                preloaded.append(name)
+            except Exception as e:
+                logger.debug(f"Warm-up skipped {name}: {e}")
+        return preloaded
+
+    def install(self) -> None:
+        """Add the middleware that loads the routers before the first request needing them."""
+
+        @self.app.middleware("http")
+        async def load_routers(request: Request, call_next):
+            if not self._loaded and self.needs_routers(request.url.path):
+                await self.ensure_loaded()
+            return await call_next(request)
@@ -20,6 +20,7 @@ Date: November 21, 2025
 Version: 1.0.0
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 import sys
@@ -36,22 +37,10 @@ from fastapi.exceptions import RequestValidationError
 from loguru import logger
 import time
 
+from src.api.cache import start_cache_sweeper
 from src.api.config import get_settings
-from src.api.routers import upload, samples, jobs  # type: ignore[import-not-found]
-from src.api.routers import analysis  # type: ignore[import-not-found]
+from src.api.lazy_routers import LazyRouters, RouterSpec
 from src.api.routers import auth  # type: ignore[import-not-found]
-from src.api.routers import alerts  # CRMIT-003: Alert System
-from src.api.routers import chat  # P-001: AI Research Chat
-from src.api.routers import nta_ai  # NTA AI Analysis
-from src.api.routers import nanofacs_ai  # NanoFACS AI Analysis
-from src.api.routers import ai_gateway  # Hosted AI Gateway
-from src.api.routers import backup  # DB Backup & Restore
-
-try:
-    from src.api.routers import calibration as calibration_router  # CAL-001
-    _has_calibration_router = True
-except ImportError:
-    _has_calibration_router = False
 from src.database.connection import init_database, close_connections, check_connection
 
 settings = get_settings()
@@ -85,12 +74,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[
         logger.warning(f"   Database: Failed to initialize - {e}")
         logger.warning("   API will continue without database (file-based mode)")
     
+    # Reconcile the parquet catalog with files added while the API was down
+    asyncio.get_running_loop().run_in_executor(None, _sync_parquet_catalog)
+    
+    # Import routers and heavy modules now, off the request path
+    warm_up = asyncio.create_task(api_routers.warm_up(), name="router-warm-up") if settings.warmup_on_startup else None
+    
+    # Drop expired cache entries in the background instead of on read
+    cache_sweeper = start_cache_sweeper(settings.cache_sweep_interval_s)
+    
     logger.success("✅ CRMIT API ready")
     
     yield
     
     # Shutdown
     logger.info("🛑 CRMIT API shutting down...")
+    for task in (warm_up, cache_sweeper):
+        if task is not None:
+            task.cancel()
     # Close database connections
     try:
         await close_connections()
@@ -100,6 +101,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # type: ignore[
     logger.success("✅ Cleanup complete")
 
 
+def _sync_parquet_catalog() -> None:
+    from src.utils.parquet_catalog import get_parquet_catalog
+    
+    try:
+        get_parquet_catalog().sync()
+    except Exception as e:
+        logger.warning(f"   Parquet catalog: sync failed - {e}")
+
+
 async def _ensure_default_user():
     """
     Create a default 'Lab User' account for desktop mode if it doesn't exist.
@@ -181,6 +191,9 @@ app.add_middleware(
         "Content-Disposition",
         "X-Request-Id",
         "X-Vercel-AI-UI-Message-Stream",
+        "Upload-Offset",  # resumable uploads
+        "Upload-Length",
+        "Location",
     ],
     max_age=3600,  # Cache preflight requests for 1 hour
 )
@@ -346,85 +359,33 @@ async def system_status():
 # API Routers
 # ============================================================================
 
-app.include_router(
-    upload.router,
-    prefix=f"{settings.api_prefix}/upload",
-    tags=["Upload"]
-)
-
-app.include_router(
-    samples.router,
-    prefix=f"{settings.api_prefix}/samples",
-    tags=["Samples"]
-)
-
-app.include_router(
-    jobs.router,
-    prefix=f"{settings.api_prefix}/jobs",
-    tags=["Jobs"]
-)
-
-app.include_router(
-    analysis.router,
-    prefix=f"{settings.api_prefix}/analysis",
-    tags=["Analysis"]
-)
-
+# Routers are imported on the first API request (or by the startup warm-up)
+# so uvicorn binds its port before pandas/scipy/sklearn/boto3 are loaded.
+# Auth is cheap and included right away.
 app.include_router(
     auth.router,
     prefix=f"{settings.api_prefix}/auth",
     tags=["Authentication"]
 )
 
-# CRMIT-003: Alert System
-app.include_router(
-    alerts.router,
-    prefix=f"{settings.api_prefix}/alerts",
-    tags=["Alerts"]
-)
-
-# P-001: AI Research Chat
-app.include_router(
-    chat.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["AI Chat"]
-)
-
-# NTA AI Analysis
-app.include_router(
-    nta_ai.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["NTA AI"]
-)
-
-# NanoFACS AI Analysis
-app.include_router(
-    nanofacs_ai.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["NanoFACS AI"]
-)
-
-# AI Gateway (hosted service)
-app.include_router(
-    ai_gateway.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["AI Gateway"]
-)
-
-# DB Backup & Restore
-app.include_router(
-    backup.router,
-    prefix=f"{settings.api_prefix}",
-    tags=["Database"]
+api_routers = LazyRouters(
+    app,
+    [
+        RouterSpec("src.api.routers.upload", "/upload", ("Upload",)),
+        RouterSpec("src.api.routers.samples", "/samples", ("Samples",)),
+        RouterSpec("src.api.routers.jobs", "/jobs", ("Jobs",)),
+        RouterSpec("src.api.routers.analysis", "/analysis", ("Analysis",)),
+        RouterSpec("src.api.routers.alerts", "/alerts", ("Alerts",)),  # CRMIT-003: Alert System
+        RouterSpec("src.api.routers.chat", "", ("AI Chat",)),  # P-001: AI Research Chat
+        RouterSpec("src.api.routers.nta_ai", "", ("NTA AI",)),
+        RouterSpec("src.api.routers.nanofacs_ai", "", ("NanoFACS AI",)),
+        RouterSpec("src.api.routers.ai_gateway", "", ("AI Gateway",)),  # Hosted AI Gateway
+        RouterSpec("src.api.routers.backup", "", ("Database",)),  # DB Backup & Restore
+        RouterSpec("src.api.routers.calibration", "/calibration", ("Calibration",), optional=True),  # CAL-001
+    ],
+    api_prefix=settings.api_prefix,
 )
-
-# CAL-001: Bead Calibration (Feb 10, 2026)
-if _has_calibration_router:
-    app.include_router(
-        calibration_router.router,
-        prefix=f"{settings.api_prefix}/calibration",
-        tags=["Calibration"]
-    )
+api_routers.install()
 
 
 # ============================================================================
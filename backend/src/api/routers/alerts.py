@@ -29,12 +29,14 @@ from src.database.crud import (
     create_alert,
     get_alert_by_id,
     get_alerts,
+    count_alerts,
     get_alert_counts,
     acknowledge_alert,
     acknowledge_multiple_alerts,
     delete_alert,
 )
 from src.database.models import AlertSeverity, AlertType
+from src.database.pagination import next_cursor
 from src.api.auth_middleware import optional_auth
 
 
@@ -55,6 +57,7 @@ async def list_alerts(
     source: Optional[str] = Query(None, description="Filter by source (fcs_analysis, nta_analysis, etc.)"),
     limit: int = Query(50, ge=1, le=500, description="Maximum results"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor (created_at ordering)"),
     order_by: str = Query("created_at", description="Field to order by"),
     order_desc: bool = Query(True, description="Order descending"),
     db: AsyncSession = Depends(get_session)
@@ -88,7 +91,8 @@ async def list_alerts(
         ],
         "total": 25,
         "limit": 50,
-        "offset": 0
+        "offset": 0,
+        "next_cursor": "WyIyMDI1LTEyLTMxVDEwOjMwOjAwIiwgMV0"
     }
     ```
     """
@@ -112,15 +116,28 @@ async def list_alerts(
             offset=offset,
             order_by=order_by,
             order_desc=order_desc,
+            after=after,
+        )
+        total = await count_alerts(
+            db,
+            user_id=user_id,
+            sample_id=sample_id,
+            severity=severity,
+            alert_type=alert_type,
+            is_acknowledged=is_acknowledged,
+            source=source,
         )
         
         return {
             "alerts": [alert.to_dict() for alert in alerts],
-            "total": len(alerts),
+            "total": total,
             "limit": limit,
-            "offset": offset,
+            "offset": 0 if after else offset,
+            "next_cursor": next_cursor(alerts, limit, "created_at") if order_by == "created_at" else None,
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -9,6 +9,7 @@ Endpoints:
 - POST /analysis/population-shift   - Detect population shifts between samples (CRMIT-004)
 - POST /analysis/population-shift/baseline - Compare samples to baseline
 - POST /analysis/population-shift/temporal - Temporal drift detection
+- POST /analysis/population-shift/matrix - All-pairs shift matrix (cross-sample QC)
 - POST /analysis/temporal-analysis   - Time-series trend analysis (CRMIT-007)
 - POST /analysis/temporal-analysis/multi-metric - Multi-metric temporal analysis
 
@@ -19,10 +20,12 @@ Date: November 21, 2025
 Updated: January 2, 2026 - Added CRMIT-007 Temporal Analysis
 """
 
+import asyncio
+from pathlib import Path
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
-from sqlalchemy import select, desc  # type: ignore[import-not-found]
+from sqlalchemy import select  # type: ignore[import-not-found]
 from pydantic import BaseModel, Field
 from loguru import logger
 import numpy as np
@@ -35,7 +38,9 @@ except ImportError:
 
 from src.database.connection import get_session
 from src.database.models import Sample, FCSResult, NTAResult  # type: ignore[import-not-found]
+from src.database.crud import get_sample_details  # type: ignore[import-not-found]
 from src.parsers.fcs_parser import FCSParser  # type: ignore[import-not-found]
+from src.utils.fcs_cache import get_cached_metric_array, get_fcs_executor  # type: ignore[import-not-found]
 
 # Import population shift detection (CRMIT-004)
 try:
@@ -311,11 +316,7 @@ async def nta_multi_compare(
     size_min = float(request.filters.get("size_min")) if request.filters and "size_min" in request.filters else None
     size_max = float(request.filters.get("size_max")) if request.filters and "size_max" in request.filters else None
 
-    sample_result = await db.execute(
-        select(Sample).where(Sample.sample_id.in_(normalized_sample_ids))
-    )
-    samples = sample_result.scalars().all()
-    sample_by_id = {str(sample.sample_id): sample for sample in samples}
+    details = await get_sample_details(db, normalized_sample_ids)
 
     results_by_sample_id: Dict[str, Dict[str, Any]] = {}
     metadata_by_sample_id: Dict[str, Dict[str, Any]] = {}
@@ -330,18 +331,13 @@ async def nta_multi_compare(
         return True
 
     for sample_id in normalized_sample_ids:
-        sample = sample_by_id.get(sample_id)
-        if sample is None:
+        detail = details.get(sample_id)
+        if detail is None:
             errors_by_sample_id[sample_id] = "Sample not found"
             continue
 
-        nta_result = await db.execute(
-            select(NTAResult)
-            .where(NTAResult.sample_id == sample.id)
-            .order_by(desc(NTAResult.processed_at), desc(NTAResult.id))
-            .limit(1)
-        )
-        nta = nta_result.scalar_one_or_none()
+        sample = detail.sample
+        nta = detail.nta
 
         if nta is None:
             errors_by_sample_id[sample_id] = "No NTA results found"
@@ -475,27 +471,20 @@ async def run_statistical_tests(
     group_a_data: dict[str, list] = {metric: [] for metric in request.metrics}
     group_b_data: dict[str, list] = {metric: [] for metric in request.metrics}
     
+    # Load every sample of both groups (with latest results) in one batch
+    details = await get_sample_details(
+        db, [*request.sample_ids_group_a, *request.sample_ids_group_b]
+    )
+    
     async def collect_sample_metrics(sample_id: str, target_dict: dict[str, list]) -> bool:
         """Collect metrics from a sample."""
-        # Get sample
-        result = await db.execute(select(Sample).where(Sample.sample_id == sample_id))
-        sample = result.scalar_one_or_none()
-        
-        if not sample:
+        detail = details.get(sample_id)
+        if detail is None:
             logger.warning(f"Sample not found: {sample_id}")
             return False
         
-        # Get FCS results
-        fcs_result = await db.execute(
-            select(FCSResult).where(FCSResult.sample_id == sample.id)
-        )
-        fcs = fcs_result.scalar_one_or_none()
-        
-        # Get NTA results
-        nta_result = await db.execute(
-            select(NTAResult).where(NTAResult.sample_id == sample.id)
-        )
-        nta = nta_result.scalar_one_or_none()
+        fcs = detail.fcs
+        nta = detail.nta
         
         # Extract metrics
         for metric in request.metrics:
@@ -962,6 +951,20 @@ class TemporalComparisonRequest(BaseModel):
     alpha: float = Field(default=0.05)
 
 
+class ShiftMatrixRequest(BaseModel):
+    """Request for an all-pairs shift matrix."""
+    sample_ids: List[str] = Field(..., min_length=2, description="Sample IDs to compare pairwise")
+    metric: str = Field(default="particle_size", description="Metric to compare")
+    data_source: str = Field(default="fcs", description="Data source: 'fcs' or 'nta'")
+    tests: List[str] = Field(default=["ks", "emd", "mean", "variance"])
+    alpha: float = Field(default=0.05, ge=0.001, le=0.5)
+    method: str = Field(
+        default="grid",
+        description="'grid' (shared CDF grid, fast) or 'exact' (per-pair sorted merges)"
+    )
+    grid_size: int = Field(default=4096, ge=256, le=65536, description="CDF grid points for method='grid'")
+
+
 class ShiftTestResultResponse(BaseModel):
     """Single test result in response."""
     test_name: str
@@ -1011,36 +1014,43 @@ class MultiSampleShiftResponse(BaseModel):
     max_severity: str
 
 
-async def get_sample_data_for_shift(
-    db: AsyncSession,
-    sample_id: str,
-    metric: str,
-    data_source: str
-) -> tuple[np.ndarray, str]:
+class ShiftMatrixResponse(BaseModel):
+    """Response for an all-pairs shift matrix (rows/columns follow sample_ids)."""
+    success: bool
+    mode: str
+    method: str
+    metric_name: str
+    sample_ids: List[str]
+    sample_names: List[str]
+    n_events: List[int]
+    matrices: Dict[str, List[List[float]]]
+    severity: List[List[str]]
+    skipped_samples: List[str] = []
+    any_significant_shift: bool
+    max_severity: str
+
+
+def _resolve_fcs_path(file_path_fcs: Optional[str]) -> Optional[str]:
+    """Absolute path of a stored FCS file (relative paths are from cwd), if it exists."""
+    if not file_path_fcs:
+        return None
+    fcs_path = Path(file_path_fcs)
+    if not fcs_path.is_absolute():
+        fcs_path = Path.cwd() / fcs_path
+    return str(fcs_path) if fcs_path.exists() else None
+
+
+def _shift_data_from_detail(detail, sample_id: str, metric: str, data_source: str) -> np.ndarray:
     """
-    Get sample data for population shift analysis.
-    
-    Returns:
-        Tuple of (data array, sample name)
+    Blocking part of get_sample_data_for_shift(): raw events from the shared
+    FCS cache, or an approximate distribution from summary statistics.
+    Runs on the FCS worker pool.
     """
-    # Get sample
-    result = await db.execute(select(Sample).where(Sample.sample_id == sample_id))
-    sample = result.scalar_one_or_none()
-    
-    if not sample:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sample not found: {sample_id}"
-        )
-    
-    sample_name = str(sample.sample_id)
+    sample = detail.sample
     
     if data_source == "fcs":
         # Get FCS result
-        fcs_result = await db.execute(
-            select(FCSResult).where(FCSResult.sample_id == sample.id)
-        )
-        fcs = fcs_result.scalar_one_or_none()
+        fcs = detail.fcs
         
         if not fcs:
             raise HTTPException(
@@ -1048,48 +1058,15 @@ async def get_sample_data_for_shift(
                 detail=f"No FCS data for sample: {sample_id}"
             )
         
-        # Try to load raw event data from file
-        # Use getattr for safe attribute access (SQLAlchemy type hints issue)
-        file_path_fcs_val = getattr(sample, 'file_path_fcs', None)
-        file_path_fcs = str(file_path_fcs_val) if file_path_fcs_val else None
-        if file_path_fcs:
+        # Raw event data from the shared parse cache, memoized per
+        # (file version, metric, calibration)
+        fcs_path = _resolve_fcs_path(getattr(sample, 'file_path_fcs', None))
+        if fcs_path:
             try:
-                from pathlib import Path
-                
-                # Handle both absolute and relative paths
-                fcs_path = Path(file_path_fcs)
-                if not fcs_path.is_absolute():
-                    fcs_path = Path.cwd() / fcs_path
-                
-                if fcs_path.exists():
-                    parser = FCSParser(file_path=fcs_path)
-                    df = parser.parse()
-                    
-                    if df is not None and len(df) > 0:
-                        # Get appropriate column based on metric
-                        if metric == "particle_size" and "Size_nm" in df.columns:
-                            data = np.array(df["Size_nm"].dropna().values)
-                        elif metric == "fsc":
-                            fsc_cols = [c for c in df.columns if "FSC" in c.upper()]
-                            if fsc_cols:
-                                data = np.array(df[fsc_cols[0]].dropna().values)
-                            else:
-                                raise ValueError("No FSC channel found")
-                        elif metric == "ssc":
-                            ssc_cols = [c for c in df.columns if "SSC" in c.upper()]
-                            if ssc_cols:
-                                data = np.array(df[ssc_cols[0]].dropna().values)
-                            else:
-                                raise ValueError("No SSC channel found")
-                        else:
-                            # Try to find column matching metric
-                            matching = [c for c in df.columns if metric.lower() in c.lower()]
-                            if matching:
-                                data = np.array(df[matching[0]].dropna().values)
-                            else:
-                                raise ValueError(f"Metric '{metric}' not found in data")
-                        
-                        return data, sample_name
+                from src.physics.bead_calibration import get_calibration_fingerprint
+                data = get_cached_metric_array(fcs_path, metric, get_calibration_fingerprint())
+                if len(data) > 0:
+                    return data
             except Exception as e:
                 logger.warning(f"Could not load raw FCS data: {e}")
         
@@ -1105,12 +1082,11 @@ async def get_sample_data_for_shift(
             # Generate approximate distribution from summary stats
             # Estimate std from typical CV (~40% for EVs)
             std = median_size * 0.4
-            data = np.random.lognormal(
+            return np.random.lognormal(
                 mean=np.log(median_size) - 0.5 * (std/median_size)**2,
                 sigma=std/median_size,
                 size=total_events
             )
-            return data, sample_name
         
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1119,10 +1095,7 @@ async def get_sample_data_for_shift(
     
     elif data_source == "nta":
         # Get NTA result
-        nta_result = await db.execute(
-            select(NTAResult).where(NTAResult.sample_id == sample.id)
-        )
-        nta = nta_result.scalar_one_or_none()
+        nta = detail.nta
         
         if not nta:
             raise HTTPException(
@@ -1159,12 +1132,11 @@ async def get_sample_data_for_shift(
                 std = median * 0.3  # Default CV of 30%
             
             # Generate lognormal distribution (typical for EV sizes)
-            data = np.random.lognormal(
+            return np.random.lognormal(
                 mean=np.log(median) - 0.5 * (std/median)**2,
                 sigma=std/median,
                 size=10000
             )
-            return data, sample_name
         
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1178,6 +1150,59 @@ async def get_sample_data_for_shift(
         )
 
 
+async def get_sample_data_for_shift(
+    db: AsyncSession,
+    sample_id: str,
+    metric: str,
+    data_source: str
+) -> tuple[np.ndarray, str]:
+    """
+    Get sample data for population shift analysis.
+    
+    Sample rows come from get_sample_details() (memoized per request); event
+    data is loaded on the shared FCS worker pool.
+    
+    Returns:
+        Tuple of (data array, sample name)
+    """
+    detail = (await get_sample_details(db, [sample_id])).get(sample_id)
+    
+    if detail is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sample not found: {sample_id}"
+        )
+    
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(
+        get_fcs_executor(), _shift_data_from_detail, detail, sample_id, metric, data_source
+    )
+    return data, str(detail.sample.sample_id)
+
+
+async def get_samples_data_for_shift(
+    db: AsyncSession,
+    sample_ids: List[str],
+    metric: str,
+    data_source: str
+) -> List[Any]:
+    """
+    get_sample_data_for_shift() for many samples: one batched DB lookup, then
+    all event arrays loaded concurrently on the FCS worker pool.
+    
+    Returns:
+        One entry per sample ID, in order: (data array, sample name), or the
+        HTTPException that sample raised
+    """
+    # Populate the request memo first so the concurrent loads below do not
+    # touch the (non-concurrent) session
+    await get_sample_details(db, sample_ids)
+    return await asyncio.gather(
+        *(get_sample_data_for_shift(db, sid, metric, data_source) for sid in sample_ids),
+        return_exceptions=True,
+    )
+
+
 @router.post("/population-shift", response_model=PopulationShiftResponse)
 async def detect_population_shift(
     request: PopulationShiftRequest,
@@ -1225,13 +1250,14 @@ async def detect_population_shift(
         )
     
     try:
-        # Get data for both samples
-        data_a, name_a = await get_sample_data_for_shift(
-            db, request.sample_id_a, request.metric, request.data_source
-        )
-        data_b, name_b = await get_sample_data_for_shift(
-            db, request.sample_id_b, request.metric, request.data_source
+        # Get data for both samples (one batched lookup, loaded concurrently)
+        loaded = await get_samples_data_for_shift(
+            db, [request.sample_id_a, request.sample_id_b], request.metric, request.data_source
         )
+        for item in loaded:
+            if isinstance(item, Exception):
+                raise item
+        (data_a, name_a), (data_b, name_b) = loaded
         
         # Run shift detection
         if PopulationShiftDetector is None:
@@ -1336,21 +1362,26 @@ async def compare_to_baseline(
         )
     
     try:
-        # Get baseline data
-        baseline_data, baseline_name = await get_sample_data_for_shift(
-            db, request.baseline_sample_id, request.metric, request.data_source
+        # Load baseline and all comparison samples concurrently
+        loaded = await get_samples_data_for_shift(
+            db, [request.baseline_sample_id, *request.sample_ids], request.metric, request.data_source
         )
         
+        # Get baseline data
+        if isinstance(loaded[0], Exception):
+            raise loaded[0]
+        baseline_data, baseline_name = loaded[0]
+        
         # Get data for all comparison samples
         sample_data_list = []
-        for sample_id in request.sample_ids:
-            try:
-                data, name = await get_sample_data_for_shift(
-                    db, sample_id, request.metric, request.data_source
-                )
+        for sample_id, item in zip(request.sample_ids, loaded[1:]):
+            if isinstance(item, HTTPException):
+                logger.warning(f"Skipping sample {sample_id}: {item.detail}")
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                data, name = item
                 sample_data_list.append((data, sample_id, name))
-            except HTTPException as e:
-                logger.warning(f"Skipping sample {sample_id}: {e.detail}")
         
         if not sample_data_list:
             raise HTTPException(
@@ -1476,12 +1507,15 @@ async def temporal_shift_analysis(
         )
     
     try:
-        # Get data for all samples in order
+        # Get data for all samples in order (loaded concurrently)
+        loaded = await get_samples_data_for_shift(
+            db, request.sample_ids, request.metric, request.data_source
+        )
         temporal_data = []
-        for sample_id in request.sample_ids:
-            data, name = await get_sample_data_for_shift(
-                db, sample_id, request.metric, request.data_source
-            )
+        for sample_id, item in zip(request.sample_ids, loaded):
+            if isinstance(item, Exception):
+                raise item
+            data, name = item
             temporal_data.append((data, sample_id, name))
         
         # Run temporal comparison
@@ -1564,6 +1598,103 @@ async def temporal_shift_analysis(
             detail=f"Temporal shift analysis failed: {str(e)}"
         )
 
+
+@router.post("/population-shift/matrix", response_model=ShiftMatrixResponse)
+async def population_shift_matrix(
+    request: ShiftMatrixRequest,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Compare every pair of samples at once (cross-sample QC matrix).
+    
+    Each sample is sorted once and all pairs are evaluated together; with the
+    default method='grid', KS D and EMD are computed on a shared CDF grid.
+    
+    **Example:**
+    ```json
+    {
+        "sample_ids": ["Batch1_Sample1", "Batch1_Sample2", "Batch2_Sample1"],
+        "metric": "particle_size",
+        "data_source": "fcs"
+    }
+    ```
+    """
+    logger.info(f"🧮 Shift matrix: {len(request.sample_ids)} samples ({request.method})")
+    
+    if not POPULATION_SHIFT_AVAILABLE or PopulationShiftDetector is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Population shift detection module not available"
+        )
+    
+    if request.method not in ("grid", "exact"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid method: {request.method}. Must be 'grid' or 'exact'"
+        )
+    
+    try:
+        loaded = await get_samples_data_for_shift(
+            db, request.sample_ids, request.metric, request.data_source
+        )
+        sample_data_list = []
+        skipped = []
+        for sample_id, item in zip(request.sample_ids, loaded):
+            if isinstance(item, HTTPException):
+                logger.warning(f"Skipping sample {sample_id}: {item.detail}")
+                skipped.append(sample_id)
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                data, name = item
+                sample_data_list.append((data, sample_id, name))
+        
+        if len(sample_data_list) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Need at least 2 valid samples for a shift matrix"
+            )
+        
+        detector = PopulationShiftDetector(alpha=request.alpha)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                None,
+                lambda: detector.shift_matrix(
+                    sample_data_list,
+                    metric_name=request.metric,
+                    tests=request.tests,
+                    method=request.method,
+                    grid_size=request.grid_size,
+                ),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        
+        return ShiftMatrixResponse(
+            success=True,
+            mode=ComparisonMode.ALL_PAIRS.value,
+            method=result.method,
+            metric_name=result.metric_name,
+            sample_ids=result.sample_ids,
+            sample_names=result.sample_names,
+            n_events=result.n_events,
+            matrices={name: matrix.tolist() for name, matrix in result.matrices.items()},
+            severity=[[s.value for s in row] for row in result.severity],
+            skipped_samples=skipped,
+            any_significant_shift=result.any_significant_shift,
+            max_severity=result.max_severity.value
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Shift matrix failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Shift matrix failed: {str(e)}"
+        )
+
 # ============================================================================
 # CRMIT-007: Temporal Analysis Endpoints
 # ============================================================================
@@ -1719,21 +1850,21 @@ async def analyze_temporal_trends(
         values = []
         additional_metrics: Dict[str, List[float]] = {}
         
+        # Load all samples with their latest results in one batch
+        details = await get_sample_details(db, request.sample_ids)
+        
         for sample_id in request.sample_ids:
-            # Get sample
-            result = await db.execute(
-                select(Sample).where(Sample.sample_id == sample_id)
-            )
-            sample = result.scalar_one_or_none()
+            detail = details.get(sample_id)
             
-            if not sample:
+            if detail is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Sample {sample_id} not found"
                 )
             
-            # Get timestamp (use upload_date or created_at)
-            sample_time = sample.upload_date or sample.created_at
+            # Get timestamp (experiment date, else upload time)
+            sample = detail.sample
+            sample_time = sample.experiment_date or sample.upload_timestamp
             if not sample_time:
                 from datetime import datetime
                 sample_time = datetime.now()
@@ -1741,10 +1872,7 @@ async def analyze_temporal_trends(
             
             # Get metric value based on data source
             if request.data_source == "fcs":
-                fcs_result = await db.execute(
-                    select(FCSResult).where(FCSResult.sample_id == sample.id)
-                )
-                fcs_data = fcs_result.scalar_one_or_none()
+                fcs_data = detail.fcs
                 
                 if fcs_data:
                     # Get primary metric value with safe type conversion
@@ -1781,10 +1909,7 @@ async def analyze_temporal_trends(
                                 additional_metrics.setdefault(key, []).append(0.0)
             
             elif request.data_source == "nta":
-                nta_result = await db.execute(
-                    select(NTAResult).where(NTAResult.sample_id == sample.id)
-                )
-                nta_data = nta_result.scalar_one_or_none()
+                nta_data = detail.nta
                 
                 if nta_data:
                     if request.metric == "particle_size":
@@ -1920,21 +2045,21 @@ async def analyze_multi_metric_temporal(
         timestamps = []
         metrics_data: Dict[str, List[float]] = {m: [] for m in request.metrics}
         
+        # Load all samples with their latest results in one batch
+        details = await get_sample_details(db, request.sample_ids)
+        
         for sample_id in request.sample_ids:
-            # Get sample
-            result = await db.execute(
-                select(Sample).where(Sample.sample_id == sample_id)
-            )
-            sample = result.scalar_one_or_none()
+            detail = details.get(sample_id)
             
-            if not sample:
+            if detail is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Sample {sample_id} not found"
                 )
             
-            # Get timestamp
-            sample_time = sample.upload_date or sample.created_at
+            # Get timestamp (experiment date, else upload time)
+            sample = detail.sample
+            sample_time = sample.experiment_date or sample.upload_timestamp
             if not sample_time:
                 from datetime import datetime
                 sample_time = datetime.now()
@@ -1942,10 +2067,7 @@ async def analyze_multi_metric_temporal(
             
             # Get metric values
             if request.data_source == "fcs":
-                fcs_result = await db.execute(
-                    select(FCSResult).where(FCSResult.sample_id == sample.id)
-                )
-                fcs_data = fcs_result.scalar_one_or_none()
+                fcs_data = detail.fcs
                 
                 for metric in request.metrics:
                     if fcs_data:
@@ -1963,10 +2085,7 @@ async def analyze_multi_metric_temporal(
                         metrics_data[metric].append(0.0)
             
             elif request.data_source == "nta":
-                nta_result = await db.execute(
-                    select(NTAResult).where(NTAResult.sample_id == sample.id)
-                )
-                nta_data = nta_result.scalar_one_or_none()
+                nta_data = detail.nta
                 
                 for metric in request.metrics:
                     if nta_data:
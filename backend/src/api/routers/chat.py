@@ -19,8 +19,6 @@ import os
 import json
 import time
 import base64
-import tempfile
-from pathlib import Path
 from typing import Optional, Tuple, AsyncIterable, Any
 from datetime import datetime
 
@@ -39,6 +37,7 @@ except ImportError:  # pragma: no cover
 
 from src.api.aws_utils import get_bedrock_runtime_client
 from src.api.ai_gateway_client import AIGatewayError, gateway_chat
+from src.utils.summary_cache import content_digest, get_summary_cache
 
 router = APIRouter()
 
@@ -424,135 +423,135 @@ def _get_offline_response(messages: list[ChatMessage]) -> str:
 _MAX_FILE_BYTES_FOR_PARSE = 150 * 1024 * 1024  # 150 MB cap
 
 
+def _cached_summary(kind: str, data: bytes, filename: str, compute) -> str:
+    """
+    Attachment summary memoized by file content, so re-sending the same file
+    in later chat turns does not parse it again. Raises what compute() raises.
+    """
+    cache = get_summary_cache()
+    key = cache.key(content_digest(data), kind, filename=filename)
+    return cache.get_or_compute(key, lambda: compute(data, filename))
+
+
 def _extract_fcs_summary_from_bytes(data: bytes, filename: str) -> str:
     """Parse an FCS file from raw bytes and return a compact stats summary."""
-    import numpy as np
-
     try:
-        import flowio  # type: ignore
-    except ImportError:
-        return f"Attached FCS file: {filename} (flowio not installed; cannot extract statistics)"
+        return _cached_summary("chat_fcs_summary", data, filename, _compute_fcs_summary)
+    except Exception as exc:
+        logger.warning(f"FCS parse failed for {filename}: {exc}")
+        return f"Attached FCS file: {filename} (could not extract statistics: {exc})"
 
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".fcs", delete=False) as tmp:
-            tmp.write(data)
-            tmp_path = tmp.name
-
-        fcs = flowio.FlowData(tmp_path)
-        n_channels = fcs.channel_count
-        txt = getattr(fcs, "text", {}) or {}
-
-        # Extract channel names using the same logic as the existing FCS parser
-        channel_names = []
-        for i in range(1, n_channels + 1):
-            name = (
-                txt.get(f"p{i}s", "") or txt.get(f"p{i}n", "") or
-                txt.get(f"$P{i}S", "") or txt.get(f"$P{i}N", "") or
-                txt.get(f"P{i}S", "") or txt.get(f"P{i}N", "") or
-                f"Channel_{i}"
-            )
-            channel_names.append(name.strip())
-
-        # Event matrix
-        raw = np.array(fcs.events, dtype=float).reshape(-1, n_channels)
-        n_events = raw.shape[0]
-
-        # Build per-channel stats (limit to 15 channels to keep prompt concise)
-        ch_stats = []
-        for i, name in enumerate(channel_names[:15]):
-            col = raw[:, i]
-            ch_stats.append(
-                f"  {name}: mean={col.mean():.1f}, median={np.median(col):.1f}, "
-                f"std={col.std():.1f}, min={col.min():.1f}, max={col.max():.1f}"
-            )
 
-        # Highlight FSC/SSC scatter parameters
-        fsc_idx = next((i for i, n in enumerate(channel_names) if "FSC" in n.upper()), None)
-        ssc_idx = next((i for i, n in enumerate(channel_names) if "SSC" in n.upper()), None)
-        ev_lines = []
-        if fsc_idx is not None:
-            fsc = raw[:, fsc_idx]
-            ev_lines.append(f"  FSC: median={np.median(fsc):.1f}, mean={fsc.mean():.1f}, std={fsc.std():.1f}")
-        if ssc_idx is not None:
-            ssc = raw[:, ssc_idx]
-            ev_lines.append(f"  SSC: median={np.median(ssc):.1f}, mean={ssc.mean():.1f}, std={ssc.std():.1f}")
-
-        sample_id = (
-            txt.get("$SRC") or txt.get("src") or txt.get("$SMNO") or
-            txt.get("TUBE NAME") or txt.get("tube name") or filename
+def _compute_fcs_summary(data: bytes, filename: str) -> str:
+    """Uncached FCS summary; raises if the file cannot be parsed."""
+    from src.parsers.fcs_bytes import read_fcs_bytes
+    from src.utils.channel_stats import channel_statistics
+
+    # Events are decoded straight from the attachment bytes (no temp file);
+    # statistics run on the float32 view
+    fcs = read_fcs_bytes(data)
+    txt = fcs.text
+    channel_names = fcs.channel_names
+    n_channels = fcs.channel_count
+    n_events = fcs.event_count
+    events = fcs.events_float32()
+
+    # Per-channel stats (limit to 15 channels to keep prompt concise), plus
+    # the FSC/SSC scatter parameters highlighted below
+    fsc_idx = next((i for i, n in enumerate(channel_names) if "FSC" in n.upper()), None)
+    ssc_idx = next((i for i, n in enumerate(channel_names) if "SSC" in n.upper()), None)
+    wanted = sorted(set(range(min(15, n_channels))) | {i for i in (fsc_idx, ssc_idx) if i is not None})
+    matrix = events if len(wanted) == n_channels else events[:, wanted]
+    col_stats = channel_statistics(matrix, [channel_names[i] for i in wanted], quantiles=())
+
+    ch_stats = []
+    for name in channel_names[:15]:
+        cs = col_stats.get(name)
+        if cs is None:
+            ch_stats.append(f"  {name}: no finite values")
+            continue
+        ch_stats.append(
+            f"  {name}: mean={cs['mean']:.1f}, median={cs['median']:.1f}, "
+            f"std={cs['std']:.1f}, min={cs['min']:.1f}, max={cs['max']:.1f}"
         )
-        cytometer = txt.get("$CYT") or txt.get("cyt") or txt.get("CYTOMETER") or "Unknown"
-        date_str = txt.get("$DATE") or txt.get("date") or "Unknown"
-
-        summary_lines = [
-            f"=== FCS File Analysis: {filename} ===",
-            f"Sample ID: {sample_id}",
-            f"Cytometer: {cytometer}",
-            f"Acquisition date: {date_str}",
-            f"Total events recorded: {n_events:,}",
-            f"Channels ({n_channels}): {', '.join(channel_names)}",
-            "",
-            "Per-channel statistics:",
-        ] + ch_stats
-
-        if ev_lines:
-            summary_lines += ["", "Scatter channel summary:"] + ev_lines
-
-        summary_lines += [
-            "",
-            "Please analyze this FCS data for extracellular vesicle (EV) characterization. "
-            "Provide insights on particle distribution, scatter profile, concentration estimates, "
-            "size population breakdown, and any notable quality control observations.",
-        ]
-
-        return "\n".join(summary_lines)
 
-    except Exception as exc:
-        logger.warning(f"FCS parse failed for {filename}: {exc}")
-        return f"Attached FCS file: {filename} (could not extract statistics: {exc})"
-    finally:
-        if tmp_path:
-            try:
-                Path(tmp_path).unlink(missing_ok=True)
-            except Exception:
-                pass
+    ev_lines = []
+    for label, idx in (("FSC", fsc_idx), ("SSC", ssc_idx)):
+        cs = col_stats.get(channel_names[idx]) if idx is not None else None
+        if cs is not None:
+            ev_lines.append(f"  {label}: median={cs['median']:.1f}, mean={cs['mean']:.1f}, std={cs['std']:.1f}")
+
+    sample_id = (
+        txt.get("src") or txt.get("smno") or
+        txt.get("tube name") or filename
+    )
+    cytometer = txt.get("cyt") or txt.get("cytometer") or "Unknown"
+    date_str = txt.get("date") or "Unknown"
+
+    summary_lines = [
+        f"=== FCS File Analysis: {filename} ===",
+        f"Sample ID: {sample_id}",
+        f"Cytometer: {cytometer}",
+        f"Acquisition date: {date_str}",
+        f"Total events recorded: {n_events:,}",
+        f"Channels ({n_channels}): {', '.join(channel_names)}",
+        "",
+        "Per-channel statistics:",
+    ] + ch_stats
+
+    if ev_lines:
+        summary_lines += ["", "Scatter channel summary:"] + ev_lines
+
+    summary_lines += [
+        "",
+        "Please analyze this FCS data for extracellular vesicle (EV) characterization. "
+        "Provide insights on particle distribution, scatter profile, concentration estimates, "
+        "size population breakdown, and any notable quality control observations.",
+    ]
+
+    return "\n".join(summary_lines)
 
 
 def _extract_csv_summary_from_bytes(data: bytes, filename: str) -> str:
     """Parse a CSV/NTA file and return a compact stats summary."""
-    import io
-    import numpy as np
-
     try:
-        import pandas as pd  # type: ignore
+        import pandas as pd  # type: ignore  # noqa: F401
     except ImportError:
         return f"Attached CSV file: {filename} (pandas not installed)"
 
     try:
-        df = pd.read_csv(io.BytesIO(data), nrows=100_000)
-        rows, cols = df.shape
-        numeric = df.select_dtypes(include=[np.number])
-        stats_lines = []
-        for col in numeric.columns[:20]:  # cap at 20 columns
-            s = numeric[col]
-            stats_lines.append(
-                f"  {col}: mean={s.mean():.3g}, median={s.median():.3g}, "
-                f"std={s.std():.3g}, min={s.min():.3g}, max={s.max():.3g}"
-            )
-        return "\n".join([
-            f"=== CSV/NTA File Analysis: {filename} ===",
-            f"Rows: {rows:,}, Columns: {cols}",
-            "Numeric column statistics:",
-            *stats_lines,
-            "",
-            "Please analyze this NTA/CSV data for extracellular vesicle characterization.",
-        ])
+        return _cached_summary("chat_csv_summary", data, filename, _compute_csv_summary)
     except Exception as exc:
         logger.warning(f"CSV parse failed for {filename}: {exc}")
         return f"Attached CSV file: {filename} (could not parse: {exc})"
 
 
+def _compute_csv_summary(data: bytes, filename: str) -> str:
+    """Uncached CSV/NTA summary; raises if the file cannot be parsed."""
+    import io
+    import numpy as np
+    import pandas as pd  # type: ignore
+
+    df = pd.read_csv(io.BytesIO(data), nrows=100_000)
+    rows, cols = df.shape
+    numeric = df.select_dtypes(include=[np.number])
+    stats_lines = []
+    for col in numeric.columns[:20]:  # cap at 20 columns
+        s = numeric[col]
+        stats_lines.append(
+            f"  {col}: mean={s.mean():.3g}, median={s.median():.3g}, "
+            f"std={s.std():.3g}, min={s.min():.3g}, max={s.max():.3g}"
+        )
+    return "\n".join([
+        f"=== CSV/NTA File Analysis: {filename} ===",
+        f"Rows: {rows:,}, Columns: {cols}",
+        "Numeric column statistics:",
+        *stats_lines,
+        "",
+        "Please analyze this NTA/CSV data for extracellular vesicle characterization.",
+    ])
+
+
 def _summarize_file_part(part: dict) -> str:
     """Extract a statistics summary from a file message part."""
     filename = (part.get("filename") or part.get("name") or "unknown").strip()
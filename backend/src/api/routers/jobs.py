@@ -18,7 +18,7 @@ from typing import Optional
 import traceback
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
-from sqlalchemy import select, func  # type: ignore[import-not-found]
+from sqlalchemy import select  # type: ignore[import-not-found]
 from loguru import logger
 import numpy as np
 import uuid
@@ -26,6 +26,7 @@ import uuid
 from src.database.connection import get_session
 from src.database.models import ProcessingJob, Sample  # type: ignore[import-not-found]
 from src.database.crud import create_fcs_result, create_nta_result, update_job_status
+from src.database.pagination import apply_keyset, cached_count, invalidate_counts, next_cursor
 from src.api.auth_middleware import optional_auth
 from src.parsers.fcs_parser import FCSParser
 from src.parsers.nta_parser import NTAParser
@@ -222,6 +223,7 @@ async def _execute_retry_job(db: AsyncSession, new_job: ProcessingJob, sample: S
 async def list_jobs(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     status_filter: Optional[str] = Query(None, description="Filter by status (pending/running/completed/failed/cancelled)"),
     job_type: Optional[str] = Query(None, description="Filter by job type (fcs_parse/nta_parse/batch_process)"),
     db: AsyncSession = Depends(get_session)
@@ -232,6 +234,7 @@ async def list_jobs(
     **Query Parameters:**
     - skip: Pagination offset
     - limit: Number of results
+    - after: Opaque cursor returned as `next_cursor` (replaces `skip`)
     - status_filter: Filter by job status
     - job_type: Filter by job type
     
@@ -241,6 +244,7 @@ async def list_jobs(
         "total": 50,
         "skip": 0,
         "limit": 100,
+        "next_cursor": null,
         "jobs": [
             {
                 "id": 1,
@@ -267,32 +271,25 @@ async def list_jobs(
         if job_type:
             query = query.where(ProcessingJob.job_type == job_type)
         
-        # Get total count
-        count_query = select(func.count()).select_from(ProcessingJob)
-        if status_filter:
-            count_query = count_query.where(ProcessingJob.status == status_filter)
-        if job_type:
-            count_query = count_query.where(ProcessingJob.job_type == job_type)
+        # Get total count (cached briefly per filter combination)
+        total = await cached_count(db, "jobs", query)
         
-        total = (await db.execute(count_query)).scalar()
-        
-        # Apply pagination and ordering
-        query = query.order_by(ProcessingJob.created_at.desc()).offset(skip).limit(limit)
+        # Newest first; keyset page after the cursor if given
+        try:
+            query = apply_keyset(query, ProcessingJob.created_at, ProcessingJob.id, after)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.limit(limit)
+        if not after:
+            query = query.offset(skip)
         
-        # Execute query
-        result = await db.execute(query)
-        jobs = result.scalars().all()
+        # Fetch the sample name with each job instead of one query per job
+        query = query.outerjoin(Sample, Sample.id == ProcessingJob.sample_id).add_columns(Sample.sample_id)
+        rows = (await db.execute(query)).all()
+        jobs = [job for job, _ in rows]
         
-        # Get sample_id for each job
         jobs_data = []
-        for job in jobs:
-            sample_id = None
-            job_sample_id = getattr(job, 'sample_id', None)
-            if job_sample_id is not None:
-                sample_query = select(Sample.sample_id).where(Sample.id == job_sample_id)
-                sample_result = await db.execute(sample_query)
-                sample_id = sample_result.scalar_one_or_none()
-            
+        for job, sample_id in rows:
             job_status = getattr(job, 'status', None)
             job_created = getattr(job, 'created_at', None)
             job_started = getattr(job, 'started_at', None)
@@ -314,11 +311,14 @@ async def list_jobs(
         
         return {
             "total": total,
-            "skip": skip,
+            "skip": 0 if after else skip,
             "limit": limit,
+            "next_cursor": next_cursor(jobs, limit, "created_at"),
             "jobs": jobs_data
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Failed to list jobs: {e}")
         raise HTTPException(
@@ -474,6 +474,7 @@ async def cancel_job(
         setattr(job, 'status', "cancelled")
         setattr(job, 'current_step', "Cancelled by user")
         await db.commit()
+        invalidate_counts("jobs")
         
         logger.warning(f"🚫 Job cancelled: {job_id} (was: {previous_status})")
         
@@ -578,6 +579,7 @@ async def retry_job(
         # Mark original job as superseded
         job.current_step = f"Superseded by retry job {new_job_id}"  # type: ignore[assignment]
         await db.commit()
+        invalidate_counts("jobs")
 
         logger.info(f"🔄 Retrying job: {job_id} → {new_job_id} (type={job_type}, sample={sample_id})")
 
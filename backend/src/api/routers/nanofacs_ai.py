@@ -21,11 +21,14 @@ Endpoints:
 - POST /ai/nanofacs/compare          - Compare multiple FCS files
 - POST /ai/nanofacs/ask              - Ask questions about your data
 - GET  /ai/nanofacs/health           - Check AWS Bedrock connectivity
+- GET  /ai/nanofacs/list-files       - List catalogued FCS parquet files
+- GET  /ai/nanofacs/catalog/summary  - Pooled column statistics across samples
 
 Author: BioVaram Dev Team
 Date: April 2026
 """
 
+import asyncio
 import os
 import json
 try:
@@ -35,7 +38,7 @@ except ImportError:  # pragma: no cover
 import numpy as np
 import pandas as pd
 from typing import Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
 try:
     from botocore.exceptions import NoCredentialsError, PartialCredentialsError, ProfileNotFound  # type: ignore
@@ -50,7 +53,16 @@ from src.api.aws_utils import get_bedrock_runtime_client
 from src.api.ai_gateway_client import AIGatewayError, gateway_complete, gateway_health
 from src.api.config import get_settings
 from src.physics.mie_scatter import MieScatterCalculator
-from src.physics.bead_calibration import get_active_calibration, get_fcmpass_calibration
+from src.physics.bead_calibration import (
+    get_active_calibration,
+    get_calibration_fingerprint,
+    get_fcmpass_calibration,
+)
+from src.utils.channel_stats import dataframe_channel_statistics
+from src.parsers.event_parquet import read_event_metadata, read_event_parquet
+from src.utils.parquet_catalog import NANOFACS_PARQUET_DIR, get_parquet_catalog
+from src.utils.summary_cache import file_digest, get_summary_cache, remember_file_digest
+from src.utils.upload_stream import stream_upload_to_disk
 router = APIRouter()
 settings = get_settings()
 
@@ -297,10 +309,23 @@ NORMAL_RANGES = {
 # Helper — read FCS parquet file
 # ============================================================================
 
+# Columns the stats, preview and sizing helpers below read (plus the detected
+# FSC/SSC channels); everything else in an event file is left on disk
+_FCS_READ_COLUMNS = {
+    "Size", "MeanIntensity", "MaxIntensity", "MinIntensity", "Cluster",
+    "Solidity", "AspectRatio", "TraceLength", "LocationX", "LocationY",
+    "Area", "Intensity/Area", "V_nmsec-1",
+    "VSSC1-H", "VSSC-H", "VSSC1_H",  # FCMPASS sizing channels
+}
+
+
 def _read_fcs_parquet(file_path: str) -> pd.DataFrame:
-    """Read FCS parquet file and return DataFrame."""
+    """Read the columns used for AI statistics from an FCS parquet file."""
     try:
-        df = pd.read_parquet(file_path)
+        available = read_event_metadata(Path(file_path))["columns"]
+        scatter = set(_find_scatter_channels(available))
+        columns = [c for c in available if c in _FCS_READ_COLUMNS or c in scatter] or available[:1]
+        df = read_event_parquet(Path(file_path), columns=columns)
         logger.info(f"Read FCS parquet: {file_path} → {df.shape}")
         return df
     except Exception as e:
@@ -678,6 +703,25 @@ def _dedupe_file_paths(file_paths: list[str]) -> list[str]:
 # Helper — compute per-file statistics
 # ============================================================================
 
+_SUMMARY_COLUMNS = ["Size", "MeanIntensity", "MaxIntensity", "Area",
+                    "Solidity", "AspectRatio", "TraceLength", "V_nmsec-1", "Intensity/Area"]
+
+
+def _summary_block(cs: Optional[dict]) -> Optional[dict]:
+    """mean/median/std/min/max/p10/p90 (3 dp) from a channel_stats entry."""
+    if cs is None:
+        return None
+    return {
+        "mean":   round(cs["mean"], 3),
+        "median": round(cs["median"], 3),
+        "std":    round(cs["std"], 3),
+        "min":    round(cs["min"], 3),
+        "max":    round(cs["max"], 3),
+        "p10":    round(cs["quantiles"][0.10], 3),
+        "p90":    round(cs["quantiles"][0.90], 3),
+    }
+
+
 def _compute_fcs_stats(df: pd.DataFrame, file_name: str) -> dict:
     """Compute key statistics from FCS DataFrame."""
     if df.empty:
@@ -688,6 +732,7 @@ def _compute_fcs_stats(df: pd.DataFrame, file_name: str) -> dict:
     # If this is a raw FCS parquet (channels like FSC/SSC) rather than the
     # imaging-style schema documented at the top of this file, derive a Size
     # block so AI Q&A can answer median-size questions.
+    fsc_channel = ssc_channel = None
     if "Size" not in df.columns:
         derived_size, method, channel = _derive_size_stats_from_fcs_channels(df)
         if derived_size:
@@ -698,48 +743,21 @@ def _compute_fcs_stats(df: pd.DataFrame, file_name: str) -> dict:
                 stats["sizing_channel"] = channel
 
         fsc_channel, ssc_channel = _find_scatter_channels(list(df.columns))
-        if fsc_channel and fsc_channel in df.columns:
-            vals = _safe_numeric_series(df, fsc_channel)
-            if not vals.empty:
-                stats["FSC"] = {
-                    "channel": fsc_channel,
-                    "mean": round(float(vals.mean()), 3),
-                    "median": round(float(vals.median()), 3),
-                    "std": round(float(vals.std()), 3),
-                    "min": round(float(vals.min()), 3),
-                    "max": round(float(vals.max()), 3),
-                    "p10": round(float(np.percentile(vals, 10)), 3),
-                    "p90": round(float(np.percentile(vals, 90)), 3),
-                }
 
-        if ssc_channel and ssc_channel in df.columns:
-            vals = _safe_numeric_series(df, ssc_channel)
-            if not vals.empty:
-                stats["SSC"] = {
-                    "channel": ssc_channel,
-                    "mean": round(float(vals.mean()), 3),
-                    "median": round(float(vals.median()), 3),
-                    "std": round(float(vals.std()), 3),
-                    "min": round(float(vals.min()), 3),
-                    "max": round(float(vals.max()), 3),
-                    "p10": round(float(np.percentile(vals, 10)), 3),
-                    "p90": round(float(np.percentile(vals, 90)), 3),
-                }
+    # All summarised columns in one fused kernel call (moments + p10/p90)
+    summary_cols = [c for c in (fsc_channel, ssc_channel) if c]
+    summary_cols += [c for c in _SUMMARY_COLUMNS if c in df.columns and c not in summary_cols]
+    col_stats = dataframe_channel_statistics(df, summary_cols, quantiles=(0.10, 0.90))
 
-    for col in ["Size", "MeanIntensity", "MaxIntensity", "Area",
-                "Solidity", "AspectRatio", "TraceLength", "V_nmsec-1", "Intensity/Area"]:
-        if col in df.columns:
-            vals = df[col].dropna()
-            if len(vals) > 0:
-                stats[col] = {
-                    "mean":   round(float(vals.mean()), 3),
-                    "median": round(float(vals.median()), 3),
-                    "std":    round(float(vals.std()), 3),
-                    "min":    round(float(vals.min()), 3),
-                    "max":    round(float(vals.max()), 3),
-                    "p10":    round(float(np.percentile(vals, 10)), 3),
-                    "p90":    round(float(np.percentile(vals, 90)), 3),
-                }
+    for label, channel in (("FSC", fsc_channel), ("SSC", ssc_channel)):
+        block = _summary_block(col_stats.get(channel)) if channel else None
+        if block:
+            stats[label] = {"channel": channel, **block}
+
+    for col in _SUMMARY_COLUMNS:
+        block = _summary_block(col_stats.get(col))
+        if block:
+            stats[col] = block
 
     # Cluster distribution — cap to top 10 clusters by count. The full dict
     # can run into hundreds of entries on dense FCS files, which blows the
@@ -844,6 +862,49 @@ def _rule_based_fcs_anomalies(stats: dict) -> list[str]:
     return anomalies
 
 
+# ============================================================================
+# Helper — memoized per-file AI context
+# ============================================================================
+
+def _fcs_file_context(file_path: str) -> Optional[dict]:
+    """
+    Stats, raw-data preview and rule-based anomalies of one FCS parquet.
+
+    Memoized by file content and calibration state (see
+    src.utils.summary_cache), so analyze, compare and follow-up questions
+    about the same file read it only once.
+    Returns None if the file cannot be read.
+    """
+    file_name = Path(file_path).name
+    try:
+        digest = file_digest(file_path)
+    except OSError as e:
+        logger.error(f"Failed to read FCS parquet {file_path}: {e}")
+        return None
+
+    def compute() -> Optional[dict]:
+        df = _read_fcs_parquet(file_path)
+        if df.empty:
+            return None
+        stats = _compute_fcs_stats(df, file_name)
+        return {
+            "stats": stats,
+            "raw_preview": _build_raw_data_preview(df, file_name),
+            "anomalies": _rule_based_fcs_anomalies(stats),
+        }
+
+    # Size statistics come from the active calibration: a recalibration must miss
+    cache = get_summary_cache()
+    key = cache.key(digest, "nanofacs_fcs_context", file=file_name, calibration=get_calibration_fingerprint())
+    return cache.get_or_compute(key, compute)
+
+
+def _trim_raw_preview(preview: dict, max_rows: int) -> dict:
+    """Raw-data preview limited to its first ``max_rows`` sampled rows."""
+    rows = preview.get("sample_rows", [])[:max_rows]
+    return {**preview, "sample_rows": rows, "rows_sampled": len(rows)}
+
+
 # ============================================================================
 # Helper — suggest graphs
 # ============================================================================
@@ -1020,16 +1081,16 @@ async def analyze_fcs_with_ai(request: FCSAnalyzeRequest):
     all_stats = []
     raw_previews = []
     raw_preview_truncated_files = 0
+    rule_anomalies = []
     for fp in request.file_paths:
-        df = _read_fcs_parquet(fp)
-        if df.empty:
+        context = _fcs_file_context(fp)
+        if context is None:
             logger.warning(f"Empty or unreadable file: {fp}")
             continue
-        file_name = Path(fp).name
-        stats = _compute_fcs_stats(df, file_name)
-        all_stats.append(stats)
+        all_stats.append(context["stats"])
+        rule_anomalies.extend(context["anomalies"])
         if len(raw_previews) < 4:
-            raw_previews.append(_build_raw_data_preview(df, file_name))
+            raw_previews.append(context["raw_preview"])
         else:
             raw_preview_truncated_files += 1
 
@@ -1039,11 +1100,6 @@ async def analyze_fcs_with_ai(request: FCSAnalyzeRequest):
             detail="Could not read any FCS parquet files. Check file paths."
         )
 
-    # Rule-based anomalies
-    rule_anomalies = []
-    for stats in all_stats:
-        rule_anomalies.extend(_rule_based_fcs_anomalies(stats))
-
     # Graph suggestions
     graph_suggestions = _suggest_graphs(all_stats, request.parameters_of_interest)
 
@@ -1208,12 +1264,10 @@ async def compare_fcs_files(request: FCSCompareRequest):
     all_stats = []
     raw_previews = []
     for fp in request.file_paths:
-        df = _read_fcs_parquet(fp)
-        if not df.empty:
-            file_name = Path(fp).name
-            stats = _compute_fcs_stats(df, file_name)
-            all_stats.append(stats)
-            raw_previews.append(_build_raw_data_preview(df, file_name, max_rows=12))
+        context = _fcs_file_context(fp)
+        if context is not None:
+            all_stats.append(context["stats"])
+            raw_previews.append(_trim_raw_preview(context["raw_preview"], 12))
 
     if len(all_stats) < 2:
         raise HTTPException(
@@ -1323,13 +1377,11 @@ async def ask_about_fcs_data(request: FCSAskRequest):
     raw_previews = []
     raw_preview_truncated_files = 0
     for fp in request.file_paths:
-        df = _read_fcs_parquet(fp)
-        if not df.empty:
-            file_name = Path(fp).name
-            stats = _compute_fcs_stats(df, file_name)
-            all_stats.append(stats)
+        context = _fcs_file_context(fp)
+        if context is not None:
+            all_stats.append(context["stats"])
             if len(raw_previews) < 4:
-                raw_previews.append(_build_raw_data_preview(df, file_name, max_rows=12))
+                raw_previews.append(_trim_raw_preview(context["raw_preview"], 12))
             else:
                 raw_preview_truncated_files += 1
 
@@ -1383,36 +1435,74 @@ Keep the answer concise (4-6 sentences)."""
 
 
 @router.get("/ai/nanofacs/list-files")
-async def list_nanofacs_parquet_files():
-    """List all available NanoFACS FCS parquet files on the server."""
-    base_dirs = [
-        settings.parquet_dir / "nanofacs",
-        Path(__file__).parent.parent.parent.parent / "data" / "nanofacs_parquet",
-    ]
+async def list_nanofacs_parquet_files(refresh: bool = False):
+    """
+    List all available NanoFACS FCS parquet files on the server.
     
-    seen_paths: set[str] = set()
-    files = []
-    for base_dir in base_dirs:
-        if base_dir.exists():
-            for f in base_dir.rglob("*.fcs.parquet"):
-                p = str(f.resolve())
-                if p in seen_paths:
-                    continue
-                seen_paths.add(p)
-                files.append({
-                    "path": p,
-                    "name": f.name,
-                    "folder": f.parent.name,
-                    "size_kb": round(f.stat().st_size / 1024, 1)
-                })
+    Served from the parquet catalog; ``refresh=true`` first rescans the data
+    folders for files copied in by hand.
+    """
+    def load_entries() -> list:
+        # The first read of the manifest may scan the data folders
+        catalog = get_parquet_catalog()
+        if refresh:
+            catalog.sync()
+        return catalog.entries(kind="fcs_events")
+    
+    entries = await asyncio.get_running_loop().run_in_executor(None, load_entries)
+    files = [
+        {
+            "path": entry["path"],
+            "name": entry["name"],
+            "folder": entry["folder"],
+            "size_kb": round(entry["size_bytes"] / 1024, 1),
+        }
+        for entry in entries
+    ]
     
     return {
         "files": sorted(files, key=lambda x: x["name"]),
         "total": len(files),
-        "base_dir": str(base_dirs[0])
+        "base_dir": str(settings.parquet_dir / "nanofacs")
     }
 
 
+@router.get("/ai/nanofacs/catalog/summary")
+async def summarize_catalog_column(
+    column: str,
+    kind: str = "fcs_events",
+    instrument: Optional[str] = None,
+    treatment: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    value_min: Optional[float] = None,
+    value_max: Optional[float] = None,
+):
+    """
+    Pooled statistics of one column across catalogued samples.
+    
+    Example: median size of all CD81 samples this month:
+    ``?column=diameter_nm&treatment=CD81&date_from=2026-10-01``.
+    Only files matching the instrument/treatment/date filters are opened.
+    """
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: get_parquet_catalog().summarize(
+                column,
+                kind=kind,
+                instrument=instrument,
+                treatment=treatment,
+                date_from=date_from,
+                date_to=date_to,
+                value_min=value_min,
+                value_max=value_max,
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 # ============================================================================
 # Upload Parquet File Endpoint
 # ============================================================================
@@ -1430,12 +1520,19 @@ async def upload_parquet_file(
     if not filename.endswith(".fcs.parquet") and not filename.endswith(".parquet"):
         raise HTTPException(status_code=400, detail="Only .fcs.parquet files accepted.")
 
-    base_dir = Path(__file__).parent.parent.parent.parent / "data" / "nanofacs_parquet" / folder
+    base_dir = NANOFACS_PARQUET_DIR / folder
     base_dir.mkdir(parents=True, exist_ok=True)
 
+    # Stream to disk in chunks rather than holding the whole file in memory
     dest = base_dir / filename
-    content = await file.read()
-    dest.write_bytes(content)
+    stored = await stream_upload_to_disk(file, dest)
+    remember_file_digest(dest, stored.sha256)
+
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, lambda: get_parquet_catalog().register(dest))
+    except Exception as e:
+        dest.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail=f"Not a readable parquet file: {e}")
 
     logger.info(f"Uploaded parquet: {dest}")
     return {
@@ -1443,7 +1540,7 @@ async def upload_parquet_file(
         "path": str(dest),
         "name": filename,
         "folder": folder,
-        "size_bytes": len(content)
+        "size_bytes": stored.size_bytes
     }
 
 # ============================================================================
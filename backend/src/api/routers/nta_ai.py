@@ -38,6 +38,7 @@ from pydantic import BaseModel, Field
 from loguru import logger
 from src.api.aws_utils import get_bedrock_runtime_client
 from src.api.ai_gateway_client import AIGatewayError, gateway_complete, gateway_health
+from src.utils.summary_cache import file_digest, get_summary_cache
 router = APIRouter()
 
 
@@ -453,18 +454,37 @@ async def _fetch_nta_results(sample_id: str) -> dict:
                         continue
                 return None
 
+            def _parsed_nta_summary(nta_file_path: Path) -> dict:
+                """Parser metadata and computed results of an NTA file, memoized by file content."""
+                def compute() -> dict:
+                    parser = NTAParser(nta_file_path)
+                    if not parser.validate():
+                        logger.warning(f"NTA validation failed for '{sample_id}' ({nta_file_path})")
+                    parsed_df = parser.parse()
+                    try:
+                        computed, error = _calculate_nta_results_from_parsed_df(parsed_df), None
+                    except ValueError as calc_err:
+                        computed, error = None, str(calc_err)
+                    return {
+                        "raw_metadata": getattr(parser, "raw_metadata", {}) or {},
+                        "measurement_params": getattr(parser, "measurement_params", {}) or {},
+                        "computed": computed,
+                        "error": error,
+                    }
+
+                cache = get_summary_cache()
+                key = cache.key(file_digest(nta_file_path), "nta_file_summary")
+                return cache.get_or_compute(key, compute)
+
             parsed_metadata: dict = {}
             parsed_measurement_params: dict = {}
 
             if nta_row and getattr(sample, "file_path_nta", None):
                 try:
                     nta_file_path = _resolve_existing_file_path(str(getattr(sample, "file_path_nta")))
-                    parser = NTAParser(nta_file_path)
-                    if not parser.validate():
-                        logger.warning(f"NTA validation failed for '{sample_id}' ({nta_file_path})")
-                    _ = parser.parse()
-                    parsed_metadata = getattr(parser, "raw_metadata", {}) or {}
-                    parsed_measurement_params = getattr(parser, "measurement_params", {}) or {}
+                    parsed = _parsed_nta_summary(nta_file_path)
+                    parsed_metadata = parsed["raw_metadata"]
+                    parsed_measurement_params = parsed["measurement_params"]
                 except Exception as meta_err:
                     logger.warning(f"Failed to parse NTA metadata for '{sample_id}': {type(meta_err).__name__}: {meta_err}")
 
@@ -482,15 +502,15 @@ async def _fetch_nta_results(sample_id: str) -> dict:
                     return {}
 
                 try:
-                    parser = NTAParser(nta_file_path)
-                    if not parser.validate():
-                        logger.warning(f"NTA validation failed for '{sample_id}' ({nta_file_path})")
-
-                    parsed_df = parser.parse()
-                    computed = _calculate_nta_results_from_parsed_df(parsed_df)
+                    parsed = _parsed_nta_summary(nta_file_path)
+                    if parsed["computed"] is None:
+                        raise ValueError(parsed["error"])
+                    computed = parsed["computed"]
+                    measurement_params = parsed["measurement_params"]
+                    raw_metadata = parsed["raw_metadata"]
 
-                    temperature = parser.measurement_params.get("temperature")
-                    measurement_date = _parse_measurement_datetime(getattr(parser, "raw_metadata", {}) or {})
+                    temperature = measurement_params.get("temperature")
+                    measurement_date = _parse_measurement_datetime(raw_metadata)
 
                     # NOTE: We intentionally do NOT write back to the DB here.
                     # In some environments, the SQLite schema may lag behind the SQLAlchemy model,
@@ -519,18 +539,18 @@ async def _fetch_nta_results(sample_id: str) -> dict:
                     "bin_120_150nm_pct": computed.get("bin_120_150nm_pct"),
                     "bin_150_200nm_pct": computed.get("bin_150_200nm_pct"),
 
-                    "temperature_celsius": float(parser.measurement_params.get("temperature")) if parser.measurement_params.get("temperature") is not None else None,
-                    "ph": float(parser.measurement_params.get("ph")) if parser.measurement_params.get("ph") is not None else None,
-                    "conductivity": float(parser.measurement_params.get("conductivity")) if parser.measurement_params.get("conductivity") is not None else None,
-                    "viscosity": float(parser.measurement_params.get("viscosity")) if parser.measurement_params.get("viscosity") is not None else None,
-                    "laser_wavelength_nm": float(parser.measurement_params.get("laser_wavelength")) if parser.measurement_params.get("laser_wavelength") is not None else None,
-                    "dilution_factor": float(parser.measurement_params.get("dilution")) if parser.measurement_params.get("dilution") is not None else None,
-                    "operator": getattr(sample, "operator", None) or (getattr(parser, "raw_metadata", {}) or {}).get("operator"),
-                    "instrument": (getattr(parser, "raw_metadata", {}) or {}).get("instrument_serial"),
-                    "sensitivity": float(parser.measurement_params.get("sensitivity")) if parser.measurement_params.get("sensitivity") is not None else None,
-                    "shutter": float(parser.measurement_params.get("shutter")) if parser.measurement_params.get("shutter") is not None else None,
-                    "positions": int(parser.measurement_params.get("num_positions")) if parser.measurement_params.get("num_positions") is not None else None,
-                    "number_of_traces": int(parser.measurement_params.get("num_traces")) if parser.measurement_params.get("num_traces") is not None else None,
+                    "temperature_celsius": float(measurement_params.get("temperature")) if measurement_params.get("temperature") is not None else None,
+                    "ph": float(measurement_params.get("ph")) if measurement_params.get("ph") is not None else None,
+                    "conductivity": float(measurement_params.get("conductivity")) if measurement_params.get("conductivity") is not None else None,
+                    "viscosity": float(measurement_params.get("viscosity")) if measurement_params.get("viscosity") is not None else None,
+                    "laser_wavelength_nm": float(measurement_params.get("laser_wavelength")) if measurement_params.get("laser_wavelength") is not None else None,
+                    "dilution_factor": float(measurement_params.get("dilution")) if measurement_params.get("dilution") is not None else None,
+                    "operator": getattr(sample, "operator", None) or raw_metadata.get("operator"),
+                    "instrument": raw_metadata.get("instrument_serial"),
+                    "sensitivity": float(measurement_params.get("sensitivity")) if measurement_params.get("sensitivity") is not None else None,
+                    "shutter": float(measurement_params.get("shutter")) if measurement_params.get("shutter") is not None else None,
+                    "positions": int(measurement_params.get("num_positions")) if measurement_params.get("num_positions") is not None else None,
+                    "number_of_traces": int(measurement_params.get("num_traces")) if measurement_params.get("num_traces") is not None else None,
                 }
 
             (
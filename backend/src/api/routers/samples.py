@@ -17,10 +17,12 @@ Date: November 21, 2025
 
 from typing import Optional, List, Dict, Any, Tuple, cast  # noqa: F401
 from pathlib import Path
+import asyncio
 import json
 import re
 import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from sqlalchemy import select, func, delete as sql_delete, update as sql_update  # type: ignore[import-not-found]
 from loguru import logger
@@ -28,6 +30,7 @@ from loguru import logger
 from src.api.config import get_settings
 
 from src.database.connection import get_session
+from src.database.pagination import apply_keyset, cached_count, invalidate_counts, next_cursor
 from src.database.models import Sample, FCSResult, NTAResult, QCReport, ProcessingJob, ExperimentalConditions, Alert  # type: ignore[import-not-found]
 from src.api.auth_middleware import optional_auth
 
@@ -404,8 +407,9 @@ def _diagnose_multi_solution_event(
 
 @router.get("/", response_model=dict)
 async def list_samples(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored when 'after' is given)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
     treatment: Optional[str] = Query(None, description="Filter by treatment"),
     qc_status: Optional[str] = Query(None, description="Filter by QC status (pass/warn/fail)"),
     processing_status: Optional[str] = Query(None, description="Filter by processing status"),
@@ -418,6 +422,9 @@ async def list_samples(
     **Query Parameters:**
     - skip: Pagination offset (default: 0)
     - limit: Number of results (default: 100, max: 1000)
+    - after: Opaque cursor returned as `next_cursor`; fetches the page after it.
+      Prefer this over `skip` — it stays fast at any depth and does not
+      shift when new samples are uploaded while paging.
     - treatment: Filter by treatment (e.g., "CD81", "ISO")
     - qc_status: Filter by QC status ("pass", "warn", "fail")
     - processing_status: Filter by processing status ("pending", "completed", "failed")
@@ -428,6 +435,7 @@ async def list_samples(
         "total": 150,
         "skip": 0,
         "limit": 100,
+        "next_cursor": "WyIyMDI1LTExLTIxVDEyOjAwOjAwIiwgMV0",
         "samples": [
             {
                 "id": 1,
@@ -459,22 +467,17 @@ async def list_samples(
         if processing_status:
             query = query.where(Sample.processing_status == processing_status)
         
-        # Get total count
-        count_query = select(func.count()).select_from(Sample)
-        if user_id is not None:
-            count_query = count_query.where(Sample.user_id == user_id)
-        if treatment:
-            count_query = count_query.where(Sample.treatment == treatment)
-        if qc_status:
-            count_query = count_query.where(Sample.qc_status == qc_status)
-        if processing_status:
-            count_query = count_query.where(Sample.processing_status == processing_status)
-        
-        total_result = await db.execute(count_query)
-        total = total_result.scalar()
+        # Get total count (cached briefly per filter combination)
+        total = await cached_count(db, "samples", query)
         
-        # Apply ordering (most recently uploaded first) then pagination
-        query = query.order_by(Sample.upload_timestamp.desc()).offset(skip).limit(limit)
+        # Most recently uploaded first; keyset page after the cursor if given
+        try:
+            query = apply_keyset(query, Sample.upload_timestamp, Sample.id, after)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.limit(limit)
+        if not after:
+            query = query.offset(skip)
         
         # Execute query
         result = await db.execute(query)
@@ -504,11 +507,14 @@ async def list_samples(
         
         return {
             "total": total,
-            "skip": skip,
+            "skip": 0 if after else skip,
             "limit": limit,
+            "next_cursor": next_cursor(samples, limit, "upload_timestamp"),
             "samples": samples_data
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"❌ Failed to list samples: {e}")
         raise HTTPException(
@@ -801,12 +807,15 @@ async def get_fcs_results(
             if parquet_path:
                 try:
                     import numpy as np
-                    import pandas as pd
                     from pathlib import Path
+                    from src.parsers.event_parquet import read_event_parquet
                     
                     parquet_file = Path(parquet_path)
                     if parquet_file.exists():
-                        df = pd.read_parquet(parquet_file)
+                        # Only the size column is needed, not every channel
+                        df = read_event_parquet(
+                            parquet_file, columns=['diameter_nm', 'particle_size_nm', 'size_nm']
+                        )
                         # Look for pre-calculated diameter column
                         size_col = None
                         for col_name in ['diameter_nm', 'particle_size_nm', 'size_nm']:
@@ -958,6 +967,109 @@ async def get_nta_results(
         )
 
 
+# ============================================================================
+# Sample Preview Endpoints
+# ============================================================================
+
+def _backfill_fcs_preview(sample_id: str, fcs_path: str) -> Optional[Dict[str, Any]]:
+    """Build the FCS preview of a sample uploaded before previews existed."""
+    from src.utils.fcs_cache import get_cached_fcs_data  # type: ignore[import-not-found]
+    from src.utils.channel_config import get_channel_config  # type: ignore[import-not-found]
+    from src.utils.sample_previews import build_fcs_preview, write_preview
+
+    parsed_data, channels = get_cached_fcs_data(fcs_path)
+    channel_config = get_channel_config()
+    preview, png = build_fcs_preview(
+        parsed_data,
+        channel_config.detect_fsc_channel(channels),
+        channel_config.detect_ssc_channel(channels),
+        parameters={'backfilled': True},
+    )
+    write_preview(sample_id, "fcs", preview, png)
+    logger.info(f"🖼️ Backfilled FCS preview for {sample_id}")
+    return preview
+
+
+@router.get("/{sample_id}/preview", response_model=dict)
+async def get_sample_preview(
+    sample_id: str,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Precomputed preview of a sample for dashboards and sample lists.
+    
+    Served from small artifacts written at upload time (no event data is
+    read). Samples uploaded before previews existed get their FCS preview
+    built on the first request.
+    
+    **Response:**
+    ```json
+    {
+        "sample_id": "P5_F10_CD81",
+        "fcs": {
+            "n_events": 300000,
+            "quantile_levels": [0.01, 0.05, ...],
+            "channels": {"FSC-H": {"min": 1.0, "max": 9.9e5, "median": 4.2e3, "quantiles": [...]}},
+            "size_histogram": {"bin_edges_nm": [...], "counts": [...], "n": 9874, "quantiles": [...]},
+            "density": {"x_channel": "FSC-H", "y_channel": "SSC-H", "x_scale": "log", ...}
+        },
+        "nta": null,
+        "density_url": "/api/v1/samples/P5_F10_CD81/preview/density.png"
+    }
+    ```
+    """
+    from src.utils.sample_previews import density_png_path, load_preview
+
+    try:
+        result = await db.execute(select(Sample).where(Sample.sample_id == sample_id))
+        sample = result.scalar_one_or_none()
+        if not sample:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Sample not found: {sample_id}"
+            )
+        
+        fcs_preview = load_preview(sample_id, "fcs")
+        fcs_path = _sample_fcs_path(sample)
+        if fcs_preview is None and fcs_path and Path(fcs_path).exists():
+            try:
+                loop = asyncio.get_running_loop()
+                fcs_preview = await loop.run_in_executor(None, _backfill_fcs_preview, sample_id, fcs_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not backfill FCS preview for {sample_id}: {e}")
+        
+        has_density = density_png_path(sample_id) is not None
+        return {
+            "sample_id": sample_id,
+            "fcs": fcs_preview,
+            "nta": load_preview(sample_id, "nta"),
+            "density_url": f"{settings.api_prefix}/samples/{sample_id}/preview/density.png" if has_density else None,
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Failed to get preview for {sample_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get sample preview: {str(e)}"
+        )
+
+
+@router.get("/{sample_id}/preview/density.png")
+async def get_sample_preview_density(sample_id: str):
+    """FSC/SSC density thumbnail (256x256 PNG) written at upload time."""
+    from src.utils.sample_previews import density_png_path
+
+    path = density_png_path(sample_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No density preview for sample {sample_id}"
+        )
+    return FileResponse(path=str(path), media_type="image/png")
+
+
 # ============================================================================
 # Delete Sample Endpoint
 # ============================================================================
@@ -1044,6 +1156,15 @@ async def delete_sample(
         )
         await db.execute(sql_delete(Sample).where(Sample.id == sample_pk))
         await db.commit()
+        invalidate_counts("samples")
+        invalidate_counts("jobs")
+        
+        # Cached plots/analyses of this sample (in every worker when caches are shared)
+        from src.api.cache import invalidate_sample_caches
+        invalidate_sample_caches(sample_id)
+        
+        from src.utils.sample_previews import delete_previews
+        delete_previews(sample_id)
         
         logger.warning(f"🗑️  Deleted sample: {sample_id} (FCS: {fcs_count}, NTA: {nta_count}, QC: {qc_count}, Jobs: {job_count})")
         
@@ -1085,13 +1206,29 @@ async def get_scatter_data(
     db: AsyncSession = Depends(get_session)
 ):
     """Get FSC/SSC scatter plot data for a sample (cached for 2 minutes)."""
-    # Check cache first — scatter data is expensive (FCS parse + Mie calculations)
+    # Scatter data is expensive (FCS parse + Mie calculations): serve it from
+    # the cache, and let concurrent requests for the same view share one computation
     from src.api.cache import scatter_cache, make_cache_key
     cache_key = f"scatter:{sample_id}:{make_cache_key(max_points, fsc_channel, ssc_channel, wavelength_nm, n_particle, n_medium)}"
-    cached = scatter_cache.get(cache_key)
-    if cached is not None:
-        logger.debug(f"📊 Cache HIT for scatter data: {sample_id}")
-        return cached
+    return await scatter_cache.get_or_compute_async(
+        cache_key,
+        lambda: _compute_scatter_data(
+            sample_id, max_points, fsc_channel, ssc_channel, wavelength_nm, n_particle, n_medium, db
+        ),
+        ttl_seconds=120,
+    )
+
+
+async def _compute_scatter_data(
+    sample_id: str,
+    max_points: int,
+    fsc_channel: Optional[str],
+    ssc_channel: Optional[str],
+    wavelength_nm: float,
+    n_particle: float,
+    n_medium: float,
+    db: AsyncSession,
+) -> dict:
     """
     Get FSC/SSC scatter plot data for a sample.
     
@@ -1135,14 +1272,14 @@ async def get_scatter_data(
             )
         
         # Parse FCS file to get scatter data (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data  # type: ignore[import-not-found]
+        from src.utils.fcs_cache import load_cached_fcs_data  # type: ignore[import-not-found]
         from src.utils.channel_config import get_channel_config  # type: ignore[import-not-found]
         import pandas as pd
         import numpy as np
         
         logger.info(f"📊 Loading scatter data for sample: {sample_id}")
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Get channel configuration
         channel_config = get_channel_config()
@@ -1219,9 +1356,8 @@ async def get_scatter_data(
         try:
             if fcmpass_calibration and fcmpass_calibration.calibrated:
                 # === FCMPASS K-BASED (HIGHEST PRIORITY, VALIDATED) ===
-                # If user requested a different EV RI, update the LUT
-                if abs(fcmpass_calibration.n_ev - n_particle) > 1e-6:
-                    fcmpass_calibration.update_ev_ri(n_particle)
+                # Size with the requested EV RI (a copy: the calibrator is shared)
+                fcmpass_calibration = fcmpass_calibration.with_ev_ri(n_particle)
                 logger.info(
                     f"🎯 Using FCMPASS k-based sizing: k={fcmpass_calibration.k_instrument:.1f}, "
                     f"CV={fcmpass_calibration.k_cv_pct:.1f}%, RI_ev={fcmpass_calibration.n_ev}"
@@ -1401,8 +1537,6 @@ async def get_scatter_data(
             except Exception as e:
                 logger.debug(f"Gain mismatch check skipped: {e}")
         
-        # Cache the response for 2 minutes
-        scatter_cache.set(cache_key, response_data, 120)
         return response_data
         
     except HTTPException:
@@ -1495,12 +1629,12 @@ async def get_clustered_scatter_data(
             )
         
         # Parse FCS file (cached to avoid re-parsing on every request)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.utils.channel_config import get_channel_config
         
         logger.info(f"📊 Loading clustered scatter data for {sample_id} at zoom level {zoom_level}")
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Detect channels
         channel_config = get_channel_config()
@@ -1842,12 +1976,12 @@ async def analyze_gated_population(
             )
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.utils.channel_config import get_channel_config
         
         logger.info(f"🎯 Running gated analysis for sample: {sample_id}, gate: {request.gate_name}")
         
-        parsed_data, _channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, _channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Validate channels exist
         available_channels = list(parsed_data.columns)
@@ -2200,12 +2334,12 @@ async def get_recommended_axes(
             )
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.visualization.auto_axis_selector import AutoAxisSelector
         
         logger.info(f"🎯 Analyzing optimal axes for sample: {sample_id}")
         
-        parsed_data, all_channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, all_channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Initialize auto-axis selector
         selector = AutoAxisSelector()
@@ -2329,14 +2463,25 @@ async def get_size_bins(
     }
     ```
     """
-    # Check cache first
+    # Cached for 2 minutes; concurrent requests for the same bins share one computation
     from src.api.cache import size_bins_cache, make_cache_key
     cache_key = f"bins:{sample_id}:{make_cache_key(fsc_channel, wavelength_nm, n_particle, n_medium)}"
-    cached = size_bins_cache.get(cache_key)
-    if cached is not None:
-        logger.debug(f"📊 Cache HIT for size bins: {sample_id}")
-        return cached
-    
+    return await size_bins_cache.get_or_compute_async(
+        cache_key,
+        lambda: _compute_size_bins(sample_id, fsc_channel, wavelength_nm, n_particle, n_medium, db),
+        ttl_seconds=120,
+    )
+
+
+async def _compute_size_bins(
+    sample_id: str,
+    fsc_channel: Optional[str],
+    wavelength_nm: float,
+    n_particle: float,
+    n_medium: float,
+    db: AsyncSession,
+) -> dict:
+    """Size-bin response of get_size_bins (uncached)."""
     try:
         # Get sample
         result = await db.execute(select(Sample).where(Sample.sample_id == sample_id))
@@ -2357,12 +2502,12 @@ async def get_size_bins(
             )
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data  # type: ignore[import-not-found]
+        from src.utils.fcs_cache import load_cached_fcs_data  # type: ignore[import-not-found]
         import numpy as np
         
         logger.info(f"📏 Calculating size bins for sample: {sample_id}")
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Get channel configuration
         from src.utils.channel_config import get_channel_config  # type: ignore[import-not-found]
@@ -2503,8 +2648,6 @@ async def get_size_bins(
             }
         }
         
-        # Cache for 2 minutes
-        size_bins_cache.set(cache_key, response_data, 120)
         return response_data
         
     except HTTPException:
@@ -2586,18 +2729,34 @@ async def get_distribution_analysis(
     - Use median (D50) instead of mean for non-normal distributions
     - Per MISEV2018 guidelines: report median with D10/D90 for EV sizing
     """
+    from src.api.cache import distribution_cache, make_cache_key
+    
+    # Distribution analysis is expensive: cached for 2 minutes, and concurrent
+    # requests for the same analysis share one computation
+    cache_key = f"dist:{sample_id}:{make_cache_key(fsc_channel, wavelength_nm, n_particle, n_medium, include_overlays)}"
+    return await distribution_cache.get_or_compute_async(
+        cache_key,
+        lambda: _compute_distribution_analysis(
+            sample_id, fsc_channel, wavelength_nm, n_particle, n_medium, include_overlays, db
+        ),
+        ttl_seconds=120,
+    )
+
+
+async def _compute_distribution_analysis(
+    sample_id: str,
+    fsc_channel: Optional[str],
+    wavelength_nm: float,
+    n_particle: float,
+    n_medium: float,
+    include_overlays: bool,
+    db: AsyncSession,
+) -> dict:
+    """Analysis response of get_distribution_analysis (uncached)."""
     from src.physics.statistics_utils import comprehensive_distribution_analysis
     from src.physics.mie_scatter import MieScatterCalculator
     from src.parsers.fcs_parser import FCSParser
     from pathlib import Path
-    from src.api.cache import distribution_cache, make_cache_key
-    
-    # Check cache first — distribution analysis is expensive
-    cache_key = f"dist:{sample_id}:{make_cache_key(fsc_channel, wavelength_nm, n_particle, n_medium, include_overlays)}"
-    cached = distribution_cache.get(cache_key)
-    if cached is not None:
-        logger.debug(f"📊 Cache HIT for distribution analysis: {sample_id}")
-        return cached
     
     try:
         # Get sample from database
@@ -2626,8 +2785,8 @@ async def get_distribution_analysis(
                 detail=f"FCS file not found: {sample_fcs_path}"
             )
         
-        from src.utils.fcs_cache import get_cached_fcs_data
-        parsed_data, _channels = get_cached_fcs_data(sample_fcs_path)
+        from src.utils.fcs_cache import load_cached_fcs_data
+        parsed_data, _channels = await load_cached_fcs_data(sample_fcs_path)
         if parsed_data.empty:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -2648,9 +2807,8 @@ async def get_distribution_analysis(
             from src.physics.bead_calibration import get_fcmpass_calibration
             fcmpass_cal = get_fcmpass_calibration()
             if fcmpass_cal and fcmpass_cal.calibrated:
-                # Update EV RI if user specified different from calibration
-                if abs(fcmpass_cal.n_ev - n_particle) > 1e-6:
-                    fcmpass_cal.update_ev_ri(n_particle)
+                # Size with the requested EV RI (a copy: the calibrator is shared)
+                fcmpass_cal = fcmpass_cal.with_ev_ri(n_particle)
                 
                 # Auto-detect best scatter channel (prefer VSSC1-H for violet-calibrated)
                 cal_channel = None
@@ -2818,8 +2976,6 @@ async def get_distribution_analysis(
             f"recommended={analysis['conclusion']['recommended_distribution']}"
         )
         
-        # Cache for 2 minutes
-        distribution_cache.set(cache_key, analysis, 120)
         return analysis
         
     except HTTPException:
@@ -2887,13 +3043,13 @@ async def detect_anomalies(
             )
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.utils.channel_config import get_channel_config
         import numpy as np
         
         logger.info(f"🔍 Running anomaly detection for sample: {sample_id}")
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         channel_config = get_channel_config()
         
         fsc_ch = fsc_channel or channel_config.detect_fsc_channel(channels)
@@ -3052,10 +3208,10 @@ async def reanalyze_sample(
         logger.info(f"🔄 Re-analyzing sample {sample_id} with params: λ={request.wavelength_nm}nm, n_p={request.n_particle}, n_m={request.n_medium}")
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         import numpy as np
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         stats = {}  # Statistics computed inline when needed
         
         # Detect FSC and SSC channels
@@ -3081,13 +3237,18 @@ async def reanalyze_sample(
                     ssc_channel = ch
         
         # Get statistics for detected channels (computed inline since we use cached parser data)
-        def _channel_stats(df, col):
-            if col and col in df.columns:
-                s = df[col]
-                return {'mean': float(s.mean()), 'median': float(s.median()), 'std': float(s.std()), 'min': float(s.min()), 'max': float(s.max())}
-            return {}
-        fsc_stats = _channel_stats(parsed_data, fsc_channel)
-        ssc_stats = _channel_stats(parsed_data, ssc_channel)
+        from src.utils.channel_stats import dataframe_channel_statistics
+        scatter_stats = dataframe_channel_statistics(
+            parsed_data, [c for c in (fsc_channel, ssc_channel) if c], quantiles=()
+        )
+
+        def _channel_stats(col):
+            cs = scatter_stats.get(col) if col else None
+            if cs is None:
+                return {}
+            return {k: cs[k] for k in ('mean', 'median', 'std', 'min', 'max')}
+        fsc_stats = _channel_stats(fsc_channel)
+        ssc_stats = _channel_stats(ssc_channel)
         
         # Check for multi-solution Mie capability
         multi_solution_info = detect_multi_solution_channels(channels)
@@ -3115,9 +3276,8 @@ async def reanalyze_sample(
         
         if fcmpass_calibration and fcmpass_calibration.calibrated:
             try:
-                # If user requested a different EV RI, update the LUT
-                if abs(fcmpass_calibration.n_ev - request.n_particle) > 1e-6:
-                    fcmpass_calibration.update_ev_ri(request.n_particle)
+                # Size with the requested EV RI (a copy: the calibrator is shared)
+                fcmpass_calibration = fcmpass_calibration.with_ev_ri(request.n_particle)
                 logger.info(
                     f"🎯 Re-analyze using FCMPASS k-based sizing: "
                     f"k={fcmpass_calibration.k_instrument:.1f}, RI_ev={fcmpass_calibration.n_ev}"
@@ -3709,11 +3869,11 @@ async def get_available_channels(
                 detail=f"No FCS file associated with sample {sample_id}"
             )
         
-        from src.utils.fcs_cache import get_cached_fcs_data  # type: ignore[import-not-found]
+        from src.utils.fcs_cache import load_cached_fcs_data  # type: ignore[import-not-found]
         from src.utils.channel_config import get_channel_config  # type: ignore[import-not-found]
         import numpy as np
         
-        parsed_data, _channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, _channels = await load_cached_fcs_data(sample_fcs_path)
         
         config = get_channel_config()
         
@@ -4070,11 +4230,11 @@ async def get_fcs_values(
         logger.info(f"📊 Getting FCS values for {sample_id} with Mie params: λ={wavelength_nm}nm, n_p={n_particle}, n_m={n_medium}")
         
         # Parse FCS file (cached)
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.utils.channel_config import ChannelConfig
         import numpy as np
         
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         
         # Detect FSC channel
         config = ChannelConfig()
@@ -4243,11 +4403,11 @@ async def get_multi_solution_events(
         if not sample_fcs_path:
             raise HTTPException(status_code=404, detail=f"No FCS file associated with sample {sample_id}")
 
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.physics.mie_scatter import MultiSolutionMieCalculator
         from src.physics.bead_calibration import get_fcmpass_k_factor
 
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         multi_info = detect_multi_solution_channels(channels)
         if not multi_info["can_use_multi_solution"]:
             raise HTTPException(
@@ -4350,11 +4510,11 @@ async def get_multi_solution_event_details(
         if not sample_fcs_path:
             raise HTTPException(status_code=404, detail=f"No FCS file associated with sample {sample_id}")
 
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.physics.mie_scatter import MultiSolutionMieCalculator
         from src.physics.bead_calibration import get_fcmpass_k_factor
 
-        parsed_data, channels = get_cached_fcs_data(sample_fcs_path)
+        parsed_data, channels = await load_cached_fcs_data(sample_fcs_path)
         if event_id < 0 or event_id >= len(parsed_data):
             raise HTTPException(status_code=422, detail=f"event_id out of range: {event_id}")
 
@@ -4695,10 +4855,10 @@ async def cross_validate_fcs_nta(
         if not fcs_file_path:
             raise HTTPException(status_code=404, detail=f"No FCS file for sample '{fcs_sample_id}'")
         
-        from src.utils.fcs_cache import get_cached_fcs_data
+        from src.utils.fcs_cache import load_cached_fcs_data
         from src.utils.channel_config import ChannelConfig
         
-        fcs_data, fcs_channels = get_cached_fcs_data(fcs_file_path)
+        fcs_data, fcs_channels = await load_cached_fcs_data(fcs_file_path)
         
         config = ChannelConfig()
         fsc_channel = config.detect_fsc_channel(fcs_channels)
@@ -7,23 +7,31 @@ Endpoints for uploading and processing FCS, NTA, and TEM files.
 Endpoints:
 - POST /upload/fcs  - Upload and process FCS file
 - POST /upload/nta  - Upload and process NTA file
+- POST /upload/resumable  - Start a resumable (chunked) FCS/NTA upload
 - POST /upload/tem  - Upload and process TEM file (future)
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+import json
+import os
+import shutil
 from pathlib import Path
 from typing import Optional
-import shutil
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import numpy as np
 import pandas as pd
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, status, Header
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, status, Header, Request, Response
 from fastapi.responses import JSONResponse  # noqa: F401
+from pydantic import BaseModel, Field
+from starlette.requests import ClientDisconnect
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from loguru import logger
 
@@ -38,6 +46,7 @@ from src.database.crud import (
     create_fcs_result,
     create_nta_result,
     create_processing_job,
+    get_reusable_job,
     update_job_status,
     create_alert,
 )
@@ -46,9 +55,13 @@ from src.database.models import AlertType, AlertSeverity
 from src.parsers.fcs_parser import FCSParser
 from src.parsers.nta_parser import NTAParser
 from src.parsers.parquet_writer import ParquetWriter
+from src.utils.file_lock import InterProcessLock
+from src.utils.parquet_catalog import get_parquet_catalog
+from src.utils.sample_previews import build_fcs_preview, build_nta_preview, copy_previews, write_preview
+from src.utils.upload_stream import UPLOAD_CHUNK_SIZE, StoredUpload, stream_upload_to_disk
 from src.physics.mie_scatter import MieScatterCalculator, MultiSolutionMieCalculator
 # Import bead calibration for calibrated sizing (CAL-001, Feb 10, 2026)
-from src.physics.bead_calibration import get_active_calibration
+from src.physics.bead_calibration import get_active_calibration, get_calibration_fingerprint
 # Import size configuration for consistent filtering (TASK-002 fix, Dec 17, 2025)
 from src.physics.size_config import (
     DEFAULT_SIZE_CONFIG, 
@@ -497,9 +510,13 @@ async def generate_nta_alerts(
 # Helper Functions
 # ============================================================================
 
+# Bump when the FCS parse pipeline changes so stored results are not reused
+FCS_INGEST_VERSION = 1
+
+
 async def save_uploaded_file(upload_file: UploadFile, destination: Path) -> Path:
     """
-    Save uploaded file to disk.
+    Save uploaded file to disk (see stream_upload_to_disk()).
     
     Args:
         upload_file: FastAPI UploadFile object
@@ -511,34 +528,92 @@ async def save_uploaded_file(upload_file: UploadFile, destination: Path) -> Path
     Raises:
         HTTPException: If file size exceeds limit or save fails
     """
-    destination.parent.mkdir(parents=True, exist_ok=True)
+    return (await stream_upload_to_disk(upload_file, destination)).path
+
+
+def fcs_ingest_key(
+    content_sha256: str,
+    wavelength_nm: Optional[float] = None,
+    n_particle: Optional[float] = None,
+    n_medium: Optional[float] = None,
+) -> str:
+    """
+    Dedupe key for an FCS upload: the file content plus everything its parse
+    results depend on (Mie parameters, active calibration, pipeline version).
+    """
+    def number(value) -> Optional[float]:
+        # Internal callers (e.g. /batch) pass FastAPI Form() defaults through
+        return float(value) if isinstance(value, (int, float)) else None
     
+    parts = [
+        content_sha256,
+        number(wavelength_nm),
+        number(n_particle),
+        number(n_medium),
+        get_calibration_fingerprint(),
+        FCS_INGEST_VERSION,
+    ]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+async def find_reusable_fcs_ingest(db: AsyncSession, ingest_key: str) -> Optional[dict]:
+    """
+    Stored results of an earlier, identical FCS upload, if they can be reused.
+    
+    Returns:
+        Dict with the earlier job's ``fcs_results``, ``file_metadata``, the
+        stored ``file_path`` and ``parquet_path`` (None if gone), or None
+    """
     try:
-        # Check file size
-        upload_file.file.seek(0, 2)  # Seek to end
-        file_size = upload_file.file.tell()
-        upload_file.file.seek(0)  # Reset to start
-        
-        max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
-        if file_size > max_size_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size {file_size / 1024 / 1024:.1f}MB exceeds limit of {settings.max_upload_size_mb}MB"
-            )
-        
-        # Save file
-        with destination.open("wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-        
-        logger.info(f"✅ Saved uploaded file: {destination.name} ({file_size / 1024:.1f}KB)")
-        return destination
-        
+        job = await get_reusable_job(db, ingest_key, "fcs_parse")
     except Exception as e:
-        logger.error(f"❌ Failed to save file: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to save file: {str(e)}"
+        logger.warning(f"⚠️ Upload dedupe lookup failed: {e}")
+        return None
+    if job is None or job.sample is None or not job.sample.file_path_fcs:
+        return None
+    
+    file_path = Path(str(job.sample.file_path_fcs))
+    if not file_path.exists():
+        return None
+    
+    result_data = dict(job.result_data or {})
+    file_metadata = result_data.pop("file_metadata", None) or {}
+    parquet = result_data.get("parquet_file_path")
+    parquet_path = Path(parquet) if parquet and Path(parquet).exists() else None
+    if parquet and parquet_path is None:
+        result_data.pop("parquet_file_path", None)
+        result_data.pop("parquet_file", None)
+    return {
+        "fcs_results": result_data,
+        "file_metadata": file_metadata,
+        "file_path": file_path,
+        "parquet_path": parquet_path,
+        "sample_id": job.sample.sample_id,
+    }
+
+
+async def _register_in_catalog(parquet_path: Path) -> None:
+    """
+    Add a freshly written Parquet to the dataset catalog (best effort).
+    
+    Registering takes the cross-process catalog lock and rewrites the
+    manifest, so it runs on the default executor, not the event loop.
+    """
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: get_parquet_catalog().register(parquet_path)
         )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not catalog {parquet_path.name}: {e}")
+
+
+def _write_fcs_preview(sample_id: str, events, x_channel, y_channel, sizes, parameters: dict) -> None:
+    """Store the sample's FCS preview artifacts (best effort)."""
+    try:
+        preview, png = build_fcs_preview(events, x_channel, y_channel, sizes=sizes, parameters=parameters)
+        write_preview(sample_id, "fcs", preview, png)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write FCS preview for {sample_id}: {e}")
 
 
 def _merge_nta_notes(base_notes: Optional[str], extra_fields: dict[str, Optional[str]]) -> Optional[str]:
@@ -638,27 +713,109 @@ async def upload_fcs_file(
     """
     logger.info(f"📤 Uploading FCS file: {file.filename}")
     
+    # Validate file extension
+    filename = file.filename or ""
+    if not filename.lower().endswith('.fcs'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only .fcs files are accepted."
+        )
+    
+    # Save uploaded file
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stored = await stream_upload_to_disk(file, settings.upload_dir / f"{timestamp}_{filename}")
+    return await _ingest_fcs_upload(
+        stored,
+        filename,
+        timestamp,
+        treatment=treatment,
+        dye=dye,
+        concentration_ug=concentration_ug,
+        preparation_method=preparation_method,
+        operator=operator,
+        notes=notes,
+        user_id=user_id,
+        wavelength_nm=wavelength_nm,
+        n_particle=n_particle,
+        n_medium=n_medium,
+        db=db,
+    )
+
+
+async def _ingest_fcs_upload(
+    stored: StoredUpload,
+    filename: str,
+    timestamp: str,
+    treatment: Optional[str] = None,
+    dye: Optional[str] = None,
+    concentration_ug: Optional[float] = None,
+    preparation_method: Optional[str] = None,
+    operator: Optional[str] = None,
+    notes: Optional[str] = None,
+    user_id: Optional[int] = None,
+    wavelength_nm: Optional[float] = None,
+    n_particle: Optional[float] = None,
+    n_medium: Optional[float] = None,
+    *,
+    db: AsyncSession,
+) -> dict:
+    """
+    Parse an FCS file already saved to the upload directory and record it.
+    
+    Used by /upload/fcs after streaming the request body, and by resumable
+    finalize on the staged file moved into place.
+    
+    Args:
+        stored: The saved file with its size and SHA-256
+        filename: Original filename, used for the sample ID
+        timestamp: Prefix shared by the saved file and its Parquet
+    
+    Returns:
+        The /upload/fcs response
+    """
+    file_path = stored.path
     try:
-        # Validate file extension
-        filename = file.filename or ""
-        if not filename.lower().endswith('.fcs'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid file type. Only .fcs files are accepted."
-            )
-        
         # Generate sample ID
-        sample_id = generate_sample_id(file.filename or "unknown.fcs")
+        sample_id = generate_sample_id(filename or "unknown.fcs")
         
-        # Save uploaded file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_path = settings.upload_dir / f"{timestamp}_{file.filename}"
-        await save_uploaded_file(file, file_path)
+        ingest_key = fcs_ingest_key(stored.sha256, wavelength_nm, n_particle, n_medium)
+        reused = await find_reusable_fcs_ingest(db, ingest_key)
         
         # Parse FCS file using professional parser
         fcs_results = None
         fcs_parquet_path: Optional[Path] = None
         parser = None
+        extracted_metadata: dict = {}
+        if reused is not None:
+            # Same bytes already processed with the same parameters: keep the
+            # stored copy, its Parquet and its results instead of parsing again
+            file_path.unlink(missing_ok=True)
+            file_path = reused["file_path"]
+            fcs_results = reused["fcs_results"]
+            fcs_parquet_path = reused["parquet_path"]
+            extracted_metadata = reused["file_metadata"]
+            logger.info(f"♻️ Identical FCS upload ({stored.sha256[:12]}), reusing results from {file_path.name}")
+            if not copy_previews(reused["sample_id"], sample_id, "fcs"):
+                logger.debug(f"No stored preview for {reused['sample_id']}, it will be built on first request")
+            return await _record_fcs_upload(
+                sample_id,
+                stored,
+                file_path,
+                ingest_key,
+                fcs_results,
+                fcs_parquet_path,
+                extracted_metadata,
+                deduplicated=True,
+                treatment=treatment,
+                dye=dye,
+                concentration_ug=concentration_ug,
+                preparation_method=preparation_method,
+                operator=operator,
+                notes=notes,
+                user_id=user_id,
+                db=db,
+            )
+        
         try:
             logger.info(f"🔬 Parsing FCS file with professional parser...")
             parser = FCSParser(file_path)
@@ -688,13 +845,16 @@ async def upload_fcs_file(
                         metadata={
                             "sample_id": sample_id,
                             "sample_type": "fcs",
-                            "source_file": file.filename or "unknown.fcs",
+                            "source_file": filename or "unknown.fcs",
+                            "treatment": treatment if isinstance(treatment, str) else "",
                         },
                     )
                     logger.info(f"🧠 Wrote NanoFACS parquet: {fcs_parquet_path}")
                 except Exception as parquet_error:
                     logger.warning(f"⚠️ Could not write NanoFACS parquet for {sample_id}: {parquet_error}")
                     fcs_parquet_path = None  # file was never written; don't return a dead path
+                if fcs_parquet_path is not None:
+                    await _register_in_catalog(fcs_parquet_path)
                 
                 # Extract channel names and total events
                 event_count = stats.get('_summary', {}).get('total_events', len(parsed_data))
@@ -868,8 +1028,7 @@ async def upload_fcs_file(
                             _median_ssc = float(parsed_data[_fcmpass_channel].median())
                             if _median_ssc > 0:
                                 _fcmpass_ri = n_particle if n_particle is not None else 1.37
-                                if abs(_fcmpass_cal.n_ev - _fcmpass_ri) > 1e-6:
-                                    _fcmpass_cal.update_ev_ri(_fcmpass_ri)
+                                _fcmpass_cal = _fcmpass_cal.with_ev_ri(_fcmpass_ri)
                                 _d, _in_range = _fcmpass_cal.predict_batch(np.array([_median_ssc]))
                                 if not np.isnan(_d[0]) and _d[0] > 0:
                                     particle_size_median_nm = float(_d[0])
@@ -1212,11 +1371,93 @@ async def upload_fcs_file(
                 }
                 
                 logger.success(f"✅ Parsed {event_count} events with {len(channels)} channels")
+                _write_fcs_preview(
+                    sample_id, parsed_data, fsc_channel, ssc_channel, computed_sizes,
+                    {
+                        'wavelength_nm': mie_wl,
+                        'n_particle': mie_np,
+                        'n_medium': mie_nm,
+                        'sizing_method': size_statistics.get('method') if size_statistics else None,
+                        'sized_events': int(len(computed_sizes)) if computed_sizes is not None else 0,
+                    },
+                )
                 logger.success(f"📊 Statistics: FSC median={fsc_stats.get('median')}, SSC median={ssc_stats.get('median')}")
         except Exception as parse_error:
             logger.error(f"⚠️ Parser failed: {parse_error}", exc_info=True)
             fcs_results = None
         
+        # Extract file metadata for auto-filling experimental conditions
+        try:
+            if parser is not None:
+                extracted_metadata = parser.extract_metadata() or {}
+                logger.info(f"📋 Extracted metadata: operator={extracted_metadata.get('operator')}, "
+                           f"date={extracted_metadata.get('acquisition_date')}, "
+                           f"temp={extracted_metadata.get('temperature')}")
+        except Exception as meta_error:
+            logger.warning(f"⚠️ Could not extract metadata: {meta_error}")
+        
+        return await _record_fcs_upload(
+            sample_id,
+            stored,
+            file_path,
+            ingest_key,
+            fcs_results,
+            fcs_parquet_path,
+            extracted_metadata,
+            deduplicated=False,
+            treatment=treatment,
+            dye=dye,
+            concentration_ug=concentration_ug,
+            preparation_method=preparation_method,
+            operator=operator,
+            notes=notes,
+            user_id=user_id,
+            db=db,
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ Failed to upload FCS file: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process upload: {str(e)}"
+        )
+
+
+async def _record_fcs_upload(
+    sample_id: str,
+    stored: StoredUpload,
+    file_path: Path,
+    ingest_key: str,
+    fcs_results: Optional[dict],
+    fcs_parquet_path: Optional[Path],
+    extracted_metadata: dict,
+    deduplicated: bool = False,
+    treatment: Optional[str] = None,
+    dye: Optional[str] = None,
+    concentration_ug: Optional[float] = None,
+    preparation_method: Optional[str] = None,
+    operator: Optional[str] = None,
+    notes: Optional[str] = None,
+    user_id: Optional[int] = None,
+    *,
+    db: AsyncSession,
+) -> dict:
+    """
+    Save a parsed (or reused) FCS ingest to the database and build the response.
+    
+    Args:
+        sample_id: Sample ID derived from the filename
+        stored: The uploaded file with its size and SHA-256
+        file_path: Stored FCS file (the earlier copy when deduplicated)
+        ingest_key: fcs_ingest_key() of the upload, kept on the job
+        deduplicated: Whether the results were reused from an earlier ingest
+    
+    Returns:
+        The /upload/fcs response
+    """
+    try:
         # Create sample record in database
         db_sample = None
         db_job = None
@@ -1289,6 +1530,7 @@ async def upload_fcs_file(
                     job_id=job_id,
                     job_type="fcs_parse",
                     sample_id=db_sample.id,  # type: ignore[arg-type]
+                    input_hash=ingest_key,
                 )
                 logger.info(f"📋 Created processing job: {job_id}")
                 
@@ -1307,12 +1549,16 @@ async def upload_fcs_file(
                         cd81_positive_pct=fcs_results.get('cd81_positive_pct'),
                         parquet_file_path=_serialize_file_path(fcs_parquet_path) if fcs_parquet_path else None,
                     )
-                    # Mark job as completed
+                    # Mark job as completed (with what a re-upload needs to reuse it)
                     await update_job_status(
                         db=db,
                         job_id=job_id,
                         status="completed",
-                        result_data=fcs_results,
+                        result_data={
+                            **fcs_results,
+                            "parquet_file_path": _serialize_file_path(fcs_parquet_path) if fcs_parquet_path else None,
+                            "file_metadata": json.loads(json.dumps(extracted_metadata, default=str)),
+                        },
                     )
                     logger.success(f"💾 Saved FCS results to database")
                     
@@ -1342,17 +1588,6 @@ async def upload_fcs_file(
         
         logger.success(f"✅ FCS file uploaded: {sample_id} (job: {job_id})")
         
-        # Extract file metadata for auto-filling experimental conditions
-        extracted_metadata: dict = {}
-        try:
-            if parser is not None:
-                extracted_metadata = parser.extract_metadata() or {}
-                logger.info(f"📋 Extracted metadata: operator={extracted_metadata.get('operator')}, "
-                           f"date={extracted_metadata.get('acquisition_date')}, "
-                           f"temp={extracted_metadata.get('temperature')}")
-        except Exception as meta_error:
-            logger.warning(f"⚠️ Could not extract metadata: {meta_error}")
-        
         # Build response with parsed results
         response_data = {
             "success": True,
@@ -1369,6 +1604,8 @@ async def upload_fcs_file(
             "processing_status": "completed" if fcs_results else "pending",
             "message": "File uploaded successfully, processing started",
             "file_size_mb": file_path.stat().st_size / 1024 / 1024,
+            "content_sha256": stored.sha256,
+            "deduplicated": deduplicated,
             "upload_timestamp": datetime.now().isoformat(),
         }
         
@@ -1463,17 +1700,68 @@ async def upload_nta_file(
     """
     logger.info(f"📤 Uploading NTA file: {file.filename}")
     
+    # Validate file extension
+    filename = file.filename or ""
+    if not (filename.lower().endswith('.txt') or filename.lower().endswith('.csv')):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only .txt and .csv files are accepted."
+        )
+    
+    # Save uploaded file
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    file_path = await save_uploaded_file(file, settings.upload_dir / f"{timestamp}_{filename}")
+    return await _ingest_nta_upload(
+        file_path,
+        filename,
+        timestamp,
+        treatment=treatment,
+        marker=marker,
+        dye=dye,
+        marker_concentration=marker_concentration,
+        marker_concentration_unit=marker_concentration_unit,
+        preparation_method=preparation_method,
+        temperature_celsius=temperature_celsius,
+        operator=operator,
+        notes=notes,
+        user_id=user_id,
+        db=db,
+    )
+
+
+async def _ingest_nta_upload(
+    file_path: Path,
+    filename: str,
+    timestamp: str,
+    treatment: Optional[str] = None,
+    marker: Optional[str] = None,
+    dye: Optional[str] = None,
+    marker_concentration: Optional[float] = None,
+    marker_concentration_unit: Optional[str] = None,
+    preparation_method: Optional[str] = None,
+    temperature_celsius: Optional[float] = None,
+    operator: Optional[str] = None,
+    notes: Optional[str] = None,
+    user_id: Optional[int] = None,
+    *,
+    db: AsyncSession,
+) -> dict:
+    """
+    Parse an NTA file already saved to the upload directory and record it.
+    
+    Used by /upload/nta and by resumable finalize (see _ingest_fcs_upload()).
+    
+    Args:
+        file_path: The saved file
+        filename: Original filename, used for the sample ID
+        timestamp: Prefix shared by the saved file and its Parquet
+    
+    Returns:
+        The /upload/nta response
+    """
     try:
-        # Validate file extension
-        filename = file.filename or ""
-        if not (filename.lower().endswith('.txt') or filename.lower().endswith('.csv')):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid file type. Only .txt and .csv files are accepted."
-            )
-        
         # Generate sample ID
-        sample_id = generate_sample_id(file.filename or "unknown.txt")
+        sample_id = generate_sample_id(filename or "unknown.txt")
 
         # Backward compatibility: marker is the primary field, treatment is fallback alias.
         resolved_marker = (marker or treatment or "").strip() or None
@@ -1491,11 +1779,6 @@ async def upload_nta_file(
             },
         )
         
-        # Save uploaded file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_path = settings.upload_dir / f"{timestamp}_{file.filename}"
-        await save_uploaded_file(file, file_path)
-        
         # Parse NTA file using professional parser
         nta_results = None
         nta_parquet_path: Optional[Path] = None
@@ -1519,11 +1802,13 @@ async def upload_nta_file(
                     nta_parquet_path,
                     metadata={
                         "sample_id": sample_id,
-                        "source_file": file.filename or "",
+                        "source_file": filename or "",
                         "instrument_type": "nta",
                         "created_at": datetime.now().isoformat(),
+                        "treatment": resolved_marker or "",
                     },
                 )
+                await _register_in_catalog(nta_parquet_path)
                 parquet_data, _ = ParquetWriter.read_with_metadata(nta_parquet_path)
 
                 # Calculate statistics from parsed data
@@ -1709,6 +1994,10 @@ async def upload_nta_file(
                             "parquet_file_path": _serialize_file_path(nta_parquet_path),
                         }
                         logger.success(f"✅ Parsed NTA data: {int(total_particle_count)} particles, median={d50:.1f}nm")
+                        try:
+                            write_preview(sample_id, "nta", build_nta_preview(parquet_data, sizes_sorted, counts_sorted))
+                        except Exception as preview_error:
+                            logger.warning(f"⚠️ Could not write NTA preview for {sample_id}: {preview_error}")
         except Exception as parse_error:
             logger.error(f"⚠️ NTA Parser failed: {parse_error}, continuing with upload...")
             nta_results = None
@@ -2096,3 +2385,414 @@ async def upload_batch(
     logger.info(f"✅ Batch upload complete: {results['uploaded']} succeeded, {results['failed']} failed")
     
     return results
+
+
+# ============================================================================
+# Resumable Upload Endpoints
+# ============================================================================
+#
+# tus-style protocol for large FCS/NTA files:
+#   1. POST   /upload/resumable                  -> upload_id (offset 0)
+#   2. PATCH  /upload/resumable/{id}             -> append bytes at Upload-Offset
+#   3. HEAD   /upload/resumable/{id}             -> current Upload-Offset (resume)
+#   4. POST   /upload/resumable/{id}/finalize    -> process like /upload/fcs or /upload/nta
+#
+# Staged bytes and the create request live on disk under the upload dir, so
+# an upload survives dropped connections and server restarts. A batch is one
+# resumable upload per file. Requests that change an upload hold its lock
+# file (.resumable/<id>.lock), which also serializes them across worker
+# processes.
+
+RESUMABLE_EXTENSIONS = {"fcs": (".fcs",), "nta": (".txt", ".csv")}
+
+# Staged uploads with no activity for this long are removed on the next create
+RESUMABLE_UPLOAD_TTL_HOURS = 24
+
+_resumable_locks: dict[str, asyncio.Lock] = {}
+
+
+class ResumableUploadCreate(BaseModel):
+    """Create request; the metadata fields match /upload/fcs and /upload/nta."""
+    filename: str = Field(..., description="Original file name (.fcs, .txt or .csv)")
+    size_bytes: int = Field(..., gt=0, description="Total file size in bytes")
+    sha256: Optional[str] = Field(None, description="Hex SHA-256 of the whole file, verified on finalize")
+    treatment: Optional[str] = None
+    dye: Optional[str] = None
+    concentration_ug: Optional[float] = None
+    preparation_method: Optional[str] = None
+    operator: Optional[str] = None
+    notes: Optional[str] = None
+    user_id: Optional[int] = None
+    wavelength_nm: Optional[float] = None
+    n_particle: Optional[float] = None
+    n_medium: Optional[float] = None
+    marker: Optional[str] = None
+    marker_concentration: Optional[float] = None
+    marker_concentration_unit: Optional[str] = None
+    temperature_celsius: Optional[float] = None
+
+
+def _resumable_root() -> Path:
+    return settings.upload_dir / ".resumable"
+
+
+def _load_resumable_upload(upload_id: str, current_user: dict | None) -> tuple[Path, dict]:
+    """
+    Staging directory and stored create request of a resumable upload.
+    
+    An upload started by a signed-in user is only visible to that user;
+    one started without a token stays open to unauthenticated clients
+    (desktop mode).
+    
+    Raises:
+        HTTPException: 404 if the upload does not exist (or has expired),
+            403 if it belongs to another user
+    """
+    try:
+        upload_id = uuid.UUID(upload_id).hex
+    except ValueError:
+        upload_id = ""
+    staging_dir = _resumable_root() / upload_id
+    info_path = staging_dir / "upload.json"
+    if not upload_id or not info_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resumable upload not found or expired"
+        )
+    info = json.loads(info_path.read_text())
+    owner = info.get("owner")
+    if owner is not None and (current_user is None or str(current_user.get("sub")) != owner):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This upload belongs to another user"
+        )
+    return staging_dir, info
+
+
+@asynccontextmanager
+async def _resumable_lock(staging_dir: Path):
+    """
+    Exclusive access to one staged upload, within this process and across
+    workers.
+    
+    Raises:
+        HTTPException: 404 if the upload was finalized or cancelled while waiting
+    """
+    async with _resumable_locks.setdefault(staging_dir.name, asyncio.Lock()):
+        async with InterProcessLock(staging_dir.with_name(f"{staging_dir.name}.lock")):
+            if not (staging_dir / "upload.json").exists():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Resumable upload not found or expired"
+                )
+            yield
+
+
+def _drop_resumable_upload(staging_dir: Path) -> None:
+    """Delete a staged upload (caller holds its lock)."""
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    try:
+        staging_dir.with_name(f"{staging_dir.name}.lock").unlink(missing_ok=True)
+    except OSError:
+        pass  # still open elsewhere (Windows); purged with stale uploads
+
+
+def _resumable_status(staging_dir: Path, info: dict) -> dict:
+    data_path = staging_dir / "data.part"
+    offset = data_path.stat().st_size if data_path.exists() else 0
+    last_activity = datetime.fromtimestamp((data_path if data_path.exists() else staging_dir).stat().st_mtime)
+    return {
+        "upload_id": staging_dir.name,
+        "filename": info["filename"],
+        "file_type": info["file_type"],
+        "offset": offset,
+        "size_bytes": info["size_bytes"],
+        "complete": offset == info["size_bytes"],
+        "expires_at": (last_activity + timedelta(hours=RESUMABLE_UPLOAD_TTL_HOURS)).isoformat(),
+    }
+
+
+def _offset_headers(upload_status: dict) -> dict[str, str]:
+    return {
+        "Upload-Offset": str(upload_status["offset"]),
+        "Upload-Length": str(upload_status["size_bytes"]),
+        "Cache-Control": "no-store",
+    }
+
+
+def _purge_stale_resumable_uploads() -> None:
+    """Remove staged uploads that have seen no activity within the TTL."""
+    root = _resumable_root()
+    if not root.exists():
+        return
+    cutoff = datetime.now().timestamp() - RESUMABLE_UPLOAD_TTL_HOURS * 3600
+    for staging_dir in root.iterdir():
+        data_path = staging_dir / "data.part"
+        try:
+            if not staging_dir.is_dir():
+                # Lock file of an upload that no longer exists
+                if staging_dir.suffix == ".lock" and not staging_dir.with_suffix("").exists():
+                    if staging_dir.stat().st_mtime < cutoff:
+                        staging_dir.unlink(missing_ok=True)
+                continue
+            last_activity = (data_path if data_path.exists() else staging_dir).stat().st_mtime
+            if last_activity < cutoff:
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                _resumable_locks.pop(staging_dir.name, None)
+                logger.info(f"🧹 Removed expired resumable upload: {staging_dir.name}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not check resumable upload {staging_dir.name}: {e}")
+
+
+@router.post("/resumable", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    request: ResumableUploadCreate,
+    response: Response,
+    current_user: dict | None = Depends(optional_auth),
+):
+    """
+    Start a resumable upload of an FCS or NTA file.
+    
+    The file is then sent with one or more PATCH requests (raw bytes, with an
+    ``Upload-Offset`` header) and processed by ``POST .../finalize``. After a
+    dropped connection, ``HEAD`` (or ``GET``) returns the offset to resume at.
+    
+    **Response:**
+    ```json
+    {
+        "upload_id": "3f2a...",
+        "offset": 0,
+        "size_bytes": 524288000,
+        "chunk_size": 8388608,
+        "expires_at": "2026-10-19T12:00:00"
+    }
+    ```
+    """
+    filename = Path(request.filename).name
+    file_type = next(
+        (kind for kind, extensions in RESUMABLE_EXTENSIONS.items() if filename.lower().endswith(extensions)),
+        None,
+    )
+    if file_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file type. Only .fcs, .txt and .csv files are accepted."
+        )
+    if request.size_bytes > settings.max_upload_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the upload limit of {settings.max_upload_size_mb}MB"
+        )
+    
+    await asyncio.get_running_loop().run_in_executor(None, _purge_stale_resumable_uploads)
+    
+    upload_id = uuid.uuid4().hex
+    staging_dir = _resumable_root() / upload_id
+    staging_dir.mkdir(parents=True)
+    info = {
+        **request.model_dump(),
+        "filename": filename,
+        "file_type": file_type,
+        "owner": str(current_user["sub"]) if current_user else None,
+        "created_at": datetime.now().isoformat(),
+    }
+    (staging_dir / "upload.json").write_text(json.dumps(info))
+    (staging_dir / "data.part").touch()
+    
+    logger.info(f"📤 Resumable {file_type.upper()} upload started: {filename} ({request.size_bytes / 1024 / 1024:.1f}MB, {upload_id})")
+    
+    upload_status = _resumable_status(staging_dir, info)
+    response.headers.update(_offset_headers(upload_status))
+    response.headers["Location"] = f"{settings.api_prefix}/upload/resumable/{upload_id}"
+    return {**upload_status, "chunk_size": 8 * UPLOAD_CHUNK_SIZE}
+
+
+@router.head("/resumable/{upload_id}")
+async def get_resumable_upload_offset(
+    upload_id: str,
+    current_user: dict | None = Depends(optional_auth),
+):
+    """tus-style offset probe: the ``Upload-Offset`` header is where to resume."""
+    staging_dir, info = _load_resumable_upload(upload_id, current_user)
+    return Response(status_code=status.HTTP_200_OK, headers=_offset_headers(_resumable_status(staging_dir, info)))
+
+
+@router.get("/resumable/{upload_id}", response_model=dict)
+async def get_resumable_upload(
+    upload_id: str,
+    response: Response,
+    current_user: dict | None = Depends(optional_auth),
+):
+    """Status of a resumable upload (offset, size, expiry)."""
+    staging_dir, info = _load_resumable_upload(upload_id, current_user)
+    upload_status = _resumable_status(staging_dir, info)
+    response.headers.update(_offset_headers(upload_status))
+    return upload_status
+
+
+@router.patch("/resumable/{upload_id}", response_model=dict)
+async def append_resumable_upload(
+    upload_id: str,
+    http_request: Request,
+    response: Response,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    current_user: dict | None = Depends(optional_auth),
+):
+    """
+    Append a chunk to a resumable upload.
+    
+    **Request:** the raw chunk bytes as the body, with ``Upload-Offset`` set
+    to the current offset. A mismatched offset returns 409 with the offset to
+    resume from. If the connection drops mid-chunk, every byte that arrived
+    is kept, so the client only re-sends from the new offset.
+    """
+    staging_dir, info = _load_resumable_upload(upload_id, current_user)
+    data_path = staging_dir / "data.part"
+    size_bytes = info["size_bytes"]
+    loop = asyncio.get_running_loop()
+    
+    async with _resumable_lock(staging_dir):
+        offset = data_path.stat().st_size
+        if upload_offset != offset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Upload-Offset does not match the upload", "offset": offset}
+            )
+        
+        buffer = bytearray()
+        
+        def flush(out) -> None:
+            out.write(buffer)
+            out.flush()
+        
+        out = await loop.run_in_executor(None, data_path.open, "ab")
+        try:
+            async for chunk in http_request.stream():
+                if offset + len(buffer) + len(chunk) > size_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Chunk runs past the declared upload size of {size_bytes} bytes"
+                    )
+                buffer.extend(chunk)
+                if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                    await loop.run_in_executor(None, flush, out)
+                    offset += len(buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            logger.warning(f"⚠️ Resumable upload {staging_dir.name} interrupted at {offset + len(buffer)} bytes")
+        finally:
+            # Bytes that arrived are kept even if the chunk was cut short
+            if buffer:
+                await loop.run_in_executor(None, flush, out)
+            await loop.run_in_executor(None, out.close)
+    
+    upload_status = _resumable_status(staging_dir, info)
+    response.headers.update(_offset_headers(upload_status))
+    return upload_status
+
+
+@router.post("/resumable/{upload_id}/finalize", response_model=dict)
+async def finalize_resumable_upload(
+    upload_id: str,
+    current_user: dict | None = Depends(optional_auth),
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Process a fully-sent resumable upload.
+    
+    Runs the same pipeline (and returns the same response) as /upload/fcs or
+    /upload/nta. The staged bytes are kept if processing fails, so finalize
+    can be retried without re-sending the file.
+    """
+    staging_dir, info = _load_resumable_upload(upload_id, current_user)
+    data_path = staging_dir / "data.part"
+    loop = asyncio.get_running_loop()
+    
+    async with _resumable_lock(staging_dir):
+        upload_status = _resumable_status(staging_dir, info)
+        if not upload_status["complete"]:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={"message": "Upload is incomplete", "offset": upload_status["offset"]}
+            )
+        
+        def file_sha256() -> str:
+            digest = hashlib.sha256()
+            with data_path.open("rb") as f:
+                while chunk := f.read(8 * UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        
+        sha256 = await loop.run_in_executor(None, file_sha256)
+        if info.get("sha256") and sha256 != info["sha256"].lower():
+            _drop_resumable_upload(staging_dir)
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Checksum mismatch: the uploaded file does not match the declared sha256"
+            )
+        
+        logger.info(f"🔬 Finalizing resumable upload {staging_dir.name}: {info['filename']}")
+        # Move the staged bytes into place instead of copying them; moved back
+        # below if processing fails so finalize can be retried
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = settings.upload_dir / f"{timestamp}_{info['filename']}"
+        settings.upload_dir.mkdir(parents=True, exist_ok=True)
+        await loop.run_in_executor(None, os.replace, data_path, file_path)
+        try:
+            if info["file_type"] == "fcs":
+                result = await _ingest_fcs_upload(
+                    StoredUpload(path=file_path, size_bytes=info["size_bytes"], sha256=sha256),
+                    info["filename"],
+                    timestamp,
+                    treatment=info.get("treatment"),
+                    dye=info.get("dye"),
+                    concentration_ug=info.get("concentration_ug"),
+                    preparation_method=info.get("preparation_method"),
+                    operator=info.get("operator"),
+                    notes=info.get("notes"),
+                    user_id=info.get("user_id"),
+                    wavelength_nm=info.get("wavelength_nm"),
+                    n_particle=info.get("n_particle"),
+                    n_medium=info.get("n_medium"),
+                    db=db,
+                )
+            else:
+                result = await _ingest_nta_upload(
+                    file_path,
+                    info["filename"],
+                    timestamp,
+                    treatment=info.get("treatment"),
+                    marker=info.get("marker"),
+                    dye=info.get("dye"),
+                    marker_concentration=info.get("marker_concentration"),
+                    marker_concentration_unit=info.get("marker_concentration_unit"),
+                    preparation_method=info.get("preparation_method"),
+                    temperature_celsius=info.get("temperature_celsius"),
+                    operator=info.get("operator"),
+                    notes=info.get("notes"),
+                    user_id=info.get("user_id"),
+                    db=db,
+                )
+        except BaseException:
+            if file_path.exists():
+                await loop.run_in_executor(None, os.replace, file_path, data_path)
+            raise
+        
+        _drop_resumable_upload(staging_dir)
+    _resumable_locks.pop(staging_dir.name, None)
+    
+    return {**result, "upload_id": staging_dir.name}
+
+
+@router.delete("/resumable/{upload_id}", response_model=dict)
+async def cancel_resumable_upload(
+    upload_id: str,
+    current_user: dict | None = Depends(optional_auth),
+):
+    """Abort a resumable upload and discard its staged bytes."""
+    staging_dir, _ = _load_resumable_upload(upload_id, current_user)
+    async with _resumable_lock(staging_dir):
+        _drop_resumable_upload(staging_dir)
+    _resumable_locks.pop(staging_dir.name, None)
+    logger.info(f"🗑️ Resumable upload cancelled: {staging_dir.name}")
+    return {"success": True, "upload_id": staging_dir.name}
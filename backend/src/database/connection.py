@@ -9,19 +9,24 @@ Provides:
 - Session factory
 - Dependency injection for FastAPI
 - Connection pool management
+- SQLite profile: WAL + tuned pragmas, persistent pools, read/write split
 
 Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
 from typing import AsyncGenerator
+from sqlalchemy import event  # type: ignore[import-not-found]
 from sqlalchemy.ext.asyncio import (  # type: ignore[import-not-found]
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
     AsyncEngine
 )
-from sqlalchemy.pool import NullPool, QueuePool  # type: ignore[import-not-found]
+from sqlalchemy.orm import Session  # type: ignore[import-not-found]
+from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool  # type: ignore[import-not-found]
+from sqlalchemy.sql.dml import UpdateBase  # type: ignore[import-not-found]
+from sqlalchemy.sql.elements import TextClause  # type: ignore[import-not-found]
 from loguru import logger
 
 from src.api.config import get_settings
@@ -32,49 +37,168 @@ settings = get_settings()
 # Database Engine
 # ============================================================================
 
-# Global engine instance (created on first use)
+# Global engine instances (created on first use). For SQLite, _engine is the
+# single-connection writer and _read_engine the reader pool; for other
+# databases _read_engine stays None and _engine serves everything.
 _engine: AsyncEngine | None = None
+_read_engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
 
 
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return ":memory:" in url or url.rstrip("/").endswith("sqlite+aiosqlite:")
+
+
+def _install_sqlite_pragmas(engine: AsyncEngine) -> None:
+    """
+    Set per-connection pragmas when the pool opens a connection.
+
+    - journal_mode=WAL      readers never block the writer and vice versa
+    - synchronous=NORMAL    fsync at checkpoints only; safe with WAL
+    - busy_timeout          wait for locks instead of failing immediately
+    - mmap_size / cache     serve hot pages (sample list, jobs, alerts)
+                            from memory
+    - temp_store=MEMORY     sorts and temp indexes without temp files
+    """
+    mmap_bytes = int(settings.sqlite_mmap_mb) * 1024 * 1024
+    cache_kib = int(settings.sqlite_cache_mb) * 1024
+    busy_ms = int(settings.sqlite_busy_timeout_s * 1000)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={busy_ms}")
+        cursor.execute(f"PRAGMA mmap_size={mmap_bytes}")
+        cursor.execute(f"PRAGMA cache_size=-{cache_kib}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+def create_sqlite_engine(url: str, pool_size: int, max_overflow: int = 0) -> AsyncEngine:
+    """
+    Async SQLite engine with a persistent connection pool and tuned pragmas.
+
+    Connections (and the prepared statements sqlite3 caches on each of them)
+    survive across requests instead of being reopened per session.
+    """
+    engine = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=max(settings.sqlite_busy_timeout_s, 1.0),
+        connect_args={
+            "timeout": settings.sqlite_busy_timeout_s,
+            "cached_statements": 256,
+        },
+    )
+    _install_sqlite_pragmas(engine)
+    return engine
+
+
 def get_engine() -> AsyncEngine:
     """
     Get or create the async database engine.
     
     Returns:
-        AsyncEngine instance
+        AsyncEngine instance (for SQLite: the writer engine, also used for
+        DDL in init_database)
     
     Configuration:
-    - Pool size: Configurable via settings
+    - SQLite: persistent pools with WAL pragmas (see create_sqlite_engine);
+      with settings.sqlite_read_write_split the writer is a single pooled
+      connection, so writes are serialized in-process and readers use
+      get_read_engine()
+    - Other databases: NullPool
     - Echo SQL: Controlled by settings.db_echo
-    - Connection recycling: 3600 seconds (1 hour)
     
     Usage:
         from src.database.connection import get_engine
         engine = get_engine()
     """
-    global _engine
+    global _engine, _read_engine
     
     if _engine is None:
+        url = settings.database_url
         logger.info("🔌 Creating database engine...")
-        logger.info(f"   Database URL: {settings.database_url.split('@')[-1]}")  # Hide credentials
-        
-        # Use NullPool for async engines (required for asyncpg)
-        poolclass = NullPool
-        logger.info("   Pool: NullPool (async engine)")
+        logger.info(f"   Database URL: {url.split('@')[-1]}")  # Hide credentials
         
-        _engine = create_async_engine(
-            settings.database_url,
-            echo=settings.db_echo,
-            poolclass=poolclass,
-            pool_pre_ping=True,  # Verify connections before using
-        )
+        if is_sqlite_url(url) and not _is_memory_sqlite(url):
+            if settings.sqlite_read_write_split:
+                _engine = create_sqlite_engine(url, pool_size=1)
+                _read_engine = create_sqlite_engine(
+                    url,
+                    pool_size=settings.db_pool_size,
+                    max_overflow=settings.db_max_overflow,
+                )
+                logger.info(
+                    f"   Pool: SQLite WAL, 1 writer + {settings.db_pool_size} readers"
+                )
+            else:
+                _engine = create_sqlite_engine(
+                    url,
+                    pool_size=settings.db_pool_size,
+                    max_overflow=settings.db_max_overflow,
+                )
+                logger.info(f"   Pool: SQLite WAL, {settings.db_pool_size} connections")
+        else:
+            # Use NullPool for async engines (required for asyncpg)
+            logger.info("   Pool: NullPool (async engine)")
+            _engine = create_async_engine(
+                url,
+                echo=settings.db_echo,
+                poolclass=NullPool,
+                pool_pre_ping=True,  # Verify connections before using
+            )
         
         logger.success("✅ Database engine created")
     
     return _engine
 
 
+def get_read_engine() -> AsyncEngine:
+    """Engine for read-only work: the SQLite reader pool, else get_engine()."""
+    engine = get_engine()
+    return _read_engine or engine
+
+
+_WRITE_VERBS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "ALTER", "DROP")
+
+
+def _is_write(clause) -> bool:  # type: ignore[no-untyped-def]
+    if isinstance(clause, UpdateBase):
+        return True
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip().upper().startswith(_WRITE_VERBS)
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Session that reads through the reader pool until it first writes.
+
+    The first flush or INSERT/UPDATE/DELETE moves the session to the writer
+    engine for the rest of its life, so it always reads its own writes.
+    Without a read/write split this behaves like a plain Session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):  # type: ignore[no-untyped-def, override]
+        if _read_engine is None or _engine is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if not self.info.get("uses_writer") and (self._flushing or _is_write(clause)):
+            self.info["uses_writer"] = True
+        if self.info.get("uses_writer"):
+            return _engine.sync_engine
+        return _read_engine.sync_engine
+
+
 def get_session_factory() -> async_sessionmaker[AsyncSession]:
     """
     Get or create the async session factory.
@@ -96,6 +220,7 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
         _session_factory = async_sessionmaker(
             engine,
             class_=AsyncSession,
+            sync_session_class=RoutingSession,
             expire_on_commit=False,  # Don't expire objects after commit
             autoflush=False,  # Manual flushing for better control
             autocommit=False,  # Explicit transaction management
@@ -151,12 +276,15 @@ async def close_connections():
         async def shutdown():
             await close_connections()
     """
-    global _engine, _session_factory
+    global _engine, _read_engine, _session_factory
     
     if _engine is not None:
         logger.info("🔌 Closing database connections...")
+        if _read_engine is not None:
+            await _read_engine.dispose()
         await _engine.dispose()
         _engine = None
+        _read_engine = None
         _session_factory = None
         logger.success("✅ Database connections closed")
 
@@ -15,12 +15,16 @@ Author: CRMIT Backend Team
 Date: November 21, 2025
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
 from sqlalchemy import select, func, delete  # type: ignore[import-not-found]
+from sqlalchemy.orm import selectinload  # type: ignore[import-not-found]
 from loguru import logger
 
+from src.database.pagination import apply_keyset, cached_count, invalidate_counts  # type: ignore[import-not-found]
+
 from src.database.models import (  # type: ignore[import-not-found]
     Sample,
     FCSResult,
@@ -98,6 +102,7 @@ async def create_sample(
         db.add(sample)
         await db.commit()
         await db.refresh(sample)
+        invalidate_counts("samples")
         
         logger.success(f"✅ Created sample: {sample_id} (DB ID: {sample.id})")  # type: ignore[attr-defined]
         return sample
@@ -163,6 +168,69 @@ async def get_samples(
     return list(result.scalars().all())
 
 
+@dataclass
+class SampleDetail:
+    """A sample together with its most recent FCS and NTA results."""
+    sample: Sample
+    fcs: Optional[FCSResult] = None
+    nta: Optional[NTAResult] = None
+
+
+def _latest_result(results):
+    """Most recently processed result of a relationship list, or None."""
+    if not results:
+        return None
+    return max(results, key=lambda r: (r.processed_at or datetime.min, r.id or 0))
+
+
+def _forget_sample_details(db: AsyncSession) -> None:
+    """Drop the session's get_sample_details() memo after a write."""
+    db.info.pop("sample_details", None)
+
+
+async def get_sample_details(
+    db: AsyncSession,
+    sample_ids: Iterable[str],
+) -> Dict[str, SampleDetail]:
+    """
+    Load many samples with their latest FCS/NTA results in a fixed number of
+    queries: one IN query for the samples and one per result table (eager
+    selectin loading), instead of two or three queries per sample.
+    
+    Results are memoized on the session, which lives for a single request,
+    so later lookups of the same IDs within the request (e.g. per-sample
+    helpers called in a loop after a bulk prefetch) do not query again.
+    
+    Args:
+        db: Database session
+        sample_ids: Sample identifiers (duplicates are fine)
+        
+    Returns:
+        {sample_id: SampleDetail} for the IDs that exist
+    """
+    memo: Dict[str, Optional[SampleDetail]] = db.info.setdefault("sample_details", {})
+    ids = list(dict.fromkeys(sample_ids))
+    missing = [sid for sid in ids if sid not in memo]
+    
+    if missing:
+        query = (
+            select(Sample)
+            .where(Sample.sample_id.in_(missing))
+            .options(selectinload(Sample.fcs_results), selectinload(Sample.nta_results))
+        )
+        for sample in (await db.execute(query)).scalars():
+            memo[str(sample.sample_id)] = SampleDetail(
+                sample=sample,
+                fcs=_latest_result(sample.fcs_results),
+                nta=_latest_result(sample.nta_results),
+            )
+        # Remember misses too, so unknown IDs are not looked up again
+        for sid in missing:
+            memo.setdefault(sid, None)
+    
+    return {sid: detail for sid in ids if (detail := memo[sid]) is not None}
+
+
 async def update_sample(
     db: AsyncSession,
     sample_id: str,
@@ -192,6 +260,8 @@ async def update_sample(
         
         await db.commit()
         await db.refresh(sample)
+        invalidate_counts("samples")
+        _forget_sample_details(db)
         
         logger.info(f"📝 Updated sample: {sample_id}")
         return sample
@@ -228,6 +298,9 @@ async def delete_sample(db: AsyncSession, sample_id: str) -> bool:
         
         await db.delete(sample)
         await db.commit()
+        invalidate_counts("samples")
+        _forget_sample_details(db)
+        invalidate_counts("jobs")
         
         logger.warning(f"🗑️ Deleted sample: {sample_id}")
         return True
@@ -264,6 +337,7 @@ async def create_fcs_result(
         db.add(fcs_result)
         await db.commit()
         await db.refresh(fcs_result)
+        _forget_sample_details(db)
         
         logger.success(f"✅ Created FCS result for sample ID {sample_id}")
         return fcs_result
@@ -300,6 +374,7 @@ async def create_nta_result(
         db.add(nta_result)
         await db.commit()
         await db.refresh(nta_result)
+        _forget_sample_details(db)
         
         logger.success(f"✅ Created NTA result for sample ID {sample_id}")
         return nta_result
@@ -336,6 +411,7 @@ async def create_processing_job(
     job_id: str,
     job_type: str,
     sample_id: Optional[int] = None,
+    input_hash: Optional[str] = None,
 ) -> ProcessingJob:
     """
     Create a new processing job.
@@ -345,6 +421,7 @@ async def create_processing_job(
         job_id: UUID for the job
         job_type: Type of job (fcs_parse, nta_parse, batch_process)
         sample_id: Database ID of associated sample (optional)
+        input_hash: Content + parameter hash of the job input (optional)
         
     Returns:
         Created ProcessingJob object
@@ -356,11 +433,13 @@ async def create_processing_job(
             sample_id=sample_id,
             status="pending",
             progress_percent=0,
+            input_hash=input_hash,
         )
         
         db.add(job)
         await db.commit()
         await db.refresh(job)
+        invalidate_counts("jobs")
         
         logger.success(f"✅ Created processing job: {job_id} (type: {job_type})")
         return job
@@ -387,6 +466,38 @@ async def get_job_by_id(db: AsyncSession, job_id: str) -> Optional[ProcessingJob
     return result.scalar_one_or_none()
 
 
+async def get_reusable_job(
+    db: AsyncSession,
+    input_hash: str,
+    job_type: str,
+) -> Optional[ProcessingJob]:
+    """
+    Latest completed job of ``job_type`` with results for the same input.
+    
+    Args:
+        db: Database session
+        input_hash: Content + parameter hash of the job input
+        job_type: Type of job (fcs_parse, nta_parse, ...)
+        
+    Returns:
+        ProcessingJob (with its sample loaded) or None if nothing to reuse
+    """
+    query = (
+        select(ProcessingJob)
+        .options(selectinload(ProcessingJob.sample))
+        .where(
+            ProcessingJob.input_hash == input_hash,
+            ProcessingJob.job_type == job_type,
+            ProcessingJob.status == "completed",
+            ProcessingJob.result_data.isnot(None),
+        )
+        .order_by(ProcessingJob.created_at.desc(), ProcessingJob.id.desc())
+        .limit(1)
+    )
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
 async def update_job_status(
     db: AsyncSession,
     job_id: str,
@@ -440,6 +551,8 @@ async def update_job_status(
         
         await db.commit()
         await db.refresh(job)
+        if old_status != status:
+            invalidate_counts("jobs")
         
         logger.info(f"🔄 Job status: {job_id} → {old_status} → {status}")
         return job
@@ -664,6 +777,7 @@ async def create_alert(
         db.add(alert)
         await db.commit()
         await db.refresh(alert)
+        invalidate_counts("alerts")
         
         logger.info(f"🔔 Created alert: [{severity.upper()}] {title}")
         return alert
@@ -689,6 +803,31 @@ async def get_alert_by_id(
         raise
 
 
+def _filter_alerts(
+    query,
+    user_id: Optional[int] = None,
+    sample_id: Optional[int] = None,
+    severity: Optional[str] = None,
+    alert_type: Optional[str] = None,
+    is_acknowledged: Optional[bool] = None,
+    source: Optional[str] = None,
+):
+    """Apply the alert listing filters shared by get_alerts() and count_alerts()."""
+    if user_id is not None:
+        query = query.where(Alert.user_id == user_id)
+    if sample_id is not None:
+        query = query.where(Alert.sample_id == sample_id)
+    if severity is not None:
+        query = query.where(Alert.severity == severity)
+    if alert_type is not None:
+        query = query.where(Alert.alert_type == alert_type)
+    if is_acknowledged is not None:
+        query = query.where(Alert.is_acknowledged == is_acknowledged)
+    if source is not None:
+        query = query.where(Alert.source == source)
+    return query
+
+
 async def get_alerts(
     db: AsyncSession,
     user_id: Optional[int] = None,
@@ -701,6 +840,7 @@ async def get_alerts(
     offset: int = 0,
     order_by: str = "created_at",
     order_desc: bool = True,
+    after: Optional[str] = None,
 ) -> List[Alert]:
     """
     Get alerts with filtering and pagination.
@@ -717,36 +857,41 @@ async def get_alerts(
         offset: Offset for pagination
         order_by: Field to order by
         order_desc: Whether to order descending
+        after: Keyset cursor from a previous page (created_at ordering only;
+            takes precedence over ``offset``)
         
     Returns:
         List of Alert objects
+        
+    Raises:
+        ValueError: If ``after`` is given with another ordering or is malformed
     """
     try:
-        query = select(Alert)
-        
-        # Apply filters
-        if user_id is not None:
-            query = query.where(Alert.user_id == user_id)
-        if sample_id is not None:
-            query = query.where(Alert.sample_id == sample_id)
-        if severity is not None:
-            query = query.where(Alert.severity == severity)
-        if alert_type is not None:
-            query = query.where(Alert.alert_type == alert_type)
-        if is_acknowledged is not None:
-            query = query.where(Alert.is_acknowledged == is_acknowledged)
-        if source is not None:
-            query = query.where(Alert.source == source)
-        
-        # Apply ordering
+        query = _filter_alerts(
+            select(Alert),
+            user_id=user_id,
+            sample_id=sample_id,
+            severity=severity,
+            alert_type=alert_type,
+            is_acknowledged=is_acknowledged,
+            source=source,
+        )
+        
+        # Apply ordering (id breaks ties so pages are stable)
         order_column = getattr(Alert, order_by, Alert.created_at)
-        if order_desc:
+        if order_column is Alert.created_at:
+            query = apply_keyset(query, Alert.created_at, Alert.id, after, descending=order_desc)
+        elif after:
+            raise ValueError("Cursor pagination is only supported when ordering by created_at")
+        elif order_desc:
             query = query.order_by(order_column.desc())
         else:
             query = query.order_by(order_column.asc())
         
         # Apply pagination
-        query = query.limit(limit).offset(offset)
+        query = query.limit(limit)
+        if not after:
+            query = query.offset(offset)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -756,6 +901,31 @@ async def get_alerts(
         raise
 
 
+async def count_alerts(
+    db: AsyncSession,
+    user_id: Optional[int] = None,
+    sample_id: Optional[int] = None,
+    severity: Optional[str] = None,
+    alert_type: Optional[str] = None,
+    is_acknowledged: Optional[bool] = None,
+    source: Optional[str] = None,
+) -> int:
+    """
+    Number of alerts matching the get_alerts() filters (cached briefly per
+    filter combination, dropped on alert writes).
+    """
+    query = _filter_alerts(
+        select(Alert),
+        user_id=user_id,
+        sample_id=sample_id,
+        severity=severity,
+        alert_type=alert_type,
+        is_acknowledged=is_acknowledged,
+        source=source,
+    )
+    return await cached_count(db, "alerts", query)
+
+
 async def get_alert_counts(
     db: AsyncSession,
     user_id: Optional[int] = None,
@@ -848,6 +1018,7 @@ async def acknowledge_alert(
         
         await db.commit()
         await db.refresh(alert)
+        invalidate_counts("alerts")
         
         logger.success(f"✅ Acknowledged alert: {alert_id}")
         return alert
@@ -909,6 +1080,7 @@ async def delete_alert(
         query = delete(Alert).where(Alert.id == alert_id)
         result = await db.execute(query)
         await db.commit()
+        invalidate_counts("alerts")
         
         deleted = result.rowcount > 0
         if deleted:
@@ -942,6 +1114,7 @@ async def delete_alerts_for_sample(
         query = delete(Alert).where(Alert.sample_id == sample_id)
         result = await db.execute(query)
         await db.commit()
+        invalidate_counts("alerts")
         
         deleted_count = result.rowcount
         logger.success(f"✅ Deleted {deleted_count} alerts for sample {sample_id}")
@@ -181,6 +181,9 @@ class Sample(Base):
         Index('idx_sample_treatment_date', 'treatment', 'experiment_date'),
         Index('idx_sample_status', 'processing_status', 'qc_status'),
         Index('idx_sample_user', 'user_id'),
+        # Keyset pagination of the newest-first sample list (global / per user)
+        Index('idx_sample_upload_ts_id', 'upload_timestamp', 'id'),
+        Index('idx_sample_user_upload_ts_id', 'user_id', 'upload_timestamp', 'id'),
     )
     
     def __repr__(self) -> str:
@@ -342,6 +345,10 @@ class ProcessingJob(Base):
     job_type = Column(String(50), nullable=False, index=True)  # "fcs_parse", "nta_parse", "batch_process"
     status = Column(String(20), nullable=False, default="pending", index=True)
     
+    # SHA-256 of the input file + processing parameters; lets an identical
+    # re-upload reuse this job's results instead of parsing again
+    input_hash = Column(String(64), nullable=True, index=True)
+    
     # Progress Tracking
     progress_percent = Column(Integer, nullable=False, default=0)
     current_step = Column(String(255), nullable=True)
@@ -362,6 +369,8 @@ class ProcessingJob(Base):
     # Indexes
     __table_args__ = (
         Index('idx_job_status_created', 'status', 'created_at'),
+        # Keyset pagination of the newest-first job list
+        Index('idx_job_created_id', 'created_at', 'id'),
     )
     
     def __repr__(self) -> str:
@@ -556,6 +565,9 @@ class Alert(Base):
         Index('idx_alert_user_ack', 'user_id', 'is_acknowledged'),
         Index('idx_alert_sample_type', 'sample_id', 'alert_type'),
         Index('idx_alert_source', 'source', 'created_at'),
+        # Keyset pagination of alert feeds (global / per user polling)
+        Index('idx_alert_created_id', 'created_at', 'id'),
+        Index('idx_alert_user_created_id', 'user_id', 'created_at', 'id'),
     )
     
     def __repr__(self) -> str:
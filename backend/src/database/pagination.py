@@ -0,0 +1,137 @@
+"""
+Keyset Pagination Helpers
+=========================
+
+Cursor ("keyset") pagination for the newest-first listings (samples, jobs,
+alerts) plus a short-lived cache for their total counts.
+
+OFFSET pagination makes the database walk and discard every skipped row, so
+deep pages and frequent polling get slower as the history grows. A keyset
+page instead resumes strictly after the last row of the previous page:
+
+    WHERE (ts, id) < (:last_ts, :last_id) ORDER BY ts DESC, id DESC LIMIT n
+
+which is a single range scan on a (ts, id) composite index regardless of
+page depth. The (ts, id) pair is handed to clients as an opaque ``after``
+token; ``id`` breaks ties between rows sharing a timestamp.
+
+Totals still need a ``count(*)`` over the filtered rows; those are cached
+for a few seconds per filter combination and dropped on writes, so the
+reported total is exact after local writes and at most ``ttl`` seconds
+stale otherwise.
+
+Author: CRMIT Backend Team
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import String, and_, func, literal, or_, tuple_  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
+
+from src.api.cache import count_cache, make_cache_key  # type: ignore[import-not-found]
+from src.api.config import get_settings  # type: ignore[import-not-found]
+from src.database.connection import is_sqlite_url  # type: ignore[import-not-found]
+
+
+# Seconds a cached total may be served without a write invalidating it
+COUNT_TTL_SECONDS = 15.0
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    """Encode the (timestamp, id) of the last row on a page as an ``after`` token."""
+    raw = json.dumps([timestamp.isoformat() if timestamp else None, int(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], int]:
+    """
+    Decode an ``after`` token produced by :func:`encode_cursor`.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(ts) if ts else None), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {token!r}") from e
+
+
+def _keyset_filter(ts_column, id_column, ts: Optional[datetime], row_id: int, descending: bool):
+    """
+    Condition selecting the rows strictly past the cursor (ts, row_id).
+
+    SQLite keeps DateTime as text, and the same instant can be stored two
+    ways: ``server_default=func.now()`` writes 'YYYY-MM-DD HH:MM:SS' while
+    SQLAlchemy writes 'YYYY-MM-DD HH:MM:SS.ffffff' (also for a zero
+    microsecond). A cursor read back from either row is the same datetime, so
+    the cursor's second matches both text forms and ``id`` breaks the tie.
+    """
+    if ts is None or not is_sqlite_url(get_settings().database_url):
+        bound = tuple_(ts, row_id)
+        key = tuple_(ts_column, id_column)
+        return key < bound if descending else key > bound
+    forms = [ts.strftime("%Y-%m-%d %H:%M:%S.%f")]
+    if not ts.microsecond:
+        forms.insert(0, ts.strftime("%Y-%m-%d %H:%M:%S"))
+    forms = [literal(form, String) for form in forms]
+    if descending:
+        return or_(ts_column < forms[0], and_(ts_column.in_(forms), id_column < row_id))
+    return or_(ts_column > forms[-1], and_(ts_column.in_(forms), id_column > row_id))
+
+
+def apply_keyset(query, ts_column, id_column, after: Optional[str] = None, descending: bool = True):
+    """
+    Order ``query`` by (ts_column, id_column) and, if ``after`` is given,
+    restrict it to rows strictly past that cursor.
+
+    Raises:
+        ValueError: If ``after`` is malformed.
+    """
+    if after:
+        ts, row_id = decode_cursor(after)
+        query = query.where(_keyset_filter(ts_column, id_column, ts, row_id, descending))
+    if descending:
+        return query.order_by(ts_column.desc(), id_column.desc())
+    return query.order_by(ts_column.asc(), id_column.asc())
+
+
+def next_cursor(rows: Sequence[Any], limit: int, ts_attr: str) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None if this was the last page."""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, ts_attr), last.id)
+
+
+async def cached_count(
+    db: AsyncSession,
+    table: str,
+    query,
+    ttl_seconds: float = COUNT_TTL_SECONDS,
+) -> int:
+    """
+    ``count(*)`` of the rows matched by ``query`` (its ordering and limits are
+    ignored), cached per ``table`` and filter combination.
+    """
+    count_query = (
+        query.with_only_columns(func.count(), maintain_column_froms=True)
+        .order_by(None).limit(None).offset(None)
+    )
+    compiled = count_query.compile()
+    key = f"count:{table}:{make_cache_key(str(compiled), compiled.params)}"
+
+    async def count() -> int:
+        return (await db.execute(count_query)).scalar() or 0
+
+    # Concurrent polls with the same filters share one count(*)
+    return await count_cache.get_or_compute_async(key, count, ttl_seconds=ttl_seconds)
+
+
+def invalidate_counts(table: str) -> int:
+    """Drop cached totals for ``table`` after rows were added, changed or removed."""
+    return count_cache.invalidate(f"count:{table}:")
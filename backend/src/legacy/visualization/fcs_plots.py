@@ -37,6 +37,7 @@ class FCSPlotter:
     - FSC-A vs SSC-A scatter plots (standard gating view)
     - FL channel scatter plots (marker analysis)
     - Density plots with hexbin or 2D histogram
+    - Full-event density rasters without matplotlib (plot_density_raster)
     - Gate overlays (optional)
     - Batch processing for multiple samples
     """
@@ -251,6 +252,50 @@ class FCSPlotter:
         
         return fig
     
+    def plot_density_raster(
+        self,
+        data: pd.DataFrame,
+        x_channel: str,
+        y_channel: str,
+        output_file: Path | str,
+        width: int = 800,
+        height: int = 600,
+        x_scale: str = "log",
+        y_scale: str = "log",
+        colormap: str = "viridis"
+    ) -> Path:
+        """
+        Render a density plot of every event straight to PNG (no matplotlib).
+        
+        Much cheaper than plot_scatter() on a subsample; there are no axes or
+        labels, so use it for thumbnails and batch previews rather than
+        publication figures.
+        
+        Args:
+            data: DataFrame containing FCS event data
+            x_channel: Column name for X-axis
+            y_channel: Column name for Y-axis
+            output_file: Output filename (relative to output_dir)
+            width: Image width in pixels (one bin per pixel)
+            height: Image height in pixels
+            x_scale: 'linear', 'log' or 'asinh'
+            y_scale: 'linear', 'log' or 'asinh'
+            colormap: 'viridis', 'inferno', 'plasma' or 'greys'
+            
+        Returns:
+            Path of the written PNG
+        """
+        from src.visualization.density_raster import render_density_png
+        
+        output_path = self.output_dir / output_file
+        render_density_png(
+            data[x_channel].to_numpy(), data[y_channel].to_numpy(),
+            output_path=output_path, width=width, height=height,
+            x_scale=x_scale, y_scale=y_scale, colormap=colormap,
+        )
+        logger.info(f"Saved density raster: {output_path}")
+        return output_path
+    
     def plot_histogram(
         self,
         data: pd.DataFrame,
@@ -731,8 +776,9 @@ def generate_fcs_plots(parquet_file: Path, output_dir: Path = Path("figures/fcs"
     """
     logger.info(f"Generating plots for {parquet_file.name}")
     
-    # Load data
-    data = pd.read_parquet(parquet_file)
+    # Load data (with footer constants such as sample_id restored as columns)
+    from src.parsers.event_parquet import read_event_parquet
+    data = read_event_parquet(parquet_file, include_constants=True)
     
     # Initialize plotter
     plotter = FCSPlotter(output_dir=output_dir)
@@ -5,5 +5,11 @@ Data parsers for different instrument types.
 from .base_parser import BaseParser
 from .fcs_parser import FCSParser
 from .parquet_writer import ParquetWriter
+from .event_parquet import read_event_metadata, read_event_parquet, write_event_parquet
+from .fcs_bytes import FCSBuffer, read_fcs_bytes
 
-__all__ = ['BaseParser', 'FCSParser', 'ParquetWriter']
+__all__ = [
+    'BaseParser', 'FCSParser', 'ParquetWriter',
+    'read_event_metadata', 'read_event_parquet', 'write_event_parquet',
+    'FCSBuffer', 'read_fcs_bytes',
+]
@@ -6,10 +6,10 @@ from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, Any, Optional
 import pandas as pd
-import pyarrow as pa
-import pyarrow.parquet as pq
 from loguru import logger
 
+from .event_parquet import EVENT_ROW_GROUP_SIZE, write_event_parquet
+
 
 class BaseParser(ABC):
     """Abstract base class for all data parsers."""
@@ -58,33 +58,40 @@ class BaseParser(ABC):
     def to_parquet(
         self, 
         output_path: Path, 
-        compression: str = 'snappy',
-        metadata: Optional[Dict[str, Any]] = None
-    ) -> None:
+        compression: str = 'zstd',
+        metadata: Optional[Dict[str, Any]] = None,
+        extra_columns: Optional[Dict[str, Any]] = None,
+        row_group_size: int = EVENT_ROW_GROUP_SIZE,
+    ) -> Dict[str, Any]:
         """
-        Convert parsed data to Parquet format with embedded metadata.
+        Convert parsed data to the event Parquet layout with embedded metadata.
         
         Args:
             output_path: Path for output Parquet file
-            compression: Compression codec (snappy, gzip, zstd, none)
+            compression: Compression codec (zstd, snappy, gzip, none)
             metadata: Additional metadata to embed in Parquet file
+            extra_columns: Optional precomputed per-event columns
+                (e.g. ``{"diameter_nm": sizes}``)
+            row_group_size: Events per row group
+        
+        Returns:
+            Write summary (see write_event_parquet())
         
         HOW IT WORKS:
         -------------
         1. Validate data exists (must call parse() first)
-        2. Create output directory if needed
-        3. Convert pandas DataFrame to PyArrow Table
-        4. Embed metadata in Parquet file header
-        5. Write with compression and optimizations
-        6. Log file size for monitoring
-        
-        WHY PYARROW TABLE:
-        ------------------
-        Pandas -> PyArrow -> Parquet ensures:
-        - Correct data type mapping (int64 stays int64, not string)
-        - Efficient columnar storage
-        - Fast writes (multi-threaded)
-        - Proper null handling (NaN -> null)
+        2. Collect provenance + parsed metadata for the footer
+        3. Write with write_event_parquet():
+           - float channels -> float32, zstd (BYTE_STREAM_SPLIT when continuous)
+           - per-row constants (sample_id, file_name, ...) -> footer only
+           - ~128k-event row groups with min/max statistics
+        
+        WHY THIS LAYOUT:
+        ----------------
+        Readers (AI endpoints, analysis) usually need 2-10 channels out of
+        dozens. Narrow typed columns in moderate row groups let them read
+        just those (read_event_parquet(columns=...)), and the per-row
+        strings no longer cost space or read time.
         """
         # Step 1: Validate that data has been parsed
         # -------------------------------------------
@@ -92,27 +99,8 @@ class BaseParser(ABC):
         if self.data is None:
             raise ValueError("No data to convert. Call parse() first.")
         
-        # Step 2: Create output directory if it doesn't exist
-        # ----------------------------------------------------
-        # mkdir with parents=True creates all parent directories
-        # exist_ok=True means no error if directory already exists
-        # Example: output_path = "data/parquet/events/sample1.parquet"
-        #          Creates: data/, data/parquet/, data/parquet/events/
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Step 3: Convert pandas DataFrame to Apache Arrow Table
-        # -------------------------------------------------------
-        # Arrow is columnar in-memory format (like Parquet but uncompressed)
-        # Benefits of Arrow intermediate step:
-        # - Type safety: pandas int64 -> Arrow int64 -> Parquet INT64
-        # - Memory efficiency: Zero-copy when possible
-        # - Fast conversion: Native C++ implementation
-        table = pa.Table.from_pandas(self.data)
-        
-        # Step 4: Prepare metadata to embed in Parquet file
-        # --------------------------------------------------
-        # Parquet files can store custom key-value metadata in the header
-        # This is separate from the data itself (doesn't affect queries)
+        # Step 2: Prepare metadata to embed in the Parquet footer
+        # --------------------------------------------------------
         # Useful for: provenance, processing history, quality metrics
         metadata_dict = {
             'source_file': str(self.file_path),     # Original FCS filename
@@ -125,45 +113,16 @@ class BaseParser(ABC):
         if metadata:
             metadata_dict.update(metadata)
         
-        # Step 5: Convert metadata to bytes (Parquet requirement)
-        # --------------------------------------------------------
-        # Parquet metadata must be bytes, not strings
-        # Convert: {'key': 'value'} -> {b'key': b'value'}
-        metadata_bytes = {
-            k.encode(): str(v).encode() 
-            for k, v in metadata_dict.items()
-        }
-        
-        # Step 6: Attach metadata to Arrow Table schema
-        # ----------------------------------------------
-        # Schema defines column names, types, and file-level metadata
-        # Create new schema with our custom metadata attached
-        schema = table.schema.with_metadata(metadata_bytes)
-        table = table.cast(schema)  # Apply new schema to table
-        
-        # Step 7: Write to Parquet file with optimizations
-        # -------------------------------------------------
-        pq.write_table(
-            table, 
-            output_path, 
-            compression=compression,       # Compress data (snappy=fast, gzip=small)
-            use_dictionary=True,           # Encode repeated values once (saves space)
-            write_statistics=True,         # Min/max per column (faster queries)
-            version='2.6'                  # Latest Parquet format (best features)
+        # Step 3: Write the event layout (also creates the output directory)
+        # -------------------------------------------------------------------
+        return write_event_parquet(
+            self.data,
+            output_path,
+            metadata=metadata_dict,
+            extra_columns=extra_columns,
+            compression=compression,
+            row_group_size=row_group_size,
         )
-        # Dictionary encoding example:
-        # Instead of: ["CD81", "CD81", "CD81", ...] (10MB)
-        # Store as: [0, 0, 0, ...] + dictionary: {0: "CD81"} (1MB)
-        
-        # Statistics example:
-        # Store: column_FSC_min=100, column_FSC_max=50000
-        # Query: SELECT * WHERE FSC > 60000 → Skip file instantly (no read)
-        
-        # Step 8: Log file size for monitoring
-        # -------------------------------------
-        # Get file size in MB to track compression ratio
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        logger.info(f"Saved Parquet file: {output_path} ({file_size_mb:.2f} MB)")
     
     def get_file_info(self) -> Dict[str, Any]:
         """
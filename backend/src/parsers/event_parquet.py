@@ -0,0 +1,262 @@
+"""
+Event-level Parquet layout for parsed FCS data.
+
+Layout (``crmit.events`` v2):
+- One column per channel, stored as float32 with zstd; continuous channels
+  use BYTE_STREAM_SPLIT, integer-valued ones a dictionary
+- Columns that hold one value for the whole file (sample_id, file_name,
+  instrument_type, parse_timestamp, ...) are not repeated per row; they go
+  in the footer together with the file-level metadata (FCS TEXT keywords)
+- Row groups of ~128k events, with min/max statistics, so readers can
+  project a few channels and skip row groups instead of loading the file
+- Optional precomputed per-event columns (e.g. ``diameter_nm``, gates)
+
+Files written before this layout (one wide table, per-row strings) are
+still readable through the same reader functions.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+
+EVENT_SCHEMA_NAME = "crmit.events"
+EVENT_SCHEMA_VERSION = 2
+
+# Footer key holding the JSON document with constants and file metadata
+EVENT_FOOTER_KEY = b"crmit.events"
+
+# ~128k events per row group: a 300k-event file gets 3 groups, and a single
+# float32 channel chunk stays around 512KB before compression
+EVENT_ROW_GROUP_SIZE = 128 * 1024
+
+# Channels with fewer distinct values than this fraction of a sample (integer
+# ADC values, low-resolution channels) compress better with a dictionary than
+# with BYTE_STREAM_SPLIT
+DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+_CARDINALITY_SAMPLE = 16384
+
+
+def _prefers_dictionary(values: np.ndarray) -> bool:
+    """Whether a float channel repeats enough values for dictionary encoding."""
+    step = max(1, len(values) // _CARDINALITY_SAMPLE)
+    sample = values[::step]
+    return len(np.unique(sample)) < DICTIONARY_MAX_DISTINCT_RATIO * len(sample)
+
+
+def _constant_value(series: pd.Series) -> Optional[Any]:
+    """JSON-safe value of a column holding a single value, else None."""
+    if series.empty or series.isna().any():
+        return None
+    first = series.iloc[0]
+    if not (series == first).all():
+        return None
+    if isinstance(first, pd.Timestamp):
+        return {"timestamp": first.isoformat()}
+    if isinstance(first, (np.bool_, bool)):
+        return bool(first)
+    if isinstance(first, np.generic):
+        return first.item()
+    return first
+
+
+def write_event_parquet(
+    data: pd.DataFrame,
+    output_path: Path,
+    metadata: Optional[Dict[str, Any]] = None,
+    extra_columns: Optional[Mapping[str, Iterable]] = None,
+    compression: str = "zstd",
+    row_group_size: int = EVENT_ROW_GROUP_SIZE,
+) -> Dict[str, Any]:
+    """
+    Write parsed events in the ``crmit.events`` layout.
+
+    Args:
+        data: Parsed events (one row per event)
+        output_path: Output file path
+        metadata: File-level metadata stored in the footer (values are
+            stored as strings, as before)
+        extra_columns: Optional precomputed per-event columns, e.g.
+            ``{"diameter_nm": sizes, "gate_ev": mask}``; must match ``len(data)``
+        compression: Parquet codec for all columns
+        row_group_size: Events per row group
+
+    Returns:
+        Dictionary with num_events, channels, constants, row_groups and file_size_bytes
+
+    Raises:
+        ValueError: If an extra column does not have one value per event
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    arrays: Dict[str, pa.Array] = {}
+    constants: Dict[str, Any] = {}
+    float_columns: List[str] = []
+    split_columns: List[str] = []
+
+    for name in data.columns:
+        column = data[name]
+        if pd.api.types.is_float_dtype(column.dtype):
+            values = column.to_numpy(dtype=np.float32, copy=False)
+            arrays[str(name)] = pa.array(values)
+            float_columns.append(str(name))
+            if not _prefers_dictionary(values):
+                split_columns.append(str(name))
+            continue
+        if not pd.api.types.is_numeric_dtype(column.dtype) or pd.api.types.is_bool_dtype(column.dtype):
+            value = _constant_value(column)
+            if value is not None:
+                constants[str(name)] = value
+                continue
+        arrays[str(name)] = pa.Array.from_pandas(column)
+
+    for name, values in (extra_columns or {}).items():
+        values = np.asarray(values)
+        if len(values) != len(data):
+            raise ValueError(
+                f"Extra column '{name}' has {len(values)} values for {len(data)} events"
+            )
+        if values.dtype.kind == "f":
+            values = values.astype(np.float32, copy=False)
+            float_columns.append(name)
+            if not _prefers_dictionary(values):
+                split_columns.append(name)
+        arrays[name] = pa.array(values)
+
+    footer = {
+        "schema": EVENT_SCHEMA_NAME,
+        "version": EVENT_SCHEMA_VERSION,
+        "num_events": len(data),
+        "constants": constants,
+        "metadata": {str(k): str(v) for k, v in (metadata or {}).items()},
+    }
+    table = pa.table(arrays)
+
+    # BYTE_STREAM_SPLIT groups the exponent/mantissa bytes of neighbouring
+    # floats, which zstd then compresses far better than the raw values
+    # (~40% smaller than dictionary + snappy on continuous channels).
+    # The Arrow schema is not stored (it would repeat the footer), so the
+    # footer is added as plain key-value metadata.
+    split_set = set(split_columns)
+    with pq.ParquetWriter(
+        output_path,
+        table.schema,
+        compression=compression,
+        use_dictionary=[name for name in arrays if name not in split_set],
+        column_encoding={name: "BYTE_STREAM_SPLIT" for name in split_columns},
+        write_statistics=True,
+        store_schema=False,
+        version="2.6",
+    ) as writer:
+        writer.write_table(table, row_group_size=row_group_size)
+        writer.add_key_value_metadata({EVENT_FOOTER_KEY: json.dumps(footer, default=str).encode()})
+
+    file_size = output_path.stat().st_size
+    logger.info(
+        f"Saved event Parquet: {output_path.name} ({len(data):,} events, "
+        f"{len(float_columns)} float32 channels, {file_size / (1024 * 1024):.2f} MB)"
+    )
+    return {
+        "num_events": len(data),
+        "channels": float_columns,
+        "constants": constants,
+        "row_groups": pq.ParquetFile(output_path).num_row_groups,
+        "file_size_bytes": file_size,
+    }
+
+
+def read_event_metadata(parquet_path: Path) -> Dict[str, Any]:
+    """
+    Footer of an event Parquet file, without reading any events.
+
+    Returns:
+        Dictionary with ``version`` (1 for files written before this layout),
+        ``num_events``, ``columns``, ``constants`` and ``metadata``
+    """
+    parquet_file = pq.ParquetFile(parquet_path)
+    schema_metadata = parquet_file.metadata.metadata or {}
+    columns = parquet_file.schema_arrow.names
+
+    if EVENT_FOOTER_KEY in schema_metadata:
+        footer = json.loads(schema_metadata[EVENT_FOOTER_KEY])
+        return {
+            "version": footer.get("version", EVENT_SCHEMA_VERSION),
+            "num_events": parquet_file.metadata.num_rows,
+            "columns": columns,
+            "constants": footer.get("constants", {}),
+            "metadata": footer.get("metadata", {}),
+        }
+
+    return {
+        "version": 1,
+        "num_events": parquet_file.metadata.num_rows,
+        "columns": columns,
+        "constants": {},
+        "metadata": {
+            k.decode(errors="replace"): v.decode(errors="replace")
+            for k, v in schema_metadata.items()
+            if k not in (b"pandas", b"ARROW:schema")
+        },
+    }
+
+
+def read_event_parquet(
+    parquet_path: Path,
+    columns: Optional[Iterable[str]] = None,
+    max_events: Optional[int] = None,
+    filters: Optional[list] = None,
+    include_constants: bool = False,
+) -> pd.DataFrame:
+    """
+    Read events, loading only the requested channels and row groups.
+
+    Args:
+        parquet_path: Event Parquet file (either layout)
+        columns: Channels to load; names not in the file are skipped. None
+            loads every column.
+        max_events: Read only the leading row groups needed for this many events
+        filters: pyarrow filters, e.g. ``[("FSC-H", ">", 0)]``; row groups
+            whose min/max statistics rule them out are not read
+        include_constants: Add footer constants (sample_id, file_name, ...)
+            back as columns, for callers expecting the old wide table
+
+    Returns:
+        DataFrame of events
+    """
+    parquet_file = pq.ParquetFile(parquet_path, memory_map=True)
+    available = parquet_file.schema_arrow.names
+    if columns is not None:
+        wanted = set(columns)
+        columns = [name for name in available if name in wanted]
+
+    if filters is not None:
+        table = pq.read_table(parquet_path, columns=columns, filters=filters, memory_map=True)
+        if max_events is not None:
+            table = table.slice(0, max_events)
+    elif max_events is not None:
+        row_groups: List[int] = []
+        covered = 0
+        for index in range(parquet_file.num_row_groups):
+            if covered >= max_events:
+                break
+            row_groups.append(index)
+            covered += parquet_file.metadata.row_group(index).num_rows
+        table = parquet_file.read_row_groups(row_groups, columns=columns).slice(0, max_events)
+    else:
+        table = parquet_file.read(columns=columns)
+
+    df = table.to_pandas()
+    if include_constants:
+        for name, value in read_event_metadata(parquet_path)["constants"].items():
+            if columns is not None and name not in wanted:
+                continue
+            if isinstance(value, dict) and "timestamp" in value:
+                value = pd.Timestamp(value["timestamp"])
+            df[name] = value
+    return df
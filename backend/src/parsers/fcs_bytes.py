@@ -0,0 +1,181 @@
+"""
+FCS reader for in-memory file content.
+
+Chat attachments and other uploads arrive as bytes. Instead of writing them
+to a temporary file for flowio and expanding the events through a Python
+list into a float64 array, read_fcs_bytes() parses the HEADER and TEXT
+segments directly and decodes the DATA segment with ``np.frombuffer``:
+
+- list-mode float data ($DATATYPE F / D) becomes a zero-copy (events ×
+  channels) view of the buffer, in the file's byte order
+- integer data ($DATATYPE I) is decoded through one structured dtype (any
+  mix of 8/16/32/64-bit channels) and masked to the bits $PnR uses
+
+events_float32() gives the float32 matrix that channel_statistics() expects,
+copying only when the stored type or byte order requires it. TEXT keywords
+use flowio's convention (lower case, no leading ``$``), so code written
+against ``flowio.FlowData.text`` reads them unchanged.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+_HEADER_SIZE = 58
+
+
+@dataclass
+class FCSBuffer:
+    """Parsed FCS content backed by the caller's buffer."""
+
+    version: str
+    text: Dict[str, str]
+    channel_names: List[str]
+    events: np.ndarray
+    """(events × channels) view of the DATA segment (stored dtype and byte order)"""
+    channel_ranges: List[int] = field(default_factory=list)
+
+    @property
+    def event_count(self) -> int:
+        return int(self.events.shape[0])
+
+    @property
+    def channel_count(self) -> int:
+        return len(self.channel_names)
+
+    def events_float32(self) -> np.ndarray:
+        """Events as native float32, without a copy when already stored that way."""
+        if self.events.dtype == np.dtype("float32"):  # native byte order
+            return self.events
+        return self.events.astype(np.float32)
+
+
+def _offset(header: bytes, start: int) -> int:
+    raw = header[start:start + 8].strip()
+    return int(raw) if raw else 0
+
+
+def _parse_text(segment: bytes) -> Dict[str, str]:
+    """TEXT segment keywords (keys lower-cased without '$', like flowio)."""
+    if not segment:
+        raise ValueError("Empty FCS TEXT segment")
+    delimiter = segment[:1]
+    escaped = delimiter * 2
+    body = segment[1:]
+    # A doubled delimiter is a literal delimiter inside a keyword or value
+    placeholder = b"\x00\x01"
+    tokens = body.replace(escaped, placeholder).split(delimiter)
+    if tokens and tokens[-1] == b"":
+        tokens.pop()
+    text: Dict[str, str] = {}
+    for key, value in zip(tokens[0::2], tokens[1::2]):
+        key_str = key.replace(placeholder, delimiter).decode("latin-1").strip().lstrip("$").lower()
+        text[key_str] = value.replace(placeholder, delimiter).decode("latin-1").strip()
+    return text
+
+
+def _byte_order(text: Dict[str, str]) -> str:
+    order = text.get("byteord", "1,2,3,4").replace(" ", "")
+    if order in ("1,2,3,4", "1,2", "1", "1,2,3,4,5,6,7,8"):
+        return "<"
+    if order in ("4,3,2,1", "2,1", "8,7,6,5,4,3,2,1"):
+        return ">"
+    raise ValueError(f"Unsupported FCS byte order: {order}")
+
+
+def _channel_names(text: Dict[str, str], n_channels: int) -> List[str]:
+    """$PnS (descriptive) names, falling back to $PnN, as FCSParser does."""
+    names = []
+    for i in range(1, n_channels + 1):
+        name = (text.get(f"p{i}s", "") or text.get(f"p{i}n", "")).strip()
+        names.append(name or f"Channel_{i}")
+    return names
+
+
+def read_fcs_bytes(data: BufferLike) -> FCSBuffer:
+    """
+    Parse list-mode FCS 2.0 / 3.0 / 3.1 content held in memory.
+
+    Args:
+        data: Whole FCS file content
+
+    Returns:
+        FCSBuffer whose ``events`` is a view of ``data`` (keep ``data`` alive
+        as long as the events are used)
+
+    Raises:
+        ValueError: If the content is not a readable list-mode FCS data set
+    """
+    buffer = memoryview(data).cast("B")
+    header = bytes(buffer[:_HEADER_SIZE])
+    if len(header) < _HEADER_SIZE or not header.startswith(b"FCS"):
+        raise ValueError("Not an FCS file (missing FCS header)")
+    version = header[:6].decode("ascii")
+
+    text_start, text_end = _offset(header, 10), _offset(header, 18)
+    if not 0 < text_start <= text_end < len(buffer):
+        raise ValueError(f"Invalid FCS TEXT segment offsets {text_start}-{text_end}")
+    text = _parse_text(bytes(buffer[text_start:text_end + 1]))
+
+    # Offsets of large DATA segments only fit in TEXT ($BEGINDATA/$ENDDATA)
+    data_start, data_end = _offset(header, 26), _offset(header, 34)
+    if data_start == 0 or data_end == 0:
+        data_start = int(text.get("begindata", 0) or 0)
+        data_end = int(text.get("enddata", 0) or 0)
+
+    mode = text.get("mode", "L").upper()
+    if mode != "L":
+        raise ValueError(f"Only list-mode FCS data is supported (got $MODE={mode})")
+    n_channels = int(text["par"])
+    n_events = int(text.get("tot", 0) or 0)
+
+    order = _byte_order(text)
+    datatype = text.get("datatype", "F").upper()
+    bits = [int(text.get(f"p{i}b", "0") or 0) for i in range(1, n_channels + 1)]
+    ranges = [int(float(text.get(f"p{i}r", "0") or 0)) for i in range(1, n_channels + 1)]
+
+    if datatype in ("F", "D"):
+        dtype = np.dtype(f"{order}f{4 if datatype == 'F' else 8}")
+        row = np.dtype((dtype, n_channels))
+    elif datatype == "I":
+        if any(b not in (8, 16, 32, 64) for b in bits):
+            raise ValueError(f"Unsupported integer FCS bit widths: {sorted(set(bits))}")
+        row = np.dtype([(f"p{i}", f"{order}u{b // 8}") for i, b in enumerate(bits, start=1)])
+    else:
+        raise ValueError(f"Unsupported FCS $DATATYPE: {datatype}")
+
+    available = max(data_end - data_start + 1, 0)
+    if n_events == 0:
+        n_events = available // row.itemsize
+    if data_start + n_events * row.itemsize > len(buffer):
+        raise ValueError(
+            f"FCS DATA segment is truncated: expected {n_events * row.itemsize} bytes at offset {data_start}"
+        )
+    records = np.frombuffer(buffer, dtype=row, count=n_events, offset=data_start)
+
+    if datatype == "I":
+        if len(set(bits)) == 1:
+            events = records.view(np.dtype(f"{order}u{bits[0] // 8}")).reshape(n_events, n_channels)
+        else:
+            events = np.column_stack([records[name] for name in row.names])
+        # Integer values only use the bits needed for $PnR; the rest may hold flags
+        masks = [r - 1 if r and (r & (r - 1)) == 0 and r.bit_length() <= b else 0 for r, b in zip(ranges, bits)]
+        if any(masks):
+            events = events.copy()
+            for j, mask in enumerate(masks):
+                if mask:
+                    events[:, j] &= mask
+    else:
+        events = records.reshape(n_events, n_channels)
+
+    return FCSBuffer(
+        version=version,
+        text=text,
+        channel_names=_channel_names(text, n_channels),
+        events=events,
+        channel_ranges=ranges,
+    )
@@ -33,11 +33,13 @@ from dataclasses import dataclass, field
 from scipy.interpolate import interp1d
 from scipy.optimize import curve_fit
 from scipy.signal import find_peaks
-from scipy.ndimage import gaussian_filter1d
 from loguru import logger
 import json
 from pathlib import Path
 import datetime
+import threading
+
+from .statistics_utils import binned_kde, calculate_mode_kde
 
 
 # ============================================================================
@@ -208,26 +210,22 @@ def detect_bead_peaks(
     
     log_scatter = np.log10(positive_scatter)
     
-    # Build KDE using histogram + Gaussian smoothing (faster than scipy.stats.gaussian_kde)
+    # Binned FFT KDE over the central 99% of events (+5% margin)
     log_min, log_max = np.percentile(log_scatter, [0.5, 99.5])
     log_range = log_max - log_min
     log_min -= log_range * 0.05
     log_max += log_range * 0.05
-    
-    kde_x = np.linspace(log_min, log_max, n_kde_points)
     bin_width = (log_max - log_min) / n_kde_points
     
-    # Histogram-based KDE
-    hist_counts, hist_edges = np.histogram(log_scatter, bins=n_kde_points, range=(log_min, log_max))
-    kde_y = hist_counts.astype(float)
-    
-    # Smooth with Gaussian kernel
-    sigma_bins = kde_bandwidth / bin_width
-    sigma_bins = max(sigma_bins, 1.0)  # Minimum 1 bin smoothing
-    kde_y = gaussian_filter1d(kde_y, sigma=sigma_bins)
-    
-    # Normalize
-    kde_y = kde_y / (np.sum(kde_y) * bin_width) if np.sum(kde_y) > 0 else kde_y
+    # binned_kde takes the bandwidth as a factor of std (scipy convention)
+    kde = binned_kde(
+        log_scatter,
+        bandwidth=max(kde_bandwidth, bin_width) / np.std(log_scatter, ddof=1),
+        grid_size=n_kde_points,
+        x_range=(log_min, log_max),
+    )
+    kde_x, kde_y = kde.x, kde.density
+    bin_width = float(kde_x[1] - kde_x[0])
     
     # Find peaks
     min_distance_bins = max(int(min_peak_distance_log / bin_width), 5)
@@ -797,7 +795,6 @@ class BeadCalibrationCurve:
         std = float(np.std(diameters_valid))
         
         # Calculate mode using KDE
-        from .statistics_utils import calculate_mode_kde
         mode_result = calculate_mode_kde(diameters_valid)
         # Handle both float return and ModeResult (from scipy.stats)
         mode = float(mode_result) if not hasattr(mode_result, 'mode') else float(mode_result.mode)  # type: ignore[union-attr]
@@ -1112,14 +1109,56 @@ def calibrate_from_bead_fcs(
 
 CALIBRATION_DIR = Path(__file__).parent.parent.parent / "config" / "calibration"
 
+# Loaded calibrations by loader name: (calibration dir, fingerprint, result).
+# Endpoints call the loaders on every request and the FCMPASS one re-fits and
+# builds an EV LUT, so results are reused until the calibration files change,
+# and concurrent requests on a cold memo share one load.
+_calibration_memo: Dict[str, Tuple[Path, str, Any]] = {}
+_calibration_memo_lock = threading.Lock()
+_calibration_flights = None
+
+
+def _memoized_calibration(name: str, load: Callable[[], Any]) -> Any:
+    """
+    Result of ``load`` for the current calibration files, loaded once per
+    file version. The result is shared between callers: treat it as read-only.
+    """
+    global _calibration_flights
+    fingerprint = get_calibration_fingerprint()
+    with _calibration_memo_lock:
+        entry = _calibration_memo.get(name)
+        if entry is not None and entry[:2] == (CALIBRATION_DIR, fingerprint):
+            return entry[2]
+        if _calibration_flights is None:
+            from src.utils.single_flight import SingleFlight
+            _calibration_flights = SingleFlight("calibration")
+        flights = _calibration_flights
+
+    def load_and_store() -> Any:
+        with _calibration_memo_lock:
+            entry = _calibration_memo.get(name)
+            if entry is not None and entry[:2] == (CALIBRATION_DIR, fingerprint):
+                return entry[2]
+        result = load()
+        with _calibration_memo_lock:
+            _calibration_memo[name] = (CALIBRATION_DIR, fingerprint, result)
+        return result
+
+    return flights.do((name, CALIBRATION_DIR, fingerprint), load_and_store)
+
 
 def get_active_calibration() -> Optional[BeadCalibrationCurve]:
     """
     Load the currently active bead calibration curve.
     
     Looks for 'active_calibration.json' in config/calibration/.
-    Returns None if no calibration exists.
+    Returns None if no calibration exists. The curve is loaded once per
+    version of the file and shared between callers.
     """
+    return _memoized_calibration("active", _load_active_calibration)
+
+
+def _load_active_calibration() -> Optional[BeadCalibrationCurve]:
     active_path = CALIBRATION_DIR / "active_calibration.json"
     if not active_path.exists():
         return None
@@ -1274,9 +1313,17 @@ def get_fcmpass_calibration():
     """
     Load the active FCMPASS calibration and return a fitted FCMPASSCalibrator.
     
+    The calibrator is fitted once per version of the calibration file and
+    shared between callers, so never modify it: for another EV refractive
+    index use ``calibrator.with_ev_ri(n_ev)``, which returns a copy.
+    
     Returns:
         FCMPASSCalibrator instance if calibration exists, None otherwise
     """
+    return _memoized_calibration("fcmpass", _load_fcmpass_calibration)
+
+
+def _load_fcmpass_calibration():
     cal_path = CALIBRATION_DIR / FCMPASS_CALIBRATION_FILE
     if not cal_path.exists():
         return None
@@ -1334,6 +1381,23 @@ def get_fcmpass_k_factor() -> Optional[float]:
         return None
 
 
+def get_calibration_fingerprint() -> str:
+    """
+    Cheap identifier of the active calibration state (legacy bead curve and
+    FCMPASS), built from file modification times without loading either.
+    
+    Use it in cache keys for results that depend on the calibration, so they
+    are recomputed after a calibration is saved, activated or deleted.
+    """
+    parts = []
+    for name in ("active_calibration.json", FCMPASS_CALIBRATION_FILE):
+        try:
+            parts.append(f"{name}@{(CALIBRATION_DIR / name).stat().st_mtime_ns}")
+        except OSError:
+            parts.append(f"{name}@none")
+    return "|".join(parts)
+
+
 def get_fcmpass_calibration_status() -> Dict[str, Any]:
     """Get status of the FCMPASS calibration for UI display."""
     cal_path = CALIBRATION_DIR / FCMPASS_CALIBRATION_FILE
@@ -34,7 +34,11 @@ Flow Cytometry Application:
 - Multi-wavelength analysis enables particle characterization
 """
 
-from typing import Tuple, Optional, Dict, List, Any
+from collections import OrderedDict
+import copy
+from typing import Tuple, Optional, Dict, List, Any, Callable
+import hashlib
+import threading
 import numpy as np
 from loguru import logger
 import miepython
@@ -81,6 +85,105 @@ except ImportError:
     from size_config import DEFAULT_SIZE_CONFIG, SizeRangeConfig
 
 
+# ---------------------------------------------------------------------------
+# Shared lookup tables
+# ---------------------------------------------------------------------------
+# Calculators are created per request, but their LUTs depend only on the
+# optical parameters. Tables are memoized per process (read-only, so the
+# instances can share them) and, in multi-worker mode, also stored as
+# memory-mapped files that every worker maps instead of recomputing.
+# Concurrent requests that need the same missing table wait for one build.
+
+_LUT_MEMO_ENTRIES = 32
+_lut_memo: "OrderedDict[Tuple[str, tuple], Dict[str, np.ndarray]]" = OrderedDict()
+_lut_memo_lock = threading.Lock()
+_lut_flights = None
+
+
+def _shared_array_store():
+    try:
+        from src.utils.shared_cache import get_array_store
+    except ImportError:  # direct execution outside the backend package
+        return None
+    return get_array_store()
+
+
+def _lut_single_flight():
+    """Coalescer for concurrent builds of the same table (None outside the backend package)."""
+    global _lut_flights
+    with _lut_memo_lock:
+        if _lut_flights is None:
+            try:
+                from src.utils.single_flight import SingleFlight
+            except ImportError:  # direct execution outside the backend package
+                return None
+            _lut_flights = SingleFlight("mie_lut")
+        return _lut_flights
+
+
+def _cached_lut(
+    kind: str,
+    params: tuple,
+    build: Callable[[], Dict[str, np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """
+    Lookup-table arrays for ``kind`` and ``params``, built at most once per
+    process (and once across workers when shared caches are enabled);
+    concurrent callers missing the same table share one build.
+
+    Args:
+        kind: Table type, e.g. 'fsc' or 'multi_ssc'
+        params: Everything the table depends on (hashable, stable repr)
+        build: Computes the arrays on a miss
+
+    Returns:
+        Read-only arrays by name
+    """
+    params = tuple(p.item() if isinstance(p, np.generic) else p for p in params)
+    memo_key = (kind, params)
+    with _lut_memo_lock:
+        tables = _lut_memo.get(memo_key)
+        if tables is not None:
+            _lut_memo.move_to_end(memo_key)
+            return tables
+
+    flights = _lut_single_flight()
+    if flights is None:
+        return _load_lut(kind, params, build)
+    return flights.do(memo_key, lambda: _load_lut(kind, params, build))
+
+
+def _load_lut(
+    kind: str,
+    params: tuple,
+    build: Callable[[], Dict[str, np.ndarray]],
+) -> Dict[str, np.ndarray]:
+    """Map or build a table that missed the process memo."""
+    memo_key = (kind, params)
+    with _lut_memo_lock:
+        tables = _lut_memo.get(memo_key)  # built while this caller waited
+        if tables is not None:
+            return tables
+
+    store = _shared_array_store()
+    store_key = hashlib.sha256(f"mie-lut:{kind}:{params!r}".encode()).hexdigest()
+    entry = store.get(store_key) if store is not None else None
+    if entry is not None:
+        tables = entry[0]
+    else:
+        tables = build()
+        if store is not None:
+            store.put(store_key, tables)
+    for values in tables.values():
+        values.setflags(write=False)
+
+    with _lut_memo_lock:
+        _lut_memo[memo_key] = tables
+        while len(_lut_memo) > _LUT_MEMO_ENTRIES:
+            _lut_memo.popitem(last=False)
+    return tables
+
+
 @dataclass
 class MieScatterResult:
     """
@@ -505,34 +608,43 @@ class MieScatterCalculator:
         if self._lut_cache is not None and self._lut_cache_key == cache_key:
             return self._lut_cache
         
-        # Build new LUT
-        logger.debug(f"Building LUT: {min_diameter}-{max_diameter}nm, {lut_resolution} points")
-        
-        diameters_lut = np.linspace(min_diameter, max_diameter, lut_resolution)
-        fsc_lut = np.zeros(lut_resolution)
-        
-        for i, d in enumerate(diameters_lut):
-            result = self.calculate_scattering_efficiency(d, validate=False)
-            fsc_lut[i] = result.forward_scatter
-        
-        # Sort by FSC (Mie resonances can cause non-monotonicity)
-        sort_idx = np.argsort(fsc_lut)
-        fsc_sorted = fsc_lut[sort_idx]
-        diameters_sorted = diameters_lut[sort_idx]
-        
-        # Remove duplicates for clean interpolation
-        unique_mask = np.diff(fsc_sorted, prepend=-np.inf) > 0
-        fsc_unique = fsc_sorted[unique_mask]
-        diameters_unique = diameters_sorted[unique_mask]
+        def build() -> Dict[str, np.ndarray]:
+            logger.debug(f"Building LUT: {min_diameter}-{max_diameter}nm, {lut_resolution} points")
+            
+            diameters_lut = np.linspace(min_diameter, max_diameter, lut_resolution)
+            fsc_lut = np.zeros(lut_resolution)
+            
+            for i, d in enumerate(diameters_lut):
+                result = self.calculate_scattering_efficiency(d, validate=False)
+                fsc_lut[i] = result.forward_scatter
+            
+            # Sort by FSC (Mie resonances can cause non-monotonicity)
+            sort_idx = np.argsort(fsc_lut)
+            fsc_sorted = fsc_lut[sort_idx]
+            diameters_sorted = diameters_lut[sort_idx]
+            
+            # Remove duplicates for clean interpolation
+            unique_mask = np.diff(fsc_sorted, prepend=-np.inf) > 0
+            return {
+                'fsc_unique': fsc_sorted[unique_mask],
+                'diameters_unique': diameters_sorted[unique_mask],
+                'diameters_lut': diameters_lut,
+                'fsc_lut': fsc_lut,
+            }
+        
+        # Build new LUT (or reuse one another calculator / worker built)
+        tables = _cached_lut(
+            "fsc",
+            (min_diameter, max_diameter, lut_resolution, self.wavelength_nm, self.n_particle, self.n_medium),
+            build,
+        )
+        fsc_unique = tables['fsc_unique']
         
         # Cache the LUT
         self._lut_cache = {
-            'fsc_unique': fsc_unique,
-            'diameters_unique': diameters_unique,
+            **tables,
             'fsc_min': fsc_unique[0],
             'fsc_max': fsc_unique[-1],
-            'diameters_lut': diameters_lut,
-            'fsc_lut': fsc_lut
         }
         self._lut_cache_key = cache_key
         
@@ -914,17 +1026,24 @@ class MultiSolutionMieCalculator:
         self.k_blue = k_blue
         
         # Build lookup tables for BOTH wavelengths
-        self.lut_diameters = np.linspace(min_diameter, max_diameter, lut_resolution)
-        
-        # Pre-compute SSC for violet (405nm)
-        self.lut_ssc_violet = np.zeros(lut_resolution)
-        for i, d in enumerate(self.lut_diameters):
-            self.lut_ssc_violet[i] = self._calc_ssc(d, self.WAVELENGTH_VIOLET)
-        
-        # Pre-compute SSC for blue (488nm)
-        self.lut_ssc_blue = np.zeros(lut_resolution)
-        for i, d in enumerate(self.lut_diameters):
-            self.lut_ssc_blue[i] = self._calc_ssc(d, self.WAVELENGTH_BLUE)
+        def build() -> Dict[str, np.ndarray]:
+            diameters = np.linspace(min_diameter, max_diameter, lut_resolution)
+            # Pre-compute SSC for violet (405nm) and blue (488nm)
+            return {
+                'diameters': diameters,
+                'ssc_violet': np.array([self._calc_ssc(d, self.WAVELENGTH_VIOLET) for d in diameters]),
+                'ssc_blue': np.array([self._calc_ssc(d, self.WAVELENGTH_BLUE) for d in diameters]),
+            }
+        
+        tables = _cached_lut(
+            "multi_ssc",
+            (n_particle, n_medium, min_diameter, max_diameter, lut_resolution,
+             self.WAVELENGTH_VIOLET, self.WAVELENGTH_BLUE),
+            build,
+        )
+        self.lut_diameters = tables['diameters']
+        self.lut_ssc_violet = tables['ssc_violet']
+        self.lut_ssc_blue = tables['ssc_blue']
         
         # Pre-compute theoretical VSSC/BSSC ratios
         with np.errstate(divide='ignore', invalid='ignore'):
@@ -1357,15 +1476,21 @@ class FCMPASSCalibrator:
         if self._ev_lut_diameters is not None:
             return
         
-        self._ev_lut_diameters = np.linspace(d_min, d_max, n_points)
-        self._ev_lut_sigmas = np.zeros(n_points)
-        
-        m_ev = complex(self.n_ev, 0)
-        for i, d in enumerate(self._ev_lut_diameters):
-            result = miepython.efficiencies(m_ev, d, self.wavelength_nm, n_env=self.n_medium)
-            self._ev_lut_sigmas[i] = float(result[1]) * np.pi * (d / 2.0) ** 2
+        def build() -> Dict[str, np.ndarray]:
+            diameters = np.linspace(d_min, d_max, n_points)
+            sigmas = np.zeros(n_points)
+            
+            m_ev = complex(self.n_ev, 0)
+            for i, d in enumerate(diameters):
+                result = miepython.efficiencies(m_ev, d, self.wavelength_nm, n_env=self.n_medium)
+                sigmas[i] = float(result[1]) * np.pi * (d / 2.0) ** 2
+            
+            logger.debug(f"EV LUT built: {d_min}-{d_max}nm, {n_points} points, RI={self.n_ev}")
+            return {'diameters': diameters, 'sigmas': sigmas}
         
-        logger.debug(f"EV LUT built: {d_min}-{d_max}nm, {n_points} points, RI={self.n_ev}")
+        tables = _cached_lut("ev_sigma", (d_min, d_max, n_points, self.wavelength_nm, self.n_ev, self.n_medium), build)
+        self._ev_lut_diameters = tables['diameters']
+        self._ev_lut_sigmas = tables['sigmas']
     
     def fit_from_beads(
         self,
@@ -1541,12 +1666,37 @@ class FCMPASSCalibrator:
         
         return result
         
+    def with_ev_ri(self, n_ev: float) -> "FCMPASSCalibrator":
+        """
+        Copy of this calibrator sizing with another EV refractive index.
+        
+        The instrument constant k depends only on the beads and detector, so
+        the copy keeps the fit and only swaps the inverse-Mie LUT (memoized
+        per RI, see _cached_lut). This instance is left unchanged, which
+        makes it safe to call on the shared calibrator returned by
+        get_fcmpass_calibration() for per-request RI overrides.
+        
+        Args:
+            n_ev: EV refractive index (e.g. 1.37, 1.40)
+        
+        Returns:
+            ``self`` if the RI is unchanged, else a new calibrator
+        """
+        if abs(self.n_ev - n_ev) < 1e-6:
+            return self
+        calibrator = copy.copy(self)
+        calibrator.n_ev = n_ev
+        calibrator._ev_lut_diameters = None
+        calibrator._ev_lut_sigmas = None
+        calibrator._build_ev_lut()
+        return calibrator
+    
     def update_ev_ri(self, n_ev: float) -> None:
         """
-        Update the EV refractive index and rebuild the inverse-Mie LUT.
+        Update the EV refractive index and rebuild the inverse-Mie LUT in place.
         
-        This allows per-request RI override without re-fitting the instrument
-        constant k, which depends only on the beads and detector.
+        Only for calibrators owned by the caller; use with_ev_ri() on the
+        shared one from get_fcmpass_calibration().
         
         Args:
             n_ev: New EV refractive index (e.g. 1.37, 1.40)
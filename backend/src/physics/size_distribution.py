@@ -26,6 +26,7 @@ from loguru import logger
 
 from .mie_scatter import MieScatterCalculator
 from .statistics_utils import (
+    binned_kde,
     calculate_mode_kde, 
     calculate_comprehensive_stats,
     create_size_histogram,
@@ -319,7 +320,9 @@ class PerEventSizeAnalyzer:
         
         # Calculate comprehensive statistics
         if n_valid > 0:
-            stats = calculate_comprehensive_stats(diameters_valid)
+            # One density estimate shared by the mode and multimodality checks
+            kde = binned_kde(diameters_valid) if n_valid >= 3 else None
+            stats = calculate_comprehensive_stats(diameters_valid, kde=kde)
             stats_dict = asdict(stats)
             
             # Create histogram
@@ -331,7 +334,7 @@ class PerEventSizeAnalyzer:
             )
             
             # Check for multimodality
-            multimodality = detect_multimodality(diameters_valid)
+            multimodality = detect_multimodality(diameters_valid, kde=kde)
             
         else:
             stats_dict = {}
@@ -7,15 +7,22 @@ Provides improved statistical methods for particle sizing:
 2. Multi-modal distribution detection
 3. Configurable histogram binning
 4. Bootstrap confidence intervals
+5. Binned FFT KDE engine shared by all of the above (O(N + G log G))
+6. Closed-form / Newton MLE distribution fitting (binned for large N)
 
 Author: CRMIT Backend Team
 Date: January 20, 2026
 """
 
+import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, List, Optional, Dict, Any, Union, cast
 from scipy import stats
-from scipy.signal import find_peaks
+from scipy.fft import dct
+from scipy.optimize import brentq
+from scipy.signal import fftconvolve, find_peaks
+from scipy.special import digamma, polygamma
 from dataclasses import dataclass
 from loguru import logger
 
@@ -80,11 +87,200 @@ class DistributionStats:
     ci_95_mean: Tuple[float, float]
 
 
+# ============================================================================
+# Binned KDE Engine
+# ============================================================================
+
+# Kernel is truncated at this many bandwidths (mass beyond 5 sigma < 1e-6)
+KDE_KERNEL_TRUNCATE = 5.0
+
+# Grid spacing is kept at or below bandwidth / KDE_MIN_POINTS_PER_BANDWIDTH so
+# binning error stays far below the statistical error of the estimate
+KDE_MIN_POINTS_PER_BANDWIDTH = 4
+KDE_MAX_GRID_SIZE = 2 ** 16
+
+
+@dataclass
+class KDEResult:
+    """
+    Gaussian KDE evaluated on a regular grid.
+    
+    Attributes:
+        x: Grid points
+        density: Density at each grid point (integrates to ~1)
+        bandwidth: Kernel standard deviation in data units
+        factor: bandwidth / std(data), i.e. scipy's gaussian_kde.factor
+        n: Number of data points used
+    """
+    x: np.ndarray
+    density: np.ndarray
+    bandwidth: float
+    factor: float
+    n: int
+    
+    def at(self, values) -> np.ndarray:
+        """Density at arbitrary points (linear interpolation on the grid)."""
+        return np.interp(values, self.x, self.density, left=0.0, right=0.0)
+
+
+def _isj_bandwidth(data: np.ndarray, lo: float, hi: float, grid_size: int = 1024) -> Optional[float]:
+    """
+    Improved Sheather-Jones bandwidth (Botev, Grotowski & Kroese 2010).
+    
+    Solves the fixed-point equation on the DCT of the binned data; returns
+    None if no root is bracketed (callers fall back to Silverman).
+    """
+    n = len(data)
+    span = hi - lo
+    counts, _ = np.histogram(data, bins=grid_size, range=(lo, hi))
+    a = dct(counts / counts.sum(), type=2)
+    i_sq = np.arange(1, grid_size, dtype=np.float64) ** 2
+    a2 = (a[1:] / 2.0) ** 2
+    
+    def fixed_point(t: float) -> float:
+        ell = 7
+        f = 2.0 * np.pi ** (2 * ell) * np.sum(i_sq ** ell * a2 * np.exp(-i_sq * np.pi ** 2 * t))
+        if f <= 0:
+            return -1.0
+        for s in range(ell - 1, 1, -1):
+            k0 = np.prod(np.arange(1, 2 * s, 2, dtype=np.float64)) / np.sqrt(2 * np.pi)
+            const = (1 + 0.5 ** (s + 0.5)) / 3.0
+            time = (2 * const * k0 / (n * f)) ** (2.0 / (3 + 2 * s))
+            f = 2.0 * np.pi ** (2 * s) * np.sum(i_sq ** s * a2 * np.exp(-i_sq * np.pi ** 2 * time))
+        return t - (2 * n * np.sqrt(np.pi) * f) ** -0.4
+    
+    try:
+        t_star = brentq(fixed_point, 0.0, 0.1)
+    except ValueError:
+        return None
+    return float(np.sqrt(t_star) * span)
+
+
+def kde_bandwidth(data: np.ndarray, method: Union[str, float] = 'scott') -> float:
+    """
+    Gaussian kernel bandwidth (standard deviation, in data units).
+    
+    Args:
+        data: Finite values
+        method: 'scott' or 'silverman' (same rules as scipy.stats.gaussian_kde),
+               'isj' (Improved Sheather-Jones, robust for multimodal data),
+               or a float factor multiplied by std(data) as in scipy's bw_method
+        
+    Returns:
+        Bandwidth in data units
+    """
+    n = len(data)
+    std = float(np.std(data, ddof=1)) if n > 1 else 0.0
+    if isinstance(method, (int, float)):
+        return float(method) * std
+    method = method.lower()
+    if method == 'scott':
+        return std * n ** (-1.0 / 5.0)
+    if method == 'silverman':
+        return std * (n * 3.0 / 4.0) ** (-1.0 / 5.0)
+    if method == 'isj':
+        lo, hi = float(data.min()), float(data.max())
+        margin = (hi - lo) * 0.1
+        h = _isj_bandwidth(data, lo - margin, hi + margin) if hi > lo else None
+        if h is None or not np.isfinite(h) or h <= 0:
+            logger.debug("ISJ bandwidth did not converge, using Silverman's rule")
+            return kde_bandwidth(data, 'silverman')
+        return h
+    raise ValueError(f"Unknown bandwidth method: {method}")
+
+
+def binned_kde(
+    data: np.ndarray,
+    bandwidth: Union[str, float, None] = 'scott',
+    grid_size: int = 1000,
+    x_range: Optional[Tuple[float, float]] = None,
+    margin: float = 0.1,
+) -> KDEResult:
+    """
+    Gaussian KDE by linear binning onto a grid + FFT convolution.
+    
+    Cost is O(N + G log G) instead of O(N x G) for evaluating
+    scipy.stats.gaussian_kde on a G-point grid; the result matches it to
+    well under 1% of the peak density.
+    
+    Args:
+        data: Array of values (non-finite values are ignored)
+        bandwidth: Method name ('scott', 'silverman', 'isj'), a float factor
+                  of std(data) (scipy bw_method semantics), or None for Scott
+        grid_size: Minimum number of grid points; raised automatically so
+                  the grid resolves the bandwidth
+        x_range: (min, max) of the grid; values outside are dropped and the
+                density is normalized over the values inside. Default: data
+                range extended by ``margin`` on both sides
+        margin: Fraction of the data range added on each side (default grid)
+        
+    Returns:
+        KDEResult with the density grid
+        
+    Raises:
+        ValueError: If fewer than 2 finite values are given
+    """
+    data = np.asarray(data, dtype=np.float64)
+    data = data[np.isfinite(data)]
+    if len(data) < 2:
+        raise ValueError(f"Need at least 2 finite values for a KDE (got {len(data)})")
+    
+    std = float(np.std(data, ddof=1))
+    h = kde_bandwidth(data, 'scott' if bandwidth is None else bandwidth)
+    
+    if x_range is None:
+        d_min, d_max = float(data.min()), float(data.max())
+        pad = max((d_max - d_min) * margin, 3.0 * h)
+        lo, hi = d_min - pad, d_max + pad
+    else:
+        lo, hi = float(x_range[0]), float(x_range[1])
+        data = data[(data >= lo) & (data <= hi)]
+    
+    if not (h > 0 and hi > lo) or len(data) == 0:
+        # Degenerate (constant data): all mass at one point
+        center = float(np.median(data)) if len(data) else (lo + hi) / 2
+        x = np.linspace(center - 1.0, center + 1.0, grid_size | 1)
+        density = np.zeros(len(x))
+        density[np.argmin(np.abs(x - center))] = 1.0 / (x[1] - x[0])
+        return KDEResult(x=x, density=density, bandwidth=0.0, factor=0.0, n=len(data))
+    
+    needed = int(np.ceil((hi - lo) / h * KDE_MIN_POINTS_PER_BANDWIDTH)) + 1
+    g = int(min(max(grid_size, needed), KDE_MAX_GRID_SIZE))
+    x = np.linspace(lo, hi, g)
+    dx = x[1] - x[0]
+    
+    # Linear binning: each value splits its unit weight between its two
+    # neighbouring grid points
+    pos = (data - lo) / dx
+    left = np.clip(np.floor(pos).astype(np.int64), 0, g - 2)
+    frac = np.clip(pos - left, 0.0, 1.0)
+    counts = (np.bincount(left, weights=1.0 - frac, minlength=g)
+              + np.bincount(left + 1, weights=frac, minlength=g))
+    
+    # Gaussian kernel sampled at grid offsets (at least one point either side)
+    half = max(1, int(np.ceil(KDE_KERNEL_TRUNCATE * h / dx)))
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / h) ** 2)
+    kernel /= kernel.sum() * dx  # exact unit mass on the grid, even if h < dx
+    
+    density = fftconvolve(counts, kernel, mode='same') / len(data)
+    density = np.maximum(density, 0.0)  # FFT round-off
+    
+    return KDEResult(
+        x=x,
+        density=density,
+        bandwidth=float(h),
+        factor=float(h / std) if std > 0 else 0.0,
+        n=len(data),
+    )
+
+
 def calculate_mode_kde(
     data: np.ndarray,
-    bandwidth: Optional[float] = None,
+    bandwidth: Union[str, float, None] = None,
     n_points: int = 1000,
-    return_full: bool = False
+    return_full: bool = False,
+    kde: Optional[KDEResult] = None,
 ) -> float | ModeResult:
     """
     Calculate mode using Kernel Density Estimation.
@@ -96,9 +292,11 @@ def calculate_mode_kde(
     
     Args:
         data: Array of values
-        bandwidth: KDE bandwidth (Scott's rule if None)
-        n_points: Number of points for KDE evaluation
+        bandwidth: KDE bandwidth (Scott's rule if None); a float is a factor
+                  of std(data) as in scipy's bw_method, or 'silverman' / 'isj'
+        n_points: Minimum number of points for KDE evaluation
         return_full: If True, return ModeResult with details
+        kde: Precomputed binned_kde() of the same data, to avoid recomputing
         
     Returns:
         Mode value, or ModeResult if return_full=True
@@ -113,20 +311,24 @@ def calculate_mode_kde(
         return mode
     
     # Create KDE
-    try:
-        kde = stats.gaussian_kde(data, bw_method=bandwidth)
-    except Exception as e:
-        logger.warning(f"KDE failed: {e}, using histogram fallback")
+    if kde is None:
+        try:
+            kde = binned_kde(data, bandwidth=bandwidth, grid_size=n_points)
+        except Exception as e:
+            logger.warning(f"KDE failed: {e}, using histogram fallback")
+            mode = float(np.median(data))
+            if return_full:
+                return ModeResult(mode=mode, modes=[mode], method='median_fallback')
+            return mode
+    
+    if kde.bandwidth <= 0:
+        # Constant data: nothing to smooth
         mode = float(np.median(data))
         if return_full:
             return ModeResult(mode=mode, modes=[mode], method='median_fallback')
         return mode
     
-    # Evaluate KDE on fine grid
-    data_range = data.max() - data.min()
-    margin = data_range * 0.1
-    x_grid = np.linspace(data.min() - margin, data.max() + margin, n_points)
-    density = kde(x_grid)
+    x_grid, density = kde.x, kde.density
     
     # Find primary mode (global maximum)
     mode_idx = np.argmax(density)
@@ -141,8 +343,8 @@ def calculate_mode_kde(
     if len(peaks) == 0:
         modes = [primary_mode]
     else:
-        modes = sorted([float(x_grid[p]) for p in peaks], 
-                      key=lambda x: -kde([x])[0])
+        by_density = peaks[np.argsort(-density[peaks], kind='stable')]
+        modes = [float(x_grid[p]) for p in by_density]
     
     # Estimate confidence based on peak prominence
     if len(peaks) > 0:
@@ -156,7 +358,7 @@ def calculate_mode_kde(
         mode=primary_mode,
         modes=modes,
         method='kde',
-        bandwidth=float(kde.factor),  # type: ignore[arg-type]
+        bandwidth=kde.factor,
         confidence=confidence
     )
 
@@ -208,7 +410,8 @@ def calculate_mode_histogram(
 def calculate_comprehensive_stats(
     data: np.ndarray,
     bootstrap_ci: bool = True,
-    n_bootstrap: int = 1000
+    n_bootstrap: int = 1000,
+    kde: Optional[KDEResult] = None,
 ) -> DistributionStats:
     """
     Calculate comprehensive distribution statistics.
@@ -217,6 +420,7 @@ def calculate_comprehensive_stats(
         data: Array of values
         bootstrap_ci: Calculate bootstrap confidence intervals
         n_bootstrap: Number of bootstrap samples
+        kde: Precomputed binned_kde() of the same data (used for the mode)
         
     Returns:
         DistributionStats with all statistics
@@ -234,7 +438,7 @@ def calculate_comprehensive_stats(
     median = float(np.median(data))
     
     # Mode using KDE
-    mode_full = cast(ModeResult, calculate_mode_kde(data, return_full=True))
+    mode_full = cast(ModeResult, calculate_mode_kde(data, return_full=True, kde=kde))
     mode = mode_full.mode
     modes = mode_full.modes
     
@@ -290,7 +494,8 @@ def calculate_comprehensive_stats(
 
 def detect_multimodality(
     data: np.ndarray,
-    significance: float = 0.05
+    significance: float = 0.05,
+    kde: Optional[KDEResult] = None,
 ) -> Dict[str, Any]:
     """
     Test for multimodality in the distribution.
@@ -300,6 +505,7 @@ def detect_multimodality(
     Args:
         data: Array of values
         significance: Significance level for tests
+        kde: Precomputed binned_kde() of the same data, to avoid recomputing
         
     Returns:
         Dictionary with multimodality analysis results
@@ -307,30 +513,29 @@ def detect_multimodality(
     data = np.asarray(data)
     data = data[np.isfinite(data)]
     
+    # One density estimate serves both mode finding and the density checks
+    if kde is None and len(data) >= 3:
+        try:
+            kde = binned_kde(data)
+        except Exception as e:
+            logger.warning(f"KDE failed: {e}")
+    
     # Get KDE-based modes
-    mode_full = cast(ModeResult, calculate_mode_kde(data, return_full=True))
+    mode_full = cast(ModeResult, calculate_mode_kde(data, return_full=True, kde=kde))
     n_modes = len(mode_full.modes)
-    
-    # Silverman's test for multimodality
-    # Compare bandwidth for unimodal vs current fit
-    try:
-        kde = stats.gaussian_kde(data)
-        bandwidth = kde.factor
-    except:
-        bandwidth = None
+    bandwidth = kde.factor if kde is not None else None
     
     # Simple heuristic: check if secondary modes have significant density
     significant_modes = []
-    if n_modes > 1 and bandwidth:
-        kde = stats.gaussian_kde(data)
-        primary_density = kde([mode_full.mode])[0]
+    if n_modes > 1 and bandwidth and kde is not None:
+        mode_densities = kde.at(np.asarray(mode_full.modes))
+        primary_density = float(kde.at(mode_full.mode))
         
-        for m in mode_full.modes:
-            density = kde([m])[0]
+        for m, density in zip(mode_full.modes, mode_densities):
             if density >= 0.3 * primary_density:  # At least 30% of primary
                 significant_modes.append({
                     'mode': m,
-                    'relative_density': density / primary_density
+                    'relative_density': float(density / primary_density)
                 })
     else:
         significant_modes = [{'mode': mode_full.mode, 'relative_density': 1.0}]
@@ -692,9 +897,199 @@ def test_normality(
     }
 
 
+# ============================================================================
+# Fast Distribution Fitting
+# ============================================================================
+
+# Above this many values, likelihoods and KS statistics are computed on a
+# fine log-spaced histogram instead of every value
+FIT_BINNED_MIN_SAMPLES = 200_000
+FIT_BINNED_BINS = 8192
+
+# Candidate distributions are fitted on a thread pool above this size
+FIT_PARALLEL_MIN_SAMPLES = 20_000
+
+FIT_NEWTON_MAX_ITER = 50
+FIT_NEWTON_TOL = 1e-10
+
+_DIST_ALIASES = {
+    'gaussian': 'normal',
+    'lognormal': 'lognorm',
+    'weibull': 'weibull_min',
+}
+
+
+@dataclass
+class _FitData:
+    """
+    Sufficient statistics of positive data for MLE fitting.
+    
+    Moments are exact; ``values``/``weights`` are either the sorted raw data
+    (weights None) or log-spaced bin centers with their counts.
+    """
+    n: int
+    minimum: float
+    mean: float
+    var: float
+    log_mean: float
+    log_var: float
+    values: np.ndarray
+    weights: Optional[np.ndarray] = None
+    edges: Optional[np.ndarray] = None
+    
+    @property
+    def binned(self) -> bool:
+        return self.weights is not None
+
+
+def _prepare_fit_data(data: np.ndarray, binned: Optional[bool] = None) -> _FitData:
+    """Summarize positive, finite data for fitting (sorted, or histogrammed if binned)."""
+    n = len(data)
+    log_data = np.log(data)
+    if binned is None:
+        binned = n >= FIT_BINNED_MIN_SAMPLES
+    
+    if binned:
+        lo, hi = float(log_data.min()), float(log_data.max())
+        if hi <= lo:
+            hi = lo + 1e-9
+        log_edges = np.linspace(lo, hi, FIT_BINNED_BINS + 1)
+        counts, _ = np.histogram(log_data, bins=log_edges)
+        used = counts > 0
+        values = np.exp(0.5 * (log_edges[:-1] + log_edges[1:]))[used]
+        weights = counts[used].astype(np.float64)
+        edges = np.exp(log_edges)
+        # Keep the outer edges exact so the data range is covered
+        edges[0], edges[-1] = float(data.min()), float(data.max())
+        order_stats = dict(values=values, weights=weights, edges=np.stack([
+            edges[:-1][used], edges[1:][used]
+        ]))
+    else:
+        order_stats = dict(values=np.sort(data))
+    
+    return _FitData(
+        n=n,
+        minimum=float(data.min()),
+        mean=float(np.mean(data)),
+        var=float(np.var(data)),
+        log_mean=float(np.mean(log_data)),
+        log_var=float(np.var(log_data)),
+        **order_stats,
+    )
+
+
+def _gamma_shape_mle(fd: _FitData) -> float:
+    """Gamma shape MLE (loc=0): Newton on log(a) - digamma(a) = log(mean) - mean(log x)."""
+    s = np.log(fd.mean) - fd.log_mean
+    if not s > 0:
+        raise ValueError("Degenerate data for gamma fit")
+    # Minka's closed-form starting point (within ~1.5% of the MLE)
+    a = (3.0 - s + np.sqrt((s - 3.0) ** 2 + 24.0 * s)) / (12.0 * s)
+    for _ in range(FIT_NEWTON_MAX_ITER):
+        f = np.log(a) - digamma(a) - s
+        step = f / (1.0 / a - polygamma(1, a))
+        a_next = a - step
+        a = a_next if a_next > 0 else a / 2.0
+        if abs(step) < FIT_NEWTON_TOL * a:
+            break
+    return float(a)
+
+
+def _weibull_mle(fd: _FitData) -> Tuple[float, float]:
+    """
+    Weibull (shape, scale) MLE with loc=0.
+    
+    Newton on the profile equation sum(x^c ln x)/sum(x^c) - 1/c - mean(ln x) = 0,
+    using log values shifted by their maximum so x^c cannot overflow.
+    """
+    w = fd.weights if fd.weights is not None else np.ones(len(fd.values))
+    y = np.log(fd.values)
+    y_max = float(y.max())
+    y = y - y_max
+    y_mean = fd.log_mean - y_max
+    total = float(w.sum())
+    
+    # Moment estimate from the log-variance (Menon 1963) as starting point
+    c = np.pi / np.sqrt(6.0 * fd.log_var) if fd.log_var > 0 else 1.0
+    for _ in range(FIT_NEWTON_MAX_ITER):
+        e = w * np.exp(c * y)
+        a, b, d = e.sum(), (e * y).sum(), (e * y * y).sum()
+        f = b / a - 1.0 / c - y_mean
+        fprime = (d / a - (b / a) ** 2) + 1.0 / c ** 2
+        step = f / fprime
+        c_next = c - step
+        c = c_next if c_next > 0 else c / 2.0
+        if abs(step) < FIT_NEWTON_TOL * c:
+            break
+    
+    scale = np.exp(y_max) * (np.sum(w * np.exp(c * y)) / total) ** (1.0 / c)
+    return float(c), float(scale)
+
+
+def _fit_params(fd: _FitData, dist_name: str) -> Tuple[Tuple[float, ...], str]:
+    """
+    Maximum-likelihood parameters in scipy's (shape, loc, scale) order.
+    
+    Size distributions are fitted with loc=0 (except expon, whose loc MLE is
+    the minimum), so the shape/scale MLEs are closed-form or 1-D Newton
+    solves on sufficient statistics.
+    
+    Returns:
+        (params, method) where method is 'closed_form' or 'newton'
+    """
+    if dist_name == 'normal':
+        return (fd.mean, np.sqrt(fd.var)), 'closed_form'
+    if dist_name == 'lognorm':
+        return (np.sqrt(fd.log_var), 0.0, np.exp(fd.log_mean)), 'closed_form'
+    if dist_name == 'expon':
+        return (fd.minimum, fd.mean - fd.minimum), 'closed_form'
+    if dist_name == 'gamma':
+        a = _gamma_shape_mle(fd)
+        return (a, 0.0, fd.mean / a), 'newton'
+    if dist_name == 'weibull_min':
+        c, scale = _weibull_mle(fd)
+        return (c, 0.0, scale), 'newton'
+    raise ValueError(f"No fast fitter for {dist_name}")
+
+
+def _log_likelihood(fd: _FitData, dist, params: Tuple[float, ...]) -> float:
+    """Log-likelihood; on binned data, the piecewise-constant density approximation."""
+    if not fd.binned:
+        return float(np.sum(dist.logpdf(fd.values, *params)))
+    lo, hi = fd.edges  # type: ignore[misc]
+    mass = dist.cdf(hi, *params) - dist.cdf(lo, *params)
+    with np.errstate(divide='ignore'):
+        log_density = np.log(mass) - np.log(hi - lo)
+    return float(np.sum(fd.weights * log_density))
+
+
+def _ks_test(fd: _FitData, dist, params: Tuple[float, ...]) -> Tuple[float, float]:
+    """
+    One-sample KS statistic and p-value (same p-value as scipy.stats.kstest).
+    
+    On binned data the empirical CDF is compared at bin edges, which
+    underestimates D by at most the mass of one bin.
+    """
+    n = fd.n
+    if not fd.binned:
+        cdf = dist.cdf(fd.values, *params)
+        ranks = np.arange(1, n + 1) / n
+        d = max(float(np.max(ranks - cdf)), float(np.max(cdf - (ranks - 1.0 / n))))
+    else:
+        ecdf = np.cumsum(fd.weights) / n
+        upper = dist.cdf(fd.edges[1], *params)  # type: ignore[index]
+        lower = dist.cdf(fd.edges[0], *params)  # type: ignore[index]
+        d = max(float(np.max(np.abs(ecdf - upper))),
+                float(np.max(np.abs((ecdf - fd.weights / n) - lower))))
+    pvalue = float(np.clip(stats.kstwo.sf(d, n), 0.0, 1.0))
+    return d, pvalue
+
+
 def fit_distributions(
     data: np.ndarray,
-    distributions: Optional[List[str]] = None
+    distributions: Optional[List[str]] = None,
+    binned: Optional[bool] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Fit multiple probability distributions to particle size data and compare.
@@ -714,6 +1109,9 @@ def fit_distributions(
     Args:
         data: Array of particle sizes (nm), must be positive
         distributions: List of distribution names to fit (default: all)
+        binned: Evaluate likelihood/KS on a fine log histogram instead of
+               every value (default: when n >= FIT_BINNED_MIN_SAMPLES)
+        max_workers: Threads for fitting candidates concurrently (default: up to 4)
         
     Returns:
         Dictionary containing:
@@ -732,6 +1130,8 @@ def fit_distributions(
         'Recommended: lognorm'
     
     Notes:
+        - Parameters are maximum-likelihood estimates with loc=0 for
+          lognorm/gamma/weibull (closed form or Newton on sufficient statistics)
         - AIC = 2k - 2ln(L) where k = number of parameters, L = likelihood
         - Lower AIC indicates better fit (penalizes complexity)
         - Weibull often wins statistically but log-normal is better for biology
@@ -771,31 +1171,34 @@ def fit_distributions(
         'expon': stats.expon,
     }
     
-    fits: Dict[str, Dict[str, Any]] = {}
+    fit_data = _prepare_fit_data(data, binned=binned)
     
-    for dist_name in distributions:
-        if dist_name not in dist_map:
-            logger.warning(f"Unknown distribution: {dist_name}, skipping")
-            continue
-            
+    def fit_one(dist_name: str) -> Dict[str, Any]:
         dist = dist_map[dist_name]
-        
+        canonical = 'weibull_min' if dist_name == 'weibull' else dist_name
         try:
-            # Fit distribution to data
-            params = dist.fit(data)
+            try:
+                params, method = _fit_params(fit_data, canonical)
+                if not np.all(np.isfinite(params)):
+                    raise ValueError("non-finite parameters")
+            except Exception as e:
+                # Generic optimizer as a fallback, still with loc fixed at 0
+                logger.debug(f"Fast {dist_name} fit failed ({e}), using generic optimizer")
+                params = dist.fit(data, floc=0) if canonical in ('lognorm', 'gamma', 'weibull_min') else dist.fit(data)
+                method = 'numerical'
             
             # Calculate log-likelihood
-            log_likelihood = np.sum(dist.logpdf(data, *params))
+            log_likelihood = _log_likelihood(fit_data, dist, params)
             
-            # Calculate AIC and BIC
-            k = len(params)  # Number of parameters
+            # Calculate AIC and BIC (loc=0 is fixed, not estimated)
+            k = len(params) - (1 if canonical in ('lognorm', 'gamma', 'weibull_min') else 0)
             aic = 2 * k - 2 * log_likelihood
             bic = k * np.log(n) - 2 * log_likelihood
             
             # Kolmogorov-Smirnov goodness-of-fit test
-            ks_stat, ks_pvalue = stats.kstest(data, dist.cdf, args=params)
+            ks_stat, ks_pvalue = _ks_test(fit_data, dist, params)
             
-            fits[dist_name] = {
+            return {
                 'params': [float(p) for p in params],
                 'param_names': _get_param_names(dist_name),
                 'log_likelihood': float(log_likelihood),
@@ -803,18 +1206,35 @@ def fit_distributions(
                 'bic': float(bic),
                 'ks_statistic': float(ks_stat),
                 'ks_pvalue': float(ks_pvalue),
-                'n_params': k
+                'n_params': k,
+                'fit_method': 'binned' if fit_data.binned else method,
             }
             
         except Exception as e:
             logger.warning(f"Failed to fit {dist_name}: {e}")
-            fits[dist_name] = {
+            return {
                 'error': str(e),
                 'params': [],
                 'aic': float('inf'),
                 'bic': float('inf')
             }
     
+    known = []
+    for dist_name in distributions:
+        if dist_name not in dist_map:
+            logger.warning(f"Unknown distribution: {dist_name}, skipping")
+            continue
+        known.append(dist_name)
+    
+    # The fits are independent and numpy releases the GIL in the heavy parts
+    workers = max_workers or min(len(known), 4, os.cpu_count() or 1)
+    if workers > 1 and len(known) > 1 and n >= FIT_PARALLEL_MIN_SAMPLES:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(fit_one, known))
+    else:
+        results = [fit_one(dist_name) for dist_name in known]
+    fits: Dict[str, Dict[str, Any]] = dict(zip(known, results))
+    
     # Rank distributions by AIC
     valid_fits = {k: v for k, v in fits.items() if 'error' not in v}
     
@@ -887,7 +1307,8 @@ def generate_distribution_overlay(
     data: np.ndarray,
     distribution: str = 'lognorm',
     n_points: int = 200,
-    x_range: Optional[Tuple[float, float]] = None
+    x_range: Optional[Tuple[float, float]] = None,
+    params: Optional[List[float]] = None,
 ) -> Dict[str, Any]:
     """
     Generate theoretical distribution curve for histogram overlay visualization.
@@ -901,6 +1322,8 @@ def generate_distribution_overlay(
         distribution: Distribution to fit ('normal', 'lognorm', 'gamma', 'weibull_min')
         n_points: Number of points for the curve (higher = smoother)
         x_range: Optional (min, max) range for x-axis; auto-detected if None
+        params: Already-fitted parameters (e.g. from fit_distributions());
+               fitted here if None
         
     Returns:
         Dictionary containing:
@@ -959,7 +1382,12 @@ def generate_distribution_overlay(
     
     try:
         # Fit distribution
-        params = dist.fit(data)
+        if params is None:
+            canonical = _DIST_ALIASES.get(distribution.lower(), distribution.lower())
+            try:
+                params = list(_fit_params(_prepare_fit_data(data), canonical)[0])
+            except ValueError:
+                params = list(dist.fit(data))
         
         # Generate x range
         if x_range is None:
@@ -1020,6 +1448,31 @@ def generate_distribution_overlay(
         }
 
 
+def _kde_overlay(data: np.ndarray, kde: KDEResult, n_points: int = 200) -> Dict[str, Any]:
+    """
+    KDE density curve in the same format as generate_distribution_overlay().
+    
+    Uses the same x range and histogram scaling as the parametric overlays so
+    the curves can be drawn together.
+    """
+    x_min = max(0, np.percentile(data, 0.5))
+    x_max = np.percentile(data, 99.5)
+    margin = (x_max - x_min) * 0.1
+    x = np.linspace(max(0, x_min - margin), x_max + margin, n_points)
+    y_pdf = kde.at(x)
+    bin_width = (np.max(data) - np.min(data)) / 50  # Same ~50-bin scaling as the fits
+    return {
+        'x': x.tolist(),
+        'y_pdf': y_pdf.tolist(),
+        'y_scaled': (y_pdf * len(data) * bin_width).tolist(),
+        'bandwidth': kde.bandwidth,
+        'mode': float(kde.x[np.argmax(kde.density)]),
+        'label': f"KDE (h={kde.bandwidth:.1f})",
+        'distribution': 'kde',
+        'n_samples': len(data),
+    }
+
+
 def comprehensive_distribution_analysis(
     data: np.ndarray,
     include_overlays: bool = True
@@ -1040,6 +1493,7 @@ def comprehensive_distribution_analysis(
         - normality_tests: Results from test_normality()
         - distribution_fits: Results from fit_distributions()
         - overlays: Curve data for each fitted distribution (if requested)
+        - kde: Empirical KDE curve in the same format as an overlay (if requested)
         - summary_statistics: Mean, median, mode, percentiles, etc.
         - conclusion: Overall interpretation and recommendations
         
@@ -1082,6 +1536,12 @@ def comprehensive_distribution_analysis(
         'kurtosis': float(stats.kurtosis(data)),
     }
     
+    # One binned KDE of the sizes drives the mode and the empirical density curve
+    kde = binned_kde(data) if n >= 3 else None
+    mode_full = cast(ModeResult, calculate_mode_kde(data, return_full=True, kde=kde))
+    summary_stats['mode'] = mode_full.mode
+    summary_stats['modes'] = mode_full.modes
+    
     # Determine skewness type
     skewness = summary_stats['skewness']
     if abs(skewness) < 0.5:
@@ -1097,7 +1557,9 @@ def comprehensive_distribution_analysis(
     overlays = {}
     if include_overlays:
         for dist_name in ['normal', 'lognorm', 'gamma', 'weibull_min']:
-            overlays[dist_name] = generate_distribution_overlay(data, dist_name)
+            fitted = fits.get('fits', {}).get(dist_name, {}).get('params') or None
+            overlays[dist_name] = generate_distribution_overlay(data, dist_name, params=fitted)
+    kde_curve = _kde_overlay(data, kde) if include_overlays and kde is not None else None
     
     # Generate overall conclusion
     conclusion = {
@@ -1123,6 +1585,7 @@ def comprehensive_distribution_analysis(
         'distribution_fits': fits,
         'summary_statistics': summary_stats,
         'overlays': overlays if include_overlays else None,
+        'kde': kde_curve,
         'conclusion': conclusion,
         'n_samples': n
     }
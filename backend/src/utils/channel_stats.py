@@ -0,0 +1,201 @@
+"""
+Fused per-channel statistics for FCS event matrices.
+
+One kernel for every place that summarises channels (upload, re-analysis,
+NanoFACS AI context, batch scripts). For each column of an (events × channels)
+float32 matrix it computes, in one call:
+
+- min / max and all requested quantiles from one multi-quantile selection:
+  single-``kth`` in-place partitions applied by bisection over the needed
+  order statistics (instead of one full sort per ``Series.quantile`` call).
+  ``np.partition`` with a list of ``kth`` falls back to a scalar introselect
+  that is ~5x slower than this on SIMD builds of numpy.
+- mean, std, skewness and kurtosis from one pass of shifted power sums,
+  accumulated in float64 in cache-sized chunks
+
+Columns are independent and numpy releases the GIL for both steps, so they
+are processed on a thread pool.
+
+Semantics match pandas: std uses ddof=1, skewness/kurtosis are the same
+bias-corrected estimators as ``Series.skew`` / ``Series.kurtosis`` and
+quantiles use linear interpolation. Non-finite values are ignored.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90, 0.95)
+
+_CHUNK = 1 << 16  # events per moment chunk (~512 KB of float64)
+
+
+def _power_sums(values: np.ndarray, shift: float):
+    """Sums of d, d², d³, d⁴ with d = values - shift, in float64 chunks."""
+    s1 = s2 = s3 = s4 = 0.0
+    for start in range(0, values.size, _CHUNK):
+        d = values[start:start + _CHUNK].astype(np.float64)
+        d -= shift
+        d2 = d * d
+        s1 += float(d.sum())
+        s2 += float(d2.sum())
+        s3 += float(np.dot(d2, d))
+        s4 += float(np.dot(d2, d2))
+    return s1, s2, s3, s4
+
+
+def _select(a: np.ndarray, kth: Sequence[int], offset: int = 0):
+    """
+    Partially sort ``a`` in place so every absolute index in ``kth`` (sorted,
+    relative to ``offset``) holds its order statistic.
+    """
+    if not kth:
+        return
+    mid = len(kth) // 2
+    k = kth[mid] - offset
+    a.partition(k)
+    _select(a[:k], kth[:mid], offset)
+    _select(a[k + 1:], kth[mid + 1:], offset + k + 1)
+
+
+def _quantile_positions(n: int, quantiles: Sequence[float]):
+    pos = np.asarray(quantiles, dtype=np.float64) * (n - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, n - 1)
+    return pos - lo, lo, hi
+
+
+def column_statistics(
+    values: np.ndarray,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> Optional[Dict[str, float]]:
+    """
+    Statistics of one 1-D column. Returns None if it has no finite values.
+
+    Keys: count, mean, std, min, max, median, skewness, kurtosis and
+    ``quantiles`` as a {q: value} dict.
+    """
+    col = np.asarray(values).reshape(-1)
+    if col.dtype != np.float32 and col.dtype != np.float64:
+        col = col.astype(np.float32)
+
+    finite = np.isfinite(col)
+    # Selection works in place, so always take a private copy
+    col = col[finite] if not finite.all() else col.copy()
+    n = col.size
+    if n == 0:
+        return None
+
+    # ── order statistics: min, max and every quantile in one selection ────
+    quantiles = tuple(quantiles)
+    frac, lo, hi = _quantile_positions(n, (0.5,) + quantiles)
+    kth = np.unique(np.concatenate(([0, n - 1], lo, hi)))
+    part = col
+    _select(part, kth.tolist())
+    lo_v = part[lo].astype(np.float64)
+    hi_v = part[hi].astype(np.float64)
+    q_vals = lo_v + (hi_v - lo_v) * frac
+    median = float(q_vals[0])
+
+    # ── moments: shifted by the median to avoid cancellation ──────────────
+    s1, s2, s3, s4 = _power_sums(col, median)
+    a = s1 / n                                   # mean - median
+    mean = median + a
+    c2 = max(s2 - n * a * a, 0.0)                # Σ(x-μ)²
+    c3 = s3 - 3 * a * s2 + 2 * n * a ** 3        # Σ(x-μ)³
+    c4 = s4 - 4 * a * s3 + 6 * a * a * s2 - 3 * n * a ** 4
+
+    std = float(np.sqrt(c2 / (n - 1))) if n > 1 else float("nan")
+
+    # Same estimators (and degenerate cases) as pandas nanskew / nankurt
+    if n < 3:
+        skew = float("nan")
+    elif c2 < 1e-14:
+        skew = 0.0
+    else:
+        skew = (n * (n - 1) ** 0.5 / (n - 2)) * (c3 / c2 ** 1.5)
+
+    if n < 4:
+        kurt = float("nan")
+    elif c2 < 1e-14:
+        kurt = 0.0
+    else:
+        adj = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        kurt = (n * (n + 1) * (n - 1) * c4) / ((n - 2) * (n - 3) * c2 * c2) - adj
+
+    return {
+        "count": int(n),
+        "mean": float(mean),
+        "std": std,
+        "min": float(part[0]),
+        "max": float(part[n - 1]),
+        "median": median,
+        "skewness": float(skew),
+        "kurtosis": float(kurt),
+        "quantiles": {q: float(v) for q, v in zip(quantiles, q_vals[1:])},
+    }
+
+
+def _max_workers(n_columns: int, max_workers: Optional[int]) -> int:
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+    return max(1, min(max_workers, n_columns))
+
+
+def channel_statistics(
+    matrix: np.ndarray,
+    names: Sequence[str],
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[Dict[str, float]]]:
+    """
+    column_statistics() for every column of an (events × channels) matrix.
+
+    Columns are processed concurrently; pass ``max_workers=1`` to stay on the
+    calling thread. Fortran-ordered input avoids a strided copy per column.
+    """
+    matrix = np.asarray(matrix)
+    if matrix.ndim != 2 or matrix.shape[1] != len(names):
+        raise ValueError(
+            f"Expected an (events x {len(names)}) matrix, got shape {matrix.shape}"
+        )
+
+    def run(j):
+        return column_statistics(matrix[:, j], quantiles)
+
+    workers = _max_workers(len(names), max_workers)
+    if workers == 1:
+        results = [run(j) for j in range(len(names))]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run, range(len(names))))
+    return dict(zip(names, results))
+
+
+def dataframe_channel_statistics(
+    df: pd.DataFrame,
+    columns: Optional[Iterable[str]] = None,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[Dict[str, float]]]:
+    """
+    channel_statistics() for the numeric ``columns`` of a DataFrame (default:
+    all numeric columns). Non-numeric values are treated as missing.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    names: List[str] = [c for c in columns if c in df.columns]
+    if not names:
+        return {}
+
+    matrix = np.empty((len(df), len(names)), dtype=np.float32, order="F")
+    for j, name in enumerate(names):
+        col = df[name]
+        if not pd.api.types.is_numeric_dtype(col):
+            col = pd.to_numeric(col, errors="coerce")
+        matrix[:, j] = col.to_numpy(dtype=np.float32, na_value=np.nan)
+    return channel_statistics(matrix, names, quantiles, max_workers)
@@ -4,18 +4,40 @@ In-memory LRU cache for parsed FCS data.
 Avoids re-parsing large FCS files (900k+ events) on every API request.
 Cache is keyed by absolute file path and invalidated by file mtime.
 Limited to 5 entries (~500MB peak for typical EV datasets).
+
+Also memoizes single-metric event arrays (size / FSC / SSC / channel)
+extracted from those files, keyed by (file, mtime, metric, calibration),
+so multi-sample analyses only hold one small array per sample instead of
+whole DataFrames, and a shared worker pool for loading several files at once.
+
+In multi-worker mode (see src.utils.shared_cache) parsed events are also
+spilled to memory-mapped column files, so a file parsed by one worker is
+mapped, not re-parsed, by the others, and every worker's DataFrame views
+the same physical pages.
+
+Loads are coalesced (src.utils.single_flight): requests that miss the
+cache for the same file while it is being parsed wait for that parse
+instead of starting their own, so the burst of requests a sample page
+fires on open costs one parse. Async endpoints use load_cached_fcs_data,
+which runs the parse on the FCS worker pool instead of the event loop.
 """
 
+import asyncio
+import hashlib
 import os
 import time
 import threading
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, List
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+from src.utils.single_flight import SingleFlight
+
 
 class _FCSDataCache:
     """Thread-safe LRU cache for parsed FCS DataFrames."""
@@ -27,14 +49,18 @@ class _FCSDataCache:
         self._hits = 0
         self._misses = 0
 
-    def get(self, file_path: str) -> Optional[Tuple[pd.DataFrame, List[str]]]:
-        """Return (parsed_data, channel_names) if cached and file unchanged, else None."""
+    def get(self, file_path: str, record: bool = True) -> Optional[Tuple[pd.DataFrame, List[str]]]:
+        """
+        Return (parsed_data, channel_names) if cached and file unchanged, else None.
+
+        ``record=False`` re-checks without counting a hit or miss.
+        """
         key = os.path.normpath(os.path.abspath(file_path))
 
         with self._lock:
             entry = self._cache.get(key)
             if entry is None:
-                self._misses += 1
+                self._misses += record
                 return None
 
             cached_mtime, data, channels = entry
@@ -45,17 +71,17 @@ class _FCSDataCache:
             except OSError:
                 # File removed — evict
                 self._cache.pop(key, None)
-                self._misses += 1
+                self._misses += record
                 return None
 
             if current_mtime != cached_mtime:
                 self._cache.pop(key, None)
-                self._misses += 1
+                self._misses += record
                 return None
 
             # Move to end (most recently used)
             self._cache.move_to_end(key)
-            self._hits += 1
+            self._hits += record
             logger.debug(f"FCS cache HIT for {Path(file_path).name} (hits={self._hits})")
             return data, channels
 
@@ -100,13 +126,71 @@ class _FCSDataCache:
             }
 
 
-# Module-level singleton
+# Module-level singletons
 _fcs_cache = _FCSDataCache(max_entries=5)
+_fcs_loads = SingleFlight("fcs_parse")
+
+
+def _shared_events_key(file_path: str) -> Optional[str]:
+    """Key of a file version in the shared array store (path, size, mtime)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    raw = f"fcs-events:{os.path.normpath(os.path.abspath(file_path))}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _load_shared_events(store, key: str) -> Optional[Tuple[pd.DataFrame, List[str]]]:
+    """Parsed events of another worker, as a DataFrame over memory-mapped columns."""
+    entry = store.get(key)
+    if entry is None:
+        return None
+    arrays, meta = entry
+    data = pd.DataFrame(arrays, copy=False)
+    # Per-file constant columns (sample / file identifiers) are kept in the metadata
+    for column, value in meta.get("constants", {}).items():
+        data[column] = value
+    return data[meta["columns"]], meta["channels"]
+
+
+def _store_shared_events(store, key: str, data: pd.DataFrame, channels: List[str]) -> None:
+    arrays, constants = {}, {}
+    for column in data.columns:
+        values = data[column].to_numpy()
+        if values.dtype.kind in "biufcmM":
+            arrays[column] = values
+        elif len(values) and (data[column] == data[column].iloc[0]).all():
+            constants[column] = data[column].iloc[0]
+        else:
+            return  # Free-form text per event: keep this file per-process
+    if not all(isinstance(v, (str, int, float, bool)) for v in constants.values()):
+        return
+    meta = {"columns": [str(c) for c in data.columns], "channels": list(channels), "constants": constants}
+    store.put(key, arrays, meta)
 
 
 def get_cached_fcs_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
     """
     Parse an FCS file, using cache when possible.
+
+    Concurrent calls for a file that is not cached share a single parse.
+    
+    Returns:
+        (parsed_data_df, channel_names_list)
+    """
+    cached = _fcs_cache.get(file_path)
+    if cached is not None:
+        return cached
+    key = os.path.normpath(os.path.abspath(file_path))
+    return _fcs_loads.do(key, lambda: _load_fcs_data(file_path))
+
+
+async def load_cached_fcs_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    get_cached_fcs_data for async endpoints: a cache hit returns at once,
+    a miss is parsed on the FCS worker pool so the event loop keeps serving
+    other requests (and joins any parse of the same file already running).
     
     Returns:
         (parsed_data_df, channel_names_list)
@@ -114,6 +198,29 @@ def get_cached_fcs_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
     cached = _fcs_cache.get(file_path)
     if cached is not None:
         return cached
+    key = os.path.normpath(os.path.abspath(file_path))
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_fcs_executor(), _fcs_loads.do, key, lambda: _load_fcs_data(file_path)
+    )
+
+
+def _load_fcs_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
+    """Load a file that missed the cache (called once per concurrent burst)."""
+    # A load that finished between the caller's miss and this one
+    cached = _fcs_cache.get(file_path, record=False)
+    if cached is not None:
+        return cached
+
+    from src.utils.shared_cache import get_array_store
+    store = get_array_store()
+    shared_key = _shared_events_key(file_path) if store is not None else None
+    if shared_key is not None:
+        shared = _load_shared_events(store, shared_key)
+        if shared is not None:
+            logger.debug(f"FCS shared cache HIT for {Path(file_path).name}")
+            _fcs_cache.put(file_path, *shared)
+            return shared
 
     # Cache miss — parse the file
     from src.parsers.fcs_parser import FCSParser
@@ -122,15 +229,163 @@ def get_cached_fcs_data(file_path: str) -> Tuple[pd.DataFrame, List[str]]:
     parsed_data = parser.parse()
     channels = parser.channel_names
 
+    if shared_key is not None:
+        _store_shared_events(store, shared_key, parsed_data, channels)
     _fcs_cache.put(file_path, parsed_data, channels)
     return parsed_data, channels
 
 
+def extract_metric_array(data: pd.DataFrame, metric: str) -> np.ndarray:
+    """
+    Event values of ``metric`` from parsed FCS data, NaNs dropped.
+
+    ``particle_size`` uses the Size_nm column, ``fsc`` / ``ssc`` the first
+    FSC / SSC channel, anything else the first column whose name contains it.
+
+    Raises:
+        ValueError: If no matching column exists.
+    """
+    if metric == "particle_size" and "Size_nm" in data.columns:
+        column = "Size_nm"
+    elif metric in ("fsc", "ssc"):
+        matching = [c for c in data.columns if metric.upper() in c.upper()]
+        if not matching:
+            raise ValueError(f"No {metric.upper()} channel found")
+        column = matching[0]
+    else:
+        matching = [c for c in data.columns if metric.lower() in c.lower()]
+        if not matching:
+            raise ValueError(f"Metric '{metric}' not found in data")
+        column = matching[0]
+
+    values = data[column].to_numpy(dtype=np.float64)
+    return values[~np.isnan(values)]
+
+
+class _MetricArrayCache:
+    """Thread-safe LRU of extracted metric arrays, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self._cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: tuple, record: bool = True) -> Optional[np.ndarray]:
+        with self._lock:
+            values = self._cache.get(key)
+            if values is None:
+                self._misses += record
+                return None
+            self._cache.move_to_end(key)
+            self._hits += record
+            return values
+
+    def put(self, key: tuple, values: np.ndarray) -> None:
+        if values.nbytes > self._max_bytes:
+            return
+        values.setflags(write=False)  # shared between requests
+        with self._lock:
+            old = self._cache.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            while self._cache and self._bytes + values.nbytes > self._max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= evicted.nbytes
+            self._cache[key] = values
+            self._bytes += values.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._cache),
+                "megabytes": round(self._bytes / 1e6, 1),
+                "max_megabytes": round(self._max_bytes / 1e6, 1),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": f"{self._hits / total * 100:.1f}%" if total > 0 else "N/A",
+            }
+
+
+_metric_cache = _MetricArrayCache(
+    max_bytes=int(os.getenv("FCS_METRIC_CACHE_MB", "256")) * 1024 * 1024
+)
+_metric_loads = SingleFlight("fcs_metric")
+
+
+def get_cached_metric_array(file_path: str, metric: str, calibration_key: str = "") -> np.ndarray:
+    """
+    Event array of ``metric`` for an FCS file (read-only), memoized per file
+    version, metric and ``calibration_key`` (pass the active calibration
+    fingerprint for calibration-dependent metrics such as size).
+
+    Raises:
+        ValueError: If the metric is not present in the file.
+    """
+    key_path = os.path.normpath(os.path.abspath(file_path))
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        mtime = None
+    key = (key_path, mtime, metric, calibration_key)
+
+    values = _metric_cache.get(key)
+    if values is not None:
+        return values
+    return _metric_loads.do(key, lambda: _load_metric_array(key, file_path, metric))
+
+
+def _load_metric_array(key: tuple, file_path: str, metric: str) -> np.ndarray:
+    values = _metric_cache.get(key, record=False)
+    if values is not None:
+        return values
+    data, _channels = get_cached_fcs_data(file_path)
+    values = extract_metric_array(data, metric)
+    if key[1] is not None:
+        _metric_cache.put(key, values)
+    return values
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_fcs_executor() -> ThreadPoolExecutor:
+    """
+    Shared worker pool for loading FCS files off the event loop. Parsing is
+    mostly numpy work that releases the GIL, so threads overlap well.
+    Size with FCS_LOAD_WORKERS (default: min(4, CPU count)).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.getenv("FCS_LOAD_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fcs-load")
+    return _executor
+
+
 def clear_fcs_cache() -> None:
     """Clear the FCS parsing cache (e.g., on file deletion)."""
     _fcs_cache.clear()
+    _metric_cache.clear()
 
 
 def fcs_cache_stats() -> dict:
     """Return cache statistics."""
-    return _fcs_cache.stats
+    return {
+        **_fcs_cache.stats,
+        "coalesced_loads": _fcs_loads.stats["coalesced"],
+        "metric_arrays": {**_metric_cache.stats, "coalesced_loads": _metric_loads.stats["coalesced"]},
+    }
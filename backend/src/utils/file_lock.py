@@ -0,0 +1,128 @@
+"""
+Exclusive file locks shared by worker processes.
+
+With several uvicorn workers (CRMIT_WORKERS > 1), state kept on disk (the
+parquet catalog manifest, staged resumable uploads) can be written by two
+processes at once; an in-process threading / asyncio lock does not stop
+that. InterProcessLock takes an OS lock on a small lock file instead
+(``flock`` on POSIX, ``msvcrt.locking`` on Windows). The lock belongs to
+the open file, so it also excludes other threads of the same process, and
+it is released by the OS if the holder dies.
+
+Usage:
+    with InterProcessLock(manifest_path.with_name("_catalog.lock")):
+        ...  # read-modify-write the manifest
+
+    async with InterProcessLock(lock_path):  # polls without blocking the event loop
+        ...
+
+The lock is not reentrant: a holder acquiring the same path again waits
+for itself.
+"""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class InterProcessLock:
+    """
+    Exclusive lock on ``path`` (created if missing), usable with ``with``
+    from threads and ``async with`` from the event loop.
+    """
+
+    def __init__(self, path: Path, timeout: Optional[float] = None, poll_interval: float = 0.01):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+
+    def _open(self) -> int:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def _try_acquire(self, fd: int) -> bool:
+        if _try_lock(fd):
+            self._fd = fd
+            return True
+        return False
+
+    def _timed_out(self, started: float) -> bool:
+        return self.timeout is not None and time.monotonic() - started > self.timeout
+
+    def acquire(self) -> None:
+        """
+        Block until the lock is held.
+
+        Raises:
+            TimeoutError: If ``timeout`` seconds pass first
+        """
+        fd, started, delay = self._open(), time.monotonic(), self.poll_interval
+        while not self._try_acquire(fd):
+            if self._timed_out(started):
+                os.close(fd)
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+    async def acquire_async(self) -> None:
+        """acquire() that waits with asyncio.sleep instead of blocking the loop."""
+        fd, started, delay = self._open(), time.monotonic(), self.poll_interval
+        while not self._try_acquire(fd):
+            if self._timed_out(started):
+                os.close(fd)
+                raise TimeoutError(f"Timed out waiting for lock {self.path}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> "InterProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "InterProcessLock":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.release()
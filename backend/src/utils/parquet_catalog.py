@@ -0,0 +1,492 @@
+"""
+Catalog of processed Parquet files.
+
+Every event / summary Parquet written by the pipeline (and any found on
+disk by sync()) is registered in one manifest, ``_catalog.parquet`` in the
+parquet directory, with its schema, row counts, per-column min/max and its
+partition values (instrument, treatment, date).
+
+- Listing reads the in-memory manifest (reloaded only when the manifest
+  file changes), instead of walking the data directories on every call.
+- dataset() exposes the catalogued files as one pyarrow dataset whose
+  partition fields come from the manifest, so a filter such as
+  ``treatment == "CD81" and date >= 2026-10-01`` skips whole files without
+  opening them, and value filters skip row groups through their statistics.
+
+Writes to the manifest are atomic (write + rename). Writers (register,
+unregister, sync) hold an exclusive lock on ``_catalog.lock`` and re-read
+the manifest under it, so several worker processes registering uploads at
+once do not overwrite each other's entries.
+"""
+
+import datetime as dt
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from loguru import logger
+
+from src.parsers.event_parquet import EVENT_FOOTER_KEY, read_event_metadata
+from src.utils.file_lock import InterProcessLock
+
+
+CATALOG_FILE_NAME = "_catalog.parquet"
+CATALOG_LOCK_NAME = "_catalog.lock"
+
+# Folder for Parquets uploaded directly for NanoFACS AI analysis
+NANOFACS_PARQUET_DIR = Path(__file__).resolve().parents[2] / "data" / "nanofacs_parquet"
+
+PARTITION_SCHEMA = pa.schema([
+    pa.field("instrument", pa.string()),
+    pa.field("treatment", pa.string()),
+    pa.field("date", pa.date32()),
+])
+
+MANIFEST_SCHEMA = pa.schema([
+    pa.field("path", pa.string()),
+    pa.field("name", pa.string()),
+    pa.field("folder", pa.string()),
+    pa.field("kind", pa.string()),
+    pa.field("size_bytes", pa.int64()),
+    pa.field("mtime", pa.float64()),
+    pa.field("num_rows", pa.int64()),
+    pa.field("num_row_groups", pa.int32()),
+    pa.field("layout_version", pa.int32()),
+    pa.field("sample_id", pa.string()),
+    *PARTITION_SCHEMA,
+    pa.field("columns", pa.list_(pa.string())),
+    pa.field("column_stats", pa.string()),  # JSON {column: {min, max, null_count}}
+    pa.field("arrow_schema", pa.binary()),
+])
+
+_DATE_FORMATS = ("%d-%b-%Y", "%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y", "%Y/%m/%d", "%d.%m.%Y")
+
+
+def _parse_date(value: Any) -> Optional[dt.date]:
+    if value is None:
+        return None
+    if isinstance(value, dict) and "timestamp" in value:
+        value = value["timestamp"]
+    text = str(value).strip()
+    try:
+        return dt.datetime.fromisoformat(text).date()
+    except ValueError:
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _first(mapping: Dict[str, Any], *keys: str) -> Optional[str]:
+    for key in keys:
+        value = mapping.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return None
+
+
+def _column_stats(parquet_file: pq.ParquetFile) -> Dict[str, Dict[str, Any]]:
+    """min / max / null_count per numeric column, merged over row groups."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    metadata = parquet_file.metadata
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for ci in range(row_group.num_columns):
+            column = row_group.column(ci)
+            stats = column.statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            if not isinstance(stats.min, (int, float)) or isinstance(stats.min, bool):
+                continue
+            entry = merged.setdefault(
+                column.path_in_schema, {"min": stats.min, "max": stats.max, "null_count": 0}
+            )
+            entry["min"] = min(entry["min"], stats.min)
+            entry["max"] = max(entry["max"], stats.max)
+            entry["null_count"] += stats.null_count or 0
+    return merged
+
+
+def describe_parquet(path: Path, **overrides: Any) -> Dict[str, Any]:
+    """
+    Manifest row for one Parquet file (reads the footer only).
+
+    Args:
+        path: Parquet file
+        **overrides: Values that win over what the file says, e.g.
+            ``treatment="CD81"`` from the upload form
+
+    Returns:
+        Dictionary matching MANIFEST_SCHEMA
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    parquet_file = pq.ParquetFile(path)
+    footer = read_event_metadata(path)
+    constants, metadata = footer["constants"], footer["metadata"]
+
+    kind = "summary"
+    if path.name.endswith(".fcs.parquet") or EVENT_FOOTER_KEY in (parquet_file.metadata.metadata or {}):
+        kind = "fcs_events"
+    elif path.name.lower().startswith("nta") or "nta" in (part.lower() for part in path.parts[-3:-1]):
+        kind = "nta"
+
+    row = {
+        "path": str(path),
+        "name": path.name,
+        "folder": path.parent.name,
+        "kind": kind,
+        "size_bytes": stat.st_size,
+        "mtime": stat.st_mtime,
+        "num_rows": parquet_file.metadata.num_rows,
+        "num_row_groups": parquet_file.metadata.num_row_groups,
+        "layout_version": footer["version"],
+        "sample_id": _first({**metadata, **constants}, "sample_id"),
+        "instrument": _first({**constants, **metadata}, "cyt", "$CYT", "instrument", "instrument_type"),
+        "treatment": _first({**metadata, **constants}, "treatment"),
+        "date": (
+            _parse_date(_first(metadata, "date", "$DATE"))
+            or _parse_date(constants.get("parse_timestamp"))
+            or dt.date.fromtimestamp(stat.st_mtime)
+        ),
+        "columns": footer["columns"],
+        "column_stats": json.dumps(_column_stats(parquet_file), default=float),
+        "arrow_schema": parquet_file.schema_arrow.remove_metadata().serialize().to_pybytes(),
+    }
+    for key, value in overrides.items():
+        if key in row and value is not None:
+            row[key] = _parse_date(value) if key == "date" else value
+    return row
+
+
+class ParquetCatalog:
+    """Manifest of processed Parquet files under a set of root directories."""
+
+    def __init__(self, roots: Iterable[Path], manifest_path: Path):
+        self.roots = [Path(r) for r in roots]
+        self.manifest_path = Path(manifest_path)
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[float] = None
+        self._loaded = False
+        self._datasets: Dict[Optional[str], ds.Dataset] = {}
+        self._write_depth = 0
+
+    # ------------------------------------------------------------------
+    # Manifest persistence
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Exclusive access to the manifest for a read-modify-write, across
+        threads (RLock) and worker processes (lock file); reentrant.
+        """
+        with self._lock:
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield
+                finally:
+                    self._write_depth -= 1
+                return
+            with InterProcessLock(self.manifest_path.with_name(CATALOG_LOCK_NAME)):
+                self._write_depth = 1
+                try:
+                    yield
+                finally:
+                    self._write_depth = 0
+
+    def _reload_if_changed(self, force: bool = False) -> None:
+        """
+        Load the manifest if it changed on disk. Writers pass ``force``: file
+        times are too coarse to notice a write another process just made.
+        """
+        try:
+            mtime = self.manifest_path.stat().st_mtime
+        except OSError:
+            if not self._loaded:
+                self._loaded = True
+                self.sync()  # First use without a manifest: build it once
+            return
+        if not force and self._loaded and mtime == self._manifest_mtime:
+            return
+        if not self._read_manifest(mtime):
+            self._loaded = True
+            self.sync()
+
+    def _read_manifest(self, mtime: float) -> bool:
+        """Replace the in-memory entries with the manifest; False if it is unreadable."""
+        try:
+            rows = pq.read_table(self.manifest_path).to_pylist()
+        except Exception as e:
+            logger.warning(f"⚠️ Parquet catalog unreadable ({e}), rebuilding")
+            return False
+        self._entries = {row["path"]: row for row in rows}
+        self._manifest_mtime = mtime
+        self._loaded = True
+        self._datasets.clear()
+        return True
+
+    def _save(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pylist(list(self._entries.values()), schema=MANIFEST_SCHEMA)
+        tmp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.{os.getpid()}.tmp")
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, self.manifest_path)
+        self._manifest_mtime = self.manifest_path.stat().st_mtime
+        self._datasets.clear()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, path: Path, **overrides: Any) -> Dict[str, Any]:
+        """
+        Add or refresh one file in the catalog.
+
+        Args:
+            path: Parquet file
+            **overrides: Partition / identity values known by the caller
+                (treatment, instrument, date, sample_id)
+
+        Returns:
+            The manifest row
+        """
+        row = describe_parquet(path, **overrides)
+        with self._write_lock():
+            self._reload_if_changed(force=True)
+            previous = self._entries.get(row["path"])
+            if previous is not None:
+                # Keep caller-provided values when a file is re-registered
+                for key in ("sample_id", "instrument", "treatment"):
+                    if overrides.get(key) is None and row[key] is None:
+                        row[key] = previous.get(key)
+            self._entries[row["path"]] = row
+            self._save()
+        logger.debug(f"📚 Catalogued {row['name']} ({row['kind']}, {row['num_rows']:,} rows)")
+        return row
+
+    def unregister(self, path: Path) -> bool:
+        """Remove a file from the catalog; returns whether it was listed."""
+        key = str(Path(path).resolve())
+        with self._write_lock():
+            self._reload_if_changed(force=True)
+            if self._entries.pop(key, None) is None:
+                return False
+            self._save()
+            return True
+
+    def sync(self) -> Dict[str, int]:
+        """
+        Reconcile the catalog with the files on disk.
+
+        Walks the roots once; only new or changed files are opened.
+
+        Returns:
+            Counts of added, updated and removed files
+        """
+        with self._write_lock():
+            try:
+                self._read_manifest(self.manifest_path.stat().st_mtime)  # unreadable: rebuilt below
+            except OSError:
+                pass
+            self._loaded = True
+
+            found: Dict[str, os.stat_result] = {}
+            for root in self.roots:
+                if not root.exists():
+                    continue
+                for f in root.rglob("*.parquet"):
+                    if f.name.startswith(("_", ".")):
+                        continue
+                    found.setdefault(str(f.resolve()), f.stat())
+
+            counts = {"added": 0, "updated": 0, "removed": 0}
+            for key in list(self._entries):
+                if key not in found:
+                    del self._entries[key]
+                    counts["removed"] += 1
+            for key, stat in found.items():
+                previous = self._entries.get(key)
+                if previous and previous["mtime"] == stat.st_mtime and previous["size_bytes"] == stat.st_size:
+                    continue
+                try:
+                    row = describe_parquet(Path(key))
+                except Exception as e:
+                    logger.warning(f"⚠️ Skipping unreadable parquet {key}: {e}")
+                    continue
+                if previous:
+                    for field in ("sample_id", "instrument", "treatment"):
+                        row[field] = row[field] or previous.get(field)
+                self._entries[key] = row
+                counts["updated" if previous else "added"] += 1
+
+            if any(counts.values()) or not self.manifest_path.exists():
+                self._save()
+        logger.info(
+            f"📚 Parquet catalog synced: {len(self._entries)} files "
+            f"(+{counts['added']} ~{counts['updated']} -{counts['removed']})"
+        )
+        return counts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def entries(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Catalogued files (manifest rows without the serialized schema)."""
+        with self._lock:
+            self._reload_if_changed()
+            rows = list(self._entries.values())
+        return [
+            {k: v for k, v in row.items() if k != "arrow_schema"}
+            for row in rows
+            if kind is None or row["kind"] == kind
+        ]
+
+    def dataset(self, kind: Optional[str] = "fcs_events") -> ds.Dataset:
+        """
+        All catalogued files of one kind as a single pyarrow dataset.
+
+        The dataset schema is the union of the file schemas (numeric columns
+        whose type differs between files are read as float64; other
+        conflicting columns are left out) plus the partition fields.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            if kind in self._datasets:
+                return self._datasets[kind]
+            rows = [
+                row for row in self._entries.values()
+                if (kind is None or row["kind"] == kind) and os.path.exists(row["path"])
+            ]
+
+            field_types: Dict[str, List[pa.DataType]] = {}
+            for row in rows:
+                for field in pa.ipc.read_schema(pa.py_buffer(row["arrow_schema"])):
+                    field_types.setdefault(field.name, []).append(field.type)
+            fields = []
+            for name, types in field_types.items():
+                if name in PARTITION_SCHEMA.names:
+                    continue
+                if all(t == types[0] for t in types):
+                    fields.append(pa.field(name, types[0]))
+                elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+                    fields.append(pa.field(name, pa.float64()))
+            schema = pa.schema([*fields, *PARTITION_SCHEMA])
+
+            partitions = []
+            for row in rows:
+                expression = None
+                for name in PARTITION_SCHEMA.names:
+                    value = row[name]
+                    term = pc.field(name).is_null() if value is None else pc.field(name) == value
+                    expression = term if expression is None else expression & term
+                partitions.append(expression)
+
+            dataset = ds.FileSystemDataset.from_paths(
+                [row["path"] for row in rows],
+                schema=schema,
+                format=ds.ParquetFileFormat(),
+                filesystem=pafs.LocalFileSystem(),
+                partitions=partitions,
+            )
+            self._datasets[kind] = dataset
+            return dataset
+
+    def summarize(
+        self,
+        column: str,
+        kind: Optional[str] = "fcs_events",
+        instrument: Optional[str] = None,
+        treatment: Optional[str] = None,
+        date_from: Optional[dt.date] = None,
+        date_to: Optional[dt.date] = None,
+        value_min: Optional[float] = None,
+        value_max: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Pooled statistics of one column across the matching files.
+
+        Partition filters prune whole files; the value range is pushed down
+        to row-group statistics.
+
+        Raises:
+            ValueError: If no catalogued file has the column
+        """
+        dataset = self.dataset(kind)
+        if column not in dataset.schema.names:
+            raise ValueError(f"No catalogued {kind or ''} file has a '{column}' column")
+
+        conditions = [pc.field(column).is_valid()]
+        if instrument is not None:
+            conditions.append(pc.field("instrument") == instrument)
+        if treatment is not None:
+            conditions.append(pc.field("treatment") == treatment)
+        if date_from is not None:
+            conditions.append(pc.field("date") >= pc.scalar(date_from))
+        if date_to is not None:
+            conditions.append(pc.field("date") <= pc.scalar(date_to))
+        if value_min is not None:
+            conditions.append(pc.field(column) >= value_min)
+        if value_max is not None:
+            conditions.append(pc.field(column) <= value_max)
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+
+        fragments = list(dataset.get_fragments(filter=expression))
+        table = dataset.to_table(columns=[column], filter=expression)
+        values = table.column(column).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+        values = values[np.isfinite(values)]
+
+        result: Dict[str, Any] = {
+            "column": column,
+            "files_scanned": len(fragments),
+            "files_total": len(dataset.files),
+            "count": int(values.size),
+        }
+        if values.size:
+            p10, median, p90 = np.percentile(values, [10, 50, 90])
+            result.update({
+                "mean": float(values.mean()),
+                "median": float(median),
+                "std": float(values.std()),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "p10": float(p10),
+                "p90": float(p90),
+            })
+        return result
+
+
+_catalog: Optional[ParquetCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_parquet_catalog() -> ParquetCatalog:
+    """Catalog of the configured parquet directory and the NanoFACS upload folder."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                from src.api.config import get_settings
+                parquet_dir = get_settings().parquet_dir
+                _catalog = ParquetCatalog(
+                    roots=[parquet_dir, NANOFACS_PARQUET_DIR],
+                    manifest_path=parquet_dir / CATALOG_FILE_NAME,
+                )
+    return _catalog
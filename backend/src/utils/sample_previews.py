@@ -0,0 +1,262 @@
+"""
+Per-sample preview artifacts written at ingest time.
+
+The sample list and dashboards need a small picture of every sample (a
+scatter density, a size histogram, a few quantiles, channel ranges).
+Computing these from the FCS/NTA data on every page load means re-reading
+the full event data per sample; instead the upload pipeline writes them
+once, next to the sample's other processed data:
+
+    <parquet_dir>/previews/<sample_id>/
+        fcs.json          FCS preview (size histogram, quantiles, ranges)
+        fcs_density.png   256x256 scatter density of every event
+        nta.json          NTA preview (weighted size histogram, quantiles)
+
+Every file is small (tens of KB at most) and is served as-is by
+``GET /samples/{id}/preview``.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from src.physics.size_config import DEFAULT_SIZE_CONFIG
+from src.utils.channel_stats import dataframe_channel_statistics
+
+
+PREVIEW_VERSION = 1
+PREVIEW_DIR_NAME = "previews"
+
+# Density raster size in pixels (one bin per pixel)
+PREVIEW_DENSITY_SIZE = 256
+
+# Size histogram: log-spaced bins over the valid EV size range, so every
+# sample shares the same edges and small EVs get finer bins
+PREVIEW_SIZE_BINS = 64
+
+# Fixed quantile vector reported for sizes and every channel
+PREVIEW_QUANTILES = (0.01, 0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99)
+
+PREVIEW_KINDS = ("fcs", "nta")
+
+
+def _safe_name(sample_id: str) -> str:
+    return "".join(c if c.isalnum() or c in ("-", "_") else "_" for c in sample_id)
+
+
+def preview_dir(sample_id: str, root: Optional[Path] = None) -> Path:
+    """Directory holding the preview artifacts of one sample."""
+    if root is None:
+        from src.api.config import get_settings
+        root = get_settings().parquet_dir / PREVIEW_DIR_NAME
+    return root / _safe_name(sample_id)
+
+
+def size_bin_edges() -> np.ndarray:
+    """Shared edges of the preview size histogram (nm)."""
+    return np.geomspace(DEFAULT_SIZE_CONFIG.valid_min_nm, DEFAULT_SIZE_CONFIG.valid_max_nm, PREVIEW_SIZE_BINS + 1)
+
+
+def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles: Sequence[float]) -> list:
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    cumulative = np.cumsum(weights)
+    positions = np.searchsorted(cumulative, np.asarray(quantiles) * cumulative[-1])
+    return [float(values[min(i, len(values) - 1)]) for i in positions]
+
+
+def size_summary(sizes: Optional[np.ndarray], weights: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+    """
+    64-bin size histogram and quantile vector.
+
+    Args:
+        sizes: Particle diameters (nm); non-finite / non-positive values are ignored
+        weights: Optional per-value weights (e.g. NTA particle counts per size bin)
+
+    Returns:
+        Dictionary with bin_edges_nm, counts, n and quantiles, or None if there
+        are no usable sizes
+    """
+    if sizes is None:
+        return None
+    sizes = np.asarray(sizes, dtype=np.float64)
+    weights = np.ones_like(sizes) if weights is None else np.asarray(weights, dtype=np.float64)
+    valid = np.isfinite(sizes) & (sizes > 0) & np.isfinite(weights) & (weights >= 0)
+    sizes, weights = sizes[valid], weights[valid]
+    if len(sizes) == 0 or weights.sum() <= 0:
+        return None
+
+    edges = size_bin_edges()
+    counts, _ = np.histogram(sizes, bins=edges, weights=weights)
+    return {
+        "bin_edges_nm": [round(float(e), 3) for e in edges],
+        "counts": [float(c) for c in counts],
+        "n": float(weights.sum()),
+        "quantiles": _weighted_quantiles(sizes, weights, PREVIEW_QUANTILES),
+    }
+
+
+def channel_ranges(df: pd.DataFrame, columns: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """min / max / median and the quantile vector of each numeric channel."""
+    stats = dataframe_channel_statistics(df, columns=columns, quantiles=PREVIEW_QUANTILES)
+    ranges: Dict[str, Dict[str, Any]] = {}
+    for name, values in stats.items():
+        if values is None:
+            continue
+        ranges[str(name)] = {
+            "min": values["min"],
+            "max": values["max"],
+            "median": values["median"],
+            "quantiles": [values["quantiles"][q] for q in PREVIEW_QUANTILES],
+        }
+    return ranges
+
+
+def build_fcs_preview(
+    events: pd.DataFrame,
+    x_channel: Optional[str],
+    y_channel: Optional[str],
+    sizes: Optional[np.ndarray] = None,
+    parameters: Optional[Dict[str, Any]] = None,
+) -> tuple:
+    """
+    Preview of an FCS sample.
+
+    Args:
+        events: Parsed events
+        x_channel: Density plot x channel (usually FSC)
+        y_channel: Density plot y channel (usually SSC)
+        sizes: Particle diameters computed at ingest (may be a subsample)
+        parameters: Sizing parameters to record (wavelength, RI, method, ...)
+
+    Returns:
+        (preview dict, density PNG bytes or None)
+    """
+    from src.visualization.density_raster import density_grid, encode_png, render_density_image
+
+    preview: Dict[str, Any] = {
+        "version": PREVIEW_VERSION,
+        "kind": "fcs",
+        "created_at": datetime.now().isoformat(),
+        "n_events": int(len(events)),
+        "quantile_levels": list(PREVIEW_QUANTILES),
+        "channels": channel_ranges(events),
+        "size_histogram": size_summary(sizes),
+        "parameters": parameters or {},
+        "density": None,
+    }
+
+    png = None
+    if x_channel in events.columns and y_channel in events.columns:
+        grid = density_grid(
+            events[x_channel].to_numpy(), events[y_channel].to_numpy(),
+            width=PREVIEW_DENSITY_SIZE, height=PREVIEW_DENSITY_SIZE,
+        )
+        png = encode_png(render_density_image(grid))
+        preview["density"] = {
+            "x_channel": x_channel,
+            "y_channel": y_channel,
+            "x_scale": grid.x_scale,
+            "y_scale": grid.y_scale,
+            "x_range": list(grid.x_range),
+            "y_range": list(grid.y_range),
+            "width": PREVIEW_DENSITY_SIZE,
+            "height": PREVIEW_DENSITY_SIZE,
+            "n_binned": grid.n_binned,
+        }
+    return preview, png
+
+
+def build_nta_preview(
+    data: pd.DataFrame,
+    sizes: Optional[np.ndarray],
+    weights: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """Preview of an NTA sample (size distribution weighted by particle counts)."""
+    return {
+        "version": PREVIEW_VERSION,
+        "kind": "nta",
+        "created_at": datetime.now().isoformat(),
+        "n_rows": int(len(data)),
+        "quantile_levels": list(PREVIEW_QUANTILES),
+        "channels": channel_ranges(data),
+        "size_histogram": size_summary(sizes, weights),
+    }
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
+
+def write_preview(
+    sample_id: str,
+    kind: str,
+    preview: Dict[str, Any],
+    density_png: Optional[bytes] = None,
+    root: Optional[Path] = None,
+) -> Path:
+    """
+    Store a sample's preview (replacing any previous one of the same kind).
+
+    Raises:
+        ValueError: If kind is not 'fcs' or 'nta'
+    """
+    if kind not in PREVIEW_KINDS:
+        raise ValueError(f"Unknown preview kind '{kind}'")
+    directory = preview_dir(sample_id, root)
+    directory.mkdir(parents=True, exist_ok=True)
+    density_path = directory / f"{kind}_density.png"
+    if density_png is not None:
+        _write_atomic(density_path, density_png)
+    else:
+        density_path.unlink(missing_ok=True)
+    _write_atomic(directory / f"{kind}.json", json.dumps(preview, default=float).encode())
+    logger.debug(f"🖼️ Wrote {kind} preview for {sample_id} ({directory})")
+    return directory
+
+
+def load_preview(sample_id: str, kind: str, root: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Stored preview of one kind, or None if the sample has none."""
+    path = preview_dir(sample_id, root) / f"{kind}.json"
+    try:
+        return json.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️ Unreadable preview {path}: {e}")
+        return None
+
+
+def density_png_path(sample_id: str, kind: str = "fcs", root: Optional[Path] = None) -> Optional[Path]:
+    """Path of the stored density PNG, or None if there is none."""
+    path = preview_dir(sample_id, root) / f"{kind}_density.png"
+    return path if path.exists() else None
+
+
+def copy_previews(source_sample_id: str, target_sample_id: str, kind: str, root: Optional[Path] = None) -> bool:
+    """Copy one kind of preview between samples (identical re-uploads). Returns False if there is none."""
+    source = preview_dir(source_sample_id, root)
+    if not (source / f"{kind}.json").exists():
+        return False
+    target = preview_dir(target_sample_id, root)
+    if source == target:
+        return True
+    target.mkdir(parents=True, exist_ok=True)
+    for name in (f"{kind}.json", f"{kind}_density.png"):
+        if (source / name).exists():
+            shutil.copyfile(source / name, target / name)
+    return True
+
+
+def delete_previews(sample_id: str, root: Optional[Path] = None) -> None:
+    """Remove every preview artifact of a sample."""
+    shutil.rmtree(preview_dir(sample_id, root), ignore_errors=True)
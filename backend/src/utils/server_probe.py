@@ -0,0 +1,32 @@
+"""
+Readiness probe for a locally started API server.
+
+The desktop and module launchers start uvicorn in a background thread and
+open the browser (or native window) once the server answers, instead of
+after a fixed delay.
+"""
+
+import time
+import urllib.request
+
+
+def wait_for_server(port: int, timeout: float = 30.0, interval: float = 0.1) -> bool:
+    """
+    Poll the health endpoint until the server answers.
+
+    Returns:
+        True once /health responds, False if the timeout expired first
+    """
+    # Local server: never route the probe through a configured HTTP proxy
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+    url = f"http://127.0.0.1:{port}/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with opener.open(url, timeout=1.0) as response:
+                if response.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(interval)
+    return False
@@ -0,0 +1,326 @@
+"""
+Cross-process cache storage for multi-worker deployments.
+
+With several uvicorn workers, per-process caches multiply RAM and split hit
+rates (each worker warms its own copy). In shared mode
+(``settings.shared_cache_enabled``: CRMIT_SHARED_CACHE, on by default when
+CRMIT_WORKERS > 1) caches use two stores under ``<temp_dir>/shared_cache/``
+instead, with no external service:
+
+- SQLiteTTLStore: the TTLCache entries of src.api.cache, pickled into one
+  SQLite database (WAL mode, so readers never block each other). Every
+  worker reads and writes the same rows, so a set in one worker is a hit
+  in all of them and invalidate() / clear() reach every worker at once.
+- SharedArrayStore: large read-mostly arrays (parsed FCS event columns,
+  Mie LUTs) saved as ``.npy`` files and opened with ``np.load(mmap_mode)``.
+  All workers map the same file, so the OS page cache holds one copy of
+  the events however many workers read them.
+
+In single-process mode both getters return None and callers keep their
+in-process caches.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+TTL_DB_NAME = "ttl_cache.db"
+ARRAYS_DIR_NAME = "arrays"
+
+# Upper bound for prefix range scans: sorts after any UTF-8 key
+_KEY_MAX_SUFFIX = "\U0010ffff"
+
+
+class SQLiteTTLStore:
+    """
+    TTL key/value store shared by processes through one SQLite file.
+
+    Values are pickled; entries are namespaced by cache name, so each
+    TTLCache keeps its own entry limit and statistics.
+    """
+
+    def __init__(self, path: Path, busy_timeout_s: float = 10.0):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._busy_timeout_s = busy_timeout_s
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " cache TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL, created_at REAL NOT NULL, size_bytes INTEGER NOT NULL,"
+            " PRIMARY KEY (cache, key)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_age ON entries (cache, created_at)")
+        conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread (and per process: never reuse one across fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(
+                str(self._path), timeout=self._busy_timeout_s, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, cache: str, key: str) -> Tuple[bool, Any]:
+        """(found, value) of a live entry."""
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM entries WHERE cache = ? AND key = ?", (cache, key)
+        ).fetchone()
+        if row is None:
+            return False, None
+        if row[1] < time.time():
+            self._connection().execute(
+                "DELETE FROM entries WHERE cache = ? AND key = ? AND expires_at = ?", (cache, key, row[1])
+            )
+            return False, None
+        try:
+            return True, pickle.loads(row[0])
+        except Exception as e:
+            logger.warning(f"⚠️ Dropping unreadable shared cache entry {cache}/{key}: {e}")
+            self.delete(cache, key)
+            return False, None
+
+    def set(self, cache: str, key: str, value: Any, ttl_seconds: float, max_entries: int) -> int:
+        """
+        Store a value, evicting the oldest entries of ``cache`` beyond ``max_entries``.
+
+        Returns:
+            Number of entries evicted
+
+        Raises:
+            pickle.PicklingError / TypeError: If the value cannot be pickled
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (cache, key, value, expires_at, created_at, size_bytes)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (cache, key, sqlite3.Binary(payload), now + ttl_seconds, now, len(payload)),
+        )
+        excess = self.count(cache) - max_entries
+        if excess <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM entries WHERE cache = ? AND key IN"
+            " (SELECT key FROM entries WHERE cache = ? ORDER BY created_at LIMIT ?)",
+            (cache, cache, excess),
+        )
+        return excess
+
+    def delete(self, cache: str, key: str) -> None:
+        self._connection().execute("DELETE FROM entries WHERE cache = ? AND key = ?", (cache, key))
+
+    def invalidate(self, cache: str, prefix: str) -> int:
+        """Remove every entry of ``cache`` whose key starts with ``prefix``."""
+        cursor = self._connection().execute(
+            "DELETE FROM entries WHERE cache = ? AND key >= ? AND key < ?",
+            (cache, prefix, prefix + _KEY_MAX_SUFFIX),
+        )
+        return cursor.rowcount
+
+    def clear(self, cache: str) -> int:
+        return self._connection().execute("DELETE FROM entries WHERE cache = ?", (cache,)).rowcount
+
+    def cleanup_expired(self, cache: str) -> int:
+        return self._connection().execute(
+            "DELETE FROM entries WHERE cache = ? AND expires_at < ?", (cache, time.time())
+        ).rowcount
+
+    def count(self, cache: str) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM entries WHERE cache = ?", (cache,)).fetchone()[0]
+
+    def size_bytes(self, cache: str) -> int:
+        row = self._connection().execute(
+            "SELECT COALESCE(SUM(size_bytes), 0) FROM entries WHERE cache = ?", (cache,)
+        ).fetchone()
+        return int(row[0])
+
+
+class SharedArrayStore:
+    """
+    Named groups of numpy arrays in ``.npy`` files, memory-mapped on read.
+
+    An entry is a directory holding one file per array plus ``meta.json``;
+    it is written under a temporary name and renamed into place, so readers
+    only ever see complete entries. When the total size exceeds
+    ``max_bytes``, the least recently read entries are removed (open
+    mappings stay valid until their readers drop them).
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._root / key
+
+    def get(self, key: str, mmap_mode: Optional[str] = "c") -> Optional[Tuple[Dict[str, np.ndarray], dict]]:
+        """
+        Arrays and metadata stored under ``key``, or None.
+
+        Args:
+            key: Entry key (a hex digest; see put)
+            mmap_mode: np.load mode; the default 'c' (copy-on-write) shares
+                pages between processes while allowing private in-place edits
+        """
+        entry = self._entry_dir(key)
+        try:
+            meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+            arrays = {
+                name: np.load(entry / f"{i}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+                for i, name in enumerate(meta["arrays"])
+            }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Dropping unreadable shared array entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            os.utime(entry)  # recency for eviction
+        except OSError:
+            pass
+        return arrays, meta.get("meta", {})
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray], meta: Optional[dict] = None) -> bool:
+        """
+        Store arrays (numeric / bool / datetime dtypes only) under ``key``.
+
+        Returns:
+            True if stored (or already present), False if the arrays cannot be
+            stored or do not fit the budget
+        """
+        if any(np.asarray(a).dtype.kind not in "biufcmM" for a in arrays.values()):
+            return False
+        total = sum(np.asarray(a).nbytes for a in arrays.values())
+        if total > self._max_bytes:
+            return False
+        entry = self._entry_dir(key)
+        if (entry / "meta.json").exists():
+            return True
+
+        tmp = self._root / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            tmp.mkdir(parents=True)
+            names: List[str] = []
+            for i, (name, values) in enumerate(arrays.items()):
+                np.save(tmp / f"{i}.npy", np.ascontiguousarray(values), allow_pickle=False)
+                names.append(name)
+            (tmp / "meta.json").write_text(json.dumps({"arrays": names, "meta": meta or {}}), encoding="utf-8")
+            try:
+                os.rename(tmp, entry)
+            except OSError:
+                # Another worker stored the same entry first
+                shutil.rmtree(tmp, ignore_errors=True)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not store shared arrays {key}: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self._enforce_budget()
+        return True
+
+    def delete(self, key: str) -> None:
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in self._root.iterdir():
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                continue
+        return entries
+
+    def _enforce_budget(self) -> None:
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in entries:
+                if total <= self._max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def clear(self) -> None:
+        for _, _, entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    @property
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "megabytes": round(sum(size for _, size, _ in entries) / 1e6, 1),
+            "max_megabytes": round(self._max_bytes / 1e6, 1),
+        }
+
+
+_ttl_store: Optional[SQLiteTTLStore] = None
+_array_store: Optional[SharedArrayStore] = None
+_resolved = False
+_stores_lock = threading.Lock()
+
+
+def _resolve_stores() -> None:
+    global _ttl_store, _array_store, _resolved
+    if _resolved:
+        return
+    with _stores_lock:
+        if _resolved:
+            return
+        from src.api.config import get_settings
+        settings = get_settings()
+        if settings.shared_cache_enabled:
+            root = settings.shared_cache_dir
+            try:
+                _ttl_store = SQLiteTTLStore(root / TTL_DB_NAME)
+                _array_store = SharedArrayStore(root / ARRAYS_DIR_NAME, settings.shared_cache_max_mb * 1024 * 1024)
+                logger.info(f"🔗 Shared caches enabled at {root} (pid {os.getpid()})")
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"⚠️ Shared caches unavailable, using per-process caches: {e}")
+                _ttl_store = _array_store = None
+        _resolved = True
+
+
+def get_ttl_store() -> Optional[SQLiteTTLStore]:
+    """Shared TTL store, or None in single-process mode."""
+    _resolve_stores()
+    return _ttl_store
+
+
+def get_array_store() -> Optional[SharedArrayStore]:
+    """Shared memory-mapped array store, or None in single-process mode."""
+    _resolve_stores()
+    return _array_store
+
+
+def configure_shared_stores(
+    ttl_store: Optional[SQLiteTTLStore], array_store: Optional[SharedArrayStore]
+) -> None:
+    """Use these stores instead of the configured ones (tests, tools)."""
+    global _ttl_store, _array_store, _resolved
+    with _stores_lock:
+        _ttl_store, _array_store, _resolved = ttl_store, array_store, True
@@ -0,0 +1,138 @@
+"""
+Request coalescing ("single-flight") for expensive loads.
+
+When a sample page opens, the UI requests several views of the same sample
+at once; on a cold cache every one of them would miss and run the same
+expensive load (FCS parse, Mie LUT build, calibration fit). A SingleFlight
+lets the first caller for a key run the load while concurrent callers for
+the same key wait for it and share its result, or its exception.
+
+Only calls that overlap are coalesced: once a call finishes, the next
+caller for the key runs the load again, so keep a cache in front of it and
+re-check that cache inside the load (a caller may miss the cache just
+before the previous load stores its result).
+
+Usage:
+    _parses = SingleFlight("fcs_parse")
+    data = _parses.do(path, lambda: parse(path))                 # threads
+    data = await _parses.do_async(key, lambda: compute(db))      # event loop
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight call shared by its leader and the waiting callers."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of concurrent calls.
+
+    ``do`` coalesces calls from threads (FCS worker pool, executor threads);
+    ``do_async`` coalesces coroutines on the event loop. The two keep
+    separate in-flight tables.
+    """
+
+    def __init__(self, name: str = "default"):
+        self._name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run ``fn`` unless a call for ``key`` is already in flight, in which
+        case wait for that call and return its result.
+
+        Raises:
+            Whatever ``fn`` raised, in the leader and in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["leaders"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn()`` unless a call for ``key`` is already in flight on the
+        event loop, in which case wait for that call and return its result.
+
+        If the leading request is cancelled (client went away), one of the
+        waiting callers takes over and runs ``fn`` itself.
+
+        Raises:
+            Whatever ``fn`` raised, in the leader and in every waiting caller
+        """
+        while True:
+            future = self._async_calls.get(key)
+            if future is None:
+                break
+            self._stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled, not the leader
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        self._stats["leaders"] += 1
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: no "never retrieved" warning without waiters
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._async_calls.get(key) is future:
+                del self._async_calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {"name": self._name, **self._stats}
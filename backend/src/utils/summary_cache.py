@@ -0,0 +1,276 @@
+"""
+Content-addressed cache of derived file summaries.
+
+The AI assistants describe a file to the model through summaries computed
+from the whole file (channel statistics, sizing, raw-row previews, rule-based
+anomalies). A follow-up question about the same file needs exactly the same
+summary, so it is computed once and stored under the SHA-256 of the file's
+bytes: renaming or re-uploading a file still hits, while any change to its
+content misses.
+
+Entries are small gzip-compressed JSON files under
+``<parquet_dir>/_summary_cache/<kind>/``, fronted by an in-process LRU so
+hot entries skip the disk as well. The directory is bounded
+(CRMIT_SUMMARY_CACHE_MAX_MB): past the budget the least recently read
+entries are deleted. Bump SUMMARY_CACHE_VERSION when the summary code
+changes so old entries stop matching.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+SUMMARY_CACHE_VERSION = 2
+SUMMARY_CACHE_DIR_NAME = "_summary_cache"
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+# After exceeding the disk budget, prune down to this fraction of it, so
+# the directory is not rescanned on every following put
+_DISK_PRUNE_TARGET = 0.8
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 (hex) of in-memory file content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+# Digests of files on disk, keyed by path and invalidated by size / mtime,
+# so asking about the same file again does not re-hash it
+_file_digests: Dict[str, Tuple[int, int, str]] = {}
+_file_digests_lock = threading.Lock()
+
+
+def file_digest(file_path) -> str:
+    """
+    SHA-256 (hex) of a file's content.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    key = os.path.normpath(os.path.abspath(file_path))
+    stat = os.stat(key)
+    with _file_digests_lock:
+        known = _file_digests.get(key)
+    if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+        return known[2]
+
+    digest = hashlib.sha256()
+    with open(key, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    hexdigest = digest.hexdigest()
+    with _file_digests_lock:
+        _file_digests[key] = (stat.st_size, stat.st_mtime_ns, hexdigest)
+    return hexdigest
+
+
+def remember_file_digest(file_path, hexdigest: str) -> None:
+    """Record the digest of a file just written (e.g. hashed while streaming an upload)."""
+    key = os.path.normpath(os.path.abspath(file_path))
+    stat = os.stat(key)
+    with _file_digests_lock:
+        _file_digests[key] = (stat.st_size, stat.st_mtime_ns, hexdigest)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class SummaryCache:
+    """Thread-safe two-level (memory LRU + disk) cache of JSON-serializable summaries."""
+
+    def __init__(self, root: Optional[Path], memory_entries: int = 128, max_disk_bytes: int = 256 * 1024 * 1024):
+        self._root = Path(root) if root is not None else None
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._memory_entries = memory_entries
+        self._max_disk_bytes = max_disk_bytes
+        self._disk_bytes: Optional[int] = None  # estimate; rescanned when pruning
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(digest: str, kind: str, **params: Any) -> str:
+        """
+        Cache key of one summary of a file.
+
+        Args:
+            digest: Content digest of the file (content_digest / file_digest)
+            kind: Summary type, e.g. 'nanofacs_fcs_context'
+            **params: Anything else the summary depends on (file name, options)
+        """
+        raw = json.dumps([SUMMARY_CACHE_VERSION, kind, digest, params], sort_keys=True, default=str)
+        return f"{kind}/{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self._root / f"{key}.json.gz" if self._root is not None else None
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Stored summary, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        if path is not None:
+            try:
+                value = json.loads(gzip.decompress(path.read_bytes()))
+            except FileNotFoundError:
+                value = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Dropping unreadable summary cache entry {path.name}: {e}")
+                path.unlink(missing_ok=True)
+                value = None
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self._disk_hits += 1
+                try:
+                    os.utime(path)  # recency for pruning
+                except OSError:
+                    pass
+                return value
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, value: Any) -> Any:
+        """
+        Store a summary.
+
+        Returns:
+            The value as it will be read back (JSON round trip), so first and
+            later calls see identical data
+        """
+        payload = json.dumps(value, default=_json_default, separators=(",", ":"))
+        value = json.loads(payload)
+        self._remember(key, value)
+
+        path = self._path(key)
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                compressed = gzip.compress(payload.encode(), compresslevel=6)
+                tmp.write_bytes(compressed)
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not persist summary cache entry {key}: {e}")
+            else:
+                self._account_disk(len(compressed))
+        return value
+
+    def _disk_entries(self) -> list:
+        entries = []
+        for path in self._root.rglob("*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _account_disk(self, added: int) -> None:
+        """Track the directory size and prune the least recently read entries past the budget."""
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += added
+                if self._disk_bytes <= self._max_disk_bytes:
+                    return
+            entries = sorted(self._disk_entries())
+            total = sum(size for _, size, _ in entries)
+            if total > self._max_disk_bytes:
+                target = self._max_disk_bytes * _DISK_PRUNE_TARGET
+                removed = 0
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    path.unlink(missing_ok=True)
+                    total -= size
+                    removed += 1
+                logger.debug(f"🧹 Summary cache pruned {removed} entries ({total / 1e6:.1f} MB kept)")
+            self._disk_bytes = total
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Stored summary, computing and storing it on a miss.
+
+        A compute() returning None (or raising) is not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = compute()
+        if value is None:
+            return None
+        return self.put(key, value)
+
+    def clear(self) -> None:
+        """Drop every entry (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._hits = self._disk_hits = self._misses = 0
+        if self._root is not None:
+            for path in self._root.rglob("*.json.gz"):
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._disk_bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._disk_hits + self._misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self._memory_entries,
+                "disk_megabytes": round(self._disk_bytes / 1e6, 1) if self._disk_bytes is not None else None,
+                "max_disk_megabytes": round(self._max_disk_bytes / 1e6, 1),
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": f"{(self._hits + self._disk_hits) / total * 100:.1f}%" if total > 0 else "N/A",
+            }
+
+
+_summary_cache: Optional[SummaryCache] = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache:
+    """Shared summary cache under the configured parquet directory."""
+    global _summary_cache
+    if _summary_cache is None:
+        with _summary_cache_lock:
+            if _summary_cache is None:
+                from src.api.config import get_settings
+                settings = get_settings()
+                _summary_cache = SummaryCache(
+                    settings.parquet_dir / SUMMARY_CACHE_DIR_NAME,
+                    max_disk_bytes=settings.summary_cache_max_mb * 1024 * 1024,
+                )
+    return _summary_cache
@@ -0,0 +1,89 @@
+"""
+Streaming of uploaded files to disk.
+
+Shared by the upload routers (FCS / NTA uploads, parquet uploads to the
+NanoFACS folder): the request body is copied to disk in UPLOAD_CHUNK_SIZE
+steps while its SHA-256 is computed, so neither the whole file nor a second
+pass over it is needed to dedupe or cache by content.
+"""
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+from loguru import logger
+
+from src.api.config import get_settings
+
+
+# Bytes read from the request and written to disk per step while streaming
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class StoredUpload:
+    """An uploaded file streamed to disk, with its size and content hash."""
+    path: Path
+    size_bytes: int
+    sha256: str
+
+
+async def stream_upload_to_disk(upload_file: UploadFile, destination: Path) -> StoredUpload:
+    """
+    Stream an uploaded file to disk in chunks, hashing it on the way.
+    
+    The size limit is enforced as bytes arrive (a rejected upload never fully
+    lands on disk), and hashing + writing run on the default executor so a
+    large upload does not block the event loop.
+    
+    Args:
+        upload_file: FastAPI UploadFile object
+        destination: Destination file path
+    
+    Returns:
+        StoredUpload with the saved path, size and SHA-256 of the content
+    
+    Raises:
+        HTTPException: If file size exceeds limit or save fails
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    settings = get_settings()
+    max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    file_size = 0
+    
+    def write_chunk(buffer, chunk: bytes) -> None:
+        digest.update(chunk)
+        buffer.write(chunk)
+    
+    try:
+        await upload_file.seek(0)
+        buffer = await loop.run_in_executor(None, destination.open, "wb")
+        try:
+            while chunk := await upload_file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > max_size_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File exceeds the upload limit of {settings.max_upload_size_mb}MB"
+                    )
+                await loop.run_in_executor(None, write_chunk, buffer, chunk)
+        finally:
+            await loop.run_in_executor(None, buffer.close)
+        
+    except HTTPException:
+        destination.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        destination.unlink(missing_ok=True)
+        logger.error(f"❌ Failed to save file: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save file: {str(e)}"
+        )
+    
+    logger.info(f"✅ Saved uploaded file: {destination.name} ({file_size / 1024:.1f}KB)")
+    return StoredUpload(path=destination, size_bytes=file_size, sha256=digest.hexdigest())
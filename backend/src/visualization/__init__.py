@@ -4,6 +4,8 @@ Visualization modules for FCS and NTA data analysis.
 This package provides:
 - fcs_plots: Generate scatter plots and density plots for Flow Cytometry data
 - nta_plots: Generate size distribution histograms and curves for NTA data
+- density_raster: Headless full-event density PNGs (no matplotlib) for
+  batch plots and thumbnails
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,394 @@
+"""
+Headless Density Raster Renderer
+
+Renders two-channel event data straight to PNG without matplotlib:
+full event arrays -> 2D histogram (log / asinh / linear axes) -> count
+scaling -> colormap lookup table -> PNG (Pillow).
+
+Binning every event is O(N) with ``np.bincount`` and there are no figure,
+axes or artist objects, so a full-resolution density plot of a 1M-event
+file is cheaper than a matplotlib scatter of a 10k-50k subsample. The
+same functions render UI thumbnails (small width/height).
+
+Batches of files can be rendered on a process pool with
+``render_density_batch``.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+
+# Colormap control points (17 evenly spaced samples of the matplotlib
+# colormaps); expanded to 256-entry lookup tables on first use
+_COLORMAP_POINTS: Dict[str, List[Tuple[int, int, int]]] = {
+    "viridis": [
+        (68, 1, 84), (72, 24, 106), (71, 45, 123), (66, 64, 134), (59, 82, 139),
+        (51, 99, 141), (44, 114, 142), (38, 130, 142), (33, 145, 140), (31, 160, 136),
+        (40, 174, 128), (63, 188, 115), (94, 201, 98), (132, 212, 75), (173, 220, 48),
+        (216, 226, 25), (253, 231, 37),
+    ],
+    "inferno": [
+        (0, 0, 4), (11, 7, 36), (33, 12, 74), (61, 9, 101), (87, 16, 110),
+        (113, 25, 110), (138, 34, 106), (163, 44, 97), (188, 55, 84), (210, 70, 68),
+        (228, 90, 49), (241, 115, 29), (249, 142, 9), (252, 172, 17), (249, 203, 53),
+        (242, 234, 105), (252, 255, 164),
+    ],
+    "plasma": [
+        (13, 8, 135), (49, 5, 151), (76, 2, 161), (102, 0, 167), (126, 3, 168),
+        (149, 17, 161), (170, 35, 149), (188, 53, 135), (204, 71, 120), (218, 90, 106),
+        (230, 108, 92), (240, 128, 78), (248, 149, 64), (253, 172, 51), (253, 197, 39),
+        (248, 223, 37), (240, 249, 33),
+    ],
+    "greys": [(230, 230, 230), (0, 0, 0)],
+}
+
+_LUT_CACHE: Dict[str, np.ndarray] = {}
+
+AXIS_SCALES = ("linear", "log", "asinh")
+COUNT_SCALES = ("linear", "log", "asinh")
+
+# Default asinh cofactor for fluorescence-style channels
+DEFAULT_ASINH_COFACTOR = 150.0
+
+# Axis range defaults to these percentiles of the (transformed) events
+DEFAULT_RANGE_PERCENTILES = (0.1, 99.9)
+
+
+def colormap_lut(name: str) -> np.ndarray:
+    """
+    256 x 3 uint8 lookup table for a colormap.
+
+    Raises:
+        ValueError: If the colormap is unknown
+    """
+    lut = _LUT_CACHE.get(name)
+    if lut is not None:
+        return lut
+    if name not in _COLORMAP_POINTS:
+        raise ValueError(f"Unknown colormap '{name}'. Available: {sorted(_COLORMAP_POINTS)}")
+    points = np.asarray(_COLORMAP_POINTS[name], dtype=np.float64)
+    stops = np.linspace(0.0, 1.0, len(points))
+    t = np.linspace(0.0, 1.0, 256)
+    lut = np.stack([np.interp(t, stops, points[:, c]) for c in range(3)], axis=1)
+    lut = np.round(lut).astype(np.uint8)
+    _LUT_CACHE[name] = lut
+    return lut
+
+
+def transform_axis(
+    values: np.ndarray,
+    scale: str = "log",
+    cofactor: float = DEFAULT_ASINH_COFACTOR,
+) -> np.ndarray:
+    """
+    Axis transform applied before binning.
+
+    Args:
+        values: Raw channel values
+        scale: 'linear', 'log' (log10; non-positive values become NaN) or
+            'asinh' (asinh(x / cofactor), keeps negative values)
+        cofactor: asinh cofactor
+
+    Returns:
+        Transformed float64 array (NaN where undefined)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if scale == "linear":
+        return values
+    if scale == "log":
+        out = np.full(values.shape, np.nan)
+        positive = values > 0
+        np.log10(values, out=out, where=positive)
+        return out
+    if scale == "asinh":
+        return np.arcsinh(values / cofactor)
+    raise ValueError(f"Unknown axis scale '{scale}'. Use one of {AXIS_SCALES}")
+
+
+@dataclass
+class DensityGrid:
+    """
+    Event counts on a width x height grid (row 0 = lowest y).
+
+    Attributes:
+        counts: (height, width) int64 counts
+        x_range: Bin range on the transformed x axis
+        y_range: Bin range on the transformed y axis
+        x_scale: Axis transform used for x
+        y_scale: Axis transform used for y
+        n_events: Events given
+        n_binned: Events inside the plotted range
+    """
+    counts: np.ndarray
+    x_range: Tuple[float, float]
+    y_range: Tuple[float, float]
+    x_scale: str
+    y_scale: str
+    n_events: int
+    n_binned: int
+
+
+def _axis_range(
+    values: np.ndarray,
+    explicit: Optional[Tuple[float, float]],
+    percentiles: Tuple[float, float],
+) -> Tuple[float, float]:
+    if explicit is not None:
+        lo, hi = float(explicit[0]), float(explicit[1])
+    elif len(values) == 0:
+        lo, hi = 0.0, 1.0
+    else:
+        lo, hi = (float(v) for v in np.percentile(values, percentiles))
+    if not hi > lo:
+        hi = lo + 1.0
+    return lo, hi
+
+
+def density_grid(
+    x: np.ndarray,
+    y: np.ndarray,
+    width: int = 512,
+    height: int = 512,
+    x_scale: str = "log",
+    y_scale: str = "log",
+    x_range: Optional[Tuple[float, float]] = None,
+    y_range: Optional[Tuple[float, float]] = None,
+    cofactor: float = DEFAULT_ASINH_COFACTOR,
+    range_percentiles: Tuple[float, float] = DEFAULT_RANGE_PERCENTILES,
+) -> DensityGrid:
+    """
+    Bin every event into a width x height 2D histogram.
+
+    Args:
+        x: X channel values (raw)
+        y: Y channel values (raw)
+        width: Number of x bins (image width in pixels)
+        height: Number of y bins (image height in pixels)
+        x_scale: Axis transform for x ('linear', 'log', 'asinh')
+        y_scale: Axis transform for y
+        x_range: Range on the *transformed* x axis; default from percentiles
+        y_range: Range on the *transformed* y axis; default from percentiles
+        cofactor: asinh cofactor for asinh axes
+        range_percentiles: Percentiles used for the default ranges
+
+    Returns:
+        DensityGrid with the counts
+
+    Raises:
+        ValueError: If x and y have different lengths or the size is invalid
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.shape != y.shape:
+        raise ValueError(f"x and y must have the same length ({len(x)} != {len(y)})")
+    if width < 1 or height < 1:
+        raise ValueError(f"Invalid raster size {width}x{height}")
+
+    tx = transform_axis(x, x_scale, cofactor)
+    ty = transform_axis(y, y_scale, cofactor)
+    finite = np.isfinite(tx) & np.isfinite(ty)
+    tx, ty = tx[finite], ty[finite]
+
+    x_lo, x_hi = _axis_range(tx, x_range, range_percentiles)
+    y_lo, y_hi = _axis_range(ty, y_range, range_percentiles)
+
+    ix = np.floor((tx - x_lo) * (width / (x_hi - x_lo))).astype(np.int64)
+    iy = np.floor((ty - y_lo) * (height / (y_hi - y_lo))).astype(np.int64)
+    # Values exactly at the upper edge belong to the last bin
+    ix[tx == x_hi] = width - 1
+    iy[ty == y_hi] = height - 1
+    inside = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height)
+
+    flat = iy[inside] * width + ix[inside]
+    counts = np.bincount(flat, minlength=width * height).reshape(height, width)
+
+    return DensityGrid(
+        counts=counts,
+        x_range=(x_lo, x_hi),
+        y_range=(y_lo, y_hi),
+        x_scale=x_scale,
+        y_scale=y_scale,
+        n_events=len(x),
+        n_binned=int(flat.size),
+    )
+
+
+def render_density_image(
+    grid: DensityGrid,
+    colormap: str = "viridis",
+    count_scale: str = "log",
+    background: Tuple[int, int, int] = (255, 255, 255),
+) -> np.ndarray:
+    """
+    Color a density grid.
+
+    Args:
+        grid: Output of density_grid()
+        colormap: Colormap name ('viridis', 'inferno', 'plasma', 'greys')
+        count_scale: Count scaling before the colormap ('linear', 'log', 'asinh')
+        background: RGB color of empty bins
+
+    Returns:
+        (height, width, 3) uint8 image, top row = highest y
+    """
+    counts = grid.counts[::-1].astype(np.float64)
+    if count_scale == "log":
+        scaled = np.log1p(counts)
+    elif count_scale == "asinh":
+        scaled = np.arcsinh(counts)
+    elif count_scale == "linear":
+        scaled = counts
+    else:
+        raise ValueError(f"Unknown count scale '{count_scale}'. Use one of {COUNT_SCALES}")
+
+    peak = scaled.max()
+    if peak > 0:
+        scaled /= peak
+    index = np.round(scaled * 255).astype(np.uint8)
+    image = colormap_lut(colormap)[index]
+    image[counts == 0] = background
+    return image
+
+
+def encode_png(image: np.ndarray, compress_level: int = 6) -> bytes:
+    """Encode an RGB uint8 array as PNG bytes."""
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG", compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def render_density_png(
+    x: np.ndarray,
+    y: np.ndarray,
+    output_path: Optional[Path] = None,
+    width: int = 512,
+    height: int = 512,
+    x_scale: str = "log",
+    y_scale: str = "log",
+    colormap: str = "viridis",
+    count_scale: str = "log",
+    **grid_options: Any,
+) -> bytes:
+    """
+    Full-resolution density plot of every event as PNG.
+
+    Args:
+        x: X channel values
+        y: Y channel values
+        output_path: Also write the PNG here if given
+        width: Image width in pixels (= x bins)
+        height: Image height in pixels (= y bins)
+        x_scale: Axis transform for x ('linear', 'log', 'asinh')
+        y_scale: Axis transform for y
+        colormap: Colormap name
+        count_scale: Count scaling ('linear', 'log', 'asinh')
+        **grid_options: Passed to density_grid() (x_range, y_range, cofactor, ...)
+
+    Returns:
+        PNG bytes
+    """
+    grid = density_grid(x, y, width=width, height=height, x_scale=x_scale, y_scale=y_scale, **grid_options)
+    png = encode_png(render_density_image(grid, colormap=colormap, count_scale=count_scale))
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(png)
+    return png
+
+
+# ============================================================================
+# Batch rendering
+# ============================================================================
+
+@dataclass
+class DensityJob:
+    """
+    One density plot to render from an event file.
+
+    Attributes:
+        source: FCS file or event Parquet file
+        x_channel: X channel name
+        y_channel: Y channel name
+        output_path: PNG destination
+        options: Keyword arguments for render_density_png()
+    """
+    source: Path
+    x_channel: str
+    y_channel: str
+    output_path: Path
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+def _load_channels(source: Path, channels: Sequence[str]) -> Dict[str, np.ndarray]:
+    """Load only the requested channels from an FCS or event Parquet file."""
+    if source.suffix.lower() == ".parquet":
+        from src.parsers.event_parquet import read_event_parquet
+
+        df = read_event_parquet(source, columns=list(channels))
+    else:
+        from src.parsers.fcs_parser import FCSParser
+
+        df = FCSParser(file_path=source).parse()
+    missing = [name for name in channels if name not in df.columns]
+    if missing:
+        raise ValueError(f"{source.name}: channels not found: {missing}")
+    return {name: df[name].to_numpy() for name in channels}
+
+
+def render_density_job(job: DensityJob) -> Path:
+    """Render one DensityJob (runs inside pool workers)."""
+    columns = _load_channels(Path(job.source), [job.x_channel, job.y_channel])
+    render_density_png(columns[job.x_channel], columns[job.y_channel], output_path=job.output_path, **job.options)
+    return Path(job.output_path)
+
+
+def render_density_batch(
+    jobs: Sequence[DensityJob],
+    max_workers: Optional[int] = None,
+) -> List[Optional[Path]]:
+    """
+    Render many density plots on a process pool.
+
+    Each worker loads only the two channels it needs, so memory per worker
+    stays at one file's pair of channels.
+
+    Args:
+        jobs: Plots to render
+        max_workers: Worker processes (default: CPU count, capped by len(jobs));
+            1 renders in the calling process
+
+    Returns:
+        Output path per job, or None where rendering failed
+    """
+    if not jobs:
+        return []
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        results: List[Optional[Path]] = []
+        for job in jobs:
+            try:
+                results.append(render_density_job(job))
+            except Exception as e:
+                logger.warning(f"⚠️ Density plot failed for {Path(job.source).name}: {e}")
+                results.append(None)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_density_job, job) for job in jobs]
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning(f"⚠️ Density plot failed for {Path(job.source).name}: {e}")
+                results.append(None)
+    logger.info(f"🎨 Rendered {sum(r is not None for r in results)}/{len(jobs)} density plots ({workers} workers)")
+    return results
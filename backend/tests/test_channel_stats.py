@@ -0,0 +1,94 @@
+"""
+Unit tests for the fused channel statistics kernel.
+
+Tests cover:
+- Agreement with pandas (mean, std, skew, kurtosis, quantiles)
+- Non-finite values and degenerate columns
+- DataFrame helper and FCSParser.get_statistics output keys
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.utils.channel_stats import (
+    column_statistics,
+    channel_statistics,
+    dataframe_channel_statistics,
+)
+
+
+QUANTILES = (0.10, 0.25, 0.50, 0.75, 0.90, 0.95)
+
+
+class TestChannelStatistics:
+    """Test suite for the channel statistics kernel."""
+
+    @pytest.fixture
+    def events(self):
+        """Skewed scatter-like channels with offsets, as float32 events."""
+        rng = np.random.default_rng(42)
+        n = 50_000
+        return pd.DataFrame({
+            "FSC-H": rng.lognormal(6.0, 1.0, n),
+            "SSC-H": rng.lognormal(4.0, 1.5, n) + 1e4,
+            "FL1-H": rng.normal(100.0, 5.0, n),
+        }).astype(np.float32)
+
+    def test_matches_pandas(self, events):
+        stats = dataframe_channel_statistics(events, quantiles=QUANTILES)
+
+        for col in events.columns:
+            s = events[col]
+            got = stats[col]
+            assert got["count"] == len(s)
+            assert got["mean"] == pytest.approx(s.mean(), rel=1e-6)
+            assert got["std"] == pytest.approx(s.std(), rel=1e-6)
+            assert got["skewness"] == pytest.approx(s.skew(), rel=1e-5, abs=1e-5)
+            assert got["kurtosis"] == pytest.approx(s.kurtosis(), rel=1e-5, abs=1e-5)
+            assert got["min"] == s.min()
+            assert got["max"] == s.max()
+            assert got["median"] == pytest.approx(s.median(), rel=1e-7)
+            for q in QUANTILES:
+                assert got["quantiles"][q] == pytest.approx(s.quantile(q), rel=1e-7)
+
+    def test_threaded_matches_serial(self, events):
+        matrix = events.to_numpy(dtype=np.float32)
+        names = list(events.columns)
+        assert channel_statistics(matrix, names, max_workers=4) == \
+            channel_statistics(matrix, names, max_workers=1)
+
+    def test_ignores_non_finite(self):
+        values = np.array([1.0, 2.0, np.nan, 3.0, np.inf, 4.0, -np.inf], dtype=np.float32)
+        got = column_statistics(values, quantiles=(0.5,))
+        assert got["count"] == 4
+        assert got["mean"] == pytest.approx(2.5)
+        assert got["min"] == 1.0 and got["max"] == 4.0
+        assert got["quantiles"][0.5] == pytest.approx(2.5)
+
+    def test_constant_and_tiny_columns(self):
+        const = column_statistics(np.full(100, 7.0, dtype=np.float32))
+        assert const["std"] == 0.0
+        assert const["skewness"] == 0.0 and const["kurtosis"] == 0.0
+
+        two = column_statistics(np.array([1.0, 3.0]))
+        assert np.isnan(two["skewness"]) and np.isnan(two["kurtosis"])
+        assert column_statistics(np.array([np.nan])) is None
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            channel_statistics(np.zeros((10, 2), dtype=np.float32), ["a"])
+
+    def test_fcs_parser_statistics_keys(self, events):
+        from src.parsers.fcs_parser import FCSParser
+
+        parser = FCSParser.__new__(FCSParser)
+        parser.data = events
+        parser.channel_names = list(events.columns)
+        parser.sample_id = parser.biological_sample_id = parser.measurement_id = None
+        parser.is_baseline = False
+
+        stats = parser.get_statistics()
+        s = events["FSC-H"]
+        assert stats["FSC-H"]["q90"] == pytest.approx(s.quantile(0.90), rel=1e-7)
+        assert stats["FSC-H"]["iqr"] == pytest.approx(s.quantile(0.75) - s.quantile(0.25), rel=1e-6)
+        assert stats["_summary"]["total_events"] == len(events)
@@ -0,0 +1,74 @@
+"""
+Unit tests for the headless density raster renderer.
+
+Tests cover:
+- 2D binning of every event (log / asinh axes, explicit ranges)
+- Colormap lookup, empty-bin background and PNG encoding
+- Batch rendering from event Parquet files
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.parsers.event_parquet import write_event_parquet
+from src.visualization.density_raster import (
+    DensityJob,
+    colormap_lut,
+    density_grid,
+    render_density_batch,
+    render_density_image,
+    render_density_png,
+)
+
+
+def test_density_grid_bins_every_event():
+    x = np.array([1.0, 10.0, 100.0, 100.0, -5.0, np.nan])
+    y = np.array([1.0, 1.0, 100.0, 100.0, 10.0, 10.0])
+    grid = density_grid(x, y, width=2, height=2, x_range=(0, 2), y_range=(0, 2))
+
+    # Non-positive / NaN events drop out on log axes; row 0 is the lowest y
+    assert grid.n_events == 6 and grid.n_binned == 4
+    np.testing.assert_array_equal(grid.counts, [[1, 1], [0, 2]])
+
+    # asinh keeps negative values; default ranges trim to the 0.1-99.9th percentiles
+    asinh = density_grid(x, y, width=4, height=4, x_scale="asinh", y_scale="linear",
+                         x_range=(-1, 1), y_range=(0, 100))
+    assert asinh.n_binned == 5 and asinh.counts.sum() == 5
+    assert density_grid(x, y, x_scale="asinh", y_scale="linear").n_binned == 4
+    with pytest.raises(ValueError):
+        density_grid(x, y[:3])
+
+
+def test_render_png(tmp_path):
+    rng = np.random.default_rng(5)
+    x, y = rng.lognormal(6, 1, 50_000), rng.lognormal(5, 1, 50_000)
+
+    grid = density_grid(x, y, width=64, height=48)
+    image = render_density_image(grid, colormap="inferno")
+    assert image.shape == (48, 64, 3) and image.dtype == np.uint8
+    assert (image[grid.counts[::-1] == 0] == 255).all()
+    assert tuple(image[grid.counts[::-1] == grid.counts.max()][0]) == tuple(colormap_lut("inferno")[255])
+
+    png = render_density_png(x, y, output_path=tmp_path / "d.png", width=64, height=48)
+    assert (tmp_path / "d.png").read_bytes() == png
+    assert Image.open(io.BytesIO(png)).size == (64, 48)
+    with pytest.raises(ValueError):
+        colormap_lut("jet")
+
+
+def test_render_batch(tmp_path):
+    rng = np.random.default_rng(6)
+    jobs = []
+    for i in range(2):
+        path = tmp_path / f"s{i}.fcs.parquet"
+        write_event_parquet(pd.DataFrame({"FSC-H": rng.lognormal(6, 1, 1000), "SSC-H": rng.lognormal(5, 1, 1000)}), path)
+        jobs.append(DensityJob(path, "FSC-H", "SSC-H", tmp_path / "out" / f"s{i}.png", {"width": 32, "height": 32}))
+    jobs.append(DensityJob(tmp_path / "s0.fcs.parquet", "FSC-H", "missing", tmp_path / "out" / "bad.png"))
+
+    results = render_density_batch(jobs, max_workers=1)
+    assert results[:2] == [job.output_path for job in jobs[:2]] and results[2] is None
+    assert Image.open(jobs[0].output_path).size == (32, 32)
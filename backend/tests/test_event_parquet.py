@@ -0,0 +1,91 @@
+"""
+Unit tests for the event Parquet layout.
+
+Tests cover:
+- Float32 channels, footer constants, row-group sizing and encodings
+- Projected reads (columns, leading row groups, statistics filters)
+- Reading files written in the previous wide layout
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.parsers.event_parquet import (
+    read_event_metadata,
+    read_event_parquet,
+    write_event_parquet,
+)
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(7)
+    n = 10_000
+    df = pd.DataFrame({
+        "FSC-H": rng.lognormal(6, 1, n),
+        "SSC-H": rng.lognormal(5, 1, n),
+        "ADC-H": np.round(rng.lognormal(6, 1, n)) % 200,
+        "Cluster": rng.integers(0, 5, n),
+    })
+    df["sample_id"] = "P5_F10_CD81"
+    df["is_baseline"] = False
+    df["parse_timestamp"] = pd.Timestamp("2026-01-02 03:04:05")
+    return df
+
+
+def test_write_layout(tmp_path, events):
+    path = tmp_path / "s.fcs.parquet"
+    info = write_event_parquet(
+        events, path, metadata={"$CYT": "ZE5"},
+        extra_columns={"diameter_nm": np.full(len(events), 95.0)}, row_group_size=4096,
+    )
+
+    assert info["row_groups"] == 3
+    assert set(info["constants"]) == {"sample_id", "is_baseline", "parse_timestamp"}
+    meta = pq.ParquetFile(path).metadata
+    encodings = {meta.row_group(0).column(i).path_in_schema: meta.row_group(0).column(i).encodings
+                 for i in range(meta.num_columns)}
+    assert "BYTE_STREAM_SPLIT" in encodings["FSC-H"]
+    assert "BYTE_STREAM_SPLIT" not in encodings["ADC-H"]  # low cardinality -> dictionary
+
+    footer = read_event_metadata(path)
+    assert footer["version"] == 2 and footer["num_events"] == len(events)
+    assert footer["metadata"] == {"$CYT": "ZE5"}
+    assert "sample_id" not in footer["columns"]
+
+    df = read_event_parquet(path, include_constants=True)
+    assert df["FSC-H"].dtype == np.float32 and df["diameter_nm"].dtype == np.float32
+    np.testing.assert_array_equal(df["FSC-H"], events["FSC-H"].astype(np.float32))
+    np.testing.assert_array_equal(df["Cluster"], events["Cluster"])
+    assert df["sample_id"].iloc[-1] == "P5_F10_CD81" and not df["is_baseline"].any()
+    assert df["parse_timestamp"].iloc[0] == pd.Timestamp("2026-01-02 03:04:05")
+
+    with pytest.raises(ValueError):
+        write_event_parquet(events, path, extra_columns={"gate": [True]})
+
+
+def test_projected_reads(tmp_path, events):
+    path = tmp_path / "s.fcs.parquet"
+    write_event_parquet(events, path, row_group_size=4096)
+
+    df = read_event_parquet(path, columns=["SSC-H", "missing", "FSC-H"])
+    assert list(df.columns) == ["FSC-H", "SSC-H"] and len(df) == len(events)
+    assert len(read_event_parquet(path, columns=["FSC-H"], max_events=5000)) == 5000
+
+    threshold = float(events["FSC-H"].quantile(0.9))
+    filtered = read_event_parquet(path, columns=["FSC-H"], filters=[("FSC-H", ">", threshold)])
+    assert len(filtered) == (events["FSC-H"].astype(np.float32) > np.float32(threshold)).sum()
+
+
+def test_reads_wide_layout(tmp_path, events):
+    path = tmp_path / "old.parquet"
+    table = pa.Table.from_pandas(events)
+    pq.write_table(table.replace_schema_metadata({**table.schema.metadata, b"source_file": b"a.fcs"}), path)
+
+    footer = read_event_metadata(path)
+    assert footer["version"] == 1 and footer["metadata"] == {"source_file": "a.fcs"}
+    df = read_event_parquet(path, columns=["SSC-H", "sample_id"])
+    assert list(df.columns) == ["SSC-H", "sample_id"] and len(df) == len(events)
@@ -0,0 +1,85 @@
+"""
+Unit tests for the in-memory FCS reader.
+
+Tests cover:
+- Float data decoded as a zero-copy view, matching flowio
+- Big-endian integer data with mixed bit widths and $PnR masking
+- Chat attachment summaries computed from bytes
+"""
+
+import io
+
+import flowio
+import numpy as np
+import pytest
+
+from src.api.routers import chat
+from src.parsers.fcs_bytes import read_fcs_bytes
+from src.utils import summary_cache
+
+
+def _fcs_bytes(text: dict, data: bytes) -> bytes:
+    """Minimal FCS 3.0 file with the given TEXT keywords and DATA segment."""
+    def segment(begin_data: int) -> bytes:
+        keywords = {**text, "$BEGINDATA": str(begin_data), "$ENDDATA": str(begin_data + len(data) - 1)}
+        return ("/" + "".join(f"{k}/{v}/" for k, v in keywords.items())).encode()
+
+    text_start = 58
+    begin_data = text_start + len(segment(0)) + 16
+    body = segment(begin_data).ljust(begin_data - text_start)
+    header = b"FCS3.0    " + b"".join(
+        str(v).rjust(8).encode()
+        for v in (text_start, text_start + len(body.rstrip()) - 1, begin_data, begin_data + len(data) - 1, 0, 0)
+    )
+    return header + body + data
+
+
+def test_float_events_match_flowio(tmp_path):
+    rng = np.random.default_rng(0)
+    events = rng.lognormal(5, 1, (2000, 3)).astype(np.float32)
+    buffer = io.BytesIO()
+    flowio.create_fcs(buffer, events.ravel().tolist(), ["FSC-H", "SSC-H", "FL1-H"])
+    data = buffer.getvalue()
+
+    fcs = read_fcs_bytes(memoryview(data))
+    assert fcs.channel_names == ["FSC-H", "SSC-H", "FL1-H"] and fcs.event_count == 2000
+    assert np.shares_memory(fcs.events, np.frombuffer(data, dtype=np.uint8))
+    assert fcs.events_float32() is fcs.events
+
+    (tmp_path / "a.fcs").write_bytes(data)
+    reference = flowio.FlowData(str(tmp_path / "a.fcs"))
+    np.testing.assert_array_equal(fcs.events, np.asarray(reference.events).reshape(-1, 3))
+    assert fcs.text == dict(reference.text)
+
+
+def test_big_endian_integer_events():
+    values = np.array([[1, 70000], [1023, 5], [2048 + 7, 65535]])
+    records = np.zeros(3, dtype=[("a", ">u2"), ("b", ">u4")])
+    records["a"], records["b"] = values[:, 0], values[:, 1]
+    text = {
+        "$BYTEORD": "4,3,2,1", "$DATATYPE": "I", "$MODE": "L", "$PAR": "2", "$TOT": "3",
+        "$P1N": "FSC-H", "$P1B": "16", "$P1R": "1024",
+        "$P2N": "SSC-H", "$P2S": "SSC", "$P2B": "32", "$P2R": "100000",
+    }
+    fcs = read_fcs_bytes(_fcs_bytes(text, records.tobytes()))
+    assert fcs.channel_names == ["FSC-H", "SSC"]
+    # Channel 1 keeps the 10 bits $P1R allows; channel 2's range is not a power of two
+    np.testing.assert_array_equal(fcs.events, [[1, 70000], [1023, 5], [7, 65535]])
+    assert fcs.events_float32().dtype == np.float32
+
+    with pytest.raises(ValueError):
+        read_fcs_bytes(b"not an fcs file" * 10)
+    with pytest.raises(ValueError):
+        read_fcs_bytes(_fcs_bytes(text, records.tobytes()[:-4]))
+
+
+def test_chat_summary_from_bytes(monkeypatch):
+    monkeypatch.setattr(summary_cache, "_summary_cache", summary_cache.SummaryCache(None))
+    events = np.random.default_rng(1).lognormal(5, 1, (5000, 2)).astype(np.float32)
+    buffer = io.BytesIO()
+    flowio.create_fcs(buffer, events.ravel().tolist(), ["FSC-H", "SSC-H"])
+
+    summary = chat._extract_fcs_summary_from_bytes(buffer.getvalue(), "ev.fcs")
+    assert "Total events recorded: 5,000" in summary
+    assert f"FSC: median={np.median(events[:, 0]):.1f}" in summary
+    assert "could not extract" in chat._extract_fcs_summary_from_bytes(b"garbage", "bad.fcs")
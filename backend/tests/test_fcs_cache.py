@@ -0,0 +1,61 @@
+"""
+Unit tests for the FCS metric-array cache.
+
+Tests cover:
+- Metric column selection (fsc / ssc / name match) and NaN removal
+- Memoization per (file version, metric, calibration key)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import fcs_cache
+from src.utils.fcs_cache import extract_metric_array, get_cached_metric_array
+
+
+@pytest.fixture
+def events():
+    return pd.DataFrame({
+        "FSC-H": [1.0, 2.0, np.nan, 4.0],
+        "SSC-A": [10.0, 20.0, 30.0, 40.0],
+        "B530-H": [5.0, 6.0, 7.0, 8.0],
+    })
+
+
+def test_extract_metric_array(events):
+    np.testing.assert_array_equal(extract_metric_array(events, "fsc"), [1.0, 2.0, 4.0])
+    np.testing.assert_array_equal(extract_metric_array(events, "ssc"), [10.0, 20.0, 30.0, 40.0])
+    np.testing.assert_array_equal(extract_metric_array(events, "b530"), [5.0, 6.0, 7.0, 8.0])
+    with pytest.raises(ValueError):
+        extract_metric_array(events, "particle_size")
+
+
+def test_metric_array_memoized(tmp_path, events, monkeypatch):
+    path = tmp_path / "sample.fcs"
+    path.write_bytes(b"placeholder")
+    parses = []
+
+    def fake_parse(file_path):
+        parses.append(file_path)
+        return events, list(events.columns)
+
+    monkeypatch.setattr(fcs_cache, "get_cached_fcs_data", fake_parse)
+    fcs_cache.clear_fcs_cache()
+
+    first = get_cached_metric_array(str(path), "ssc", "cal-1")
+    second = get_cached_metric_array(str(path), "ssc", "cal-1")
+    assert second is first and len(parses) == 1
+    assert not first.flags.writeable
+
+    get_cached_metric_array(str(path), "ssc", "cal-2")
+    assert len(parses) == 2  # new calibration, new entry
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    get_cached_metric_array(str(path), "ssc", "cal-1")
+    assert len(parses) == 3  # file changed
+
+    fcs_cache.clear_fcs_cache()
@@ -0,0 +1,117 @@
+"""
+Unit tests for deferred router loading.
+
+Tests cover:
+- Importing the app does not load the scientific / AI stack
+- Routers included on the first API request; health and static paths don't wait
+- Optional routers that fail to import are skipped; warm-up preloads modules
+- Warm-up imports on a worker thread and includes routers on the event loop
+"""
+
+import asyncio
+import importlib
+import subprocess
+import sys
+import threading
+import types
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.lazy_routers import LazyRouters, RouterSpec
+
+
+def test_app_import_defers_heavy_packages():
+    code = (
+        "import sys; import src.api.main; "
+        "print(','.join(p for p in ('pandas', 'scipy', 'sklearn', 'pyarrow', 'miepython', 'boto3') if p in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def _router_module(monkeypatch, name):
+    router = APIRouter()
+
+    @router.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    module = types.ModuleType(name)
+    module.router = router
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+def test_routers_load_on_first_api_request(monkeypatch):
+    _router_module(monkeypatch, "fake_router_mod")
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    routers = LazyRouters(
+        app,
+        [
+            RouterSpec("fake_router_mod", "/things", ("Things",)),
+            RouterSpec("missing_router_mod_xyz", "/missing", optional=True),
+        ],
+        api_prefix="/api/v1",
+    )
+    routers.install()
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/somewhere/in/the/spa").status_code == 404
+    assert not routers.loaded
+
+    assert client.get("/api/v1/things/ping").json() == {"pong": True}
+    assert routers.loaded
+    assert "/api/v1/things/ping" in client.get("/openapi.json").json()["paths"]
+
+    # Loading again is a no-op (no duplicate routes)
+    n_routes = len(app.routes)
+    routers.load()
+    assert len(app.routes) == n_routes
+
+
+def test_warm_up_preloads_modules(monkeypatch):
+    _router_module(monkeypatch, "fake_router_mod")
+    app = FastAPI()
+    routers = LazyRouters(app, [RouterSpec("fake_router_mod")], warmup_modules=("json", "no_such_module_xyz"))
+
+    assert asyncio.run(routers.warm_up()) == ["json"]
+    assert routers.loaded and routers.needs_routers("/api/v1/samples")
+    assert not routers.needs_routers("/api/v1/health") and not routers.needs_routers("/_next/app.js")
+
+    failing = LazyRouters(FastAPI(), [RouterSpec("no_such_router_xyz")])
+    assert asyncio.run(failing.warm_up()) == [] and not failing.loaded
+
+
+def test_warm_up_includes_routers_on_the_event_loop(monkeypatch):
+    _router_module(monkeypatch, "fake_router_mod")
+    app = FastAPI()
+    routers = LazyRouters(app, [RouterSpec("fake_router_mod", "/things")], warmup_modules=("json",))
+    threads = {"import": set(), "include": set()}
+
+    real_import, real_include = importlib.import_module, app.include_router
+
+    def import_module(name, *args):
+        threads["import"].add(threading.current_thread())
+        return real_import(name, *args)
+
+    def include_router(*args, **kwargs):
+        threads["include"].add(threading.current_thread())
+        return real_include(*args, **kwargs)
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    monkeypatch.setattr(app, "include_router", include_router)
+
+    assert asyncio.run(routers.warm_up()) == ["json"]
+    assert threads["include"] == {threading.main_thread()}
+    assert threads["import"] and threading.main_thread() not in threads["import"]
+    assert TestClient(app).get("/api/v1/things/ping").json() == {"pong": True}
@@ -0,0 +1,127 @@
+"""
+Unit tests for keyset pagination helpers.
+
+Tests cover:
+- Cursor encode/decode round trip and malformed tokens
+- next_cursor on full and partial pages
+- Keyset paging over SQLite with tied timestamps (server_default format)
+- Keyset paging over SQLite rows written by SQLAlchemy on a whole second
+  ('.000000' suffix), both directions
+- Alert listing totals count every matching row, not just the page
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, func, insert, select  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import create_async_engine  # type: ignore[import-not-found]
+
+from src.database.pagination import apply_keyset, decode_cursor, encode_cursor, next_cursor
+
+
+class TestCursor:
+    """Cursor token handling."""
+
+    def test_round_trip(self):
+        ts = datetime(2025, 11, 21, 12, 0, 0, 123456)
+        assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+        assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+    @pytest.mark.parametrize("token", ["garbage", "", "W10"])
+    def test_malformed_raises(self, token):
+        with pytest.raises(ValueError):
+            decode_cursor(token)
+
+    def test_next_cursor(self):
+        rows = [SimpleNamespace(id=i, created_at=datetime(2025, 1, 1)) for i in (3, 2, 1)]
+        assert next_cursor(rows, limit=5, ts_attr="created_at") is None
+        assert decode_cursor(next_cursor(rows, limit=3, ts_attr="created_at")) == (datetime(2025, 1, 1), 1)
+
+
+def test_keyset_pages_sqlite_ties(tmp_path):
+    """Rows sharing a server-default timestamp are paged once each, in order."""
+    metadata = MetaData()
+    items = Table(
+        "items", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime, nullable=False, server_default=func.now()),
+    )
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'page.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(insert(items), [{} for _ in range(23)])
+
+            seen, after = [], None
+            while True:
+                query = apply_keyset(select(items), items.c.created_at, items.c.id, after).limit(5)
+                rows = (await conn.execute(query)).all()
+                seen += [r.id for r in rows]
+                after = next_cursor(rows, 5, "created_at")
+                if after is None:
+                    break
+        await engine.dispose()
+        return seen
+
+    assert asyncio.run(run()) == list(range(23, 0, -1))
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_keyset_pages_sqlite_whole_second_rows(tmp_path, descending):
+    """A cursor on a zero-microsecond row matches its '.000000' text form."""
+    metadata = MetaData()
+    items = Table(
+        "items", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("created_at", DateTime, nullable=False),
+    )
+    stamps = [datetime(2025, 1, 1, 12, 0, 0)] * 5 + [datetime(2025, 1, 1, 12, 0, 0, 500)] * 3
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'whole.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            await conn.execute(insert(items), [{"created_at": ts} for ts in stamps])
+
+            seen, after = [], None
+            for _ in range(len(stamps)):
+                query = apply_keyset(select(items), items.c.created_at, items.c.id, after, descending).limit(2)
+                rows = (await conn.execute(query)).all()
+                seen += [r.id for r in rows]
+                after = next_cursor(rows, 2, "created_at")
+                if after is None:
+                    break
+        await engine.dispose()
+        return seen
+
+    expected = list(range(1, len(stamps) + 1))
+    assert asyncio.run(run()) == (expected[::-1] if descending else expected)
+
+
+def test_alert_total_counts_all_matching_rows(tmp_path):
+    from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore[import-not-found]
+
+    from src.database import crud
+    from src.database.models import Base
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'alerts.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            for i in range(7):
+                severity = "critical" if i % 3 == 0 else "info"
+                await crud.create_alert(db, "quality_warning", severity, f"A{i}", "m", "qc_check")
+
+            page = await crud.get_alerts(db, limit=2)
+            totals = [await crud.count_alerts(db), await crud.count_alerts(db, severity="critical")]
+
+            await crud.delete_alert(db, page[0].id)
+            totals.append(await crud.count_alerts(db))
+        await engine.dispose()
+        return len(page), totals
+
+    assert asyncio.run(run()) == (2, [7, 3, 6])
@@ -0,0 +1,98 @@
+"""
+Unit tests for the Parquet dataset catalog.
+
+Tests cover:
+- Sync: registration of event / NTA files, partition values from footers
+- Manifest reuse across catalog instances and removal of deleted files
+- Partition-pruned pooled statistics over the catalog dataset
+- API handlers register and list catalog files off the event loop
+"""
+
+import asyncio
+import datetime as dt
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.parsers.event_parquet import write_event_parquet
+from src.utils.parquet_catalog import ParquetCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    rng = np.random.default_rng(3)
+    for i, (treatment, day) in enumerate([
+        ("CD81", "02-Oct-2026"), ("CD81", "15-Oct-2026"), ("CD81", "20-Sep-2026"), ("ISO", "03-Oct-2026"),
+    ]):
+        df = pd.DataFrame({
+            "FSC-H": rng.lognormal(6, 1, 2000),
+            "diameter_nm": np.full(2000, 100.0 + 10 * i),
+        })
+        df["sample_id"] = f"S{i}"
+        write_event_parquet(
+            df, tmp_path / "nanofacs" / f"s{i}.fcs.parquet",
+            metadata={"treatment": treatment, "date": day, "cyt": "ZE5"},
+        )
+    pd.DataFrame({"size_nm": [80.0, 90.0]}).to_parquet(tmp_path / "nta_sample.parquet")
+    return ParquetCatalog([tmp_path], tmp_path / "_catalog.parquet")
+
+
+def test_sync_and_listing(catalog, tmp_path):
+    assert catalog.sync() == {"added": 5, "updated": 0, "removed": 0}
+    events = {e["name"]: e for e in catalog.entries(kind="fcs_events")}
+    assert len(events) == 4 and len(catalog.entries(kind="nta")) == 1
+
+    first = events["s0.fcs.parquet"]
+    assert (first["treatment"], first["instrument"], first["date"]) == ("CD81", "ZE5", dt.date(2026, 10, 2))
+    assert (first["sample_id"], first["num_rows"], first["layout_version"]) == ("S0", 2000, 2)
+
+    # A second instance reads the manifest instead of rescanning
+    other = ParquetCatalog([tmp_path], tmp_path / "_catalog.parquet")
+    assert len(other.entries()) == 5
+    assert other.sync() == {"added": 0, "updated": 0, "removed": 0}
+
+    (tmp_path / "nanofacs" / "s3.fcs.parquet").unlink()
+    assert other.sync()["removed"] == 1
+    assert len(catalog.entries(kind="fcs_events")) == 3  # picks up the rewritten manifest
+
+
+def test_summarize_prunes_partitions(catalog):
+    october_cd81 = catalog.summarize(
+        "diameter_nm", treatment="CD81", date_from=dt.date(2026, 10, 1), date_to=dt.date(2026, 10, 31),
+    )
+    assert october_cd81["files_scanned"] == 2 and october_cd81["files_total"] == 4
+    assert october_cd81["count"] == 4000
+    assert october_cd81["median"] == pytest.approx(105.0)
+
+    assert catalog.summarize("diameter_nm", value_min=125)["count"] == 2000
+    assert catalog.summarize("diameter_nm", instrument="Other")["count"] == 0
+    with pytest.raises(ValueError):
+        catalog.summarize("missing")
+
+
+def test_handlers_use_catalog_off_the_event_loop(catalog, monkeypatch):
+    from src.api.routers import nanofacs_ai, upload
+
+    catalog.sync()
+    threads = []
+
+    class RecordingCatalog:
+        def register(self, path):
+            threads.append(threading.current_thread())
+
+        def entries(self, kind=None):
+            threads.append(threading.current_thread())
+            return catalog.entries(kind)
+
+    monkeypatch.setattr(upload, "get_parquet_catalog", RecordingCatalog)
+    monkeypatch.setattr(nanofacs_ai, "get_parquet_catalog", RecordingCatalog)
+
+    async def handlers():
+        await upload._register_in_catalog(catalog.manifest_path)
+        return await nanofacs_ai.list_nanofacs_parquet_files()
+
+    listing = asyncio.run(handlers())
+    assert listing["total"] == 4
+    assert len(threads) == 2 and threading.main_thread() not in threads
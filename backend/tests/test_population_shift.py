@@ -0,0 +1,131 @@
+"""
+Unit tests for the batch population-shift engine.
+
+Tests cover:
+- Sorted-array KS / Wasserstein kernels and moment-based Welch / Levene
+  against scipy (including ties and the large-sample KS p-value)
+- EMD permutation p-value: calibration under the null and power under a shift
+- All-pairs shift matrix: grid vs exact, and agreement with detect_shift()
+- Exact KS p-values in the exact shift matrix for pairs of small samples;
+  the grid matrix keeps the asymptotic p-value
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.analysis import population_shift
+from src.analysis.population_shift import (
+    PopulationShiftDetector,
+    ShiftSeverity,
+    emd_permutation_pvalue,
+    ks_2samp_sorted,
+    ks_pvalue,
+    levene_from_moments,
+    prepare_sample,
+    wasserstein_sorted,
+    welch_from_moments,
+)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(42)
+
+
+@pytest.mark.parametrize("n_a,n_b", [(40, 70), (3000, 5000), (30000, 25000)])
+def test_kernels_match_scipy(rng, n_a, n_b):
+    a = rng.lognormal(5.0, 1.0, n_a)
+    b = rng.lognormal(5.05, 1.1, n_b)
+    pa, pb = prepare_sample(a), prepare_sample(b)
+
+    d, p = ks_2samp_sorted(pa.values, pb.values)
+    ref = stats.ks_2samp(a, b)
+    assert d == pytest.approx(ref.statistic, abs=1e-12)
+    assert p == pytest.approx(ref.pvalue, rel=0.05, abs=1e-3)
+
+    assert wasserstein_sorted(pa.values, pb.values) == pytest.approx(stats.wasserstein_distance(a, b))
+    assert welch_from_moments(pa, pb)[1] == pytest.approx(stats.ttest_ind(a, b, equal_var=False).pvalue)
+    w, w_p = levene_from_moments(pa, pb)
+    ref_w = stats.levene(a, b, center="median")
+    assert w == pytest.approx(ref_w.statistic)
+    assert w_p == pytest.approx(ref_w.pvalue)
+
+
+def test_kernels_with_ties(rng):
+    a = rng.integers(0, 10, 20000).astype(float)
+    b = rng.integers(0, 11, 15000).astype(float)
+    sa, sb = np.sort(a), np.sort(b)
+    assert ks_2samp_sorted(sa, sb)[0] == pytest.approx(stats.ks_2samp(a, b).statistic)
+    assert wasserstein_sorted(sa, sb) == pytest.approx(stats.wasserstein_distance(a, b))
+
+
+def test_emd_permutation_pvalue(rng):
+    same = [
+        emd_permutation_pvalue(
+            np.sort(rng.normal(0, 1, 5000)), np.sort(rng.normal(0, 1, 8000)),
+            n_events=500, n_permutations=200, seed=k,
+        )
+        for k in range(20)
+    ]
+    assert np.mean(np.array(same) < 0.05) <= 0.15
+    assert np.mean(np.array(same) < 0.5) >= 0.25
+
+    a, b = np.sort(rng.normal(0, 1, 50000)), np.sort(rng.normal(0.05, 1, 50000))
+    assert emd_permutation_pvalue(a, b) < 0.01
+    assert emd_permutation_pvalue(a, b) == emd_permutation_pvalue(a, b)  # seeded
+
+
+def test_shift_matrix(rng):
+    samples = [(rng.normal(100 + 2 * i, 10, 20000), f"S{i}", f"Sample {i}") for i in range(5)]
+    samples.append((rng.normal(130, 20, 500), "S5", "Shifted"))
+    detector = PopulationShiftDetector()
+
+    grid = detector.shift_matrix(samples)
+    exact = detector.shift_matrix(samples, method="exact")
+
+    for name in ("ks_statistic", "emd", "mean_p_value", "levene_statistic"):
+        matrix = grid.matrices[name]
+        assert matrix.shape == (6, 6)
+        np.testing.assert_allclose(matrix, matrix.T)
+    np.testing.assert_allclose(np.diag(grid.matrices["ks_p_value"]), 1.0)
+    np.testing.assert_allclose(grid.matrices["ks_statistic"], exact.matrices["ks_statistic"], atol=2e-3)
+    np.testing.assert_allclose(grid.matrices["emd"], exact.matrices["emd"], rtol=0.05, atol=0.05)
+    assert (grid.matrices["emd"] <= exact.matrices["emd"] + 1e-9).all()
+
+    # The exact matrix agrees with the pairwise detector
+    pair = detector.detect_shift(samples[0][0], samples[5][0], "S0", "Sample 0", "S5", "Shifted")
+    ks = next(t for t in pair.tests if t.test_name.startswith("Kolmogorov"))
+    assert exact.matrices["ks_statistic"][0, 5] == pytest.approx(ks.statistic)
+    assert exact.severity[0][5] == pair.overall_severity == ShiftSeverity.CRITICAL
+    assert grid.max_severity == ShiftSeverity.CRITICAL and grid.any_significant_shift
+
+    with pytest.raises(ValueError):
+        detector.shift_matrix(samples[:1])
+
+
+def test_shift_matrix_small_samples_use_exact_ks_pvalue(rng):
+    samples = [(rng.normal(100 + 3 * i, 10, 40 + 10 * i), f"S{i}", f"Sample {i}") for i in range(3)]
+    matrix = PopulationShiftDetector().shift_matrix(samples, method="exact")
+
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        ref = stats.ks_2samp(samples[i][0], samples[j][0])
+        assert matrix.matrices["ks_statistic"][i, j] == pytest.approx(ref.statistic)
+        assert matrix.matrices["ks_p_value"][i, j] == pytest.approx(ref.pvalue)
+        assert matrix.matrices["ks_p_value"][j, i] == pytest.approx(ref.pvalue)
+
+
+def test_grid_shift_matrix_never_runs_the_exact_ks_test(rng, monkeypatch):
+    # Typical EV files are below KS_EXACT_MAX_N; scipy's exact test on every
+    # pair would make the grid matrix ~100x slower
+    def exact_test(*args, **kwargs):
+        raise AssertionError("grid shift matrix called scipy.stats.ks_2samp")
+
+    monkeypatch.setattr(population_shift.stats, "ks_2samp", exact_test)
+    samples = [(rng.normal(100 + i, 10, 8000), f"S{i}", f"Sample {i}") for i in range(20)]
+    matrix = PopulationShiftDetector().shift_matrix(samples)
+
+    d, p = matrix.matrices["ks_statistic"], matrix.matrices["ks_p_value"]
+    assert p.shape == (20, 20)
+    off_diagonal = ~np.eye(20, dtype=bool)
+    np.testing.assert_allclose(p[off_diagonal], ks_pvalue(d, 8000, 8000)[off_diagonal])
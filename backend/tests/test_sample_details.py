@@ -0,0 +1,59 @@
+"""
+Unit tests for the batched sample-detail loader.
+
+Tests cover:
+- Latest FCS/NTA result selection and unknown IDs
+- Fixed query count regardless of sample count, and per-session memoization
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event  # type: ignore[import-not-found]
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # type: ignore[import-not-found]
+
+from src.database.crud import get_sample_details
+from src.database.models import Base, Sample, FCSResult, NTAResult
+
+
+def test_batched_loader(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'details.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async with factory() as session:
+            for i in range(30):
+                sample = Sample(sample_id=f"S{i}", processing_status="completed")
+                sample.fcs_results = [FCSResult(total_events=100 + i)]
+                sample.nta_results = [
+                    NTAResult(mean_size_nm=1.0, median_size_nm=1.0, processed_at=datetime(2020, 1, 1)),
+                    NTAResult(mean_size_nm=2.0, median_size_nm=90.0 + i, processed_at=datetime(2025, 1, 1)),
+                ]
+                session.add(sample)
+            await session.commit()
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+        async with factory() as session:
+            ids = [f"S{i}" for i in range(30)] + ["missing", "S0"]
+            details = await get_sample_details(session, ids)
+            first_pass = len(statements)
+
+            # Memoized: repeated and single lookups in the same session are free
+            again = await get_sample_details(session, ["S5", "missing"])
+            second_pass = len(statements) - first_pass
+
+        await engine.dispose()
+        return details, again, first_pass, second_pass
+
+    details, again, first_pass, second_pass = asyncio.run(run())
+
+    assert len(details) == 30 and "missing" not in details
+    assert details["S7"].fcs.total_events == 107
+    assert details["S7"].nta.median_size_nm == 97.0
+    assert first_pass == 3  # samples + fcs_results + nta_results
+    assert second_pass == 0
+    assert list(again) == ["S5"]
@@ -0,0 +1,82 @@
+"""
+Unit tests for per-sample preview artifacts.
+
+Tests cover:
+- FCS preview: density PNG, channel ranges, size histogram and quantiles
+- Weighted NTA size histogram
+- Storage round trip, copy between samples and deletion
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.utils.sample_previews import (
+    PREVIEW_QUANTILES,
+    PREVIEW_SIZE_BINS,
+    build_fcs_preview,
+    build_nta_preview,
+    copy_previews,
+    delete_previews,
+    density_png_path,
+    load_preview,
+    preview_dir,
+    write_preview,
+)
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "FSC-H": rng.lognormal(6, 1, 20_000),
+        "SSC-H": rng.lognormal(5, 1, 20_000),
+        "Time": np.arange(20_000, dtype=np.float64),
+    })
+
+
+def test_fcs_preview(events):
+    sizes = np.random.default_rng(4).lognormal(np.log(100), 0.3, 5000)
+    preview, png = build_fcs_preview(events, "FSC-H", "SSC-H", sizes=np.append(sizes, np.nan))
+
+    assert Image.open(io.BytesIO(png)).size == (256, 256)
+    assert preview["n_events"] == 20_000 and preview["density"]["x_channel"] == "FSC-H"
+    assert preview["channels"]["Time"]["max"] == 19_999
+    assert preview["channels"]["Time"]["quantiles"][4] == pytest.approx(np.median(events["Time"]), rel=1e-3)
+
+    histogram = preview["size_histogram"]
+    assert len(histogram["counts"]) == PREVIEW_SIZE_BINS and len(histogram["bin_edges_nm"]) == PREVIEW_SIZE_BINS + 1
+    assert histogram["n"] == sum(histogram["counts"]) == 5000
+    assert histogram["quantiles"][4] == pytest.approx(np.median(sizes), rel=1e-2)
+
+    no_density, no_png = build_fcs_preview(events, "FSC-H", "missing")
+    assert no_png is None and no_density["density"] is None and no_density["size_histogram"] is None
+
+
+def test_nta_preview_is_count_weighted():
+    sizes = np.array([60.0, 100.0, 200.0])
+    preview = build_nta_preview(pd.DataFrame({"size": sizes}), sizes, np.array([1.0, 8.0, 1.0]))
+    histogram = preview["size_histogram"]
+    assert histogram["n"] == 10
+    assert histogram["quantiles"][PREVIEW_QUANTILES.index(0.5)] == 100.0
+    assert max(histogram["counts"]) == 8
+
+
+def test_storage_round_trip(tmp_path, events):
+    preview, png = build_fcs_preview(events, "FSC-H", "SSC-H")
+    write_preview("P5 F10/CD81", "fcs", preview, png, root=tmp_path)
+    assert preview_dir("P5 F10/CD81", tmp_path).name == "P5_F10_CD81"
+    assert load_preview("P5 F10/CD81", "fcs", tmp_path) == preview
+    assert load_preview("P5 F10/CD81", "nta", tmp_path) is None
+
+    assert copy_previews("P5 F10/CD81", "copy", "fcs", root=tmp_path)
+    assert density_png_path("copy", root=tmp_path).read_bytes() == png
+    assert not copy_previews("missing", "copy", "fcs", root=tmp_path)
+
+    delete_previews("copy", root=tmp_path)
+    assert load_preview("copy", "fcs", tmp_path) is None and density_png_path("copy", root=tmp_path) is None
+    with pytest.raises(ValueError):
+        write_preview("x", "bogus", {}, root=tmp_path)
@@ -0,0 +1,68 @@
+"""
+Unit tests for the SQLite read/write session split.
+
+Tests cover:
+- Reads of a fresh session go to the reader pool
+- Flushes and INSERT/UPDATE/DELETE statements go to the writer
+- Reads after a session's first write stay on the writer (read-your-writes)
+"""
+
+import asyncio
+
+from sqlalchemy import event, func, select, text  # type: ignore[import-not-found]
+
+from src.database import connection
+from src.database.models import Alert, Base
+
+
+def test_routing_session_read_write_split(tmp_path, monkeypatch):
+    monkeypatch.setattr(connection.settings, "database_url", f"sqlite+aiosqlite:///{tmp_path / 'split.db'}")
+    monkeypatch.setattr(connection.settings, "sqlite_read_write_split", True)
+    for name in ("_engine", "_read_engine", "_session_factory"):
+        monkeypatch.setattr(connection, name, None)
+
+    statements = []
+
+    def record(engine_name):
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append((engine_name, statement.split()[0].upper()))
+        return before_cursor_execute
+
+    async def alert_count(db):
+        return (await db.execute(select(func.count(Alert.id)))).scalar()
+
+    async def run():
+        writer = connection.get_engine()
+        reader = connection.get_read_engine()
+        assert reader is not writer
+        async with writer.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        event.listen(writer.sync_engine, "before_cursor_execute", record("writer"))
+        event.listen(reader.sync_engine, "before_cursor_execute", record("reader"))
+        factory = connection.get_session_factory()
+
+        async with factory() as db:
+            assert await alert_count(db) == 0
+        reads = list(statements)
+
+        async with factory() as db:
+            db.add(Alert(alert_type="quality_warning", severity="info", title="t", message="m", source="qc"))
+            await db.flush()
+            flushed = list(statements)
+            assert await alert_count(db) == 1  # uncommitted row: only the writer sees it
+            await db.commit()
+        in_transaction = statements[len(flushed):]
+
+        async with factory() as db:
+            await db.execute(text("UPDATE alerts SET title = 'renamed'"))
+            await db.commit()
+        updated = statements[len(flushed) + len(in_transaction):]
+
+        await connection.close_connections()
+        return reads, flushed[len(reads):], in_transaction, updated
+
+    reads, flushed, in_transaction, updated = asyncio.run(run())
+    assert reads and all(engine == "reader" for engine, _ in reads)
+    assert ("writer", "INSERT") in flushed and all(engine == "writer" for engine, _ in flushed)
+    assert ("writer", "SELECT") in in_transaction and all(engine == "writer" for engine, _ in in_transaction)
+    assert updated == [("writer", "UPDATE")]
@@ -0,0 +1,152 @@
+"""
+Unit tests for the cross-process (multi-worker) caches.
+
+Tests cover:
+- TTLCache on the SQLite store: hits, invalidation and eviction across "workers"
+- A value set by another process is visible (real subprocess)
+- Parsed FCS events and Mie LUTs reused from memory-mapped files
+- File locks and catalog registration from several processes at once
+"""
+
+import mmap
+import subprocess
+import sys
+from pathlib import Path
+
+import flowio
+import numpy as np
+import pytest
+
+from src.api.cache import TTLCache
+from src.physics import mie_scatter
+from src.utils import fcs_cache, shared_cache
+from src.utils.file_lock import InterProcessLock
+from src.utils.shared_cache import SharedArrayStore, SQLiteTTLStore
+
+
+def _is_mapped(values) -> bool:
+    while values is not None:
+        if isinstance(values, (np.memmap, mmap.mmap)):
+            return True
+        values = getattr(values, "base", None)
+    return False
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    ttl_store = SQLiteTTLStore(tmp_path / "ttl_cache.db")
+    array_store = SharedArrayStore(tmp_path / "arrays", max_bytes=64 * 1024 * 1024)
+    monkeypatch.setattr(shared_cache, "_ttl_store", ttl_store)
+    monkeypatch.setattr(shared_cache, "_array_store", array_store)
+    monkeypatch.setattr(shared_cache, "_resolved", True)
+    return ttl_store, array_store
+
+
+def test_ttl_cache_shared_between_workers(stores):
+    worker_a = TTLCache(max_entries=3, name="scatter_data")
+    worker_b = TTLCache(max_entries=3, name="scatter_data")
+
+    worker_a.set("scatter:P1:abc", {"points": [1, 2]}, ttl_seconds=60)
+    worker_a.set("scatter:P10:abc", {"points": [3]}, ttl_seconds=60)
+    assert worker_b.get("scatter:P1:abc") == {"points": [1, 2]}
+    assert worker_b.stats["shared"] and worker_b.stats["entries"] == 2
+
+    assert worker_b.invalidate("scatter:P1:") == 1
+    assert worker_a.get("scatter:P1:abc") is None
+    assert worker_a.get("scatter:P10:abc") == {"points": [3]}
+
+    worker_a.set("expired", 1, ttl_seconds=-1)
+    assert worker_b.get("expired") is None
+    for i in range(4):
+        worker_a.set(f"k{i}", i, ttl_seconds=60)
+    assert worker_b.stats["entries"] == 3 and worker_b.get("k3") == 3
+
+    worker_a.set("unpicklable", lambda: None, ttl_seconds=60)
+    assert worker_b.get("unpicklable") is None
+    assert TTLCache(name="other").get("k3") is None
+
+
+def test_value_from_another_process(stores, tmp_path):
+    code = (
+        "import sys; sys.path.insert(0, '.'); "
+        "from src.utils.shared_cache import SQLiteTTLStore; "
+        f"SQLiteTTLStore({str(tmp_path / 'ttl_cache.db')!r}).set('row_counts', 'count:samples:x', 42, 60, 10)"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert TTLCache(name="row_counts").get("count:samples:x") == 42
+
+
+def test_fcs_events_and_luts_memory_mapped(stores, tmp_path, monkeypatch):
+    events = np.random.default_rng(0).lognormal(5, 1, (3000, 3)).astype(np.float32)
+    path = tmp_path / "s1.fcs"
+    with open(path, "wb") as f:
+        flowio.create_fcs(f, events.ravel().tolist(), ["FSC-H", "SSC-H", "FL1-H"])
+
+    fcs_cache.clear_fcs_cache()
+    parsed, channels = fcs_cache.get_cached_fcs_data(str(path))
+
+    # Another worker: empty per-process cache, must not re-parse
+    fcs_cache.clear_fcs_cache()
+    import src.parsers.fcs_parser as fcs_parser
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file was parsed again")
+
+    monkeypatch.setattr(fcs_parser, "FCSParser", fail)
+    shared, shared_channels = fcs_cache.get_cached_fcs_data(str(path))
+    fcs_cache.clear_fcs_cache()
+
+    assert shared_channels == channels and list(shared.columns) == list(parsed.columns)
+    np.testing.assert_array_equal(shared["SSC-H"].to_numpy(), events[:, 1])
+    assert _is_mapped(shared["FSC-H"].to_numpy())
+    assert (shared["file_name"] == "s1.fcs").all()
+
+    builds = []
+    calculator = mie_scatter.MultiSolutionMieCalculator(n_particle=1.41, lut_resolution=50)
+    monkeypatch.setattr(mie_scatter, "_lut_memo", type(mie_scatter._lut_memo)())
+    monkeypatch.setattr(mie_scatter.MultiSolutionMieCalculator, "_calc_ssc", lambda self, d, w: builds.append(d) or 0.0)
+    again = mie_scatter.MultiSolutionMieCalculator(n_particle=1.41, lut_resolution=50)
+    assert builds == []
+    np.testing.assert_array_equal(again.lut_ssc_blue, calculator.lut_ssc_blue)
+    assert not again.lut_ssc_blue.flags.writeable
+
+
+def test_catalog_writes_from_several_processes(tmp_path):
+    import pandas as pd
+    from src.utils.parquet_catalog import ParquetCatalog
+
+    lock_path = tmp_path / "x.lock"
+    holder = subprocess.Popen(
+        [sys.executable, "-c", (
+            "import sys, time; sys.path.insert(0, '.'); "
+            "from src.utils.file_lock import InterProcessLock; "
+            f"lock = InterProcessLock({str(lock_path)!r}); lock.acquire(); print('held', flush=True); time.sleep(2)"
+        )],
+        cwd=Path(__file__).parent.parent, stdout=subprocess.PIPE, text=True,
+    )
+    assert holder.stdout.readline().strip() == "held"
+    with pytest.raises(TimeoutError):
+        InterProcessLock(lock_path, timeout=0.2).acquire()
+    holder.wait()
+    with InterProcessLock(lock_path, timeout=1):
+        pass
+
+    # Three "workers" each register their own uploads into one manifest
+    for i in range(12):
+        pd.DataFrame({"size_nm": [80.0 + i]}).to_parquet(tmp_path / f"w{i % 3}_{i}.pq")
+
+    script = (
+        "import sys; sys.path.insert(0, '.'); from pathlib import Path; "
+        "from src.utils.parquet_catalog import ParquetCatalog; "
+        f"root = Path({str(tmp_path)!r}); catalog = ParquetCatalog([root / 'none'], root / '_catalog.parquet'); "
+        "[catalog.register(p.rename(p.with_suffix('.parquet'))) for p in sorted(root.glob(f'w{sys.argv[1]}_*.pq'))]"
+    )
+    workers = [
+        subprocess.Popen([sys.executable, "-c", script, str(w)], cwd=Path(__file__).parent.parent, stderr=subprocess.PIPE)
+        for w in range(3)
+    ]
+    for proc in workers:
+        assert proc.wait() == 0, proc.stderr.read()
+    entries = ParquetCatalog([tmp_path / "none"], tmp_path / "_catalog.parquet").entries()
+    assert len(entries) == 12
@@ -0,0 +1,140 @@
+"""
+Unit tests for request coalescing (single-flight).
+
+Tests cover:
+- Concurrent loads of an uncached FCS file share one parse (threads and async)
+- A failed load raises in every waiting caller, and the next call retries
+- TTLCache.get_or_compute_async runs one computation for concurrent misses
+- Calibration loaders are fitted once per calibration file version
+- Per-request EV RI overrides never modify the shared calibrator
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.parsers.fcs_parser as fcs_parser
+from src.api.cache import TTLCache
+from src.physics import bead_calibration
+from src.utils import fcs_cache
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.fixture
+def slow_parser(tmp_path, monkeypatch):
+    path = tmp_path / "s1.fcs"
+    path.write_bytes(b"FCS3.0")
+    parses = []
+
+    class SlowParser:
+        def __init__(self, file_path):
+            self.channel_names = ["FSC-H", "SSC-H"]
+
+        def parse(self):
+            parses.append(threading.current_thread().name)
+            time.sleep(0.2)
+            return pd.DataFrame({"FSC-H": [1.0, 2.0], "SSC-H": [3.0, 4.0]})
+
+    monkeypatch.setattr(fcs_parser, "FCSParser", SlowParser)
+    fcs_cache.clear_fcs_cache()
+    yield str(path), parses
+    fcs_cache.clear_fcs_cache()
+
+
+def test_concurrent_fcs_loads_share_one_parse(slow_parser):
+    path, parses = slow_parser
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: fcs_cache.get_cached_fcs_data(path), range(5)))
+    assert len(parses) == 1
+    assert all(data is results[0][0] for data, _ in results)
+
+    fcs_cache.clear_fcs_cache()
+
+    async def page_load():
+        return await asyncio.gather(*(fcs_cache.load_cached_fcs_data(path) for _ in range(5)))
+
+    results = asyncio.run(page_load())
+    assert len(parses) == 2 and parses[1].startswith("fcs-load")
+    assert all(data is results[0][0] for data, _ in results)
+    assert fcs_cache.fcs_cache_stats()["coalesced_loads"] >= 4
+
+
+def test_failure_reaches_every_waiter_then_retries():
+    flights = SingleFlight("test")
+    calls = []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.1)
+        raise ValueError("corrupt file")
+
+    def call():
+        try:
+            flights.do("k", failing)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        errors = list(pool.map(lambda _: call(), range(4)))
+    assert errors == ["corrupt file"] * 4 and len(calls) == 1
+    assert flights.do("k", lambda: 42) == 42 and flights.in_flight == 0
+
+
+def test_ttl_cache_get_or_compute_async():
+    cache = TTLCache(name="test_scatter")
+    computed = []
+
+    async def compute():
+        computed.append(1)
+        await asyncio.sleep(0.05)
+        return {"points": [1, 2, 3]}
+
+    async def burst():
+        return await asyncio.gather(*(cache.get_or_compute_async("scatter:P1:x", compute, 60) for _ in range(5)))
+
+    results = asyncio.run(burst())
+    assert len(computed) == 1 and all(r is results[0] for r in results)
+    assert asyncio.run(cache.get_or_compute_async("scatter:P1:x", compute, 60)) is results[0]
+    assert len(computed) == 1
+    assert cache.stats["coalesced"] == 4
+
+
+def test_calibration_loaded_once_per_file_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(bead_calibration, "CALIBRATION_DIR", tmp_path)
+    monkeypatch.setattr(bead_calibration, "_calibration_memo", {})
+    loads = []
+    monkeypatch.setattr(bead_calibration, "_load_fcmpass_calibration", lambda: loads.append(1) or object())
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: bead_calibration.get_fcmpass_calibration(), range(4)))
+    assert len(loads) == 1 and all(r is results[0] for r in results)
+
+    (tmp_path / bead_calibration.FCMPASS_CALIBRATION_FILE).write_text("{}")
+    assert bead_calibration.get_fcmpass_calibration() is not results[0]
+    assert len(loads) == 2
+
+
+def test_shared_calibrator_not_changed_by_ri_overrides():
+    from src.physics.mie_scatter import FCMPASSCalibrator
+
+    shared = FCMPASSCalibrator(n_ev=1.37)
+    shared.fit_from_beads({100.0: 1500.0, 200.0: 30000.0, 400.0: 400000.0})
+    au = np.array([2000.0, 8000.0, 50000.0])
+    expected = {ri: shared.with_ev_ri(ri).predict_batch(au)[0] for ri in (1.37, 1.45)}
+    assert not np.allclose(expected[1.37], expected[1.45])
+
+    def size(i):
+        ri = (1.37, 1.45)[i % 2]
+        return ri, shared.with_ev_ri(ri).predict_batch(au)[0]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for ri, diameters in pool.map(size, range(40)):
+            np.testing.assert_array_equal(diameters, expected[ri])
+    assert shared.n_ev == 1.37
+    np.testing.assert_array_equal(shared.predict_batch(au)[0], expected[1.37])
@@ -0,0 +1,115 @@
+"""
+Unit tests for the content-addressed AI summary cache.
+
+Tests cover:
+- Memory / disk round trip, key derivation and digest invalidation
+- Disk budget: least recently read entries pruned
+- NanoFACS follow-up questions reusing the file context (stubbed LLM), and
+  missing it after a recalibration
+- Chat attachment summaries memoized by content
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.routers import chat, nanofacs_ai
+from src.parsers.event_parquet import write_event_parquet
+from src.utils import summary_cache
+from src.utils.summary_cache import SummaryCache, content_digest, file_digest
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SummaryCache(tmp_path / "cache")
+    monkeypatch.setattr(summary_cache, "_summary_cache", cache)
+    return cache
+
+
+def test_round_trip_and_keys(tmp_path, cache):
+    key = cache.key(content_digest(b"abc"), "kind", file="a.fcs")
+    assert key != cache.key(content_digest(b"abd"), "kind", file="a.fcs")
+    assert key != cache.key(content_digest(b"abc"), "kind", file="b.fcs")
+
+    stored = cache.put(key, {"n": np.int64(3), "values": np.arange(2.0), "pair": (1, 2)})
+    assert stored == {"n": 3, "values": [0.0, 1.0], "pair": [1, 2]}
+    assert SummaryCache(tmp_path / "cache").get(key) == stored
+
+    assert cache.get_or_compute("kind/none", lambda: None) is None
+    assert cache.get("kind/none") is None
+
+    path = tmp_path / "f.bin"
+    path.write_bytes(b"one")
+    first = file_digest(path)
+    assert first == content_digest(b"one") and file_digest(path) == first
+    path.write_bytes(b"two!")
+    assert file_digest(path) == content_digest(b"two!")
+
+
+def test_follow_up_questions_reuse_file_context(tmp_path, cache, monkeypatch):
+    rng = np.random.default_rng(0)
+    path = tmp_path / "s1.parquet"
+    write_event_parquet(pd.DataFrame({
+        "FSC-H": rng.lognormal(6, 1, 5000),
+        "SSC-H": rng.lognormal(5, 1, 5000),
+    }), path)
+
+    prompts = []
+    monkeypatch.setattr(nanofacs_ai, "_call_bedrock", lambda prompt, max_tokens=1500: prompts.append(prompt) or "stub")
+    request = nanofacs_ai.FCSAskRequest(question="What is the median SSC?", file_paths=[str(path)])
+    first = asyncio.run(nanofacs_ai.ask_about_fcs_data(request))
+
+    read_parquet = nanofacs_ai._read_fcs_parquet
+
+    def fail(file_path):
+        raise AssertionError("file was read again")
+
+    monkeypatch.setattr(nanofacs_ai, "_read_fcs_parquet", fail)
+    second = asyncio.run(nanofacs_ai.ask_about_fcs_data(request))
+    assert first.answer == second.answer == "stub"
+    assert prompts[0] == prompts[1]
+    assert cache.stats["misses"] == 1 and cache.stats["hits"] == 1
+
+    # Size statistics depend on the calibration: a new one must not reuse the context
+    reads = []
+    monkeypatch.setattr(nanofacs_ai, "_read_fcs_parquet", lambda p: reads.append(p) or read_parquet(p))
+    monkeypatch.setattr(nanofacs_ai, "get_calibration_fingerprint", lambda: "fcmpass_calibration.json@1")
+    asyncio.run(nanofacs_ai.ask_about_fcs_data(request))
+    asyncio.run(nanofacs_ai.ask_about_fcs_data(request))
+    assert len(reads) == 1
+
+
+def test_disk_budget_prunes_least_recently_read(tmp_path):
+    cache = SummaryCache(tmp_path / "cache", memory_entries=1, max_disk_bytes=20_000)
+    blob = np.random.default_rng(0).integers(0, 2**31, 1000).tolist()  # ~5 kB compressed
+    keys = [cache.key(content_digest(str(i).encode()), "kind") for i in range(8)]
+    for i, key in enumerate(keys):
+        if i >= 1:
+            assert cache.get(keys[0])["i"] == 0  # keep reading the first entry
+        time.sleep(0.02)  # file times have clock-tick resolution
+        cache.put(key, {"i": i, "blob": blob})
+        time.sleep(0.02)
+
+    files = list((tmp_path / "cache").rglob("*.json.gz"))
+    assert sum(f.stat().st_size for f in files) <= 20_000
+    assert len(files) < len(keys)
+    assert SummaryCache(tmp_path / "cache").get(keys[0]) is not None
+    assert cache.stats["disk_megabytes"] <= 0.02
+
+
+def test_chat_attachment_summary_memoized(cache, monkeypatch):
+    calls = []
+    original = chat._compute_csv_summary
+
+    def compute(data, filename):
+        calls.append(filename)
+        return original(data, filename)
+
+    monkeypatch.setattr(chat, "_compute_csv_summary", compute)
+    data = b"size_nm,count\n80,10\n120,5\n"
+    first = chat._extract_csv_summary_from_bytes(data, "nta.csv")
+    assert chat._extract_csv_summary_from_bytes(data, "nta.csv") == first
+    assert "size_nm" in first and calls == ["nta.csv"]
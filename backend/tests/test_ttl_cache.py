@@ -0,0 +1,101 @@
+"""
+Unit tests for the in-memory TTLCache.
+
+Tests cover:
+- LRU eviction: reads keep an entry alive, the least recently used goes first
+- Expiry heap: cleanup and the background sweeper remove only expired entries
+- Estimated memory of NumPy / pandas / nested payloads in the stats
+- Per-sample invalidation does not touch other samples' keys
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from src.api import cache as cache_module
+from src.api.cache import TTLCache, estimate_size_bytes
+
+
+def test_lru_eviction_and_overwrite():
+    cache = TTLCache(max_entries=3, name="test_lru")
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper(), ttl_seconds=60)
+    assert cache.get("a") == "A"  # a is now the most recently used
+
+    cache.set("d", "D", ttl_seconds=60)
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in ("a", "c", "d")] == ["A", "C", "D"]
+
+    # Expired entries make room before live ones are evicted
+    cache.set("c", "C2", ttl_seconds=-1)
+    cache.set("e", "E", ttl_seconds=60)
+    assert cache.get("a") == "A" and cache.get("d") == "D" and cache.get("c") is None
+    assert cache.stats["evictions"] == 1 and cache.stats["entries"] == 3
+
+
+def test_expiry_heap_and_sweeper(monkeypatch):
+    cache = TTLCache(name="test_expiry")
+    cache.set("old", 1, ttl_seconds=-1)
+    cache.set("fresh", 2, ttl_seconds=60)
+    cache.set("renewed", 3, ttl_seconds=-1)
+    cache.set("renewed", 4, ttl_seconds=60)  # the stale heap item must not remove it
+
+    assert cache.cleanup_expired() == 1
+    assert cache.get("fresh") == 2 and cache.get("renewed") == 4
+    assert cache.stats["entries"] == 2 and cache.stats["expirations"] == 1
+
+    # Heap does not grow without bound when keys are rewritten
+    for _ in range(500):
+        cache.set("fresh", 2, ttl_seconds=60)
+    assert len(cache._expiry_heap) <= 2 * cache.stats["entries"] + 64
+
+    swept = TTLCache(name="test_sweeper")
+    swept.set("scatter:P1:x", {"points": [1]}, ttl_seconds=0.05)
+    monkeypatch.setattr(cache_module, "_all_caches", (swept,))
+
+    async def run_briefly():
+        assert cache_module.start_cache_sweeper(0) is None
+        sweeper = cache_module.start_cache_sweeper(0.1)
+        await asyncio.sleep(0.35)
+        sweeper.cancel()
+
+    asyncio.run(run_briefly())
+    assert swept.stats["entries"] == 0 and swept.stats["expirations"] == 1
+    assert swept.stats["size_bytes"] == 0
+
+
+def test_memory_estimates_in_stats():
+    events = np.zeros((100_000, 2), dtype=np.float64)
+    frame = pd.DataFrame(events, columns=["FSC-H", "SSC-H"])
+    payload = {"data": [{"x": 1.0, "y": 2.0, "index": i} for i in range(5000)], "sample_id": "P1"}
+
+    assert estimate_size_bytes(events) == events.nbytes
+    assert events.nbytes <= estimate_size_bytes(frame) < events.nbytes * 1.1
+    assert 5000 * 200 < estimate_size_bytes(payload) < 5000 * 1000
+
+    cache = TTLCache(name="test_memory")
+    cache.set("fcs:P1:x", frame, ttl_seconds=60)
+    cache.set("scatter:P1:x", payload, ttl_seconds=60)
+    stats = cache.stats
+    assert stats["size_bytes"] == estimate_size_bytes(frame) + estimate_size_bytes(payload)
+    assert stats["megabytes"] > 1.6
+
+    cache.invalidate("fcs:P1:")
+    assert cache.stats["size_bytes"] == estimate_size_bytes(payload)
+    assert all("megabytes" in s for s in cache_module.get_all_cache_stats())
+
+
+def test_sample_invalidation_uses_key_groups():
+    cache = TTLCache(name="test_groups")
+    for sample in ("P1", "P10", "P2"):
+        for i in range(3):
+            cache.set(f"scatter:{sample}:{i}", i, ttl_seconds=60)
+    cache.set("count:samples:abc", 7, ttl_seconds=60)
+
+    assert cache.invalidate("scatter:P1:") == 3
+    assert cache.get("scatter:P10:0") == 0 and cache.get("scatter:P1:0") is None
+    assert cache.invalidate("scatter:P10:1") == 1
+    assert cache.invalidate("scatter:P") == 5  # plain prefixes still work
+    assert cache.invalidate("count:samples:") == 1
+    assert cache.stats["entries"] == 0 and cache._groups == {}
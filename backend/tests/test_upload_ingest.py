@@ -0,0 +1,233 @@
+"""
+Unit tests for streaming upload ingestion.
+
+Tests cover:
+- Chunked save with content hashing
+- Incremental size-limit enforcement (partial file removed)
+- FCS dedupe key sensitivity to processing parameters
+- Re-uploading identical FCS content reuses the earlier file, results and
+  previews; a changed wavelength or calibration parses again
+- Resumable upload protocol (offsets, conflicts, resume, cancel)
+- Resumable uploads only accept requests from the user who started them
+- Finalizing a resumable upload moves the staged file into place, records the
+  sample and its job, and removes the staging directory
+"""
+
+import asyncio
+import hashlib
+import io
+
+import flowio
+import numpy as np
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.api.routers import upload
+from src.api.routers.upload import fcs_ingest_key
+from src.utils import upload_stream
+from src.utils.upload_stream import stream_upload_to_disk
+
+
+def _upload(payload: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(payload), filename="sample.fcs")
+
+
+def test_stream_upload_hashes_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_stream, "UPLOAD_CHUNK_SIZE", 1000)
+    payload = bytes(range(256)) * 50
+
+    stored = asyncio.run(stream_upload_to_disk(_upload(payload), tmp_path / "a" / "sample.fcs"))
+
+    assert stored.path.read_bytes() == payload
+    assert stored.size_bytes == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+
+
+def test_stream_upload_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_stream, "UPLOAD_CHUNK_SIZE", 64 * 1024)
+    monkeypatch.setattr(upload.settings, "max_upload_size_mb", 1)
+    destination = tmp_path / "big.fcs"
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(stream_upload_to_disk(_upload(b"x" * (1024 * 1024 + 1)), destination))
+
+    assert exc.value.status_code == 413
+    assert not destination.exists()
+
+
+def test_fcs_ingest_key():
+    digest = hashlib.sha256(b"events").hexdigest()
+    assert fcs_ingest_key(digest) == fcs_ingest_key(digest, None, None, None)
+    assert fcs_ingest_key(digest) != fcs_ingest_key(digest, n_particle=1.45)
+    assert fcs_ingest_key(digest) != fcs_ingest_key(hashlib.sha256(b"other").hexdigest())
+
+
+def test_resumable_upload_protocol(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path)
+    client = TestClient(app)
+    base = "/api/v1/upload/resumable"
+    payload = b"FCS3.0" + bytes(range(256)) * 20
+
+    created = client.post(base, json={"filename": "run.fcs", "size_bytes": len(payload)})
+    assert created.status_code == 201
+    upload_id = created.json()["upload_id"]
+
+    first = client.patch(f"{base}/{upload_id}", content=payload[:1000], headers={"Upload-Offset": "0"})
+    assert first.json()["offset"] == 1000
+    stale = client.patch(f"{base}/{upload_id}", content=payload[:1000], headers={"Upload-Offset": "0"})
+    assert stale.status_code == 409 and stale.json()["detail"]["offset"] == 1000
+    assert client.post(f"{base}/{upload_id}/finalize").status_code == 409
+
+    offset = int(client.head(f"{base}/{upload_id}").headers["Upload-Offset"])
+    rest = client.patch(f"{base}/{upload_id}", content=payload[offset:], headers={"Upload-Offset": str(offset)})
+    assert rest.json()["complete"]
+    overrun = client.patch(f"{base}/{upload_id}", content=b"x", headers={"Upload-Offset": str(len(payload))})
+    assert overrun.status_code == 413
+    assert (tmp_path / ".resumable" / upload_id / "data.part").read_bytes() == payload
+
+    assert client.delete(f"{base}/{upload_id}").status_code == 200
+    assert client.get(f"{base}/{upload_id}").status_code == 404
+    assert client.post(base, json={"filename": "run.exe", "size_bytes": 10}).status_code == 400
+
+
+def test_resumable_upload_is_owned_by_its_creator(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from src.api.auth_middleware import create_access_token
+    from src.api.main import app
+
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path)
+    client = TestClient(app)
+    base = "/api/v1/upload/resumable"
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': '2'})}"}
+
+    upload_id = client.post(base, json={"filename": "run.fcs", "size_bytes": 10}, headers=alice).json()["upload_id"]
+
+    for headers in ({}, bob):
+        chunk = client.patch(f"{base}/{upload_id}", content=b"x" * 4, headers={**headers, "Upload-Offset": "0"})
+        assert chunk.status_code == 403
+        assert client.head(f"{base}/{upload_id}", headers=headers).status_code == 403
+        assert client.delete(f"{base}/{upload_id}", headers=headers).status_code == 403
+        assert client.post(f"{base}/{upload_id}/finalize", headers=headers).status_code == 403
+
+    chunk = client.patch(f"{base}/{upload_id}", content=b"x" * 4, headers={**alice, "Upload-Offset": "0"})
+    assert chunk.status_code == 200 and chunk.json()["offset"] == 4
+    assert client.delete(f"{base}/{upload_id}", headers=alice).status_code == 200
+
+
+def test_fcs_reupload_reuses_earlier_ingest(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select  # type: ignore[import-not-found]
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # type: ignore[import-not-found]
+
+    from src.api.main import app
+    from src.database.connection import get_session
+    from src.database.models import Base, Sample
+    from src.utils.sample_previews import load_preview
+
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload.settings, "parquet_dir", tmp_path / "parquet")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dedupe.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def session():
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    async def stored_paths():
+        async with AsyncSession(engine) as db:
+            rows = await db.execute(select(Sample.sample_id, Sample.file_path_fcs))
+            return dict(rows.all())
+
+    asyncio.run(create_tables())
+    monkeypatch.setitem(app.dependency_overrides, get_session, session)
+    client = TestClient(app)
+
+    buffer = io.BytesIO()
+    events = np.random.default_rng(5).lognormal(6, 1, (3000, 2))
+    flowio.create_fcs(buffer, events.ravel().tolist(), ["FSC-H", "SSC-H"])
+
+    def post(name, **form):
+        response = client.post("/api/v1/upload/fcs", files={"file": (name, buffer.getvalue())}, data=form)
+        assert response.status_code == 200
+        return response.json()
+
+    first, again = post("run_a.fcs"), post("run_b.fcs")
+    assert not first["deduplicated"] and again["deduplicated"]
+    assert again["content_sha256"] == first["content_sha256"]
+    assert again["fcs_results"]["total_events"] == first["fcs_results"]["total_events"] == 3000
+    assert len(list((tmp_path / "uploads").iterdir())) == 1  # the second copy was removed
+    paths = asyncio.run(stored_paths())
+    assert paths["run_b"] == paths["run_a"]
+    assert load_preview("run_b", "fcs") == load_preview("run_a", "fcs") is not None
+
+    # Anything the parse results depend on makes it a new ingest
+    assert not post("run_c.fcs", wavelength_nm="488")["deduplicated"]
+    monkeypatch.setattr(upload, "get_calibration_fingerprint", lambda: "recalibrated")
+    assert not post("run_d.fcs")["deduplicated"]
+    assert len(list((tmp_path / "uploads").iterdir())) == 3
+    asyncio.run(engine.dispose())
+
+
+def test_resumable_finalize_ingests_staged_file(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select  # type: ignore[import-not-found]
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # type: ignore[import-not-found]
+
+    from src.api.main import app
+    from src.database.connection import get_session
+    from src.database.models import Base, ProcessingJob, Sample
+
+    monkeypatch.setattr(upload.settings, "upload_dir", tmp_path / "uploads")
+    monkeypatch.setattr(upload.settings, "parquet_dir", tmp_path / "parquet")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'finalize.db'}")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def session():
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            yield db
+
+    async def stored_rows():
+        async with AsyncSession(engine) as db:
+            samples = (await db.execute(select(Sample.sample_id, Sample.file_path_fcs))).all()
+            jobs = (await db.execute(select(ProcessingJob.job_id, ProcessingJob.status))).all()
+            return samples, jobs
+
+    asyncio.run(create_tables())
+    monkeypatch.setitem(app.dependency_overrides, get_session, session)
+    client = TestClient(app)
+    base = "/api/v1/upload/resumable"
+
+    buffer = io.BytesIO()
+    flowio.create_fcs(buffer, np.random.default_rng(9).lognormal(6, 1, (2000, 2)).ravel().tolist(), ["FSC-H", "SSC-H"])
+    payload = buffer.getvalue()
+    digest = hashlib.sha256(payload).hexdigest()
+
+    created = client.post(base, json={"filename": "staged.fcs", "size_bytes": len(payload), "sha256": digest})
+    upload_id = created.json()["upload_id"]
+    assert client.patch(f"{base}/{upload_id}", content=payload, headers={"Upload-Offset": "0"}).json()["complete"]
+
+    finalized = client.post(f"{base}/{upload_id}/finalize")
+    assert finalized.status_code == 200
+    result = finalized.json()
+    assert result["upload_id"] == upload_id and result["sample_id"] == "staged"
+    assert result["content_sha256"] == digest
+    assert result["fcs_results"]["total_events"] == 2000
+
+    assert not (tmp_path / "uploads" / ".resumable" / upload_id).exists()
+    moved = [path for path in (tmp_path / "uploads").iterdir() if path.is_file()]
+    assert len(moved) == 1 and moved[0].name.endswith("_staged.fcs") and moved[0].read_bytes() == payload
+    samples, jobs = asyncio.run(stored_rows())
+    assert [sample_id for sample_id, _ in samples] == ["staged"]
+    assert jobs == [(result["job_id"], "completed")]
+    assert client.get(f"{base}/{upload_id}").status_code == 404
+    asyncio.run(engine.dispose())
@@ -0,0 +1,77 @@
+"""
+bench_startup.py – measure backend import (cold start) cost.
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters and
+reports the median wall time plus the slowest top-level imports, so
+regressions such as TensorFlow or a DB connection creeping back into import
+time show up immediately.
+
+Usage:
+    python bench_startup.py                 # 5 runs of "import main"
+    python bench_startup.py -n 10 --top 15
+    python bench_startup.py --module routers.western_routes
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def run_once(module: str):
+    env = dict(os.environ, TEM_MODEL_WARMUP="0")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or ["?"]
+        raise SystemExit(f"import {module} failed: {tail[0]}")
+
+    imports = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            depth = (len(m.group(3)) - 1) // 2
+            imports[m.group(4)] = (int(m.group(2)) / 1e6, depth)
+    return wall, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--module", default="main")
+    args = parser.parse_args()
+
+    walls = []
+    cumulative = {}
+    for _ in range(max(1, args.runs)):
+        wall, imports = run_once(args.module)
+        walls.append(wall)
+        for name, (secs, depth) in imports.items():
+            cumulative.setdefault(name, ([], depth))[0].append(secs)
+
+    print(f"import {args.module}: median {statistics.median(walls):.2f}s "
+          f"(min {min(walls):.2f}s, max {max(walls):.2f}s, {len(walls)} runs)")
+    print(f"\nSlowest imports (median cumulative, depth <= 2):")
+    rows = [
+        (statistics.median(times), depth, name)
+        for name, (times, depth) in cumulative.items()
+        if depth <= 2
+    ]
+    for secs, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {secs:7.3f}s  {'  ' * depth}{name}")
+
+
+if __name__ == "__main__":
+    main()
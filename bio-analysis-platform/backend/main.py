@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -6,14 +7,28 @@ from pathlib import Path
 from routers.tem_routes import router as tem_router
 from routers.western_routes import router as western_router
 from services.western.western_model import WesternBlot
-from services.tem.tem_service import Base, engine
+from services.tem.tem_service import start_db_init, CNN_MODEL_PATH
+from services.tem.model_registry import start_warmup
 import os
 import sys
 MODULE_PROFILE = os.getenv("MODULE_PROFILE", "tem_wb")
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Bio Analysis Platform")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tables are created on a background thread instead of at import or in
+    # this hook, so uvicorn starts serving (and /health answers) without
+    # waiting on Postgres; the first database session waits for it instead.
+    start_db_init()
+    if MODULE_PROFILE in ["tem_wb", "full"]:
+        # TensorFlow, CNN weights and the Western pipeline's deferred imports
+        # load in the background; a request that arrives first simply loads
+        # what it needs itself (TEM_MODEL_WARMUP=0 disables).
+        start_warmup([CNN_MODEL_PATH], modules=["scipy.signal", "plotly.graph_objects"])
+    yield
+
+
+app = FastAPI(title="Bio Analysis Platform", lifespan=lifespan)
 
 
 @app.get("/health")
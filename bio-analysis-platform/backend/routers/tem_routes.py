@@ -2,7 +2,6 @@ from fastapi import APIRouter, UploadFile, File, Query, HTTPException, Form
 from typing import List, Optional
 import os
 import uuid
-import cv2
 import json
 import numpy as np
 from pathlib import Path
@@ -28,15 +27,24 @@ from services.tem.tem_service import (
     get_nm_per_pixel_for_record,
     get_min_nm_value,
     apply_min_nm_filter,
-    compute_radial_intensity,
+    fill_missing_intensities,
     run_analysis,
     safe_int,
     decode_upload_to_bgr,
     save_shape_outputs,
     shape_particles_to_boxes,
     run_shape_pipeline_on_bgr,
-    build_table_response,
+    save_particles,
+    delete_particles,
+    load_boxes,
+    load_boxes_for_records,
+    rescale_particles,
+    query_particle_table,
     find_nearest_particle,
+    get_bgr,
+    get_gray,
+    invalidate_image,
+    image_cache_stats,
     DEFAULT_MIN_NM,
     DEFAULT_NM_PER_PIXEL,
     ALLOWED_TYPES,
@@ -44,6 +52,7 @@ from services.tem.tem_service import (
     MAX_FILES,
     UPLOAD_DIR,
 )
+from services.tem.model_registry import registry_status
 
 router = APIRouter()
 
@@ -53,6 +62,16 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/image-cache/stats")
+def get_image_cache_stats():
+    return image_cache_stats()
+
+
+@router.get("/models/status")
+def get_models_status():
+    return registry_status()
+
+
 @router.post("/upload-multiple-images/{user_id}")
 async def upload_images(
     user_id: str,
@@ -104,7 +123,7 @@ async def upload_images(
                 image_url=url,
                 original_image_url=url,
                 display_image_url=url,
-                boxes=boxes,
+                boxes=[],
                 scale=None,
                 min_nm=DEFAULT_MIN_NM,
                 analysis_method=method,
@@ -112,6 +131,8 @@ async def upload_images(
 
             try:
                 db.add(rec)
+                db.flush()
+                save_particles(db, image_id, boxes, nm_per_pixel)
                 db.commit()
             except Exception as e:
                 db.rollback()
@@ -154,17 +175,16 @@ def get_user_images(user_id: str):
     db = db_session()
     try:
         rows = db.query(ImageRecord).filter(ImageRecord.user_id == user_id).all()
+        boxes_by_image = load_boxes_for_records(db, rows)
         out = {}
         for r in rows:
             try:
-                min_nm = get_min_nm_value(r.min_nm)
-                npp = get_nm_per_pixel_for_record(r)
                 out[r.image_id] = {
                     "image_url": _resolve_display_url(r),
                     "original_image_url": get_original_url(r),
                     "scale": r.scale,
-                    "min_nm": min_nm,
-                    "boxes": apply_min_nm_filter(r.boxes or [], min_nm, fallback_nm_per_pixel=npp),
+                    "min_nm": get_min_nm_value(r.min_nm),
+                    "boxes": boxes_by_image.get(r.image_id, []),
                     "analysis_method": r.analysis_method,
                 }
             except Exception as e:
@@ -190,13 +210,12 @@ def get_image(user_id: str, image_id: str):
             return {"error": "Image not found"}
 
         min_nm = get_min_nm_value(rec.min_nm)
-        npp = get_nm_per_pixel_for_record(rec)
         return {
             "image_url": get_display_url(rec),
             "original_image_url": get_original_url(rec),
             "scale": rec.scale,
             "min_nm": min_nm,
-            "boxes": apply_min_nm_filter(rec.boxes or [], min_nm, fallback_nm_per_pixel=npp),
+            "boxes": load_boxes(db, rec, min_nm),
             "analysis_method": rec.analysis_method,
         }
     finally:
@@ -215,18 +234,12 @@ def set_scale(user_id: str, image_id: str, scale: ScaleInput):
         if not rec:
             return {"error": "Image not found"}
 
+        load_boxes(db, rec)  # migrates a legacy JSON blob before rescaling
         rec.scale = scale.model_dump()
         npp = nm_per_pixel_from_scale(rec.scale)
-        boxes = rec.boxes or []
 
         if npp is not None:
-            for c in boxes:
-                try:
-                    rpx = float(c.get("r", 0))
-                    c["diameter_nm"] = round((rpx * 2.0) * npp, 2)
-                except Exception:
-                    pass
-            rec.boxes = boxes
+            rescale_particles(db, rec.image_id, npp)
 
         if rec.min_nm is None:
             rec.min_nm = DEFAULT_MIN_NM
@@ -238,7 +251,7 @@ def set_scale(user_id: str, image_id: str, scale: ScaleInput):
             "status": "success",
             "scale": rec.scale,
             "min_nm": min_nm,
-            "boxes": apply_min_nm_filter(boxes, min_nm, fallback_nm_per_pixel=get_nm_per_pixel_for_record(rec)),
+            "boxes": load_boxes(db, rec, min_nm),
         }
     finally:
         db.close()
@@ -282,7 +295,7 @@ def set_min_nm(user_id: str, image_id: str, payload: MinNmInput):
         return {
             "status": "success",
             "min_nm": min_nm,
-            "boxes": apply_min_nm_filter(rec.boxes or [], min_nm, fallback_nm_per_pixel=get_nm_per_pixel_for_record(rec)),
+            "boxes": load_boxes(db, rec, min_nm),
             "scale": rec.scale,
             "image_url": get_display_url(rec),
         }
@@ -313,7 +326,7 @@ def set_hide_filter(user_id: str, image_id: str, payload: HideFilterInput):
             "status": "success",
             "min_nm": min_nm,
             "hide_below_nm": min_nm,
-            "boxes": apply_min_nm_filter(rec.boxes or [], min_nm, fallback_nm_per_pixel=get_nm_per_pixel_for_record(rec)),
+            "boxes": load_boxes(db, rec, min_nm),
             "scale": rec.scale,
             "image_url": get_display_url(rec),
         }
@@ -337,7 +350,7 @@ def update_circles(user_id: str, image_id: str, circles: List[CircleIn], fast: i
         npp = nm_per_pixel_from_scale(scale) or DEFAULT_NM_PER_PIXEL
         min_nm = get_min_nm_value(rec.min_nm)
 
-        old_boxes = rec.boxes or []
+        old_boxes = load_boxes(db, rec)
         old_by_num = {}
         for b in old_boxes:
             try:
@@ -354,7 +367,13 @@ def update_circles(user_id: str, image_id: str, circles: List[CircleIn], fast: i
 
             old = old_by_num.get(idx)
             if old:
-                if circle_dict.get("intensity") is None and old.get("intensity") is not None:
+                # Radial profiles are cheap to recompute, so only carry the old
+                # one over when the circle has not been moved or resized.
+                same_geometry = all(
+                    old.get(k) is not None and abs(float(old[k]) - float(circle_dict[k])) < 1e-6
+                    for k in ("x", "y", "r")
+                )
+                if circle_dict.get("intensity") is None and old.get("intensity") is not None and same_geometry:
                     circle_dict["intensity"] = old.get("intensity")
                 if circle_dict.get("shape") is None and old.get("shape") is not None:
                     circle_dict["shape"] = old.get("shape")
@@ -373,17 +392,11 @@ def update_circles(user_id: str, image_id: str, circles: List[CircleIn], fast: i
 
             enriched.append(circle_dict)
 
-        img_gray = None
-        img_path = get_original_image_path(rec)
-        if img_path and os.path.exists(img_path):
-            img_gray = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
+        img_gray = get_gray(get_original_image_path(rec))
 
-        if img_gray is not None:
-            for c in enriched:
-                if c.get("intensity") is None:
-                    c["intensity"] = compute_radial_intensity(img_gray, c["x"], c["y"], c["r"])
+        fill_missing_intensities(enriched, img_gray)
 
-        rec.boxes = enriched
+        save_particles(db, rec.image_id, enriched, npp)
         db.commit()
 
         return {
@@ -412,7 +425,7 @@ def delete_circles(user_id: str, image_id: str, payload: DeleteCirclesInput):
         min_nm = get_min_nm_value(rec.min_nm)
         to_delete = set(int(x) for x in (payload.numbers or []) if str(x).isdigit())
 
-        old_boxes = rec.boxes or []
+        old_boxes = load_boxes(db, rec)
         kept = []
         for b in old_boxes:
             try:
@@ -431,13 +444,14 @@ def delete_circles(user_id: str, image_id: str, payload: DeleteCirclesInput):
             bb["number"] = idx
             renumbered.append(bb)
 
-        rec.boxes = renumbered
+        npp = get_nm_per_pixel_for_record(rec)
+        save_particles(db, rec.image_id, renumbered, npp)
         db.commit()
 
         return {
             "status": "success",
             "deleted": sorted(list(to_delete)),
-            "boxes": apply_min_nm_filter(renumbered, min_nm, fallback_nm_per_pixel=get_nm_per_pixel_for_record(rec)),
+            "boxes": apply_min_nm_filter(renumbered, min_nm, fallback_nm_per_pixel=npp),
             "scale": rec.scale,
             "min_nm": min_nm,
         }
@@ -468,7 +482,8 @@ async def reanalyze_image(
         npp = get_nm_per_pixel_for_record(rec)
         boxes = await run_analysis(method, img_path, npp)
 
-        rec.boxes = boxes
+        rec.boxes = []
+        save_particles(db, rec.image_id, boxes, npp)
         rec.analysis_method = method
         rec.display_image_url = rec.original_image_url or rec.image_url
         db.commit()
@@ -506,12 +521,14 @@ def delete_image(user_id: str, image_id: str):
                 paths_to_delete.add(p)
 
         for file_path in paths_to_delete:
+            invalidate_image(file_path)
             if file_path and os.path.exists(file_path):
                 try:
                     os.remove(file_path)
                 except Exception as e:
                     print(f"[WARN] Could not delete file {file_path}: {e}")
 
+        delete_particles(db, rec.image_id)
         db.delete(rec)
         db.commit()
 
@@ -525,6 +542,7 @@ def clear_all_images():
     if os.path.exists(UPLOAD_DIR):
         for file in os.listdir(UPLOAD_DIR):
             file_path = os.path.join(UPLOAD_DIR, file)
+            invalidate_image(file_path)
             if os.path.isfile(file_path):
                 try:
                     os.remove(file_path)
@@ -533,6 +551,7 @@ def clear_all_images():
 
     db = db_session()
     try:
+        delete_particles(db)
         db.query(ImageRecord).delete()
         db.commit()
         return {"status": "all images deleted"}
@@ -540,34 +559,45 @@ def clear_all_images():
         db.close()
 
 
+def _particle_table(image_id: str, status: str, size: Optional[str], limit: Optional[int], offset: int):
+    db = db_session()
+    try:
+        rec = db.query(ImageRecord).filter(ImageRecord.image_id == image_id).first()
+        if not rec:
+            return {"error": "Image not found"}
+        return query_particle_table(db, rec, status, size, limit=limit, offset=offset)
+    finally:
+        db.close()
+
+
 @router.get("/images/{image_id}/table/intact")
-def get_intact_table(image_id: str, size: Optional[str] = None):
-    found = find_image_by_id_db(image_id)
-    if not found:
-        return {"error": "Image not found"}
-    _, _, rec = found
-    min_nm = get_min_nm_value(rec.min_nm)
-    return build_table_response(rec.boxes or [], "intact", size, min_nm=min_nm)
+def get_intact_table(
+    image_id: str,
+    size: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+):
+    return _particle_table(image_id, "intact", size, limit, offset)
 
 
 @router.get("/images/{image_id}/table/not_intact")
-def get_not_intact_table(image_id: str, size: Optional[str] = None):
-    found = find_image_by_id_db(image_id)
-    if not found:
-        return {"error": "Image not found"}
-    _, _, rec = found
-    min_nm = get_min_nm_value(rec.min_nm)
-    return build_table_response(rec.boxes or [], "not_intact", size, min_nm=min_nm)
+def get_not_intact_table(
+    image_id: str,
+    size: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+):
+    return _particle_table(image_id, "not_intact", size, limit, offset)
 
 
 @router.get("/images/{image_id}/table/needs_review")
-def get_needs_review_table(image_id: str, size: Optional[str] = None):
-    found = find_image_by_id_db(image_id)
-    if not found:
-        return {"error": "Image not found"}
-    _, _, rec = found
-    min_nm = get_min_nm_value(rec.min_nm)
-    return build_table_response(rec.boxes or [], "needs_review", size, min_nm=min_nm)
+def get_needs_review_table(
+    image_id: str,
+    size: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+):
+    return _particle_table(image_id, "needs_review", size, limit, offset)
 
 
 @router.post("/line-intensity")
@@ -582,7 +612,7 @@ def line_intensity(data: LineIntensityRequest):
     if not img_path or not os.path.exists(img_path):
         raise HTTPException(status_code=404, detail="Image file missing on disk")
 
-    image = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
+    image = get_gray(img_path)
     if image is None:
         raise HTTPException(status_code=400, detail="Failed to read image")
 
@@ -751,7 +781,7 @@ def shape_classify_existing(
         if not original_path or not os.path.exists(original_path):
             raise HTTPException(status_code=404, detail="Original image file not found")
 
-        img_bgr = cv2.imread(original_path, cv2.IMREAD_COLOR)
+        img_bgr = get_bgr(original_path)
         if img_bgr is None:
             raise HTTPException(status_code=400, detail="Failed to read image")
 
@@ -779,7 +809,8 @@ def shape_classify_existing(
         )
 
         rec.display_image_url = result_image_url
-        rec.boxes = boxes
+        rec.boxes = []
+        save_particles(db, rec.image_id, boxes, npp)
         rec.analysis_method = "shape"
         db.commit()
 
@@ -820,7 +851,7 @@ def shape_classify_existing_with_feedback(
         if not original_path or not os.path.exists(original_path):
             raise HTTPException(status_code=404, detail="Original image file not found")
 
-        img_bgr = cv2.imread(original_path, cv2.IMREAD_COLOR)
+        img_bgr = get_bgr(original_path)
         if img_bgr is None:
             raise HTTPException(status_code=400, detail="Failed to read image")
 
@@ -850,7 +881,8 @@ def shape_classify_existing_with_feedback(
         )
 
         rec.display_image_url = result_image_url
-        rec.boxes = boxes
+        rec.boxes = []
+        save_particles(db, rec.image_id, boxes, npp)
         rec.analysis_method = "shape"
         db.commit()
 
@@ -892,6 +924,7 @@ def recover_images(user_id: str):
                         has_file = True
                         break
             if not has_file:
+                delete_particles(db, r.image_id)
                 db.delete(r)
                 purged += 1
         db.commit()
@@ -8,6 +8,7 @@ All original endpoints preserved unchanged.
 
 from fastapi import APIRouter, HTTPException, File, UploadFile, Form
 from fastapi.responses import JSONResponse
+import asyncio
 import os
 import shutil
 import json
@@ -15,7 +16,6 @@ import traceback
 import cv2
 import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from sqlalchemy import desc
 from pydantic import BaseModel
 from typing import List, Optional
@@ -32,11 +32,13 @@ except ImportError:
 
 from services.western.western_service import (
     safe_filename,
-    preprocess_image,
+    preprocess_image_bytes,
     detect_lanes,
     detect_bands_in_lane,
-    detect_bands_with_confidence,
-    build_kda_mapper,
+    detect_bands_all_lanes,
+    kda_mapper_for_blot,
+    build_band_table,
+    analyze_blots_batch,
     ai_validate_bands,
     annotate_gel_image,
     UPLOAD_FOLDER,
@@ -45,7 +47,7 @@ from services.western.western_service import (
 
 router = APIRouter()
 
-from services.tem.tem_service import SessionLocal
+from services.tem.tem_service import db_session
 from services.western.western_model import WesternBlot
 
 # ── AWS / Nova config from environment ───────────────────────────────────────
@@ -69,7 +71,7 @@ async def upload_western(file: UploadFile = File(...)):
 
         image_url = f"/uploads/western/{filename}"
 
-        db = SessionLocal()
+        db = db_session()
         record = WesternBlot(
             image_name=filename,
             image_url=image_url,
@@ -96,7 +98,7 @@ async def upload_western(file: UploadFile = File(...)):
 @router.get("/last")
 def get_last_uploaded():
     try:
-        db     = SessionLocal()
+        db     = db_session()
         record = db.query(WesternBlot).order_by(desc(WesternBlot.id)).first()
         db.close()
         if not record:
@@ -109,7 +111,7 @@ def get_last_uploaded():
 @router.get("/all")
 def get_all_images():
     try:
-        db      = SessionLocal()
+        db      = db_session()
         records = db.query(WesternBlot).order_by(desc(WesternBlot.id)).all()
         db.close()
         images  = [{"id": r.id, "image_name": r.image_name, "image_url": r.image_url} for r in records]
@@ -121,7 +123,7 @@ def get_all_images():
 @router.delete("/{image_id}")
 def delete_image(image_id: int):
     try:
-        db     = SessionLocal()
+        db     = db_session()
         record = db.query(WesternBlot).filter(WesternBlot.id == image_id).first()
         if not record:
             db.close()
@@ -153,15 +155,11 @@ async def detect_ruler_bands(
     top_mark_y: float = Form(...),
     bottom_mark_y: float = Form(...),
 ):
-    temp_path = None
     try:
-        filename  = safe_filename(file.filename)
-        temp_path = os.path.join(UPLOAD_FOLDER, f"temp_{filename}")
-
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        original_gray, processed_img = preprocess_image(temp_path)
+        # Preprocessed in memory and cached by content hash, so the /analyze
+        # call that follows for the same gel skips CLAHE + blur.
+        data = await file.read()
+        original_gray, processed_img = preprocess_image_bytes(data, name=file.filename)
         img_h, img_w = processed_img.shape
 
         top_y    = max(0, min(float(top_mark_y), float(bottom_mark_y)))
@@ -226,12 +224,6 @@ async def detect_ruler_bands(
     except Exception as e:
         traceback.print_exc()
         return JSONResponse(status_code=500, content={"error": f"Unexpected error: {str(e)}"})
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except Exception:
-                pass
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -259,10 +251,11 @@ async def analyze_western_blot(
         filename  = safe_filename(file.filename)
         file_path = os.path.join(UPLOAD_FOLDER, filename)
 
+        data = await file.read()
         with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            buffer.write(data)
 
-        original_gray, processed_img = preprocess_image(file_path)
+        original_gray, processed_img = preprocess_image_bytes(data, name=filename)
         lane_peaks = sorted(detect_lanes(processed_img))
 
         if len(lane_peaks) == 0:
@@ -277,108 +270,19 @@ async def analyze_western_blot(
                 return JSONResponse(status_code=400, content={"error": "Invalid ruler_marks JSON"})
 
         # ── Build kDa mapper ──────────────────────────────────────────────
-        if len(parsed_ruler_marks) >= 2:
-            try:
-                ruler_positions  = [float(m["y"])   for m in parsed_ruler_marks]
-                ruler_kda_values = [float(m["kda"]) for m in parsed_ruler_marks]
-                if any(v <= 0 for v in ruler_kda_values):
-                    return JSONResponse(status_code=400, content={
-                        "error": "All kDa values must be positive numbers."
-                    })
-                pixel_to_kda = build_kda_mapper(ruler_positions, ruler_kda_values)
-            except (KeyError, ValueError) as e:
-                return JSONResponse(status_code=400, content={
-                    "error": f"Invalid ruler mark data: {str(e)}"
-                })
-        else:
-            band_peaks_ruler, _, _, _ = detect_bands_in_lane(
-                processed_img, int(lane_peaks[ruler_lane])
-            )
-            if len(band_peaks_ruler) < 2:
-                return JSONResponse(status_code=400, content={
-                    "error": "Not enough ruler bands for kDa mapping. Please mark the ruler lane."
-                })
-            default_kda  = [180, 130, 100, 70, 55, 40, 35, 25, 15, 10]
-            pixel_to_kda = build_kda_mapper(band_peaks_ruler, default_kda)
+        pixel_to_kda = kda_mapper_for_blot(
+            processed_img, lane_peaks, ruler_lane, parsed_ruler_marks
+        )
 
         # ── CV band detection (with confidence) ───────────────────────────
-        band_data    = {}
-        for lane_index, lane_x in enumerate(lane_peaks):
-            band_peaks, intensities, confidence, left, right = detect_bands_with_confidence(
-                processed_img, int(lane_x)
-            )
-            band_data[lane_index] = {
-                "lane_x":     int(lane_x),
-                "left":       int(left),
-                "right":      int(right),
-                "positions":  band_peaks,
-                "intensities": intensities,
-                "confidence": confidence,
-            }
+        # All lane profiles come from one cumulative sum over the image.
+        lane_bands = detect_bands_all_lanes(processed_img, [int(lx) for lx in lane_peaks])
 
         # ── Build frontend band list ──────────────────────────────────────
-        frontend_bands = []
-        results        = []
-        band_counter   = 1
-
-        for lane, data in band_data.items():
-            positions   = data["positions"]
-            intensities = data["intensities"]
-            confidences = data["confidence"] if len(data["confidence"]) == len(positions) else [1.0] * len(positions)
-
-            for pos, intensity, conf in zip(positions, intensities, confidences):
-                try:
-                    kda_value = pixel_to_kda(float(pos))
-                except Exception:
-                    kda_value = 0.0
-
-                relative_quantity = (float(intensity) / 100.0) * volume_loaded
-
-                calculated_concentration = None
-                if (
-                    reference_intensity is not None
-                    and reference_concentration is not None
-                    and reference_intensity != 0
-                ):
-                    calculated_concentration = (
-                        float(intensity) / float(reference_intensity)
-                    ) * float(reference_concentration)
-
-                display_concentration = (
-                    round(float(calculated_concentration), 3)
-                    if calculated_concentration is not None
-                    else round(float(relative_quantity), 3)
-                )
-
-                band_label = f"B{band_counter}"
-
-                frontend_bands.append({
-                    "id":              band_counter,
-                    "name":            band_label,
-                    "lane":            int(lane),
-                    "x":               int(data["lane_x"]),
-                    "y":               int(pos),
-                    "w":               50,
-                    "h":               12,
-                    "molecularWeight": round(float(kda_value), 2),
-                    "intensity":       round(float(intensity), 3),
-                    "relativeQuantity": round(float(relative_quantity), 3),
-                    "concentration":   display_concentration,
-                    "confidence":      round(float(conf), 3),   # NEW
-                })
-
-                results.append({
-                    "Lane":            int(lane),
-                    "Band":            band_label,
-                    "kDa":             round(float(kda_value), 2),
-                    "Intensity":       round(float(intensity), 3),
-                    "Relative Quantity": round(float(relative_quantity), 3),
-                    "X_Position":      int(data["lane_x"]),
-                    "Y_Position":      int(pos),
-                    "Confidence":      round(float(conf), 3),   # NEW
-                })
-
-                band_counter += 1
+        frontend_bands, results = build_band_table(
+            lane_peaks, lane_bands, pixel_to_kda,
+            volume_loaded, reference_intensity, reference_concentration,
+        )
 
         # ── Nova AI validation ────────────────────────────────────────────
         # Runs if: frontend sends use_ai=true, OR AI_PROVIDER=bedrock in .env
@@ -424,6 +328,8 @@ async def analyze_western_blot(
 
         # ── 3D intensity surface plot ─────────────────────────────────────
         try:
+            import plotly.graph_objects as go   # heavy; imported on first use
+
             step   = max(1, min(original_gray.shape[0], original_gray.shape[1]) // 200)
             z_data = original_gray[::step, ::step].astype(float)
             fig_3d = go.Figure(data=[go.Surface(
@@ -470,6 +376,80 @@ async def analyze_western_blot(
         return JSONResponse(status_code=500, content={"error": f"Unexpected error: {str(e)}"})
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch analyze
+# ─────────────────────────────────────────────────────────────────────────────
+
+@router.post("/analyze-batch")
+async def analyze_western_batch(
+    files: List[UploadFile] = File(...),
+    ruler_lane: int = Form(0),
+    volume_loaded: float = Form(10.0),
+    reference_intensity: Optional[float] = Form(None),
+    reference_concentration: Optional[float] = Form(None),
+    ruler_marks: Optional[str] = Form(None),
+):
+    """
+    CV analysis of many blots in one request.
+
+    Blots are processed in parallel on the service worker pool; duplicate
+    uploads are analysed once.  Each blot gets its own annotated image and all
+    bands are written to one combined CSV.  The Nova AI pass is not run here –
+    re-open individual blots with /analyze for a second opinion.
+    """
+    try:
+        if not files:
+            return JSONResponse(status_code=400, content={"error": "No files provided"})
+
+        parsed_ruler_marks = None
+        if ruler_marks:
+            try:
+                parsed_ruler_marks = json.loads(ruler_marks)
+            except json.JSONDecodeError:
+                return JSONResponse(status_code=400, content={"error": "Invalid ruler_marks JSON"})
+
+        blots = [(file.filename, await file.read()) for file in files]
+
+        batch_dir = os.path.join(RESULT_FOLDER, "batch")
+        os.makedirs(batch_dir, exist_ok=True)
+
+        blot_results = await asyncio.to_thread(
+            analyze_blots_batch,
+            blots,
+            annotate_dir=batch_dir,
+            ruler_lane=ruler_lane,
+            volume_loaded=volume_loaded,
+            reference_intensity=reference_intensity,
+            reference_concentration=reference_concentration,
+            ruler_marks=parsed_ruler_marks,
+        )
+
+        rows = []
+        for res in blot_results:
+            if res["status"] != "success":
+                continue
+            res["annotated_image"] = f"/results/western/batch/annotated_{res['sha256'][:16]}.png"
+            rows.extend({"File": res["file"], **row} for row in res["results"])
+
+        csv_path = os.path.join(RESULT_FOLDER, "batch_results.csv")
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+
+        succeeded = sum(1 for r in blot_results if r["status"] == "success")
+        return {
+            "status":     "success",
+            "blot_count": len(blot_results),
+            "succeeded":  succeeded,
+            "failed":     len(blot_results) - succeeded,
+            "band_count": len(rows),
+            "csv_file":   "/results/western/batch_results.csv",
+            "blots":      blot_results,
+        }
+
+    except Exception as e:
+        traceback.print_exc()
+        return JSONResponse(status_code=500, content={"error": f"Unexpected error: {str(e)}"})
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Report
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,235 @@
+"""
+Decoded-image cache shared by every TEM route.
+
+Interactive edits (dragging circles, line profiles, re-running the shape
+pipeline) used to decode the original micrograph from disk on every request.
+This module keeps the decoded arrays — and products derived from them such as
+the preprocessed image and the Canny edge map — in a bounded, byte-budgeted
+LRU so repeated requests on the same image only pay for array work.
+
+Entries are keyed by (absolute path, mtime_ns, product). A file that is
+rewritten on disk therefore gets a new key and the stale arrays are dropped
+the next time it is loaded. Cached arrays are marked read-only; callers that
+need to draw on an image must ``.copy()`` it first.
+
+Budget
+------
+TEM_IMAGE_CACHE_MB   (default: 256)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import cv2
+import numpy as np
+
+
+DEFAULT_CACHE_MB = 256
+
+_Key = Tuple[str, int, str]
+
+
+class DecodedImageCache:
+    """Thread-safe LRU of decoded image arrays bounded by total ``nbytes``."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[_Key, np.ndarray]" = OrderedDict()
+        self._by_path: Dict[str, Set[_Key]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        path: str,
+        product: str,
+        builder: Callable[[], Optional[np.ndarray]],
+    ) -> Optional[np.ndarray]:
+        """
+        Return the cached ``product`` for ``path`` or build and store it.
+
+        Returns None if the file does not exist or ``builder`` returns None.
+        """
+        norm = os.path.abspath(path)
+        try:
+            mtime_ns = os.stat(norm).st_mtime_ns
+        except OSError:
+            return None
+
+        key = (norm, mtime_ns, product)
+        with self._lock:
+            arr = self._entries.get(key)
+            if arr is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return arr
+            self.misses += 1
+
+        # Decode outside the lock so a slow TIFF does not block other images.
+        arr = builder()
+        if arr is None:
+            return None
+        arr.flags.writeable = False
+        return self._put(key, arr)
+
+    def _put(self, key: _Key, arr: np.ndarray) -> np.ndarray:
+        norm, mtime_ns, _ = key
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another request decoded the same image concurrently.
+                return existing
+
+            # A newer mtime means the file changed on disk: drop old versions.
+            for stale in [k for k in self._by_path.get(norm, ()) if k[1] != mtime_ns]:
+                self._remove(stale)
+
+            if arr.nbytes > self.max_bytes:
+                return arr
+
+            self._entries[key] = arr
+            self._by_path.setdefault(norm, set()).add(key)
+            self._bytes += arr.nbytes
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        return arr
+
+    def _remove(self, key: _Key):
+        arr = self._entries.pop(key, None)
+        if arr is None:
+            return
+        self._bytes -= arr.nbytes
+        keys = self._by_path.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_path[key[0]]
+
+    def invalidate(self, path: str) -> int:
+        """Drop every product cached for ``path``. Returns the number removed."""
+        norm = os.path.abspath(path)
+        with self._lock:
+            keys = list(self._by_path.get(norm, ()))
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_path.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "images": len(self._by_path),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+def _budget_bytes() -> int:
+    try:
+        mb = float(os.getenv("TEM_IMAGE_CACHE_MB", DEFAULT_CACHE_MB))
+    except ValueError:
+        mb = DEFAULT_CACHE_MB
+    return int(max(mb, 0) * 1024 * 1024)
+
+
+_cache = DecodedImageCache(_budget_bytes())
+
+
+def get_image_cache() -> DecodedImageCache:
+    return _cache
+
+
+# ===========================================================================
+# Products
+# ===========================================================================
+
+def get_bgr(path: Optional[str]) -> Optional[np.ndarray]:
+    """Original image decoded as 8-bit BGR (``cv2.IMREAD_COLOR``)."""
+    if not path:
+        return None
+    return _cache.get_or_compute(path, "bgr", lambda: cv2.imread(path, cv2.IMREAD_COLOR))
+
+
+def get_gray(path: Optional[str]) -> Optional[np.ndarray]:
+    """Original image decoded as 8-bit grayscale (``cv2.IMREAD_GRAYSCALE``)."""
+    if not path:
+        return None
+    return _cache.get_or_compute(path, "gray", lambda: cv2.imread(path, cv2.IMREAD_GRAYSCALE))
+
+
+def get_preprocessed(
+    path: Optional[str],
+    sigma: float = 1.5,
+    clahe_clip: float = 2.0,
+    clahe_tile: int = 8,
+) -> Optional[np.ndarray]:
+    """
+    Gaussian blur + CLAHE of the BGR→gray image, matching
+    ``TEMAnalyzer._preprocess`` for the same parameters.
+    """
+    if not path:
+        return None
+
+    def build():
+        bgr = get_bgr(path)
+        if bgr is None:
+            return None
+        gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        blurred = cv2.GaussianBlur(gray, (0, 0), sigma)
+        clahe = cv2.createCLAHE(clipLimit=clahe_clip, tileGridSize=(clahe_tile, clahe_tile))
+        return clahe.apply(blurred)
+
+    product = f"preprocessed:{sigma}:{clahe_clip}:{clahe_tile}"
+    return _cache.get_or_compute(path, product, build)
+
+
+def get_edge_map(
+    path: Optional[str],
+    low: int = 30,
+    high: int = 80,
+    sigma: float = 1.5,
+    clahe_clip: float = 2.0,
+    clahe_tile: int = 8,
+) -> Optional[np.ndarray]:
+    """Canny edge map of :func:`get_preprocessed` for the same parameters."""
+    if not path:
+        return None
+
+    def build():
+        pre = get_preprocessed(path, sigma, clahe_clip, clahe_tile)
+        if pre is None:
+            return None
+        return cv2.Canny(pre, low, high)
+
+    product = f"edges:{low}:{high}:{sigma}:{clahe_clip}:{clahe_tile}"
+    return _cache.get_or_compute(path, product, build)
+
+
+def invalidate_image(path: Optional[str]) -> int:
+    if not path:
+        return 0
+    return _cache.invalidate(path)
+
+
+def clear_image_cache():
+    _cache.clear()
+
+
+def image_cache_stats() -> dict:
+    return _cache.stats()
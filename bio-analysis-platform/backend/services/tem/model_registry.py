@@ -0,0 +1,154 @@
+"""
+Lazy registry for heavy TEM ML dependencies.
+
+Importing TensorFlow/Keras and loading .h5 weights takes several seconds, and
+used to happen when tem_service was imported — i.e. before the server could
+answer /health or any Western request. This module defers both until the
+first request that actually needs a CNN, and keeps loaded models for the
+lifetime of the process so later requests do not reload the weights.
+
+An optional warm-up thread (see ``start_warmup``) can pre-load everything
+once the server is up, so the first TEM request is fast too.
+
+Env
+---
+TEM_MODEL_WARMUP   "1" (default) to warm up in the background on startup,
+                   "0" to load strictly on first use.
+"""
+
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_keras = None
+_keras_error: Optional[str] = None
+_keras_lock = threading.Lock()
+
+_models: Dict[Tuple[str, int], object] = {}
+_models_lock = threading.Lock()
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_state = {"status": "idle", "seconds": None, "error": None}
+
+
+def get_keras():
+    """
+    Import and return ``tensorflow.keras`` on first call, or None if
+    TensorFlow is not installed. The import is attempted only once.
+    """
+    global _keras, _keras_error
+    if _keras is not None or _keras_error is not None:
+        return _keras
+
+    with _keras_lock:
+        if _keras is None and _keras_error is None:
+            os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+            try:
+                import tensorflow as tf
+                from tensorflow import keras
+                _keras = keras
+                print("TensorFlow loaded successfully:", tf.__version__)
+            except Exception as e:
+                _keras_error = str(e)
+                print("TensorFlow load error:", e)
+                logger.warning("TensorFlow not available — CNN classifier disabled.")
+    return _keras
+
+
+def tf_available() -> bool:
+    return get_keras() is not None
+
+
+def load_keras_model(model_path: str):
+    """
+    Return the Keras model stored at ``model_path``, loading it at most once
+    per file version (path + mtime). Returns None if TensorFlow is missing,
+    the file does not exist or loading fails.
+    """
+    keras = get_keras()
+    if keras is None or not model_path:
+        return None
+
+    norm = os.path.abspath(model_path)
+    try:
+        key = (norm, os.stat(norm).st_mtime_ns)
+    except OSError:
+        return None
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    # One lock for all models: loads are rare and TF is not keen on
+    # concurrent graph construction anyway.
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            try:
+                model = keras.models.load_model(norm)
+            except Exception as e:
+                logger.error(f"Failed to load model {norm} — {e}")
+                return None
+            for stale in [k for k in _models if k[0] == norm]:
+                del _models[stale]
+            _models[key] = model
+            logger.info(f"Loaded model from {norm}")
+    return model
+
+
+def warm_up(model_paths=(), modules=()):
+    """
+    Import the TEM analyzers, TensorFlow and any extra ``modules`` (e.g. the
+    deferred imports of the Western pipeline), then load ``model_paths``.
+    """
+    started = time.perf_counter()
+    _warmup_state.update(status="running", error=None)
+    try:
+        # Analyzer modules pull in scikit-image, httpx and boto3.
+        from . import tem_analyzer, tem_analyzer_cnn, tem_analyzer_voronoi, tem_analyzer_ai  # noqa: F401
+        for name in modules:
+            importlib.import_module(name)
+
+        if get_keras() is not None:
+            for path in model_paths:
+                if path and os.path.exists(path):
+                    load_keras_model(path)
+        _warmup_state["status"] = "done"
+    except Exception as e:
+        _warmup_state.update(status="failed", error=str(e))
+        logger.warning(f"TEM warm-up failed: {e}")
+    finally:
+        _warmup_state["seconds"] = round(time.perf_counter() - started, 2)
+        print(f"TEM warm-up {_warmup_state['status']} in {_warmup_state['seconds']}s")
+
+
+def start_warmup(model_paths=(), modules=()) -> Optional[threading.Thread]:
+    """
+    Run :func:`warm_up` on a daemon thread unless TEM_MODEL_WARMUP=0.
+    Safe to call more than once; only the first call starts a thread.
+    """
+    global _warmup_thread
+    if os.getenv("TEM_MODEL_WARMUP", "1") == "0":
+        return None
+    if _warmup_thread is not None:
+        return _warmup_thread
+    _warmup_thread = threading.Thread(
+        target=warm_up, args=(tuple(model_paths), tuple(modules)),
+        name="tem-warmup", daemon=True,
+    )
+    _warmup_thread.start()
+    return _warmup_thread
+
+
+def registry_status() -> dict:
+    return {
+        "tensorflow_loaded": _keras is not None,
+        "tensorflow_error": _keras_error,
+        "models": sorted({path for path, _ in _models}),
+        "warmup": dict(_warmup_state),
+    }
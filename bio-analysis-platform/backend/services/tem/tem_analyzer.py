@@ -45,18 +45,11 @@ import boto3
 import certifi
 from botocore.exceptions import ClientError
 
-# TensorFlow / Keras CNN
-os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
-
+# TensorFlow / Keras CNN — imported on first use by the model registry
 try:
-    import tensorflow as tf
-    from tensorflow import keras
-    TF_AVAILABLE = True
-    print("TensorFlow loaded successfully:", tf.__version__)
-except Exception as e:
-    TF_AVAILABLE = False
-    print("TensorFlow load error:", e)
-    logging.warning("TensorFlow not available — CNN classifier disabled.")
+    from .model_registry import get_keras, load_keras_model
+except ImportError:  # run as a script (python tem_analyzer.py / run_tests.py)
+    from model_registry import get_keras, load_keras_model
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -210,17 +203,14 @@ class CNNClassifier:
         self._load_model()
 
     def _load_model(self):
-        if not TF_AVAILABLE:
-            logger.warning("CNN: TensorFlow not available.")
-            return
         if not os.path.exists(self.cfg.CNN_MODEL_PATH):
             logger.warning(f"CNN: Model not found at {self.cfg.CNN_MODEL_PATH}")
             return
-        try:
-            self.model = keras.models.load_model(self.cfg.CNN_MODEL_PATH)
-            logger.info(f"CNN: Loaded model from {self.cfg.CNN_MODEL_PATH}")
-        except Exception as e:
-            logger.error(f"CNN: Failed to load model — {e}")
+        if get_keras() is None:
+            logger.warning("CNN: TensorFlow not available.")
+            return
+        # Cached by the registry, so only the first analyzer pays for loading
+        self.model = load_keras_model(self.cfg.CNN_MODEL_PATH)
 
     def classify(self, cropped_bgr: np.ndarray) -> VoteResult:
         if self.model is None:
@@ -451,12 +441,20 @@ class TEMAnalyzer:
     # Public API
     # ------------------------------------------------------------------
 
-    def analyze(self, image_bgr: np.ndarray) -> AnalysisResult:
+    def analyze(
+        self,
+        image_bgr:    np.ndarray,
+        preprocessed: Optional[np.ndarray] = None,
+        edge_map:     Optional[np.ndarray] = None,
+    ) -> AnalysisResult:
+        # preprocessed / edge_map may be supplied from the TEM image cache
+        # (see image_cache.get_preprocessed) to skip recomputing them.
         gray         = self._to_gray(image_bgr)
-        preprocessed = self._preprocess(gray)
+        if preprocessed is None:
+            preprocessed = self._preprocess(gray)
         centers      = self._detect_blobs(preprocessed)
         label_map    = self._watershed_segment(preprocessed, centers)
-        particles    = self._process_particles(image_bgr, gray, preprocessed, label_map)
+        particles    = self._process_particles(image_bgr, gray, preprocessed, label_map, edge_map)
         annotated    = self._draw_results(image_bgr, particles)
         detection    = self._draw_detection_only(image_bgr, particles)
 
@@ -541,9 +539,10 @@ class TEMAnalyzer:
     # Step 5: Feature extraction + three classifiers + majority vote
     # ------------------------------------------------------------------
 
-    def _process_particles(self, image_bgr, gray, preprocessed, label_map):
+    def _process_particles(self, image_bgr, gray, preprocessed, label_map, edge_map=None):
         particles = []
-        edge_map  = cv2.Canny(preprocessed, 30, 80)
+        if edge_map is None:
+            edge_map = cv2.Canny(preprocessed, 30, 80)
         props     = regionprops(label_map, intensity_image=gray)
 
         for prop in props:
@@ -707,10 +706,18 @@ class TEMAnalyzer:
 # Drop-in API wrapper (compatible with existing main.py / FastAPI routes)
 # ===========================================================================
 
-def analyze_image(image_bgr: np.ndarray, config: TEMConfig = None) -> dict:
+def analyze_image(
+    image_bgr:    np.ndarray,
+    config:       TEMConfig = None,
+    preprocessed: Optional[np.ndarray] = None,
+    edge_map:     Optional[np.ndarray] = None,
+) -> dict:
     """
     Drop-in wrapper for FastAPI routes.
 
+    preprocessed / edge_map are optional precomputed products of image_bgr
+    (blur + CLAHE, and Canny on that) for the same config.
+
     Returns:
     {
         "total":          int,
@@ -724,7 +731,7 @@ def analyze_image(image_bgr: np.ndarray, config: TEMConfig = None) -> dict:
     }
     """
     analyzer = TEMAnalyzer(config)
-    result   = analyzer.analyze(image_bgr)
+    result   = analyzer.analyze(image_bgr, preprocessed=preprocessed, edge_map=edge_map)
 
     return {
         "total":          result.total_detected,
@@ -8,25 +8,8 @@ import os
 import asyncio
 import httpx
 
-
-def compute_radial_intensity(img_gray, x, y, r, samples=10):
-    """Intensity profile (center -> edge)."""
-    h, w = img_gray.shape
-    cx, cy, r = int(x), int(y), int(r)
-
-    values = []
-    for i in range(samples + 1):
-        rr = int((i / samples) * r)
-        px = min(max(cx + rr, 0), w - 1)
-        py = min(max(cy, 0), h - 1)
-        values.append(int(img_gray[py, px]))
-
-    return {
-        "center_intensity": values[0] if values else None,
-        "edge_intensity": values[-1] if values else None,
-        "mean_intensity": round(float(np.mean(values)), 2) if values else None,
-        "radial_intensity": values,
-    }
+from .image_cache import get_bgr
+from .radial_intensity import compute_radial_intensities
 
 
 class ClaudeAIAnalyzer:
@@ -116,7 +99,7 @@ Coordinates in pixels from top-left. r is radius in pixels."""}
 
     def enrich_results(self, results: List[Dict], image_path: str) -> List[Dict]:
         """Add intensity data and diameter to Claude's results."""
-        bgr = cv2.imread(image_path)
+        bgr = get_bgr(image_path)
         if bgr is None:
             return results
 
@@ -135,9 +118,13 @@ Coordinates in pixels from top-left. r is radius in pixels."""}
                 "r": round(float(radius), 2),
                 "diameter_nm": diameter_nm,
                 "viability": r.get("viability", "needs_review"),
-                "intensity": compute_radial_intensity(gray, x, y, radius),
+                "intensity": None,
             })
-        
+
+        profiles = compute_radial_intensities(gray, [(c["x"], c["y"], c["r"]) for c in circles])
+        for c, intensity in zip(circles, profiles):
+            c["intensity"] = intensity
+
         return circles
 
 
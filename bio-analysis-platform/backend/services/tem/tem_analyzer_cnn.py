@@ -6,33 +6,21 @@ from skimage import filters, measure, morphology, feature, segmentation
 from typing import List, Dict, Optional
 import os
 
-try:
-    from tensorflow import keras
-    import json
-    CNN_AVAILABLE = True
-except ImportError:
-    CNN_AVAILABLE = False
-    print("Warning: TensorFlow not available. CNN classifier will not work.")
+from .image_cache import get_bgr
+from .radial_intensity import compute_radial_intensities
 
+import json
+from functools import lru_cache
 
-def compute_radial_intensity(img_gray, x, y, r, samples=10):
-    """Intensity profile (center -> edge)."""
-    h, w = img_gray.shape
-    cx, cy, r = int(x), int(y), int(r)
+from .model_registry import get_keras, load_keras_model
 
-    values = []
-    for i in range(samples + 1):
-        rr = int((i / samples) * r)
-        px = min(max(cx + rr, 0), w - 1)
-        py = min(max(cy, 0), h - 1)
-        values.append(int(img_gray[py, px]))
 
-    return {
-        "center_intensity": values[0] if values else None,
-        "edge_intensity": values[-1] if values else None,
-        "mean_intensity": round(float(np.mean(values)), 2) if values else None,
-        "radial_intensity": values,
-    }
+@lru_cache(maxsize=8)
+def _load_metadata(metadata_path: str) -> dict:
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
 
 
 class CNNEVAnalyzer:
@@ -49,7 +37,7 @@ class CNNEVAnalyzer:
         self.class_names = ["non_viable", "viable"]
         
         # Load CNN model if available
-        if CNN_AVAILABLE and os.path.exists(model_path):
+        if os.path.exists(model_path) and get_keras() is not None:
             self.load_cnn_model(model_path, metadata_path)
         else:
             print(f"CNN model not found at {model_path}. Using fallback classification.")
@@ -62,19 +50,19 @@ class CNNEVAnalyzer:
 
     def load_cnn_model(self, model_path: str, metadata_path: str):
         """Load trained CNN model"""
+        # The registry keeps the model in memory, so constructing an analyzer
+        # per request no longer reloads the weights.
+        self.model = load_keras_model(model_path)
+        if self.model is None:
+            print(f"Error loading CNN model: {model_path}")
+            return
+
         try:
-            self.model = keras.models.load_model(model_path)
-            
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                    self.img_size = metadata.get('img_size', 128)
-                    self.class_names = metadata.get('class_names', ["non_viable", "viable"])
-            
-            print(f"CNN model loaded from {model_path}")
+            metadata = _load_metadata(metadata_path)
+            self.img_size = metadata.get('img_size', 128)
+            self.class_names = metadata.get('class_names', ["non_viable", "viable"])
         except Exception as e:
-            print(f"Error loading CNN model: {e}")
-            self.model = None
+            print(f"Error loading CNN metadata: {e}")
 
     def get_best_channel(self, bgr_img):
         """Select channel with best focus."""
@@ -84,7 +72,7 @@ class CNNEVAnalyzer:
 
     def detect_particles(self, image_path: str):
         """Detect particle regions using traditional CV"""
-        bgr = cv2.imread(image_path)
+        bgr = get_bgr(image_path)
         if bgr is None:
             return [], None
 
@@ -241,9 +229,14 @@ class CNNEVAnalyzer:
                 "diameter_nm": diameter_nm,
                 "viability": viability,
                 "confidence": round(float(confidence), 3),
-                "intensity": compute_radial_intensity(gray_img, cx, cy, r_px),
+                "intensity": None,
             })
 
+        # Radial intensity profiles for all particles in one pass
+        profiles = compute_radial_intensities(gray_img, [(c["x"], c["y"], c["r"]) for c in circles])
+        for c, intensity in zip(circles, profiles):
+            c["intensity"] = intensity
+
         # Sort and number
         circles.sort(key=lambda c: c["r"], reverse=True)
         for idx, c in enumerate(circles, start=1):
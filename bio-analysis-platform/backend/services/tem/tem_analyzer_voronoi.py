@@ -6,25 +6,8 @@ from scipy.spatial import Voronoi
 from skimage import filters, measure, morphology, feature, segmentation
 from typing import List, Dict, Tuple
 
-
-def compute_radial_intensity(img_gray, x, y, r, samples=10):
-    """Intensity profile (center -> edge)."""
-    h, w = img_gray.shape
-    cx, cy, r = int(x), int(y), int(r)
-
-    values = []
-    for i in range(samples + 1):
-        rr = int((i / samples) * r)
-        px = min(max(cx + rr, 0), w - 1)
-        py = min(max(cy, 0), h - 1)
-        values.append(int(img_gray[py, px]))
-
-    return {
-        "center_intensity": values[0] if values else None,
-        "edge_intensity": values[-1] if values else None,
-        "mean_intensity": round(float(np.mean(values)), 2) if values else None,
-        "radial_intensity": values,
-    }
+from .image_cache import get_bgr
+from .radial_intensity import compute_radial_intensities
 
 
 def polygon_area(corners):
@@ -67,7 +50,7 @@ class VoronoiEVAnalyzer:
         Detect particle centroids for Voronoi analysis.
         Returns: (points array, grayscale image)
         """
-        bgr = cv2.imread(image_path)
+        bgr = get_bgr(image_path)
         if bgr is None:
             return np.array([]), None
 
@@ -292,12 +275,17 @@ class VoronoiEVAnalyzer:
                     "r": round(float(r_px), 2),
                     "diameter_nm": diameter_nm,
                     "viability": status,
-                    "intensity": compute_radial_intensity(gray_img, point[0], point[1], r_px),
+                    "intensity": None,
                     "voronoi_area": round(float(area), 2),  # Additional metadata
                     "density_threshold": round(float(threshold_area), 2),
                 }
             )
 
+        # Radial intensity profiles for all particles in one pass
+        profiles = compute_radial_intensities(gray_img, [(c["x"], c["y"], c["r"]) for c in circles])
+        for c, intensity in zip(circles, profiles):
+            c["intensity"] = intensity
+
         # Sort and number
         circles.sort(key=lambda c: c["r"], reverse=True)
         for idx, c in enumerate(circles, start=1):
@@ -2,19 +2,27 @@ from fastapi import HTTPException
 from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional, Tuple, Any
 
-from .tem_analyzer import analyze_image as analyze_image_rulebased
-from .tem_analyzer_voronoi import analyze_image_voronoi
-from .tem_analyzer_ai import analyze_image_ai_async
-from .tem_analyzer_cnn import analyze_image_cnn
-
+# Analyzer modules (scikit-image, boto3, TensorFlow via model_registry) are
+# imported inside the analysis functions so that importing this module — and
+# therefore starting the server — stays cheap.
 from .shape_classifier import (
     get_shape_classification_rules,
     run_shape_classification_pipeline,
     find_nearest_particle,
 )
+from .radial_intensity import compute_radial_intensity, compute_radial_intensities
+from .image_cache import (
+    get_bgr,
+    get_gray,
+    get_preprocessed,
+    get_edge_map,
+    invalidate_image,
+    image_cache_stats,
+)
 
 import os
 import sys
+import threading
 import uuid
 import cv2
 import math
@@ -22,7 +30,11 @@ import numpy as np
 
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
-from sqlalchemy import create_engine, Column, String, Text, Float, JSON, text
+from sqlalchemy import (
+    create_engine, Column, String, Text, Float, Integer, JSON, Index, Numeric,
+    text, insert, or_, cast, func,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker, declarative_base
 from pathlib import Path
 from PIL import Image
@@ -78,11 +90,34 @@ class ImageRecord(Base):
 
     scale = Column(JSON, nullable=True)
     min_nm = Column(Float, nullable=False, default=DEFAULT_MIN_NM)
+    # Legacy per-image JSON blob. Particles now live in tem_particles; any
+    # boxes still stored here are moved across by migrate_legacy_boxes().
     boxes = Column(JSON, nullable=False, default=list)
     analysis_method = Column(String, nullable=False, default="rulebased")
 
 
-Base.metadata.create_all(bind=engine)
+class ParticleRecord(Base):
+    """One detected/edited circle of a TEM image."""
+
+    __tablename__ = "tem_particles"
+
+    image_id = Column(String, primary_key=True)
+    number = Column(Integer, primary_key=True)
+
+    x = Column(Float, nullable=False, default=0.0)
+    y = Column(Float, nullable=False, default=0.0)
+    r = Column(Float, nullable=False, default=0.0)
+    # Effective diameter (explicit value, else derived from r and the scale)
+    # so size filters can run in SQL.
+    diameter_nm = Column(Float, nullable=True)
+    viability = Column(String, nullable=False, default="needs_review")
+    confidence = Column(Float, nullable=True)
+    # Everything else on the box (intensity, shape, votes, shape_meta, ...)
+    extra = Column(JSON, nullable=True)
+
+    __table_args__ = (
+        Index("ix_tem_particles_image_viability_diameter", "image_id", "viability", "diameter_nm"),
+    )
 
 
 def ensure_extra_columns():
@@ -95,10 +130,46 @@ def ensure_extra_columns():
             conn.execute(text(stmt))
 
 
-ensure_extra_columns()
+_db_ready = False
+_db_init_lock = threading.Lock()
+
+
+def init_db():
+    """
+    Create tables and apply the column patches once per process.
+
+    Never run at import time, so importing the service (PyInstaller
+    analysis, scripts, tests) does not touch Postgres. Concurrent callers
+    wait for the first one to finish.
+    """
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_init_lock:
+        if not _db_ready:
+            Base.metadata.create_all(bind=engine)
+            ensure_extra_columns()
+            _db_ready = True
+
+
+def start_db_init() -> threading.Thread:
+    """
+    Run init_db() on a daemon thread, so app startup (and /health) does not
+    wait for Postgres. db_session() waits for it, and retries it if it failed.
+    """
+    def run():
+        try:
+            init_db()
+        except Exception as e:
+            print(f"[WARN] Database init failed, retrying on first use: {e}")
+
+    thread = threading.Thread(target=run, name="tem-db-init", daemon=True)
+    thread.start()
+    return thread
 
 
 def db_session():
+    init_db()
     return SessionLocal()
 
 
@@ -342,23 +413,24 @@ def apply_min_nm_filter(boxes: List[dict], min_nm: float, fallback_nm_per_pixel:
     return out
 
 
-def compute_radial_intensity(img, x, y, r, samples=10):
-    h, w = img.shape
-    cx, cy, r = int(x), int(y), int(r)
+def fill_missing_intensities(boxes: List[dict], img_gray) -> List[dict]:
+    """
+    Compute radial intensity for every box lacking one, in a single batch.
 
-    values = []
-    for i in range(samples + 1):
-        rr = int((i / samples) * r)
-        px = min(max(cx + rr, 0), w - 1)
-        py = min(max(cy, 0), h - 1)
-        values.append(int(img[py, px]))
+    Boxes without a radius are skipped. A box with r=0 (a point detection)
+    gets a flat profile of its centre pixel.
+    """
+    if img_gray is None:
+        return boxes
 
-    return {
-        "center_intensity": values[0] if values else None,
-        "edge_intensity": values[-1] if values else None,
-        "mean_intensity": round(float(np.mean(values)), 2) if values else None,
-        "radial_intensity": values,
-    }
+    todo = [b for b in boxes if b.get("intensity") is None and b.get("r") is not None]
+    profiles = compute_radial_intensities(
+        img_gray,
+        [(b.get("x", 0), b.get("y", 0), b.get("r", 0)) for b in todo],
+    )
+    for b, intensity in zip(todo, profiles):
+        b["intensity"] = intensity
+    return boxes
 
 
 def normalize_particle_box(p: dict, idx: int, nm_per_pixel: Optional[float], img_gray=None) -> dict:
@@ -399,16 +471,15 @@ def normalize_particle_box(p: dict, idx: int, nm_per_pixel: Optional[float], img
     if box["diameter_nm"] is None:
         box["diameter_nm"] = calculate_diameter_nm_from_px(box["r"], nm_per_pixel)
 
-    if img_gray is not None and box["intensity"] is None and box["r"] and box["x"] is not None and box["y"] is not None:
-        box["intensity"] = compute_radial_intensity(img_gray, box["x"], box["y"], box["r"])
+    # box["r"] is a 0.0 placeholder when the detector reported no radius
+    if img_gray is not None and r is not None:
+        fill_missing_intensities([box], img_gray)
 
     return box
 
 
 def normalize_boxes(raw_result, nm_per_pixel: Optional[float], img_path: Optional[str] = None) -> List[dict]:
-    img_gray = None
-    if img_path and os.path.exists(img_path):
-        img_gray = cv2.imread(img_path, cv2.IMREAD_GRAYSCALE)
+    img_gray = get_gray(img_path)
 
     if isinstance(raw_result, list):
         normalized = []
@@ -419,31 +490,34 @@ def normalize_boxes(raw_result, nm_per_pixel: Optional[float], img_path: Optiona
                 item["number"] = idx
             if item.get("diameter_nm") is None and item.get("r") is not None:
                 item["diameter_nm"] = calculate_diameter_nm_from_px(item.get("r"), nm_per_pixel)
-            if img_gray is not None and item.get("intensity") is None and item.get("r") is not None:
-                item["intensity"] = compute_radial_intensity(
-                    img_gray,
-                    item.get("x", 0),
-                    item.get("y", 0),
-                    item.get("r", 0),
-                )
             normalized.append(item)
-        return normalized
+        return fill_missing_intensities(normalized, img_gray)
 
     if isinstance(raw_result, dict):
         particles = raw_result.get("particles", [])
-        return [
-            normalize_particle_box(p, idx, nm_per_pixel, img_gray=img_gray)
+        boxes = [
+            normalize_particle_box(p, idx, nm_per_pixel)
             for idx, p in enumerate(particles, start=1)
         ]
+        return fill_missing_intensities(boxes, img_gray)
 
     return []
 
 
 def analyze_rulebased_path(image_path: str, nm_per_pixel: Optional[float]) -> List[dict]:
-    img = cv2.imread(image_path)
+    from .tem_analyzer import analyze_image as analyze_image_rulebased, TEMConfig
+
+    img = get_bgr(image_path)
     if img is None:
         raise HTTPException(status_code=400, detail="Failed to read uploaded image")
-    result = analyze_image_rulebased(img)
+    cfg = TEMConfig()
+    pre_params = (cfg.GAUSSIAN_SIGMA, cfg.CLAHE_CLIP, cfg.CLAHE_TILE)
+    result = analyze_image_rulebased(
+        img,
+        cfg,
+        preprocessed=get_preprocessed(image_path, *pre_params),
+        edge_map=get_edge_map(image_path, 30, 80, *pre_params),
+    )
     return normalize_boxes(result, nm_per_pixel=nm_per_pixel, img_path=image_path)
 
 
@@ -451,6 +525,8 @@ def analyze_cnn_path(image_path: str, nm_per_pixel: Optional[float]) -> List[dic
     if not os.path.exists(CNN_MODEL_PATH):
         print(f"[WARN] CNN model not found at {CNN_MODEL_PATH}, falling back to rule-based analysis")
         return analyze_rulebased_path(image_path, nm_per_pixel)
+    from .tem_analyzer_cnn import analyze_image_cnn
+
     result = analyze_image_cnn(
         image_path,
         nm_per_pixel=nm_per_pixel or DEFAULT_NM_PER_PIXEL,
@@ -461,10 +537,14 @@ def analyze_cnn_path(image_path: str, nm_per_pixel: Optional[float]) -> List[dic
 
 async def run_analysis(method: str, image_path: str, nm_per_pixel: Optional[float]) -> List[dict]:
     if method == "voronoi":
+        from .tem_analyzer_voronoi import analyze_image_voronoi
+
         result = analyze_image_voronoi(image_path, nm_per_pixel=nm_per_pixel or DEFAULT_NM_PER_PIXEL)
         return normalize_boxes(result, nm_per_pixel=nm_per_pixel, img_path=image_path)
 
     if method == "ai":
+        from .tem_analyzer_ai import analyze_image_ai_async
+
         result = await analyze_image_ai_async(image_path, nm_per_pixel=nm_per_pixel or DEFAULT_NM_PER_PIXEL)
         return normalize_boxes(result, nm_per_pixel=nm_per_pixel, img_path=image_path)
 
@@ -594,9 +674,7 @@ def shape_particles_to_boxes(
     nm_per_pixel: float,
     image_path: Optional[str] = None,
 ) -> List[dict]:
-    img_gray = None
-    if image_path and os.path.exists(image_path):
-        img_gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    img_gray = get_gray(image_path)
 
     boxes = []
     for idx, p in enumerate(particles or [], start=1):
@@ -624,12 +702,9 @@ def shape_particles_to_boxes(
             "shape_meta": p,
         }
 
-        if img_gray is not None:
-            box["intensity"] = compute_radial_intensity(img_gray, x, y, r)
-
         boxes.append(box)
 
-    return boxes
+    return fill_missing_intensities(boxes, img_gray)
 
 
 def run_shape_pipeline_on_bgr(
@@ -684,35 +759,222 @@ def get_size_bin(d):
     return "200_plus"
 
 
-def build_table_response(boxes, status_filter=None, size_filter=None, min_nm: float = DEFAULT_MIN_NM):
-    filtered = []
+# Diameter ranges [lo, hi) in nm matching get_size_bin().
+SIZE_BIN_RANGES = {
+    "below_30": (None, 30.0),
+    "30_50": (30.0, 50.0),
+    "50_100": (50.0, 100.0),
+    "100_200": (100.0, 200.0),
+    "200_plus": (200.0, None),
+}
 
-    for c in boxes or []:
-        d = get_effective_diameter_nm(c, fallback_nm_per_pixel=DEFAULT_NM_PER_PIXEL)
-        if d is None:
-            continue
+PARTICLE_COLUMNS = ("number", "x", "y", "r", "diameter_nm", "viability", "confidence")
 
-        try:
-            if float(d) < float(min_nm):
-                continue
-        except Exception:
-            continue
 
-        if status_filter and c.get("viability") != status_filter:
-            continue
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except Exception:
+        return None
 
-        size_bin = get_size_bin(d)
-        if size_filter and size_bin != size_filter:
-            continue
 
-        filtered.append(
-            {
-                "number": c.get("number"),
-                "diameter_nm": d,
-                "viability": c.get("viability"),
-                "confidence": c.get("confidence"),
-            }
+def particle_row(image_id: str, box: dict, idx: int, nm_per_pixel: float = DEFAULT_NM_PER_PIXEL) -> dict:
+    number = box.get("number")
+    try:
+        number = int(number) if number is not None else idx
+    except Exception:
+        number = idx
+
+    return {
+        "image_id": image_id,
+        "number": number,
+        "x": _float_or_none(box.get("x")) or 0.0,
+        "y": _float_or_none(box.get("y")) or 0.0,
+        "r": _float_or_none(box.get("r")) or 0.0,
+        "diameter_nm": get_effective_diameter_nm(box, fallback_nm_per_pixel=nm_per_pixel),
+        "viability": normalize_viability(box.get("viability")),
+        "confidence": _float_or_none(box.get("confidence")),
+        "extra": {k: v for k, v in box.items() if k not in PARTICLE_COLUMNS} or None,
+    }
+
+
+def particle_to_box(p: ParticleRecord) -> dict:
+    box = dict(p.extra or {})
+    box.update(
+        number=p.number,
+        x=p.x,
+        y=p.y,
+        r=p.r,
+        diameter_nm=p.diameter_nm,
+        viability=p.viability,
+        confidence=p.confidence,
+    )
+    return box
+
+
+def save_particles(db, image_id: str, boxes: List[dict], nm_per_pixel: float = DEFAULT_NM_PER_PIXEL):
+    """
+    Replace the particle set of an image with ``boxes`` (bulk upsert).
+
+    Rows are upserted on (image_id, number) and numbers no longer present are
+    deleted. A box whose number is already used by an earlier box gets the
+    next free number instead. The caller commits.
+    """
+    rows = [particle_row(image_id, b, idx, nm_per_pixel) for idx, b in enumerate(boxes or [], start=1)]
+    # One row per number: a Postgres upsert cannot touch the same key twice
+    numbers = []
+    taken = set()
+    next_free = max((row["number"] for row in rows), default=0) + 1
+    for row in rows:
+        if row["number"] in taken:
+            row["number"] = next_free
+            next_free += 1
+        taken.add(row["number"])
+        numbers.append(row["number"])
+
+    stale = db.query(ParticleRecord).filter(ParticleRecord.image_id == image_id)
+    if numbers:
+        stale = stale.filter(ParticleRecord.number.notin_(numbers))
+    stale.delete(synchronize_session=False)
+
+    if not rows:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = pg_insert(ParticleRecord)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ParticleRecord.image_id, ParticleRecord.number],
+            set_={
+                col: stmt.excluded[col]
+                for col in ("x", "y", "r", "diameter_nm", "viability", "confidence", "extra")
+            },
         )
+        db.execute(stmt, rows)
+    else:
+        db.query(ParticleRecord).filter(
+            ParticleRecord.image_id == image_id,
+            ParticleRecord.number.in_(numbers),
+        ).delete(synchronize_session=False)
+        db.execute(insert(ParticleRecord), rows)
+
+
+def delete_particles(db, image_id: Optional[str] = None):
+    q = db.query(ParticleRecord)
+    if image_id is not None:
+        q = q.filter(ParticleRecord.image_id == image_id)
+    q.delete(synchronize_session=False)
+
+
+def migrate_legacy_boxes(db, rec: ImageRecord) -> bool:
+    """Move boxes still held in the legacy JSON column into tem_particles."""
+    if not rec.boxes:
+        return False
+    save_particles(db, rec.image_id, rec.boxes, get_nm_per_pixel_for_record(rec))
+    rec.boxes = []
+    db.commit()
+    return True
+
+
+def _min_nm_clause(min_nm: float):
+    d = ParticleRecord.diameter_nm
+    return or_(d.is_(None), d >= float(min_nm))
 
-    filtered = sorted(filtered, key=lambda x: (x["number"] is None, x["number"]))
-    return {"total": len(filtered), "circles": filtered}
\ No newline at end of file
+
+def load_boxes(db, rec: ImageRecord, min_nm: Optional[float] = None) -> List[dict]:
+    """Boxes of ``rec`` ordered by number, optionally hiding those below ``min_nm``."""
+    migrate_legacy_boxes(db, rec)
+    q = db.query(ParticleRecord).filter(ParticleRecord.image_id == rec.image_id)
+    if min_nm is not None:
+        q = q.filter(_min_nm_clause(min_nm))
+    return [particle_to_box(p) for p in q.order_by(ParticleRecord.number)]
+
+
+def load_boxes_for_records(db, recs: List[ImageRecord]) -> Dict[str, List[dict]]:
+    """Visible boxes (each image's own min_nm) for many images in one query."""
+    for rec in recs:
+        migrate_legacy_boxes(db, rec)
+
+    min_by_image = {rec.image_id: get_min_nm_value(rec.min_nm) for rec in recs}
+    out: Dict[str, List[dict]] = {image_id: [] for image_id in min_by_image}
+    if not out:
+        return out
+
+    q = (
+        db.query(ParticleRecord)
+        .filter(ParticleRecord.image_id.in_(list(out)))
+        .order_by(ParticleRecord.image_id, ParticleRecord.number)
+    )
+    for p in q:
+        if p.diameter_nm is None or p.diameter_nm >= min_by_image[p.image_id]:
+            out[p.image_id].append(particle_to_box(p))
+    return out
+
+
+def rescale_particles(db, image_id: str, nm_per_pixel: float):
+    """Recompute diameter_nm = 2 r · nm/px for every particle of an image."""
+    db.query(ParticleRecord).filter(ParticleRecord.image_id == image_id).update(
+        {
+            ParticleRecord.diameter_nm: cast(
+                func.round(cast(ParticleRecord.r * 2.0 * float(nm_per_pixel), Numeric), 2),
+                Float,
+            )
+        },
+        synchronize_session=False,
+    )
+
+
+def query_particle_table(
+    db,
+    rec: ImageRecord,
+    status_filter: Optional[str] = None,
+    size_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> dict:
+    """
+    Particle table of an image (status / size filters) with pagination.
+
+    ``total`` is the number of matching particles, not the page length.
+    """
+    migrate_legacy_boxes(db, rec)
+    min_nm = get_min_nm_value(rec.min_nm)
+    d = ParticleRecord.diameter_nm
+
+    q = db.query(
+        ParticleRecord.number,
+        ParticleRecord.diameter_nm,
+        ParticleRecord.viability,
+        ParticleRecord.confidence,
+    ).filter(
+        ParticleRecord.image_id == rec.image_id,
+        d.isnot(None),
+        d >= min_nm,
+    )
+
+    if status_filter:
+        q = q.filter(ParticleRecord.viability == status_filter)
+
+    if size_filter:
+        if size_filter not in SIZE_BIN_RANGES:
+            return {"total": 0, "circles": [], "offset": offset, "limit": limit}
+        lo, hi = SIZE_BIN_RANGES[size_filter]
+        if lo is not None:
+            q = q.filter(d >= lo)
+        if hi is not None:
+            q = q.filter(d < hi)
+
+    total = q.count()
+    q = q.order_by(ParticleRecord.number).offset(max(int(offset or 0), 0))
+    if limit is not None:
+        q = q.limit(int(limit))
+
+    circles = [
+        {
+            "number": number,
+            "diameter_nm": diameter_nm,
+            "viability": viability,
+            "confidence": confidence,
+        }
+        for number, diameter_nm, viability, confidence in q
+    ]
+    return {"total": total, "circles": circles, "offset": offset, "limit": limit}
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Particle store check — save_particles on an in-memory SQLite database.
+
+Usage (from bio-analysis-platform/backend):
+    python -m services.tem.test_particle_store
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.tem.tem_service import ParticleRecord, save_particles
+
+
+def test_boxes_sharing_a_number_are_renumbered():
+    engine = create_engine("sqlite://")
+    ParticleRecord.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+
+    save_particles(db, "img", [
+        {"number": 1, "x": 10, "y": 10, "r": 5},
+        {"number": 2, "x": 20, "y": 20, "r": 5},
+        {"number": 2, "x": 30, "y": 30, "r": 5},
+        {"number": 1, "x": 40, "y": 40, "r": 5},
+    ])
+    db.commit()
+
+    rows = db.query(ParticleRecord).order_by(ParticleRecord.number).all()
+    assert [(p.number, p.x) for p in rows] == [(1, 10), (2, 20), (3, 30), (4, 40)]
+
+    # Saving again with the stored numbers keeps the set as is
+    save_particles(db, "img", [{"number": p.number, "x": p.x, "y": p.y, "r": p.r} for p in rows[:3]])
+    db.commit()
+    assert [(p.number, p.x) for p in db.query(ParticleRecord).order_by(ParticleRecord.number)] == [(1, 10), (2, 20), (3, 30)]
+
+
+if __name__ == "__main__":
+    test_boxes_sharing_a_number_are_renumbered()
+    print("OK")
@@ -23,22 +23,20 @@ Key improvements over v1
 from __future__ import annotations
 
 import base64
+import hashlib
 import io
 import json
 import logging
 import os
-import shutil
 import sys
-import traceback
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-from fastapi.responses import JSONResponse
-from scipy.signal import find_peaks
 
 # ── optional Bedrock ──────────────────────────────────────────────────────────
 try:
@@ -115,6 +113,26 @@ def preprocess_image(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
         except Exception:
             raise ValueError(f"Could not read image at path: {file_path}")
 
+    return _preprocess_decoded(img)
+
+
+def _decode_image_bytes(data: bytes, name: str = "image") -> np.ndarray:
+    """Decode an uploaded gel image from memory (same fallbacks as preprocess_image)."""
+    if not data:
+        raise ValueError(f"Empty image upload: {name}")
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+    if img is None:
+        try:
+            import tifffile
+            raw = tifffile.imread(io.BytesIO(data))
+            img = cv2.cvtColor(raw, cv2.COLOR_RGB2BGR) if raw.ndim == 3 else raw
+        except Exception:
+            raise ValueError(f"Could not read image: {name}")
+    return img
+
+
+def _preprocess_decoded(img: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Grayscale → uint8 → invert → CLAHE → blur for an already decoded image."""
     # ── to grayscale ──────────────────────────────────────────────────────────
     if img.ndim == 3:
         gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -142,6 +160,147 @@ def preprocess_image(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
     return gray, blur
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Preprocessed-image cache  (keyed by file content hash)
+# ─────────────────────────────────────────────────────────────────────────────
+# detect-ruler-bands and analyze are usually called back-to-back on the same
+# gel, and batch runs often contain re-uploads, so the CLAHE + blur result is
+# kept in a small LRU bounded by WESTERN_PREPROCESS_CACHE_MB (default 128).
+
+_PREPROCESS_CACHE_BYTES = int(float(os.getenv("WESTERN_PREPROCESS_CACHE_MB", "128")) * 1024 * 1024)
+_preprocess_cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+_preprocess_cache_bytes = 0
+_preprocess_lock = threading.Lock()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def preprocess_image_bytes(
+    data: bytes,
+    digest: Optional[str] = None,
+    name: str = "image",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    preprocess_image() for in-memory image bytes, memoised by content hash.
+
+    The returned arrays are shared between callers and are read-only.
+    """
+    global _preprocess_cache_bytes
+
+    digest = digest or content_hash(data)
+    with _preprocess_lock:
+        cached = _preprocess_cache.get(digest)
+        if cached is not None:
+            _preprocess_cache.move_to_end(digest)
+            return cached
+
+    gray, blur = _preprocess_decoded(_decode_image_bytes(data, name))
+    gray.flags.writeable = False
+    blur.flags.writeable = False
+    size = gray.nbytes + blur.nbytes
+
+    with _preprocess_lock:
+        if digest not in _preprocess_cache and size <= _PREPROCESS_CACHE_BYTES:
+            _preprocess_cache[digest] = (gray, blur)
+            _preprocess_cache_bytes += size
+            while _preprocess_cache_bytes > _PREPROCESS_CACHE_BYTES:
+                _, (g, b) = _preprocess_cache.popitem(last=False)
+                _preprocess_cache_bytes -= g.nbytes + b.nbytes
+    return gray, blur
+
+
+def preprocess_image_cached(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """preprocess_image() with the content-hash cache."""
+    with open(file_path, "rb") as fh:
+        data = fh.read()
+    return preprocess_image_bytes(data, name=file_path)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Peak finding helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _select_by_distance(peaks: np.ndarray, heights: np.ndarray, distance: int) -> np.ndarray:
+    """
+    Boolean mask equivalent to find_peaks(distance=...): higher peaks win and
+    suppress lower ones closer than ``distance`` samples.
+    """
+    keep = np.ones(len(peaks), dtype=bool)
+    if distance <= 1 or len(peaks) < 2:
+        return keep
+    # Same ordering as scipy's _select_by_peak_distance (ties included)
+    for i in np.argsort(heights)[::-1]:
+        if not keep[i]:
+            continue
+        lo = np.searchsorted(peaks, peaks[i] - distance + 1)
+        hi = np.searchsorted(peaks, peaks[i] + distance - 1, side="right")
+        keep[lo:hi] = False
+        keep[i] = True
+    return keep
+
+
+def relaxed_peaks(
+    profile: np.ndarray,
+    levels: List[Tuple[int, float]],
+    min_count: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Progressive threshold relaxation in a single pass.
+
+    ``levels`` is a list of (distance, min_prominence) tried in order; the first
+    level yielding at least ``min_count`` peaks wins, otherwise the last level's
+    peaks are returned. Equivalent to calling find_peaks once per level, but all
+    local maxima and their prominences are computed only once.
+
+    Returns (peaks, prominences).
+    """
+    # scipy.signal costs ~1 s to import; defer it to the first analysis
+    from scipy.signal import find_peaks, peak_prominences
+
+    candidates, _ = find_peaks(profile)
+    if len(candidates) == 0:
+        return candidates, np.array([])
+
+    prominences = peak_prominences(profile, candidates)[0]
+    heights = profile[candidates]
+    distance_masks: Dict[int, np.ndarray] = {}
+
+    keep = np.zeros(len(candidates), dtype=bool)
+    for distance, min_prom in levels:
+        if distance not in distance_masks:
+            distance_masks[distance] = _select_by_distance(candidates, heights, distance)
+        keep = distance_masks[distance] & (prominences >= min_prom)
+        if np.count_nonzero(keep) >= min_count:
+            break
+
+    return candidates[keep], prominences[keep]
+
+
+def lane_bounds(width: int, lane_x: int, half_width: int = 20) -> Tuple[int, int]:
+    effective_half = max(half_width, int(width * 0.015))
+    return max(lane_x - effective_half, 0), min(lane_x + effective_half, width)
+
+
+def lane_profiles(
+    processed_img: np.ndarray,
+    lane_xs: List[int],
+    half_width: int = 20,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Horizontal intensity profiles of every lane from one cumulative sum.
+
+    Returns (profiles[n_lanes, height], lefts, rights).
+    """
+    h, w = processed_img.shape
+    bounds = np.array([lane_bounds(w, int(x), half_width) for x in lane_xs], dtype=np.intp).reshape(-1, 2)
+    csum = np.zeros((h, w + 1), dtype=np.int64)
+    np.cumsum(processed_img, axis=1, dtype=np.int64, out=csum[:, 1:])
+    profiles = (csum[:, bounds[:, 1]] - csum[:, bounds[:, 0]]).T.astype(float)
+    return profiles, bounds[:, 0], bounds[:, 1]
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Lane detection  (public – same signature as before)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -156,27 +315,16 @@ def detect_lanes(processed_img: np.ndarray) -> np.ndarray:
     min_distance = max(20, int(w * 0.018))
     profile_max = float(np.max(vertical_profile))
 
-    # Try progressively lower prominence thresholds until we get lanes
-    for prom_pct in [0.08, 0.04, 0.02, 0.01]:
-        lane_peaks, _ = find_peaks(
-            vertical_profile,
-            distance=min_distance,
-            prominence=max(profile_max * prom_pct, 50),
-        )
-        if len(lane_peaks) >= 2:
-            break
-
-    # Also try tighter distance if still not enough
-    if len(lane_peaks) < 2:
-        for dist_factor in [0.012, 0.008]:
-            lane_peaks, _ = find_peaks(
-                vertical_profile,
-                distance=max(15, int(w * dist_factor)),
-                prominence=max(profile_max * 0.01, 30),
-            )
-            if len(lane_peaks) >= 2:
-                break
-
+    # Progressively lower prominence thresholds until we get lanes,
+    # then tighter distances if still not enough
+    levels = [
+        (min_distance, max(profile_max * prom_pct, 50))
+        for prom_pct in [0.08, 0.04, 0.02, 0.01]
+    ] + [
+        (max(15, int(w * dist_factor)), max(profile_max * 0.01, 30))
+        for dist_factor in [0.012, 0.008]
+    ]
+    lane_peaks, _ = relaxed_peaks(vertical_profile, levels, min_count=2)
     return lane_peaks
 
 
@@ -184,6 +332,42 @@ def detect_lanes(processed_img: np.ndarray) -> np.ndarray:
 # Band detection  (public – same signature as before + confidence)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _bands_from_profile(horizontal_profile: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(band_peaks_y, intensities) for one lane profile."""
+    if len(horizontal_profile) == 0 or np.max(horizontal_profile) == 0:
+        return np.array([]), np.array([])
+
+    peak_max = float(np.max(horizontal_profile))
+
+    # Progressive threshold relaxation - works for all image types
+    levels = [
+        (min_dist, max(peak_max * prom_pct, 10))
+        for prom_pct, min_dist in [(0.04, 8), (0.02, 6), (0.01, 5), (0.005, 4)]
+    ]
+    band_peaks, _ = relaxed_peaks(horizontal_profile, levels, min_count=2)
+
+    intensities = horizontal_profile[band_peaks] if len(band_peaks) else np.array([])
+    return band_peaks, intensities
+
+
+def _confident_bands_from_profile(hp: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(band_peaks_y, intensities, confidence) for one lane profile."""
+    peak_max = float(np.max(hp)) if len(hp) and np.max(hp) > 0 else 1.0
+
+    levels = [(8, max(peak_max * 0.04, 50)), (6, max(peak_max * 0.02, 20))]
+    band_peaks, prominences = relaxed_peaks(hp, levels, min_count=1)
+
+    if len(band_peaks) == 0:
+        return np.array([]), np.array([]), np.array([])
+
+    intensities = hp[band_peaks]
+
+    # Confidence: normalise prominence against lane max; cap at 1.0
+    confidence = np.clip(prominences / (peak_max * 0.15), 0.0, 1.0)
+
+    return band_peaks, intensities, confidence
+
+
 def detect_bands_in_lane(
     processed_img: np.ndarray,
     lane_x: int,
@@ -201,33 +385,12 @@ def detect_bands_in_lane(
     - secondary fallback with even lower thresholds
     """
     h, w = processed_img.shape
-
-    # Scale half-width for high-res images
-    effective_half = max(half_width, int(w * 0.015))
-
-    left  = max(lane_x - effective_half, 0)
-    right = min(lane_x + effective_half, w)
+    left, right = lane_bounds(w, lane_x, half_width)
 
     lane_region         = processed_img[:, left:right]
     horizontal_profile  = np.sum(lane_region, axis=1).astype(float)
 
-    if np.max(horizontal_profile) == 0:
-        return np.array([]), np.array([]), left, right
-
-    peak_max    = float(np.max(horizontal_profile))
-
-    # Progressive threshold relaxation - works for all image types
-    band_peaks, props = np.array([]), {"prominences": np.array([])}
-    for prom_pct, min_dist in [(0.04, 8), (0.02, 6), (0.01, 5), (0.005, 4)]:
-        band_peaks, props = find_peaks(
-            horizontal_profile,
-            distance=min_dist,
-            prominence=max(peak_max * prom_pct, 10),
-        )
-        if len(band_peaks) >= 2:
-            break
-
-    intensities = horizontal_profile[band_peaks] if len(band_peaks) else np.array([])
+    band_peaks, intensities = _bands_from_profile(horizontal_profile)
     return band_peaks, intensities, left, right
 
 
@@ -241,28 +404,32 @@ def detect_bands_with_confidence(
     Used internally; route handlers call the standard function for compatibility.
     """
     h, w = processed_img.shape
-    effective_half = max(half_width, int(w * 0.015))
-    left  = max(lane_x - effective_half, 0)
-    right = min(lane_x + effective_half, w)
+    left, right = lane_bounds(w, lane_x, half_width)
 
     lane_region        = processed_img[:, left:right]
     hp                 = np.sum(lane_region, axis=1).astype(float)
-    peak_max           = float(np.max(hp)) if np.max(hp) > 0 else 1.0
-
-    band_peaks, props = find_peaks(hp, distance=8, prominence=max(peak_max * 0.04, 50))
-    if len(band_peaks) == 0:
-        band_peaks, props = find_peaks(hp, distance=6, prominence=max(peak_max * 0.02, 20))
-
-    if len(band_peaks) == 0:
-        return np.array([]), np.array([]), np.array([]), left, right
 
-    intensities = hp[band_peaks]
-    prominences = props["prominences"]
+    band_peaks, intensities, confidence = _confident_bands_from_profile(hp)
+    return band_peaks, intensities, confidence, left, right
 
-    # Confidence: normalise prominence against lane max; cap at 1.0
-    confidence = np.clip(prominences / (peak_max * 0.15), 0.0, 1.0)
 
-    return band_peaks, intensities, confidence, left, right
+def detect_bands_all_lanes(
+    processed_img: np.ndarray,
+    lane_xs: List[int],
+    half_width: int = 20,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]]:
+    """
+    detect_bands_with_confidence for every lane, with all lane profiles taken
+    from a single cumulative sum over the image.
+    """
+    if len(lane_xs) == 0:
+        return []
+    profiles, lefts, rights = lane_profiles(processed_img, lane_xs, half_width)
+    out = []
+    for hp, left, right in zip(profiles, lefts, rights):
+        band_peaks, intensities, confidence = _confident_bands_from_profile(hp)
+        out.append((band_peaks, intensities, confidence, int(left), int(right)))
+    return out
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -540,3 +707,224 @@ def annotate_gel_image(
                         cv2.FONT_HERSHEY_SIMPLEX, 0.38, (255, 255, 0), 1, cv2.LINE_AA)
 
     return vis
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Band table  (shared by /analyze and /analyze-batch)
+# ─────────────────────────────────────────────────────────────────────────────
+
+DEFAULT_LADDER_KDA = [180, 130, 100, 70, 55, 40, 35, 25, 15, 10]
+
+
+def kda_mapper_for_blot(
+    processed_img: np.ndarray,
+    lane_peaks: List[int],
+    ruler_lane: int = 0,
+    ruler_marks: Optional[List[Dict]] = None,
+) -> Callable[[float], float]:
+    """
+    kDa mapper from user ruler marks, or from the ruler lane's detected bands
+    against DEFAULT_LADDER_KDA when fewer than two marks are given.
+    Raises ValueError with a user-facing message.
+    """
+    if ruler_marks and len(ruler_marks) >= 2:
+        try:
+            ruler_positions  = [float(m["y"])   for m in ruler_marks]
+            ruler_kda_values = [float(m["kda"]) for m in ruler_marks]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid ruler mark data: {str(e)}")
+        if any(v <= 0 for v in ruler_kda_values):
+            raise ValueError("All kDa values must be positive numbers.")
+        return build_kda_mapper(ruler_positions, ruler_kda_values)
+
+    band_peaks_ruler, _, _, _ = detect_bands_in_lane(
+        processed_img, int(lane_peaks[ruler_lane])
+    )
+    if len(band_peaks_ruler) < 2:
+        raise ValueError("Not enough ruler bands for kDa mapping. Please mark the ruler lane.")
+    return build_kda_mapper(band_peaks_ruler, DEFAULT_LADDER_KDA)
+
+
+def build_band_table(
+    lane_peaks: List[int],
+    lane_bands: List[Tuple[np.ndarray, np.ndarray, np.ndarray, int, int]],
+    pixel_to_kda: Callable[[float], float],
+    volume_loaded: float = 10.0,
+    reference_intensity: Optional[float] = None,
+    reference_concentration: Optional[float] = None,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Turn detect_bands_all_lanes() output into (frontend_bands, csv_rows).
+    Bands are numbered B1, B2, … across lanes in lane order.
+    """
+    frontend_bands = []
+    results        = []
+    band_counter   = 1
+
+    use_reference = (
+        reference_intensity is not None
+        and reference_concentration is not None
+        and reference_intensity != 0
+    )
+
+    for lane, (lane_x, (positions, intensities, confidence, _, _)) in enumerate(zip(lane_peaks, lane_bands)):
+        confidences = confidence if len(confidence) == len(positions) else [1.0] * len(positions)
+
+        for pos, intensity, conf in zip(positions, intensities, confidences):
+            try:
+                kda_value = pixel_to_kda(float(pos))
+            except Exception:
+                kda_value = 0.0
+
+            relative_quantity = (float(intensity) / 100.0) * volume_loaded
+
+            if use_reference:
+                display_concentration = round(
+                    (float(intensity) / float(reference_intensity)) * float(reference_concentration), 3
+                )
+            else:
+                display_concentration = round(float(relative_quantity), 3)
+
+            band_label = f"B{band_counter}"
+
+            frontend_bands.append({
+                "id":              band_counter,
+                "name":            band_label,
+                "lane":            int(lane),
+                "x":               int(lane_x),
+                "y":               int(pos),
+                "w":               50,
+                "h":               12,
+                "molecularWeight": round(float(kda_value), 2),
+                "intensity":       round(float(intensity), 3),
+                "relativeQuantity": round(float(relative_quantity), 3),
+                "concentration":   display_concentration,
+                "confidence":      round(float(conf), 3),
+            })
+
+            results.append({
+                "Lane":            int(lane),
+                "Band":            band_label,
+                "kDa":             round(float(kda_value), 2),
+                "Intensity":       round(float(intensity), 3),
+                "Relative Quantity": round(float(relative_quantity), 3),
+                "X_Position":      int(lane_x),
+                "Y_Position":      int(pos),
+                "Confidence":      round(float(conf), 3),
+            })
+
+            band_counter += 1
+
+    return frontend_bands, results
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch analysis
+# ─────────────────────────────────────────────────────────────────────────────
+# Blots are independent, and the heavy steps (decode, CLAHE, cumsum, imwrite)
+# release the GIL, so a plain thread pool scales across cores without the
+# pickling cost of a process pool.  Size: WESTERN_BATCH_WORKERS (default ≤ 4).
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            default = min(4, os.cpu_count() or 1)
+            try:
+                workers = int(os.getenv("WESTERN_BATCH_WORKERS", default))
+            except ValueError:
+                workers = default
+            _batch_executor = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="western-batch"
+            )
+        return _batch_executor
+
+
+def analyze_blot_bytes(
+    data: bytes,
+    name: str,
+    ruler_lane: int = 0,
+    volume_loaded: float = 10.0,
+    reference_intensity: Optional[float] = None,
+    reference_concentration: Optional[float] = None,
+    ruler_marks: Optional[List[Dict]] = None,
+    annotated_path: Optional[str] = None,
+    digest: Optional[str] = None,
+) -> Dict:
+    """
+    CV-only analysis of one blot held in memory.  Never raises: failures are
+    reported as {"status": "error", "error": ...} so one bad file does not
+    abort a batch.
+    """
+    digest = digest or content_hash(data)
+    try:
+        original_gray, processed_img = preprocess_image_bytes(data, digest=digest, name=name)
+        lane_peaks = [int(x) for x in sorted(detect_lanes(processed_img))]
+        if len(lane_peaks) == 0:
+            raise ValueError("No lanes detected")
+        if not 0 <= ruler_lane < len(lane_peaks):
+            raise ValueError(
+                f"Ruler lane index {ruler_lane} out of range. Only {len(lane_peaks)} lane(s) detected."
+            )
+
+        pixel_to_kda = kda_mapper_for_blot(processed_img, lane_peaks, ruler_lane, ruler_marks)
+        lane_bands   = detect_bands_all_lanes(processed_img, lane_peaks)
+        bands, results = build_band_table(
+            lane_peaks, lane_bands, pixel_to_kda,
+            volume_loaded, reference_intensity, reference_concentration,
+        )
+
+        if annotated_path:
+            cv2.imwrite(annotated_path, annotate_gel_image(original_gray, lane_peaks, bands))
+
+        return {
+            "status":         "success",
+            "file":           name,
+            "sha256":         digest,
+            "lanes_detected": len(lane_peaks),
+            "band_count":     len(bands),
+            "bands":          bands,
+            "results":        results,
+            "image_width":    int(original_gray.shape[1]),
+            "image_height":   int(original_gray.shape[0]),
+        }
+    except Exception as e:
+        logger.warning("Batch blot %s failed: %s", name, e)
+        return {"status": "error", "file": name, "sha256": digest, "error": str(e)}
+
+
+def analyze_blots_batch(
+    blots: List[Tuple[str, bytes]],
+    annotate_dir: Optional[str] = None,
+    **params,
+) -> List[Dict]:
+    """
+    Run analyze_blot_bytes over (name, bytes) pairs on the shared worker pool.
+    Results are returned in input order; identical uploads (same content hash)
+    are analysed once.  ``params`` are forwarded to analyze_blot_bytes.
+    """
+    pool    = _get_batch_executor()
+    futures = {}
+    order   = []
+    for name, data in blots:
+        digest = content_hash(data)
+        order.append((name, digest))
+        if digest in futures:
+            continue
+        annotated_path = (
+            os.path.join(annotate_dir, f"annotated_{digest[:16]}.png") if annotate_dir else None
+        )
+        futures[digest] = pool.submit(
+            analyze_blot_bytes, data, name,
+            annotated_path=annotated_path, digest=digest, **params
+        )
+
+    out = []
+    for name, digest in order:
+        result = dict(futures[digest].result(), file=name)
+        out.append(result)
+    return out
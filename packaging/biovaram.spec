@@ -162,6 +162,7 @@ hidden_imports += [
     'src.api.config',
     'src.api.main',
     'src.api.cache',
+    'src.api.lazy_routers',
     'src.api.auth_middleware',
     'src.api.routers',
     'src.api.routers.upload',
@@ -124,7 +124,7 @@ hidden_imports += [
 # --- Our source packages ---
 hidden_imports += [
     'src', 'src.api', 'src.api.config', 'src.api.main',
-    'src.api.cache', 'src.api.auth_middleware',
+    'src.api.cache', 'src.api.auth_middleware', 'src.api.lazy_routers',
     'src.api.routers', 'src.api.routers.upload', 'src.api.routers.samples',
     'src.api.routers.jobs', 'src.api.routers.analysis',
     'src.api.routers.auth', 'src.api.routers.alerts',